@@ -0,0 +1,5 @@
+"""
+Пакет бенчмарков.
+
+Содержит сценарии измерения производительности mock-сервера, запускаемые вне набора тестов.
+"""
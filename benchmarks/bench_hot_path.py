@@ -0,0 +1,253 @@
+"""Бенчмарк горячего пути выдачи моков.
+
+Выполняет сценарии нагрузки против основного приложения в процессе (прямой вызов ASGI)
+или против локального сервера uvicorn и сохраняет результаты в JSON для сравнения между коммитами:
+    - hit_by_route: мок найден по методу и URI;
+    - hit_by_req_id: мок найден по заголовку x-req-id;
+    - miss: мок не найден, запрос передается приложению;
+    - large_body: мок с большим телом ответа;
+    - admin_writes_under_reads: создание моков через административный API под конкурентным чтением.
+
+Для каждого сценария сохраняются p50/p95/p99 задержки, RPS, количество ошибок и резидентная память
+до и после сценария.
+
+Пример:
+    python -m benchmarks.bench_hot_path --target inprocess --requests 5000 --output before.json
+    python -m benchmarks.bench_hot_path --target uvicorn --baseline before.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager
+from datetime import UTC, datetime
+from importlib import metadata
+from pathlib import Path
+from typing import Any
+
+from benchmarks.load import ROOT_DIR, BenchResponse, BenchTarget, InProcessTarget, LoadStats, UvicornTarget, run_load
+
+SCENARIOS = ("hit_by_route", "hit_by_req_id", "miss", "large_body", "admin_writes_under_reads")
+PACKAGES = ("fastapi", "starlette", "pydantic", "sqlalchemy", "aiosqlite", "uvicorn", "orjson")
+JSON_HEADERS = [("content-type", "application/json")]
+
+
+async def create_mock(target: BenchTarget, payload: dict[str, Any]) -> str:
+    """Создает мок через административный API и возвращает его UUID.
+
+    Args:
+        target (BenchTarget): Цель нагрузки.
+        payload (dict[str, Any]): Данные мока.
+
+    Returns:
+        str: UUID созданного мока.
+    """
+    response = await target.request("POST", "/api/v1/mock", JSON_HEADERS, json.dumps(payload).encode())
+    if response.status_code != 201:
+        raise RuntimeError(f"Не удалось создать мок: {response.status_code} {response.body[:200]!r}")
+    return str(json.loads(response.body)["uuid"])
+
+
+async def wait_until_served(target: BenchTarget, path: str, concurrency: int, timeout: float = 10.0) -> None:
+    """Ожидает, пока мок не начнет отвечать на всех соединениях цели нагрузки.
+
+    При нескольких воркерах uvicorn мок, созданный одним воркером, появляется у остальных воркеров
+    только после синхронизации таблицы маршрутов (MOCK_SYNC_INTERVAL).
+
+    Args:
+        target (BenchTarget): Цель нагрузки.
+        path (str): Путь мока.
+        concurrency (int): Количество конкурентных клиентов.
+        timeout (float): Максимальное время ожидания в секундах.
+    """
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        stats = await run_load(lambda _: target.request("GET", path), concurrency * 4, concurrency)
+        if not stats.errors:
+            return
+        if asyncio.get_running_loop().time() > deadline:
+            raise RuntimeError(f"Мок {path} не отвечает на всех воркерах за {timeout} с")
+        await asyncio.sleep(0.1)
+
+
+def make_record(
+    scenario: str, operation: str, stats: LoadStats, rss_before: int | None, rss_after: int | None
+) -> dict[str, Any]:
+    """Формирует запись результата сценария."""
+    return {
+        "scenario": scenario,
+        "operation": operation,
+        **stats.to_dict(),
+        "rss_before_bytes": rss_before,
+        "rss_after_bytes": rss_after,
+    }
+
+
+async def run_scenarios(
+    target: BenchTarget, scenarios: list[str], count: int, concurrency: int, large_body_kb: int
+) -> list[dict[str, Any]]:
+    """Подготавливает моки и выполняет выбранные сценарии.
+
+    Args:
+        target (BenchTarget): Цель нагрузки.
+        scenarios (list[str]): Названия сценариев.
+        count (int): Количество запросов на сценарий.
+        concurrency (int): Количество конкурентных клиентов.
+        large_body_kb (int): Размер тела мока в сценарии large_body, КиБ.
+
+    Returns:
+        list[dict[str, Any]]: Результаты сценариев.
+    """
+    users_body = {"users": [{"id": i, "name": f"user-{i}"} for i in range(50)]}
+    uuid = await create_mock(
+        target,
+        {
+            "uri": "/bench/users",
+            "method": "GET",
+            "status_code": 200,
+            "headers": {"X-Mock": "bench"},
+            "body": users_body,
+        },
+    )
+    item = {"id": 0, "payload": "x" * 1000}
+    large_body = {"items": [item] * max(large_body_kb, 1)}
+    await create_mock(target, {"uri": "/bench/large", "method": "GET", "status_code": 200, "body": large_body})
+    for path in ("/bench/users", "/bench/large"):
+        await wait_until_served(target, path, concurrency)
+
+    def get(path: str, headers: list[tuple[str, str]] | None = None) -> Callable[[int], Awaitable[BenchResponse]]:
+        return lambda _: target.request("GET", path, headers)
+
+    async def create(index: int) -> BenchResponse:
+        payload = {"uri": f"/bench/created/{index}", "method": "POST", "status_code": 201, "body": {"index": index}}
+        return await target.request("POST", "/api/v1/mock", JSON_HEADERS, json.dumps(payload).encode())
+
+    reads = {
+        "hit_by_route": get("/bench/users"),
+        "hit_by_req_id": get("/bench/users", [("x-req-id", uuid)]),
+        "miss": get("/"),
+        "large_body": get("/bench/large"),
+    }
+
+    records = []
+    for scenario in scenarios:
+        # Прогрев: первые запросы включают ленивую инициализацию и не попадают в измерения.
+        await run_load(reads.get(scenario, reads["hit_by_route"]), min(count, 200), concurrency)
+        rss_before = target.rss_bytes()
+        if scenario == "admin_writes_under_reads":
+            writers = max(concurrency // 4, 1)
+            read_stats, write_stats = await asyncio.gather(
+                run_load(reads["hit_by_route"], count, max(concurrency - writers, 1)),
+                run_load(create, max(count // 10, 1), writers, expected_status=201),
+            )
+            rss_after = target.rss_bytes()
+            records.append(make_record(scenario, "read", read_stats, rss_before, rss_after))
+            records.append(make_record(scenario, "write", write_stats, rss_before, rss_after))
+        else:
+            stats = await run_load(reads[scenario], count, concurrency)
+            records.append(make_record(scenario, "read", stats, rss_before, target.rss_bytes()))
+    return records
+
+
+def collect_metadata(args: argparse.Namespace) -> dict[str, Any]:
+    """Собирает сведения об окружении запуска для сравнения результатов между коммитами."""
+    commit: str | None
+    try:
+        commit = subprocess.run(  # noqa: S603
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    packages: dict[str, str | None] = {}
+    for package in PACKAGES:
+        try:
+            packages[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            packages[package] = None
+
+    return {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "packages": packages,
+        "target": args.target,
+        "workers": args.workers if args.target == "uvicorn" else 1,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "large_body_kb": args.large_body_kb,
+    }
+
+
+def format_table(records: list[dict[str, Any]], baseline: list[dict[str, Any]] | None) -> str:
+    """Форматирует результаты в таблицу, при наличии базовой линии добавляет отношения к ней."""
+    previous = {(record["scenario"], record["operation"]): record for record in baseline or []}
+    header = f"{'scenario':<26}{'op':<7}{'rps':>10}{'p50, ms':>10}{'p95, ms':>10}{'p99, ms':>10}{'errors':>8}"
+    if baseline is not None:
+        header += f"{'rps x':>8}{'p99 x':>8}"
+    lines = [header]
+    for record in records:
+        line = (
+            f"{record['scenario']:<26}{record['operation']:<7}{record['rps']:>10.0f}"
+            f"{record['p50_ms']:>10.3f}{record['p95_ms']:>10.3f}{record['p99_ms']:>10.3f}{record['errors']:>8}"
+        )
+        old = previous.get((record["scenario"], record["operation"]))
+        if old is not None:
+            rps_ratio = record["rps"] / old["rps"] if old["rps"] else 0.0
+            p99_ratio = record["p99_ms"] / old["p99_ms"] if old["p99_ms"] else 0.0
+            line += f"{rps_ratio:>8.2f}{p99_ratio:>8.2f}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+async def main(args: argparse.Namespace) -> int:
+    """Запускает бенчмарк и выводит результаты.
+
+    Returns:
+        int: Код завершения: 1, если в сценариях были ошибки, иначе 0.
+    """
+    target_context: AbstractAsyncContextManager[BenchTarget] = (
+        UvicornTarget.start(workers=args.workers) if args.target == "uvicorn" else InProcessTarget.start()
+    )
+    async with target_context as target:
+        records = await run_scenarios(target, args.scenarios, args.requests, args.concurrency, args.large_body_kb)
+
+    report = {"meta": collect_metadata(args), "results": records}
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+    baseline = json.loads(Path(args.baseline).read_text())["results"] if args.baseline else None
+    print(format_table(records, baseline), file=sys.stderr)
+    return 1 if any(record["errors"] for record in records) else 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=("inprocess", "uvicorn"), default="inprocess", help="Цель нагрузки.")
+    parser.add_argument("--workers", type=int, default=1, help="Количество воркеров uvicorn.")
+    parser.add_argument("--requests", type=int, default=5000, help="Количество запросов на сценарий.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Количество конкурентных клиентов.")
+    parser.add_argument("--large-body-kb", type=int, default=1024, help="Размер тела мока в сценарии large_body, КиБ.")
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS), help="Выполняемые сценарии."
+    )
+    parser.add_argument("--output", help="Файл для сохранения результатов в JSON; по умолчанию stdout.")
+    parser.add_argument("--baseline", help="Файл с результатами предыдущего запуска для сравнения.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,158 @@
+"""Бенчмарк диспетчеризации моков: BaseHTTPMiddleware против чистого ASGI-middleware.
+
+Собирает два приложения с одинаковым набором маршрутов и CORS:
+    - before: диспетчеризация через `@app.middleware("http")` с созданием Request/JSONResponse;
+    - after: DynamicMockMiddleware, работающий напрямую с ASGI scope.
+
+Запросы выполняются в процессе, без сети, прямым вызовом ASGI-приложения.
+
+Пример:
+    python -m benchmarks.bench_mock_dispatch --requests 20000
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
+
+from fastapi import FastAPI, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import RequestResponseEndpoint
+from starlette.types import ASGIApp, Message
+
+from src.api.models.mock_model import MockModelWithDate
+from src.middlewares.dynamic_mock_middleware import setup_dynamic_mock_middleware
+from src.services.mock_route_table import route_table
+
+
+def build_before_app() -> FastAPI:
+    """Собирает приложение с диспетчеризацией моков через BaseHTTPMiddleware."""
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def dynamic_mock_middleware(request: Request, call_next: RequestResponseEndpoint) -> Response:
+        mock_uuid = request.headers.get("x-req-id")
+        entry = (
+            route_table.get_by_uuid(UUID(mock_uuid))
+            if mock_uuid
+            else route_table.get_last_by_route(request.method, request.url.path)
+        )
+        if entry is None:
+            return await call_next(request)
+        mock = entry.mock
+        return JSONResponse(status_code=mock.status_code, content=mock.body, headers=mock.headers)
+
+    return _finish_app(app)
+
+
+def build_after_app() -> FastAPI:
+    """Собирает приложение с чистым ASGI-middleware диспетчеризации моков."""
+    app = FastAPI()
+    setup_dynamic_mock_middleware(app)
+    return _finish_app(app)
+
+
+def _finish_app(app: FastAPI) -> FastAPI:
+    """Добавляет в приложение CORS и корневой маршрут, как в основном приложении."""
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    @app.get("/")
+    async def root() -> dict[str, str]:
+        return {"message": "Hello World"}
+
+    return app
+
+
+def make_scope(path: str, headers: list[tuple[bytes, bytes]] | None = None) -> dict[str, object]:
+    """Создает ASGI scope GET-запроса."""
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), *(headers or [])],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+
+async def run_requests(app: ASGIApp, scope: dict[str, object], count: int, concurrency: int) -> float:
+    """Выполняет запросы к приложению и возвращает пропускную способность в запросах в секунду."""
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        return None
+
+    async def worker(n: int) -> None:
+        for _ in range(n):
+            await app(dict(scope), receive, send)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(count // concurrency) for _ in range(concurrency)))
+    return (count // concurrency) * concurrency / (time.perf_counter() - started)
+
+
+async def main(count: int, concurrency: int) -> None:
+    """Запускает сценарии для обоих приложений и печатает сравнение."""
+    now = datetime.now(UTC)
+    mock = MockModelWithDate(
+        uuid=uuid4(),
+        uri="/bench/users",
+        method="GET",
+        status_code=200,
+        headers={"X-Mock": "bench"},
+        body={"users": [{"id": i, "name": f"user-{i}"} for i in range(50)]},
+        body_ref=None,
+        delay=0,
+        latency=None,
+        stream=None,
+        match=None,
+        template=None,
+        sequence=None,
+        expires_at=None,
+        ttl_seconds=None,
+        max_hits=None,
+        version=1,
+        created_at=now,
+        updated_at=now,
+    )
+    route_table.load([mock])
+
+    scenarios = {
+        "hit_by_route": make_scope("/bench/users"),
+        "hit_by_req_id": make_scope("/bench/users", [(b"x-req-id", str(mock.uuid).encode())]),
+        "miss": make_scope("/"),
+    }
+    apps = {"before": build_before_app(), "after": build_after_app()}
+
+    print(f"{'scenario':<16}{'before, rps':>14}{'after, rps':>14}{'speedup':>10}")
+    for name, scope in scenarios.items():
+        results = {}
+        for label, app in apps.items():
+            await run_requests(app, scope, min(count, 1000), concurrency)
+            results[label] = await run_requests(app, scope, count, concurrency)
+        speedup = results["after"] / results["before"]
+        print(f"{name:<16}{results['before']:>14.0f}{results['after']:>14.0f}{speedup:>9.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000, help="Количество запросов на сценарий.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Количество конкурентных клиентов.")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
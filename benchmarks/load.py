@@ -0,0 +1,421 @@
+"""Генерация нагрузки и сбор метрик задержки для бенчмарков.
+
+Предоставляет:
+    - BenchResponse и BenchTarget: ответ и общий интерфейс цели нагрузки;
+    - InProcessTarget: вызов ASGI-приложения в процессе, без сети;
+    - UvicornTarget: локальный сервер uvicorn в отдельном процессе и пул keep-alive соединений HTTP/1.1;
+    - run_load: выполнение запросов с заданной конкурентностью и расчет LoadStats.
+
+Клиент HTTP реализован на asyncio streams, чтобы бенчмарки работали без сети и дополнительных зависимостей.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Protocol
+
+from fastapi import FastAPI
+from starlette.types import Message
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+Headers = list[tuple[str, str]]
+
+
+@dataclass(frozen=True, slots=True)
+class BenchResponse:
+    """Ответ на запрос бенчмарка.
+
+    Attributes:
+        status_code (int): HTTP код ответа.
+        body (bytes): Тело ответа.
+    """
+
+    status_code: int
+    body: bytes
+
+
+class BenchTarget(Protocol):
+    """Цель нагрузки: приложение, которому отправляются запросы."""
+
+    name: str
+
+    async def request(self, method: str, path: str, headers: Headers | None = None, body: bytes = b"") -> BenchResponse:
+        """Выполняет запрос к приложению."""
+        ...
+
+    def rss_bytes(self) -> int | None:
+        """Возвращает резидентную память процессов приложения, если ее можно определить."""
+        ...
+
+
+def read_rss_bytes(pid: int) -> int | None:
+    """Возвращает резидентную память процесса по данным /proc.
+
+    Args:
+        pid (int): Идентификатор процесса.
+
+    Returns:
+        int | None: Размер резидентной памяти в байтах, либо None, если /proc недоступен.
+    """
+    try:
+        pages = int(Path(f"/proc/{pid}/statm").read_text().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+class InProcessTarget:
+    """Приложение ASGI, вызываемое в текущем процессе.
+
+    Запросы передаются напрямую в ASGI-приложение, поэтому в измерения не входят сеть,
+    разбор HTTP и накладные расходы HTTP-клиента.
+    """
+
+    name = "inprocess"
+
+    def __init__(self, app: FastAPI) -> None:
+        """Создает цель нагрузки.
+
+        Args:
+            app (FastAPI): Приложение с уже выполненным запуском lifespan.
+        """
+        self.app = app
+
+    @classmethod
+    @asynccontextmanager
+    async def start(cls) -> AsyncIterator["InProcessTarget"]:
+        """Запускает жизненный цикл основного приложения и возвращает цель нагрузки."""
+        from src.__main__ import app, lifespan
+
+        async with lifespan(app):
+            yield cls(app)
+
+    async def request(self, method: str, path: str, headers: Headers | None = None, body: bytes = b"") -> BenchResponse:
+        """Выполняет запрос прямым вызовом ASGI-приложения.
+
+        Args:
+            method (str): HTTP-метод.
+            path (str): Путь запроса, при необходимости с query-строкой.
+            headers (Headers | None): Заголовки запроса.
+            body (bytes): Тело запроса.
+
+        Returns:
+            BenchResponse: Ответ приложения.
+        """
+        path, _, query = path.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": query.encode(),
+            "headers": [
+                (b"host", b"bench"),
+                (b"content-length", str(len(body)).encode()),
+                *((name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers or ()),
+            ],
+            "client": ("127.0.0.1", 50000),
+            "server": ("bench", 80),
+        }
+        status_code = 0
+        chunks: list[bytes] = []
+
+        async def receive() -> Message:
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return BenchResponse(status_code=status_code, body=b"".join(chunks))
+
+    def rss_bytes(self) -> int | None:
+        """Возвращает резидентную память текущего процесса."""
+        return read_rss_bytes(os.getpid())
+
+
+class _HttpConnection:
+    """Keep-alive соединение HTTP/1.1 с минимальным разбором ответа."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.host = host
+        self.closed = False
+
+    async def request(self, method: str, path: str, headers: Headers | None, body: bytes) -> BenchResponse:
+        """Отправляет запрос и читает ответ с Content-Length или chunked-телом."""
+        head = [f"{method} {path} HTTP/1.1", f"host: {self.host}", f"content-length: {len(body)}"]
+        head.extend(f"{name}: {value}" for name, value in headers or ())
+        self.writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await self.writer.drain()
+
+        status_line, *header_lines = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        response_headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            if name:
+                response_headers[name.strip().lower()] = value.strip()
+
+        if "content-length" in response_headers:
+            response_body = await self.reader.readexactly(int(response_headers["content-length"]))
+        elif response_headers.get("transfer-encoding") == "chunked":
+            chunks = []
+            while size := int((await self.reader.readuntil(b"\r\n")).split(b";")[0], 16):
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readexactly(2)
+            await self.reader.readuntil(b"\r\n")
+            response_body = b"".join(chunks)
+        else:
+            response_body = b""
+        self.closed = response_headers.get("connection") == "close"
+        return BenchResponse(status_code=int(status_line.split(" ", 2)[1]), body=response_body)
+
+
+class UvicornTarget:
+    """Локальный сервер uvicorn, запущенный в отдельном процессе командой `python -m src`.
+
+    Запросы отправляются через пул keep-alive соединений: каждая конкурентная задача
+    берет соединение из пула на время одного запроса.
+    """
+
+    name = "uvicorn"
+
+    def __init__(self, process: subprocess.Popen[bytes], host: str, port: int) -> None:
+        """Создает цель нагрузки.
+
+        Args:
+            process (subprocess.Popen[bytes]): Процесс сервера.
+            host (str): Хост сервера.
+            port (int): Порт сервера.
+        """
+        self.process = process
+        self.host = host
+        self.port = port
+        self._pool: list[_HttpConnection] = []
+
+    @classmethod
+    @asynccontextmanager
+    async def start(cls, workers: int = 1, startup_timeout: float = 30.0) -> AsyncIterator["UvicornTarget"]:
+        """Запускает сервер на свободном порту и дожидается его готовности.
+
+        Args:
+            workers (int): Количество воркеров uvicorn.
+            startup_timeout (float): Максимальное время ожидания запуска в секундах.
+        """
+        host = "127.0.0.1"
+        with socket.socket() as sock:
+            sock.bind((host, 0))
+            port = sock.getsockname()[1]
+
+        env = {
+            **os.environ,
+            "SERVER_HOST": host,
+            "SERVER_PORT": str(port),
+            "SERVER_RELOAD": "false",
+            "SERVER_WORKERS": str(workers),
+        }
+        process = subprocess.Popen(  # noqa: S603
+            [sys.executable, "-m", "src"],
+            cwd=ROOT_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        target = cls(process, host, port)
+        try:
+            await target._wait_ready(startup_timeout)
+            yield target
+        finally:
+            await target.close()
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    async def _wait_ready(self, timeout: float) -> None:
+        """Ожидает, пока сервер начнет отвечать на запросы."""
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Сервер uvicorn завершился с кодом {self.process.returncode}")
+            try:
+                if (await self.request("GET", "/")).status_code == 200:
+                    return
+            except OSError:
+                pass
+            if time.monotonic() > deadline:
+                raise TimeoutError("Сервер uvicorn не запустился вовремя")
+            await asyncio.sleep(0.1)
+
+    async def request(self, method: str, path: str, headers: Headers | None = None, body: bytes = b"") -> BenchResponse:
+        """Выполняет запрос через соединение из пула.
+
+        Args:
+            method (str): HTTP-метод.
+            path (str): Путь запроса, при необходимости с query-строкой.
+            headers (Headers | None): Заголовки запроса.
+            body (bytes): Тело запроса.
+
+        Returns:
+            BenchResponse: Ответ сервера.
+        """
+        if self._pool:
+            connection = self._pool.pop()
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            connection = _HttpConnection(reader, writer, f"{self.host}:{self.port}")
+        try:
+            response = await connection.request(method, path, headers, body)
+        except BaseException:
+            connection.writer.close()
+            raise
+        if connection.closed:
+            connection.writer.close()
+        else:
+            self._pool.append(connection)
+        return response
+
+    async def close(self) -> None:
+        """Закрывает соединения пула."""
+        for connection in self._pool:
+            connection.writer.close()
+        self._pool.clear()
+
+    def rss_bytes(self) -> int | None:
+        """Возвращает суммарную резидентную память процесса сервера и его воркеров."""
+        try:
+            children = Path(f"/proc/{self.process.pid}/task/{self.process.pid}/children").read_text().split()
+        except OSError:
+            children = []
+        sizes = [read_rss_bytes(pid) for pid in (self.process.pid, *map(int, children))]
+        return sum(size for size in sizes if size is not None) if sizes[0] is not None else None
+
+
+@dataclass(frozen=True, slots=True)
+class LoadStats:
+    """Результаты одной серии запросов.
+
+    Attributes:
+        requests (int): Количество выполненных запросов.
+        errors (int): Количество запросов с неожиданным кодом ответа или исключением.
+        rps (float): Пропускная способность, запросов в секунду.
+        p50_ms (float): Медиана задержки, мс.
+        p95_ms (float): 95-й перцентиль задержки, мс.
+        p99_ms (float): 99-й перцентиль задержки, мс.
+        max_ms (float): Максимальная задержка, мс.
+        mean_ms (float): Средняя задержка, мс.
+    """
+
+    requests: int
+    errors: int
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    mean_ms: float
+
+    def to_dict(self) -> dict[str, float | int]:
+        """Возвращает результаты в виде словаря."""
+        return asdict(self)
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Возвращает перцентиль отсортированного ряда методом ближайшего ранга.
+
+    Args:
+        sorted_values (list[float]): Отсортированные значения.
+        fraction (float): Доля от 0 до 1, например 0.99.
+
+    Returns:
+        float: Значение перцентиля, либо 0, если ряд пуст.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> LoadStats:
+    """Рассчитывает статистику серии запросов.
+
+    Args:
+        latencies (list[float]): Задержки запросов в секундах.
+        errors (int): Количество ошибок.
+        elapsed (float): Общее время серии в секундах.
+
+    Returns:
+        LoadStats: Статистика серии.
+    """
+    values = sorted(latency * 1000 for latency in latencies)
+    return LoadStats(
+        requests=len(values),
+        errors=errors,
+        rps=len(values) / elapsed if elapsed > 0 else 0.0,
+        p50_ms=percentile(values, 0.50),
+        p95_ms=percentile(values, 0.95),
+        p99_ms=percentile(values, 0.99),
+        max_ms=values[-1] if values else 0.0,
+        mean_ms=sum(values) / len(values) if values else 0.0,
+    )
+
+
+async def run_load(
+    call: Callable[[int], Awaitable[BenchResponse]],
+    count: int,
+    concurrency: int,
+    expected_status: int = 200,
+) -> LoadStats:
+    """Выполняет серию запросов с заданной конкурентностью.
+
+    Args:
+        call (Callable[[int], Awaitable[BenchResponse]]): Функция выполнения запроса по его номеру.
+        count (int): Количество запросов.
+        concurrency (int): Количество конкурентных задач.
+        expected_status (int): Ожидаемый код ответа; остальные коды считаются ошибками.
+
+    Returns:
+        LoadStats: Статистика серии.
+    """
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(count))
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in counter:
+            started = time.perf_counter()
+            try:
+                response = await call(index)
+            except Exception:
+                logger.exception("Ошибка запроса бенчмарка")
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != expected_status:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(min(concurrency, count), 1))))
+    return summarize(latencies, errors, time.perf_counter() - started)
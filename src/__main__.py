@@ -1,13 +1,30 @@
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.api import api_router
-from src.db import initialize_db
+from src.db import is_in_memory_sqlite, prepare_db_schema
+from src.metrics import MetricsFileStore, MetricsFlusher, metrics
 from src.middlewares.dynamic_mock_middleware import setup_dynamic_mock_middleware
+from src.services.mock_proxy import mock_proxy
+from src.services.mock_reaper import mock_reaper
+from src.services.mock_sequence import mock_hit_counters, sequence_cursors
+from src.services.mock_service import load_mock_route_table
+from src.services.mock_snapshot import mock_snapshot_store
+from src.services.mock_sync import MockRouteTableSync
+from src.services.request_journal import RequestJournalFlusher, request_journal
 from src.settings import config
+from src.storage import initialize_storage
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
@@ -15,17 +32,81 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """
     Контекстный менеджер жизненного цикла приложения FastAPI.
 
-    Инициализирует базу данных перед запуском приложения.
+    Инициализирует хранилище мок-данных и загружает мок-данные в in-memory таблицу маршрутов
+    перед запуском приложения. Если хранилище может изменяться другими процессами,
+    запускает фоновую синхронизацию таблицы маршрутов по журналу изменений, иначе, если задан
+    файл SNAPSHOT_PATH, подключает к таблице маршрутов снимок мок-данных и сохраняет снимки. Если задан
+    каталог METRICS_DIR, периодически сохраняет в него снимок метрик воркера. Если задан
+    файл SEQUENCE_CURSORS_PATH, хранит в нем позиции сценариев моков, а в файле рядом с ним — счетчики
+    ответов моков с ограничением max_hits. В фоне удаляет моки с истекшим сроком жизни. Если задан PROXY_URL,
+    запускает прокси запросов без моков на upstream-сервер. Если включен
+    журнал запросов, в фоне сохраняет его в хранилище.
 
     Args:
         app (FastAPI): Экземпляр приложения FastAPI.
 
     Yields:
-        None: После инициализации базы данных управление возвращается FastAPI.
+        None: После инициализации хранилища управление возвращается FastAPI.
     """
-    await initialize_db()
-
-    yield
+    storage = await initialize_storage()
+
+    if config.SEQUENCE_CURSORS_PATH:
+        sequence_cursors.open(config.SEQUENCE_CURSORS_PATH)
+        mock_hit_counters.open(f"{config.SEQUENCE_CURSORS_PATH}.hits")
+
+    flusher = None
+    if config.METRICS_DIR:
+        flusher = MetricsFlusher(metrics, MetricsFileStore(config.METRICS_DIR), config.METRICS_FLUSH_INTERVAL)
+        flusher.start()
+
+    journal_flusher = None
+    if config.JOURNAL_ENABLED:
+        journal_flusher = RequestJournalFlusher(
+            request_journal, interval=config.JOURNAL_FLUSH_INTERVAL, retention=config.JOURNAL_RETENTION
+        )
+        journal_flusher.start()
+
+    sync = None
+    snapshots = None
+    if storage.shared and config.MOCK_SYNC_INTERVAL:
+        sync = MockRouteTableSync(
+            interval=config.MOCK_SYNC_INTERVAL,
+            retention=config.MOCK_CHANGE_LOG_RETENTION,
+            gap_timeout=config.MOCK_SYNC_GAP_TIMEOUT,
+        )
+        await sync.start()
+    elif not storage.shared and mock_snapshot_store.path:
+        snapshots = mock_snapshot_store
+        await snapshots.start(storage)
+    else:
+        await load_mock_route_table()
+
+    await mock_reaper.start()
+
+    if config.PROXY_URL:
+        await mock_proxy.start(
+            config.PROXY_URL,
+            timeout=config.PROXY_TIMEOUT,
+            max_connections=config.PROXY_MAX_CONNECTIONS,
+            record=config.PROXY_RECORD,
+            record_limit=config.PROXY_RECORD_LIMIT,
+        )
+
+    try:
+        yield
+    finally:
+        await mock_proxy.stop()
+        await mock_reaper.stop()
+        if sync is not None:
+            await sync.stop()
+        if snapshots is not None:
+            await snapshots.stop()
+        if journal_flusher is not None:
+            await journal_flusher.stop()
+        if flusher is not None:
+            await flusher.stop()
+        sequence_cursors.close()
+        mock_hit_counters.close()
 
 
 app = FastAPI(
@@ -70,19 +151,67 @@ async def root() -> dict[str, str]:
     return {"message": "Hello World"}
 
 
-if __name__ == "__main__":
+def main() -> None:
     """
     Точка входа для запуска приложения с помощью uvicorn.
 
-    Использует параметры хоста и порта из конфигурации.
+    Использует параметры хоста, порта, перезагрузки и количества воркеров из конфигурации.
+    Перезагрузка при изменениях (SERVER_RELOAD) поддерживает только один процесс, поэтому
+    вместе с несколькими воркерами сервер не запускается. При запуске нескольких воркеров
+    хранилище в памяти и база данных в памяти заменяются файловой базой `DB_SHARED_HOST`,
+    общей для всех процессов; если она не задана, для запуска создается новая база
+    во временном каталоге, который удаляется после остановки. Схема базы данных создается
+    заранее в главном процессе. Для объединения метрик воркеров используется каталог METRICS_DIR,
+    снимки предыдущего запуска из него удаляются. Позиции сценариев моков воркеры хранят
+    в общем файле SEQUENCE_CURSORS_PATH, а счетчики ответов моков — в файле рядом с ним; оба файла
+    пересоздаются при запуске.
+
+    Raises:
+        RuntimeError: Если SERVER_RELOAD задан вместе с SERVER_WORKERS больше 1.
 
     Example:
-        python -m src.__main__
+        python -m src
     """
     import uvicorn
 
-    uvicorn.run(
-        app,
-        host=config.SERVER_HOST,
-        port=config.SERVER_PORT,
-    )
+    workers = max(config.SERVER_WORKERS, 1)
+    if config.SERVER_RELOAD and workers > 1:
+        raise RuntimeError(
+            f"SERVER_RELOAD поддерживает только один процесс, а SERVER_WORKERS={workers}: "
+            "задайте SERVER_RELOAD=false или SERVER_WORKERS=1"
+        )
+
+    if workers == 1:
+        uvicorn.run("src.__main__:app", host=config.SERVER_HOST, port=config.SERVER_PORT, reload=config.SERVER_RELOAD)
+        return
+
+    shared_dir = None
+    if config.DB_TYPE == "memory" or is_in_memory_sqlite(config.DB_HOST):
+        shared_host = config.DB_SHARED_HOST
+        if shared_host is None:
+            shared_dir = Path(tempfile.mkdtemp(prefix="mock-rest-server-"))
+            shared_host = f"sqlite+aiosqlite:///{shared_dir / 'mock-rest-server.sqlite3'}"
+        logger.warning("Хранилище в памяти не разделяется между воркерами, используется %s", shared_host)
+        os.environ["DB_HOST"] = shared_host
+        os.environ["DB_TYPE"] = "sqlite3"
+
+    try:
+        asyncio.run(prepare_db_schema(os.environ.get("DB_HOST", config.DB_HOST)))
+
+        metrics_dir = config.METRICS_DIR or str(Path(tempfile.gettempdir()) / "mock-rest-server-metrics")
+        MetricsFileStore(metrics_dir).clear()
+        os.environ["METRICS_DIR"] = metrics_dir
+
+        cursors_path = config.SEQUENCE_CURSORS_PATH or str(Path(tempfile.gettempdir()) / "mock-rest-server-sequences")
+        Path(cursors_path).unlink(missing_ok=True)
+        Path(f"{cursors_path}.hits").unlink(missing_ok=True)
+        os.environ["SEQUENCE_CURSORS_PATH"] = cursors_path
+
+        uvicorn.run("src.__main__:app", host=config.SERVER_HOST, port=config.SERVER_PORT, workers=workers)
+    finally:
+        if shared_dir is not None:
+            shutil.rmtree(shared_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,15 @@
 
 from fastapi import APIRouter
 
+from .blob_router import router as blob_router
+from .cache_router import router as cache_router
+from .metrics_router import router as metrics_router
 from .mock_router import router as mock_router
+from .request_log_router import router as request_log_router
 
 api_router = APIRouter()
 api_router.include_router(mock_router, prefix="/api/v1", tags=["mock"])
+api_router.include_router(request_log_router, prefix="/api/v1", tags=["requests"])
+api_router.include_router(blob_router, prefix="/api/v1", tags=["blobs"])
+api_router.include_router(cache_router, prefix="/api/v1", tags=["cache"])
+api_router.include_router(metrics_router, tags=["metrics"])
@@ -0,0 +1,69 @@
+"""Модуль роутера хранилища тел ответов."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Request, status
+from fastapi.params import Path
+from fastapi.responses import FileResponse, JSONResponse
+
+from src.api.models.error_model import ErrorModel
+from src.api.models.mock_model import DIGEST_REGEX, MockBodyRef
+from src.storage import blob_store
+
+router = APIRouter()
+
+
+@router.post(
+    "/mock/blobs",
+    response_model=MockBodyRef,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/octet-stream": {"schema": {"type": "string", "format": "binary"}}},
+            "required": True,
+        }
+    },
+)
+async def upload_blob(request: Request) -> MockBodyRef:
+    """
+    Загрузить тело ответа в хранилище тел ответов.
+
+    Тело запроса записывается в файл по мере получения, не накапливаясь в памяти. Возвращенная
+    ссылка указывается в поле body_ref мок-данных; Content-Type запроса становится Content-Type ответа мока.
+
+    Args:
+        request (Request): Запрос с телом ответа в произвольном формате.
+
+    Returns:
+        MockBodyRef: Ссылка на сохраненное тело.
+    """
+    digest, size = await blob_store.put_stream(request.stream())
+    content_type = request.headers.get("content-type") or "application/octet-stream"
+    return MockBodyRef(digest=digest, size=size, content_type=content_type)
+
+
+@router.get(
+    "/mock/blobs/{digest}",
+    response_model=None,
+    responses={
+        200: {"content": {"application/octet-stream": {}}},
+        404: {"model": ErrorModel, "description": "Тело ответа не найдено"},
+    },
+)
+async def download_blob(
+    digest: Annotated[str, Path(pattern=DIGEST_REGEX, description="SHA-256 содержимого тела")],
+) -> FileResponse | JSONResponse:
+    """
+    Выгрузить тело ответа из хранилища тел ответов.
+
+    Args:
+        digest (str): SHA-256 содержимого тела.
+
+    Returns:
+        FileResponse | JSONResponse: Содержимое тела, либо ошибка 404, если тело не найдено.
+    """
+    path = blob_store.path(digest)
+    if not path.is_file():
+        error = ErrorModel(detail=f"Тело ответа {digest} не найдено")
+        return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content=error.model_dump())
+    return FileResponse(path, media_type="application/octet-stream")
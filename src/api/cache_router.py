@@ -0,0 +1,35 @@
+"""Модуль роутера кеша ответов моков."""
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from src.api.models.cache_model import ResponseCacheStats
+from src.services.response_cache import response_cache
+
+router = APIRouter()
+
+
+@router.get("/mock/cache", response_model=ResponseCacheStats)
+async def get_response_cache_stats() -> ResponseCacheStats:
+    """
+    Получить статистику кеша ответов текущего воркера.
+
+    Суммарные попадания и промахи всех воркеров доступны на странице метрик
+    в счетчике `mock_response_cache_requests_total`.
+
+    Returns:
+        ResponseCacheStats: Количество и размер ответов в кеше, попадания, промахи и их доля, вытеснения.
+    """
+    return ResponseCacheStats.model_validate(response_cache.stats())
+
+
+@router.delete("/mock/cache")
+async def clear_response_cache() -> JSONResponse:
+    """
+    Очистить кеш ответов текущего воркера.
+
+    Returns:
+        JSONResponse: 200 после очистки кеша.
+    """
+    response_cache.clear()
+    return JSONResponse(status_code=200, content=None)
@@ -0,0 +1,40 @@
+"""Модуль роутера страницы метрик в текстовом формате Prometheus."""
+
+import asyncio
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from src.metrics import CONTENT_TYPE, METRICS_PATH, MetricsFileStore, MetricsSnapshot, metrics, render_prometheus
+from src.settings import config
+
+router = APIRouter()
+
+
+def collect_metrics_snapshot() -> MetricsSnapshot:
+    """
+    Собрать снимок метрик приложения.
+
+    При запуске нескольких воркеров (задан METRICS_DIR) сначала сохраняет снимок текущего
+    воркера, затем объединяет снимки всех воркеров.
+
+    Returns:
+        MetricsSnapshot: Снимок метрик.
+    """
+    if not config.METRICS_DIR:
+        return metrics.snapshot()
+    store = MetricsFileStore(config.METRICS_DIR)
+    store.write(metrics.snapshot())
+    return store.read_all()
+
+
+@router.get(METRICS_PATH, response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """
+    Получить метрики приложения в текстовом формате Prometheus.
+
+    Returns:
+        PlainTextResponse: Страница метрик.
+    """
+    snapshot = await asyncio.to_thread(collect_metrics_snapshot) if config.METRICS_DIR else metrics.snapshot()
+    return PlainTextResponse(render_prometheus(snapshot), media_type=CONTENT_TYPE)
@@ -1,62 +1,301 @@
-from typing import Annotated
+import json
+from collections.abc import AsyncIterator
+from typing import Annotated, Any, Literal
 from uuid import UUID
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Body, Request, Response, status
+from fastapi.exceptions import RequestValidationError
 from fastapi.params import Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
 
+from src.api.models.bulk_model import BulkImportResult
 from src.api.models.error_model import ErrorModel
 from src.api.models.mock_model import MockData, MockModelWithDate
-from src.services.mock_service import create_mock_data, delete_mock_data, get_all_mock_data, get_mock_data_by_uuid
+from src.api.models.page_model import MockPage
+from src.services.mock_bulk_service import encode_mock_stream, export_mock_data, import_mock_data, iter_ndjson_lines
+from src.services.mock_service import (
+    MockVersionConflictError,
+    create_mock_data,
+    delete_mock_data,
+    get_mock_data_by_uuid,
+    get_mock_data_page,
+    get_mock_history,
+    iter_mock_data,
+    patch_mock_data,
+    reset_mock_sequence,
+    rollback_mock_data,
+    update_mock_data,
+)
+from src.settings import config
+from src.storage import MockRouteConflictError
 
 router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 100
+"""Размер страницы списка мок-данных, если передан только курсор."""
+
+_UPDATE_RESPONSES: dict[int | str, dict[str, Any]] = {
+    400: {"model": ErrorModel, "description": "Тело ответа по ссылке body_ref не найдено"},
+    404: {"model": ErrorModel, "description": "Мок-данные не найдены"},
+    409: {
+        "model": ErrorModel,
+        "description": "Версия мок-данных не совпадает с ожидаемой, или маршрут занят другими мок-данными",
+    },
+}
+
+VersionQuery = Annotated[
+    int | None, Query(ge=1, description="Ожидаемая текущая версия мок-данных; при несовпадении возвращается 409")
+]
+
+
+def _not_found() -> JSONResponse:
+    """Возвращает ответ 404 для мок-данных, не найденных по UUID."""
+    error = ErrorModel(detail="Мок-данные с указанным UUID не найдены")
+    return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content=error.model_dump())
+
 
 @router.get(
     "/mock",
-    response_model=list[MockModelWithDate] | MockModelWithDate,
-    responses={404: {"model": ErrorModel, "description": "Мок-данные не найдены"}},
+    response_model=list[MockModelWithDate] | MockModelWithDate | MockPage,
+    responses={
+        200: {"content": {"application/x-ndjson": {}}},
+        400: {"model": ErrorModel, "description": "Некорректный курсор страницы"},
+        404: {"model": ErrorModel, "description": "Мок-данные не найдены"},
+    },
 )
 async def get_mock(
     uuid: Annotated[UUID | None, Query(description="UUID мок-данных")] = None,
-) -> list[MockModelWithDate] | MockModelWithDate | JSONResponse:
+    limit: Annotated[int | None, Query(ge=1, le=1000, description="Размер страницы")] = None,
+    cursor: Annotated[str | None, Query(description="Курсор следующей страницы")] = None,
+    method: Annotated[str | None, Query(description="Фильтр по HTTP методу")] = None,
+    uri_prefix: Annotated[str | None, Query(description="Фильтр по префиксу URI")] = None,
+    status_code: Annotated[int | None, Query(description="Фильтр по HTTP коду ответа")] = None,
+    stream: Annotated[bool, Query(description="Отдать мок-данные потоком в формате NDJSON")] = False,
+    include_body: Annotated[
+        bool, Query(description="Загружать тела ответов в списке; при false тела не читаются из хранилища")
+    ] = True,
+) -> list[MockModelWithDate] | MockModelWithDate | MockPage | Response:
     """
-    Получить мок-данные по UUID или список всех мок-данных.
+    Получить мок-данные по UUID, страницу мок-данных или список всех мок-данных.
+
+    Список всех мок-данных и поток NDJSON читаются из курсора базы данных и отправляются
+    клиенту по мере чтения, поэтому потребление памяти не зависит от количества моков.
 
     Args:
-        uuid (UUID | None): UUID мок-данных. Если не указан, возвращается список всех мок-данных.
+        uuid (UUID | None): UUID мок-данных. Если не указан, возвращается список мок-данных.
+        limit (int | None): Размер страницы. Если указан вместе с курсором или без него, возвращается страница.
+        cursor (str | None): Курсор следующей страницы из предыдущего ответа.
+        method (str | None): Фильтр по HTTP методу.
+        uri_prefix (str | None): Фильтр по префиксу URI.
+        status_code (int | None): Фильтр по HTTP коду ответа.
+        stream (bool): Отдать все подходящие мок-данные потоком в формате NDJSON.
+        include_body (bool): Загружать тела ответов в списке; при false поле body равно null.
 
     Returns:
-        list[MockModelWithDate] | MockModelWithDate | JSONResponse:
-            - Если uuid не указан: список всех мок-данных или ошибка 404, если данных нет.
+        list[MockModelWithDate] | MockModelWithDate | MockPage | Response:
             - Если uuid указан: объект мок-данных или ошибка 404, если не найден.
+            - Если stream=true: поток NDJSON с мок-данными.
+            - Если указан limit или cursor: страница мок-данных или ошибка 400 при некорректном курсоре.
+            - Иначе: список всех мок-данных или ошибка 404, если данных нет.
     """
-    if uuid is None:
-        mocks = await get_all_mock_data()
-        if not mocks:
-            error = ErrorModel(detail="Мок-данные не найдены")
+    if uuid is not None:
+        mock = await get_mock_data_by_uuid(uuid)
+        if mock is None:
+            error = ErrorModel(detail="Мок-данные с указанным UUID не найдены")
             return JSONResponse(status_code=404, content=error.model_dump())
-        return mocks
+        return mock
 
-    mock = await get_mock_data_by_uuid(uuid)
-    if mock is None:
-        error = ErrorModel(detail="Мок-данные с указанным UUID не найдены")
+    if stream:
+        mocks = iter_mock_data(
+            config.BULK_BATCH_SIZE,
+            method=method,
+            uri_prefix=uri_prefix,
+            status_code=status_code,
+            include_body=include_body,
+        )
+        return StreamingResponse(encode_mock_stream(mocks, ndjson=True), media_type="application/x-ndjson")
+
+    if limit is not None or cursor is not None:
+        try:
+            items, next_cursor = await get_mock_data_page(
+                limit=limit or DEFAULT_PAGE_SIZE,
+                cursor=cursor,
+                method=method,
+                uri_prefix=uri_prefix,
+                status_code=status_code,
+                include_body=include_body,
+            )
+        except ValueError as e:
+            error = ErrorModel(detail=str(e))
+            return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=error.model_dump())
+        return MockPage(items=items, next_cursor=next_cursor)
+
+    mocks = iter_mock_data(
+        config.BULK_BATCH_SIZE, method=method, uri_prefix=uri_prefix, status_code=status_code, include_body=include_body
+    )
+    first = await anext(mocks, None)
+    if first is None:
+        await mocks.aclose()
+        error = ErrorModel(detail="Мок-данные не найдены")
         return JSONResponse(status_code=404, content=error.model_dump())
-    return mock
 
+    async def iter_all() -> AsyncIterator[MockModelWithDate]:
+        yield first
+        async for mock in mocks:
+            yield mock
+
+    return StreamingResponse(encode_mock_stream(iter_all(), ndjson=False), media_type="application/json")
 
-@router.post("/mock", response_model=MockModelWithDate, status_code=status.HTTP_201_CREATED)
-async def create_mock(mock: MockData) -> MockModelWithDate:
+
+@router.post(
+    "/mock",
+    response_model=MockModelWithDate,
+    status_code=status.HTTP_201_CREATED,
+    responses={400: {"model": ErrorModel, "description": "Тело ответа по ссылке body_ref не найдено"}},
+)
+async def create_mock(mock: MockData) -> MockModelWithDate | JSONResponse:
     """
     Создать новые мок-данные.
 
+    Большое JSON-тело сохраняется в хранилище тел ответов и возвращается ссылкой body_ref.
+    Если для маршрута с теми же условиями match уже есть мок-данные, они изменяются как новая версия.
+
     Args:
         mock (MockData): Данные для создания нового мока.
 
     Returns:
-        MockModelWithDate: Созданный объект мок-данных с датой.
+        MockModelWithDate | JSONResponse: Созданный объект мок-данных с датой, либо ошибка 400,
+            если тело по ссылке body_ref не найдено в хранилище тел ответов.
     """
-    mock_data = await create_mock_data(mock)
+    try:
+        mock_data = await create_mock_data(mock)
+    except ValueError as e:
+        error = ErrorModel(detail=str(e))
+        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=error.model_dump())
+    return mock_data
+
+
+@router.put("/mock", response_model=MockModelWithDate, responses=_UPDATE_RESPONSES)
+async def update_mock(uuid: UUID, mock: MockData, version: VersionQuery = None) -> MockModelWithDate | JSONResponse:
+    """
+    Заменить мок-данные на месте.
+
+    UUID и дата создания сохраняются, версия увеличивается на единицу, а предыдущая версия
+    сохраняется в истории изменений.
+
+    Args:
+        uuid (UUID): UUID изменяемых мок-данных.
+        mock (MockData): Новые данные мока.
+        version (int | None): Ожидаемая текущая версия мок-данных.
+
+    Returns:
+        MockModelWithDate | JSONResponse: Измененные мок-данные, либо ошибка 404, если мок-данные не найдены,
+            409, если версия не совпадает с ожидаемой или маршрут занят другими мок-данными,
+            или 400, если тело по ссылке body_ref не найдено.
+    """
+    try:
+        mock_data = await update_mock_data(uuid, mock, version)
+    except (MockVersionConflictError, MockRouteConflictError) as e:
+        return JSONResponse(status_code=status.HTTP_409_CONFLICT, content=ErrorModel(detail=str(e)).model_dump())
+    except ValueError as e:
+        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=ErrorModel(detail=str(e)).model_dump())
+    return mock_data if mock_data is not None else _not_found()
+
+
+@router.patch("/mock", response_model=MockModelWithDate, responses=_UPDATE_RESPONSES)
+async def patch_mock(
+    uuid: UUID,
+    changes: Annotated[
+        dict[str, Any],
+        Body(
+            description="Изменяемые поля мок-данных; null очищает поле",
+            examples=[{"status_code": 503, "body": {"error": "maintenance"}}],
+        ),
+    ],
+    version: VersionQuery = None,
+) -> MockModelWithDate | JSONResponse:
+    """
+    Изменить отдельные поля мок-данных на месте.
+
+    Args:
+        uuid (UUID): UUID изменяемых мок-данных.
+        changes (dict[str, Any]): Изменяемые поля мок-данных.
+        version (int | None): Ожидаемая текущая версия мок-данных.
+
+    Returns:
+        MockModelWithDate | JSONResponse: Измененные мок-данные, либо ошибка 404, если мок-данные не найдены,
+            409, если мок-данные изменены другим запросом или маршрут занят другими мок-данными,
+            400, если тело по ссылке body_ref не найдено, или 422, если передано неизвестное поле
+            или поля после изменения некорректны.
+    """
+    try:
+        mock_data = await patch_mock_data(uuid, changes, version)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False), body=changes) from e
+    except (MockVersionConflictError, MockRouteConflictError) as e:
+        return JSONResponse(status_code=status.HTTP_409_CONFLICT, content=ErrorModel(detail=str(e)).model_dump())
+    except ValueError as e:
+        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=ErrorModel(detail=str(e)).model_dump())
+    return mock_data if mock_data is not None else _not_found()
+
+
+@router.get(
+    "/mock/history",
+    response_model=list[MockModelWithDate],
+    responses={404: {"model": ErrorModel, "description": "Мок-данные не найдены"}},
+)
+async def get_mock_versions(uuid: UUID) -> list[MockModelWithDate] | JSONResponse:
+    """
+    Получить сохраненные предыдущие версии мок-данных.
+
+    Args:
+        uuid (UUID): UUID мок-данных.
+
+    Returns:
+        list[MockModelWithDate] | JSONResponse: Версии от новых к старым, либо ошибка 404, если мок-данные не найдены.
+    """
+    history = await get_mock_history(uuid)
+    return history if history is not None else _not_found()
+
+
+@router.post(
+    "/mock/rollback",
+    response_model=MockModelWithDate,
+    responses={
+        404: {"model": ErrorModel, "description": "Мок-данные или версия не найдены"},
+        409: {"model": ErrorModel, "description": "Мок-данные изменены во время отката или маршрут занят"},
+    },
+)
+async def rollback_mock(
+    uuid: UUID,
+    version: Annotated[
+        int | None, Query(ge=1, description="Версия из истории; по умолчанию предшествующая текущей")
+    ] = None,
+) -> MockModelWithDate | JSONResponse:
+    """
+    Вернуть мок-данные к версии из истории изменений.
+
+    Откат сохраняется как новая версия мок-данных.
+
+    Args:
+        uuid (UUID): UUID мок-данных.
+        version (int | None): Версия из истории; по умолчанию предшествующая текущей.
+
+    Returns:
+        MockModelWithDate | JSONResponse: Мок-данные после отката, либо ошибка 404, если мок-данные
+            или версия не найдены, или 409, если мок-данные изменены во время отката или маршрут версии
+            занят другими мок-данными.
+    """
+    try:
+        mock_data = await rollback_mock_data(uuid, version)
+    except (MockVersionConflictError, MockRouteConflictError) as e:
+        return JSONResponse(status_code=status.HTTP_409_CONFLICT, content=ErrorModel(detail=str(e)).model_dump())
+    except ValueError as e:
+        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=ErrorModel(detail=str(e)).model_dump())
+    if mock_data is None:
+        error = ErrorModel(detail="Мок-данные или версия с указанным номером не найдены")
+        return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content=error.model_dump())
     return mock_data
 
 
@@ -78,3 +317,104 @@ async def delete_mock(uuid: UUID) -> JSONResponse:
         error = ErrorModel(detail="Мок-данные с указанным UUID не найдены")
         return JSONResponse(status_code=404, content=error.model_dump())
     return JSONResponse(status_code=200, content=None)
+
+
+@router.post(
+    "/mock/sequence/reset",
+    responses={404: {"model": ErrorModel, "description": "Мок-данные со сценарием не найдены"}},
+)
+async def reset_mock_sequence_position(
+    uuid: Annotated[UUID | None, Query(description="UUID мок-данных со сценарием; без него сбрасываются все")] = None,
+) -> JSONResponse:
+    """
+    Сбросить сценарий мок-данных к первому шагу.
+
+    Args:
+        uuid (UUID | None): UUID мок-данных со сценарием. Если не указан, сбрасываются все сценарии.
+
+    Returns:
+        JSONResponse:
+            - 200, если позиции сценариев сброшены.
+            - 404, если мок-данные со сценарием с указанным UUID не найдены.
+    """
+    if not reset_mock_sequence(uuid):
+        error = ErrorModel(detail="Мок-данные со сценарием с указанным UUID не найдены")
+        return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content=error.model_dump())
+    return JSONResponse(status_code=status.HTTP_200_OK, content=None)
+
+
+@router.post(
+    "/mock/bulk",
+    response_model=BulkImportResult,
+    responses={400: {"model": ErrorModel, "description": "Некорректный формат тела запроса"}},
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string", "description": "Один объект MockData на строку"}},
+                "application/json": {"schema": {"type": "array", "items": {"$ref": "#/components/schemas/MockData"}}},
+            },
+        }
+    },
+)
+async def bulk_create_mock(request: Request) -> BulkImportResult | JSONResponse:
+    """
+    Массово создать мок-данные из NDJSON или JSON-массива.
+
+    Тело в формате NDJSON (`application/x-ndjson`) разбирается потоково, JSON-массив
+    (`application/json`) читается целиком. Моки сохраняются пакетами по `BULK_BATCH_SIZE`
+    в отдельных транзакциях.
+
+    Args:
+        request (Request): Входящий HTTP-запрос с телом NDJSON или JSON-массивом.
+
+    Returns:
+        BulkImportResult | JSONResponse:
+            - Результат импорта с UUID созданных моков и ошибками отдельных элементов.
+            - 400, если JSON-массив не удалось разобрать.
+    """
+    if request.headers.get("content-type", "").startswith("application/json"):
+        try:
+            items = json.loads(await request.body())
+        except json.JSONDecodeError as e:
+            error = ErrorModel(detail=f"Invalid JSON: {e}")
+            return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=error.model_dump())
+        if not isinstance(items, list):
+            error = ErrorModel(detail="Ожидается JSON-массив мок-данных")
+            return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=error.model_dump())
+
+        async def iter_items() -> AsyncIterator[object]:
+            for item in items:
+                yield item
+
+        return await import_mock_data(iter_items(), batch_size=config.BULK_BATCH_SIZE)
+
+    return await import_mock_data(iter_ndjson_lines(request.stream()), batch_size=config.BULK_BATCH_SIZE)
+
+
+@router.get(
+    "/mock/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "application/json": {}}}},
+)
+async def export_mock(
+    export_format: Annotated[
+        Literal["ndjson", "json"], Query(alias="format", description="Формат выгрузки")
+    ] = "ndjson",
+) -> StreamingResponse:
+    """
+    Выгрузить все мок-данные потоком.
+
+    Строки читаются из курсора базы данных пачками по `BULK_BATCH_SIZE` и сразу отправляются клиенту.
+
+    Args:
+        export_format (Literal["ndjson", "json"]): Формат выгрузки: NDJSON или JSON-массив.
+
+    Returns:
+        StreamingResponse: Потоковый ответ с мок-данными.
+    """
+    ndjson = export_format == "ndjson"
+    return StreamingResponse(
+        export_mock_data(batch_size=config.BULK_BATCH_SIZE, ndjson=ndjson),
+        media_type="application/x-ndjson" if ndjson else "application/json",
+    )
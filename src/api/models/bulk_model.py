@@ -0,0 +1,36 @@
+from typing import Annotated
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class BulkImportError(BaseModel):
+    """Модель ошибки импорта одного элемента при массовой загрузке моков.
+
+    Attributes:
+        index (int): Порядковый номер элемента во входных данных, начиная с 0.
+        detail (str): Описание ошибки.
+    """
+
+    index: Annotated[int, Field(ge=0, description="Порядковый номер элемента во входных данных", examples=[3])]
+    detail: Annotated[str, Field(description="Описание ошибки", examples=["status_code: Input should be an integer"])]
+
+
+class BulkImportResult(BaseModel):
+    """Модель результата массовой загрузки моков.
+
+    Attributes:
+        created (int): Количество созданных моков.
+        updated (int): Количество элементов, изменивших мок занятого маршрута как новую версию.
+        failed (int): Количество элементов, которые не удалось импортировать.
+        uuids (list[UUID]): UUID созданных или измененных моков в порядке следования во входных данных.
+        errors (list[BulkImportError]): Ошибки импорта отдельных элементов.
+    """
+
+    created: Annotated[int, Field(ge=0, description="Количество созданных моков", examples=[4999])]
+    updated: Annotated[
+        int, Field(ge=0, description="Количество элементов, изменивших мок занятого маршрута", examples=[0])
+    ]
+    failed: Annotated[int, Field(ge=0, description="Количество элементов с ошибками", examples=[1])]
+    uuids: Annotated[list[UUID], Field(description="UUID созданных или измененных моков")]
+    errors: Annotated[list[BulkImportError], Field(description="Ошибки импорта отдельных элементов")]
@@ -0,0 +1,23 @@
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+
+class ResponseCacheStats(BaseModel):
+    """Модель статистики кеша ответов воркера.
+
+    Attributes:
+        entries (int): Количество ответов в кеше.
+        bytes (int): Суммарный размер ответов в кеше в байтах.
+        hits (int): Количество запросов, ответ на которые найден в кеше.
+        misses (int): Количество запросов, ответ на которые не найден в кеше.
+        hit_ratio (float): Доля запросов, ответ на которые найден в кеше.
+        evictions (int): Количество ответов, вытесненных из-за ограничений количества и размера кеша.
+    """
+
+    entries: Annotated[int, Field(ge=0, description="Количество ответов в кеше", examples=[120])]
+    bytes: Annotated[int, Field(ge=0, description="Суммарный размер ответов в кеше в байтах", examples=[48200])]
+    hits: Annotated[int, Field(ge=0, description="Количество попаданий в кеш", examples=[9000])]
+    misses: Annotated[int, Field(ge=0, description="Количество промахов кеша", examples=[1000])]
+    hit_ratio: Annotated[float, Field(ge=0, le=1, description="Доля попаданий в кеш", examples=[0.9])]
+    evictions: Annotated[int, Field(ge=0, description="Количество вытесненных ответов", examples=[0])]
@@ -1,12 +1,317 @@
 import re
-from datetime import datetime
+from datetime import UTC, datetime, timedelta
 from typing import Annotated, Literal
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+from src.services.route_trie import validate_route_template
+from src.services.template_expression import find_template_expressions
 
 URI_REGEX = r"^/[^/]+(/[^/]+)*$"
 
+DIGEST_REGEX = r"^[0-9a-f]{64}$"
+"""Формат SHA-256 тела ответа в хранилище тел ответов."""
+
+MAX_LATENCY_MS = 60000
+"""Максимальное значение задержки профиля в миллисекундах."""
+
+LatencyMs = Annotated[float, Field(ge=0, le=MAX_LATENCY_MS)]
+
+
+def validate_header_text(value: str) -> str:
+    """Проверяет, что имя или значение заголовка ответа можно передать по HTTP.
+
+    Args:
+        value (str): Имя или значение заголовка.
+
+    Returns:
+        str: Проверенное имя или значение.
+
+    Raises:
+        ValueError: Если строка содержит символы вне latin-1 или управляющие символы перевода строки.
+    """
+    try:
+        value.encode("latin-1")
+    except UnicodeEncodeError as e:
+        raise ValueError(f"Заголовок ответа должен содержать только символы latin-1: {value!r}") from e
+    if any(char in value for char in "\r\n\0"):
+        raise ValueError(f"Заголовок ответа не должен содержать переводы строки: {value!r}")
+    return value
+
+
+def validate_response_headers(headers: dict[str, str] | None) -> dict[str, str] | None:
+    """Проверяет имена и значения заголовков ответа функцией `validate_header_text`.
+
+    Args:
+        headers (dict[str, str] | None): Заголовки ответа.
+
+    Returns:
+        dict[str, str] | None: Проверенные заголовки.
+    """
+    for name, value in (headers or {}).items():
+        validate_header_text(name)
+        validate_header_text(value)
+    return headers
+
+
+class MockMatch(BaseModel):
+    """Условия, при которых мок выбирается для запроса.
+
+    Все указанные условия должны выполняться одновременно. Если для маршрута подходят несколько
+    моков с условиями, выбирается мок с наибольшим числом условий, а при равенстве - последний созданный.
+    Мок без условий используется, только если не подошел ни один мок с условиями.
+
+    Attributes:
+        query (dict[str, str] | None): Ожидаемые значения query-параметров.
+        headers (dict[str, str] | None): Ожидаемые значения заголовков запроса (имена без учета регистра).
+        body (dict[str, object] | None): Ожидаемые значения полей JSON-тела запроса по путям через точку.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    query: Annotated[
+        dict[str, str] | None,
+        Field(default=None, description="Ожидаемые значения query-параметров", examples=[{"page": "2"}]),
+    ]
+    headers: Annotated[
+        dict[str, str] | None,
+        Field(default=None, description="Ожидаемые значения заголовков запроса", examples=[{"X-Tenant": "acme"}]),
+    ]
+    body: Annotated[
+        dict[str, object] | None,
+        Field(
+            default=None,
+            description="Ожидаемые значения полей JSON-тела запроса, путь к полю указывается через точку",
+            examples=[{"user.id": 42, "items.0.sku": "A-1"}],
+        ),
+    ]
+
+
+class MockLatency(BaseModel):
+    """Профиль задержки в миллисекундах, из которого для каждого ответа выбирается случайное значение.
+
+    Распределения:
+
+        - fixed: всегда `value`;
+        - uniform: равномерно от `min` до `max`;
+        - normal: нормально со средним `mean` и отклонением `stddev`, ограничено `min` и `max`, если они заданы;
+        - percentiles: по таблице перцентилей `{перцентиль: задержка}` с линейной интерполяцией между точками.
+
+    Attributes:
+        distribution (str): Распределение задержки.
+        value (float | None): Задержка распределения fixed.
+        min (float | None): Нижняя граница задержки.
+        max (float | None): Верхняя граница задержки.
+        mean (float | None): Средняя задержка распределения normal.
+        stddev (float | None): Стандартное отклонение распределения normal.
+        percentiles (dict[float, float] | None): Таблица перцентилей распределения percentiles.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    distribution: Annotated[
+        Literal["fixed", "uniform", "normal", "percentiles"],
+        Field(default="fixed", description="Распределение задержки"),
+    ]
+    value: Annotated[LatencyMs | None, Field(default=None, description="Задержка распределения fixed")]
+    min: Annotated[LatencyMs | None, Field(default=None, description="Нижняя граница задержки")]
+    max: Annotated[LatencyMs | None, Field(default=None, description="Верхняя граница задержки")]
+    mean: Annotated[LatencyMs | None, Field(default=None, description="Средняя задержка распределения normal")]
+    stddev: Annotated[LatencyMs | None, Field(default=None, description="Стандартное отклонение распределения normal")]
+    percentiles: Annotated[
+        dict[Annotated[float, Field(ge=0, le=100)], LatencyMs] | None,
+        Field(
+            default=None,
+            description="Задержка по перцентилям распределения percentiles",
+            examples=[{"50": 20, "95": 120, "99": 400}],
+        ),
+    ]
+
+    @model_validator(mode="after")
+    def validate_distribution(self) -> "MockLatency":
+        """Проверяет, что заданы параметры выбранного распределения.
+
+        Returns:
+            MockLatency: Проверенный профиль задержки.
+
+        Raises:
+            ValueError: Если параметры распределения не заданы или противоречат друг другу.
+        """
+        required = {
+            "fixed": ("value",),
+            "uniform": ("min", "max"),
+            "normal": ("mean", "stddev"),
+            "percentiles": ("percentiles",),
+        }[self.distribution]
+        missing = [name for name in required if getattr(self, name) is None]
+        if missing:
+            raise ValueError(f"Для распределения {self.distribution} необходимо задать: {', '.join(missing)}")
+        if self.min is not None and self.max is not None and self.min > self.max:
+            raise ValueError("Нижняя граница задержки больше верхней")
+        if self.percentiles is not None and not self.percentiles:
+            raise ValueError("Таблица перцентилей не должна быть пустой")
+        return self
+
+
+class MockStreaming(BaseModel):
+    """Параметры потоковой отдачи тела ответа частями.
+
+    Attributes:
+        chunk_size (int): Размер части тела в байтах.
+        rate (int | None): Скорость отдачи тела в байтах в секунду.
+        chunk_delay (MockLatency | None): Профиль задержки перед каждой следующей частью.
+        chunked (bool): Отдавать ответ без Content-Length (Transfer-Encoding: chunked).
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    chunk_size: Annotated[
+        int, Field(default=1024, ge=1, le=1024 * 1024, description="Размер части тела в байтах", examples=[16, 1024])
+    ]
+    rate: Annotated[
+        int | None,
+        Field(default=None, ge=1, description="Скорость отдачи тела в байтах в секунду", examples=[1024, 65536]),
+    ]
+    chunk_delay: Annotated[
+        MockLatency | None, Field(default=None, description="Профиль задержки перед каждой следующей частью тела")
+    ]
+    chunked: Annotated[
+        bool, Field(default=True, description="Отдавать ответ без Content-Length (Transfer-Encoding: chunked)")
+    ]
+
+
+class MockBodyRef(BaseModel):
+    """Ссылка на тело ответа, сохраненное в хранилище тел ответов.
+
+    Тело загружается запросом `POST /api/v1/mock/blobs` и хранится в файле, имя которого
+    совпадает с SHA-256 содержимого, поэтому одинаковые тела разных моков хранятся один раз.
+
+    Attributes:
+        digest (str): SHA-256 содержимого тела в шестнадцатеричном виде.
+        size (int | None): Размер тела в байтах, заполняется сервером.
+        content_type (str): Значение заголовка Content-Type ответа.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    digest: Annotated[
+        str,
+        Field(
+            pattern=DIGEST_REGEX,
+            description="SHA-256 содержимого тела в шестнадцатеричном виде",
+            examples=["9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08"],
+        ),
+    ]
+    size: Annotated[int | None, Field(default=None, ge=0, description="Размер тела в байтах, заполняется сервером")]
+    content_type: Annotated[
+        str,
+        Field(
+            default="application/octet-stream",
+            description="Значение заголовка Content-Type ответа",
+            examples=["image/png", "application/x-protobuf"],
+        ),
+    ]
+
+    @field_validator("content_type")
+    @classmethod
+    def validate_content_type(cls, v: str) -> str:
+        """Проверяет, что Content-Type можно передать в заголовке ответа."""
+        return validate_header_text(v)
+
+
+class MockTemplate(BaseModel):
+    """Параметры шаблонизации ответа.
+
+    Строковые значения тела и значения заголовков могут содержать выражения `{{ выражение }}`:
+
+        - `path.<имя>`, `query.<имя>`, `headers.<имя>`: параметр пути, query-параметр, заголовок запроса;
+        - `body`, `body.<путь>`: JSON-тело запроса или его поле по пути через точку;
+        - `request.method`, `request.path`: метод и путь запроса;
+        - `uuid`, `now`, `timestamp`, `timestamp_ms`: случайный UUID, текущее время в ISO 8601,
+          Unix-время в секундах и миллисекундах.
+
+    Строка, целиком состоящая из одного выражения, заменяется JSON-значением (числа и объекты
+    сохраняют тип), выражения внутри строки подставляются текстом. Отсутствующие значения
+    заменяются null или пустой строкой.
+
+    Attributes:
+        body (bool): Подставлять значения в тело ответа.
+        headers (bool): Подставлять значения в заголовки ответа.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    body: Annotated[bool, Field(default=True, description="Подставлять значения в тело ответа")]
+    headers: Annotated[bool, Field(default=True, description="Подставлять значения в заголовки ответа")]
+
+
+class MockSequenceStep(BaseModel):
+    """Шаг сценария мока: ответ, заданные поля которого заменяют соответствующие поля мока.
+
+    Attributes:
+        status_code (int | None): HTTP код ответа шага.
+        headers (dict[str, str] | None): HTTP заголовки ответа шага.
+        body (dict[str, object] | None): Тело ответа шага в формате JSON.
+        delay (int | None): Задержка ответа шага в миллисекундах.
+        repeat (int): Количество запросов подряд, получающих ответ шага.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    status_code: Annotated[int | None, Field(default=None, ge=100, le=699, description="HTTP код ответа шага")]
+    headers: Annotated[dict[str, str] | None, Field(default=None, description="HTTP заголовки ответа шага")]
+    body: Annotated[dict[str, object] | None, Field(default=None, description="Тело ответа шага в формате JSON")]
+    delay: Annotated[int | None, Field(default=None, ge=0, le=5000, description="Задержка ответа шага в миллисекундах")]
+    repeat: Annotated[
+        int, Field(default=1, ge=1, le=1_000_000, description="Количество запросов подряд, получающих ответ шага")
+    ]
+
+    @field_validator("headers")
+    @classmethod
+    def validate_headers(cls, v: dict[str, str] | None) -> dict[str, str] | None:
+        """Проверяет, что заголовки шага можно передать в ответе."""
+        return validate_response_headers(v)
+
+
+class MockSequence(BaseModel):
+    """Сценарий мока: упорядоченная последовательность ответов маршрута.
+
+    Каждый запрос к моку получает ответ очередного шага. После последнего шага сценарий
+    либо продолжает отдавать ответ последнего шага (stick), либо начинается заново (cycle).
+
+    Attributes:
+        mode (str): Поведение после последнего шага: stick или cycle.
+        steps (list[MockSequenceStep]): Шаги сценария.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    mode: Annotated[
+        Literal["stick", "cycle"],
+        Field(default="stick", description="После последнего шага: stick — повторять его, cycle — начать заново"),
+    ]
+    steps: Annotated[
+        list[MockSequenceStep],
+        Field(
+            min_length=1,
+            max_length=1000,
+            description="Шаги сценария",
+            examples=[[{"status_code": 503, "repeat": 2}, {"status_code": 200}]],
+        ),
+    ]
+
+
+def _template_strings(value: object) -> list[str]:
+    """Возвращает строковые значения JSON-документа, включая вложенные."""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return [string for item in value.values() for string in _template_strings(item)]
+    if isinstance(value, list):
+        return [string for item in value for string in _template_strings(item)]
+    return []
+
 
 class MockData(BaseModel):
     """Базовая модель для определения мок-ответа.
@@ -20,7 +325,16 @@ class MockData(BaseModel):
         status_code (int): HTTP код состояния ответа.
         headers (Json): HTTP заголовки ответа.
         body (Json): Тело HTTP ответа в формате JSON.
+        body_ref (MockBodyRef | None): Ссылка на тело ответа в хранилище тел ответов вместо body.
         delay (int): Задержка ответа в миллисекундах.
+        latency (MockLatency | None): Профиль задержки перед ответом, добавляется к delay.
+        stream (MockStreaming | None): Параметры потоковой отдачи тела ответа частями.
+        match (MockMatch | None): Условия выбора мока по query-параметрам, заголовкам и телу запроса.
+        template (MockTemplate | None): Параметры шаблонизации тела и заголовков ответа данными запроса.
+        sequence (MockSequence | None): Сценарий: последовательность ответов мока на очередные запросы.
+        expires_at (datetime | None): Время, после которого мок удаляется.
+        ttl_seconds (int | None): Время жизни мока в секундах; при проверке заменяется на expires_at.
+        max_hits (int | None): Количество ответов, после которого мок удаляется.
     """
 
     model_config = ConfigDict(from_attributes=True)
@@ -30,9 +344,10 @@ class MockData(BaseModel):
         Field(
             pattern=URI_REGEX,
             description=(
-                "URI эндпоинта для мок-ответа (должен начинаться с / и может содержать дополнительные сегменты пути)"
+                "URI эндпоинта для мок-ответа (должен начинаться с / и может содержать дополнительные сегменты пути). "
+                "Сегмент {name} совпадает с любым сегментом пути, сегмент * в конце URI - с остатком пути"
             ),
-            examples=["/api/v1/users"],
+            examples=["/api/v1/users", "/api/v1/users/{id}", "/files/*"],
         ),
     ]
     method: Annotated[
@@ -69,6 +384,17 @@ class MockData(BaseModel):
         ),
     ]
 
+    body_ref: Annotated[
+        MockBodyRef | None,
+        Field(
+            default=None,
+            description=(
+                "Ссылка на тело ответа в хранилище тел ответов (двоичные и большие тела); "
+                "не задается одновременно с body"
+            ),
+        ),
+    ]
+
     delay: Annotated[
         int | None,
         Field(
@@ -80,6 +406,82 @@ class MockData(BaseModel):
         ),
     ]
 
+    latency: Annotated[
+        MockLatency | None,
+        Field(
+            default=None,
+            description="Профиль задержки перед ответом (время до первого байта), добавляется к delay",
+            examples=[{"distribution": "percentiles", "percentiles": {"50": 20, "99": 400}}],
+        ),
+    ]
+
+    stream: Annotated[
+        MockStreaming | None,
+        Field(
+            default=None,
+            description="Потоковая отдача тела ответа частями с ограничением скорости и задержками между частями",
+            examples=[{"chunk_size": 64, "rate": 1024}],
+        ),
+    ]
+
+    match: Annotated[
+        MockMatch | None,
+        Field(default=None, description="Условия выбора мока по query-параметрам, заголовкам и телу запроса"),
+    ]
+
+    template: Annotated[
+        MockTemplate | None,
+        Field(
+            default=None,
+            description=(
+                "Шаблонизация ответа: выражения {{ ... }} в строках тела и значениях заголовков "
+                "заменяются данными запроса"
+            ),
+            examples=[{"body": True, "headers": True}],
+        ),
+    ]
+
+    sequence: Annotated[
+        MockSequence | None,
+        Field(
+            default=None,
+            description=(
+                "Сценарий: очередные запросы получают ответы шагов по порядку, "
+                "поля шага заменяют соответствующие поля мока"
+            ),
+        ),
+    ]
+
+    expires_at: Annotated[
+        datetime | None,
+        Field(
+            default=None,
+            description="Время, после которого мок перестает отвечать и удаляется; время без часового пояса — UTC",
+            examples=["2030-01-01T00:00:00Z"],
+        ),
+    ]
+
+    ttl_seconds: Annotated[
+        int | None,
+        Field(
+            default=None,
+            ge=1,
+            exclude=True,
+            description="Время жизни мока в секундах от момента сохранения; заменяется на expires_at",
+            examples=[60, 3600],
+        ),
+    ]
+
+    max_hits: Annotated[
+        int | None,
+        Field(
+            default=None,
+            ge=1,
+            description="Количество ответов мока, после которого он удаляется",
+            examples=[1, 3],
+        ),
+    ]
+
     @field_validator("uri")
     @classmethod
     def validate_uri(cls, v: str) -> str:
@@ -92,14 +494,102 @@ class MockData(BaseModel):
             Self: Проверенный URI.
 
         Raises:
-            ValueError: Если URI не начинается с '/' или имеет некорректный формат.
+            ValueError: Если URI не начинается с '/', имеет некорректный формат или некорректный шаблон.
         """
         if not v.startswith("/"):
             raise ValueError("URI должен начинаться с '/'")
         if not re.match(URI_REGEX, v):
             raise ValueError("URI должен иметь корректный формат пути")
+        validate_route_template(v)
         return v
 
+    @field_validator("headers")
+    @classmethod
+    def validate_headers(cls, v: dict[str, str] | None) -> dict[str, str] | None:
+        """Проверяет, что заголовки можно передать в ответе.
+
+        Заголовки кодируются в latin-1 при сборке ответа, поэтому мок с другими символами
+        отклоняется до сохранения.
+
+        Args:
+            v (dict[str, str] | None): Заголовки ответа.
+
+        Returns:
+            dict[str, str] | None: Проверенные заголовки.
+
+        Raises:
+            ValueError: Если имя или значение заголовка содержит символы вне latin-1 или перевод строки.
+        """
+        return validate_response_headers(v)
+
+    @field_validator("expires_at")
+    @classmethod
+    def validate_expires_at(cls, v: datetime | None) -> datetime | None:
+        """Приводит время истечения без часового пояса к UTC.
+
+        Args:
+            v (datetime | None): Время истечения.
+
+        Returns:
+            datetime | None: Время истечения с часовым поясом.
+        """
+        return v.replace(tzinfo=UTC) if v is not None and v.tzinfo is None else v
+
+    @model_validator(mode="after")
+    def validate_expiry(self) -> "MockData":
+        """Заменяет время жизни мока временем истечения.
+
+        Returns:
+            MockData: Проверенные мок-данные.
+
+        Raises:
+            ValueError: Если заданы одновременно expires_at и ttl_seconds.
+        """
+        if self.ttl_seconds is None:
+            return self
+        if self.expires_at is not None:
+            raise ValueError("Срок жизни мока задается либо в expires_at, либо в ttl_seconds")
+        self.expires_at = datetime.now(UTC) + timedelta(seconds=self.ttl_seconds)
+        self.ttl_seconds = None
+        return self
+
+    @model_validator(mode="after")
+    def validate_body(self) -> "MockData":
+        """Проверяет, что тело ответа задано не более чем одним способом.
+
+        Returns:
+            MockData: Проверенные мок-данные.
+
+        Raises:
+            ValueError: Если заданы одновременно body и body_ref.
+        """
+        if self.body is not None and self.body_ref is not None:
+            raise ValueError("Тело ответа задается либо в body, либо в body_ref")
+        return self
+
+    @model_validator(mode="after")
+    def validate_template(self) -> "MockData":
+        """Проверяет выражения шаблона в теле и заголовках ответа.
+
+        Returns:
+            MockData: Проверенные мок-данные.
+
+        Raises:
+            ValueError: Если выражение шаблона некорректно или шаблон задан для тела из хранилища тел ответов.
+        """
+        if self.template is None:
+            return self
+        if self.template.body and self.body_ref is not None:
+            raise ValueError("Тело из хранилища тел ответов (body_ref) не может быть шаблоном")
+        bodies = [self.body, *(step.body for step in self.sequence.steps)] if self.sequence else [self.body]
+        headers = [self.headers, *(step.headers for step in self.sequence.steps)] if self.sequence else [self.headers]
+        strings = [string for body in bodies for string in _template_strings(body)] if self.template.body else []
+        if self.template.headers:
+            strings.extend(value for item in headers for value in (item or {}).values())
+        for string in strings:
+            find_template_expressions(string)
+        return self
+
 
 class MockWithUUID(MockData):
     """Модель мок-ответа с уникальным идентификатором.
@@ -122,13 +612,19 @@ class MockWithUUID(MockData):
 class MockModelWithDate(MockWithUUID):
     """Полная модель мок-ответа с метаданными.
 
-    Расширяет MockWithUUID, добавляя информацию о времени создания и обновления мока.
+    Расширяет MockWithUUID, добавляя информацию о времени создания и обновления мока и его версию.
 
     Attributes:
+        version (int): Версия мока, увеличивается при каждом изменении.
         created_at (datetime): Дата и время создания мока.
         updated_at (datetime): Дата и время последнего обновления мока.
     """
 
+    version: Annotated[
+        int,
+        Field(default=1, ge=1, description="Версия мока, увеличивается при каждом изменении", examples=[1, 2]),
+    ]
+
     created_at: Annotated[
         datetime,
         Field(
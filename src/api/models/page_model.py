@@ -0,0 +1,23 @@
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+from src.api.models.mock_model import MockModelWithDate
+
+
+class MockPage(BaseModel):
+    """Модель страницы списка мок-данных.
+
+    Attributes:
+        items (list[MockModelWithDate]): Мок-данные на странице в порядке создания.
+        next_cursor (str | None): Курсор следующей страницы, либо None, если страница последняя.
+    """
+
+    items: Annotated[list[MockModelWithDate], Field(description="Мок-данные на странице в порядке создания")]
+    next_cursor: Annotated[
+        str | None,
+        Field(
+            description="Курсор следующей страницы, либо null, если страница последняя",
+            examples=["eyJjIjoiMjAyMy0xMC0wMVQxNTozMDowMCIsInUiOiI1NTBlODQwMCJ9"],
+        ),
+    ]
@@ -0,0 +1,80 @@
+from datetime import datetime
+from typing import TYPE_CHECKING, Annotated
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+if TYPE_CHECKING:
+    from src.db.models.mock_data import MockRequestLog
+
+
+class RecordedRequest(BaseModel):
+    """Модель записи журнала входящих запросов к мокам.
+
+    Attributes:
+        id (int): Идентификатор записи, возрастает со временем получения запроса.
+        mock_uuid (UUID | None): UUID мока, выбранного для запроса, либо None, если мок не найден.
+        method (str): HTTP метод запроса.
+        path (str): Путь запроса.
+        query (str): Строка query-параметров запроса.
+        headers (dict[str, str]): Заголовки запроса с именами в нижнем регистре.
+        body (str): Начало тела запроса в UTF-8; некорректные байты заменяются символом U+FFFD.
+        body_size (int): Полный размер тела запроса в байтах.
+        body_truncated (bool): Было ли тело запроса обрезано до JOURNAL_BODY_LIMIT байт.
+        status_code (int | None): HTTP код ответа, либо None, если ответ не был отправлен.
+        created_at (datetime): Дата и время получения запроса.
+    """
+
+    id: Annotated[int, Field(description="Идентификатор записи", examples=[42])]
+    mock_uuid: Annotated[
+        UUID | None,
+        Field(description="UUID мока, выбранного для запроса", examples=["550e8400-e29b-41d4-a716-446655440000"]),
+    ]
+    method: Annotated[str, Field(description="HTTP метод запроса", examples=["POST"])]
+    path: Annotated[str, Field(description="Путь запроса", examples=["/api/users"])]
+    query: Annotated[str, Field(description="Строка query-параметров запроса", examples=["page=2"])]
+    headers: Annotated[dict[str, str], Field(description="Заголовки запроса", examples=[{"x-tenant": "acme"}])]
+    body: Annotated[str, Field(description="Начало тела запроса в UTF-8", examples=['{"name": "John"}'])]
+    body_size: Annotated[int, Field(ge=0, description="Полный размер тела запроса в байтах", examples=[16])]
+    body_truncated: Annotated[bool, Field(description="Тело запроса обрезано до JOURNAL_BODY_LIMIT байт")]
+    status_code: Annotated[int | None, Field(description="HTTP код ответа", examples=[201])]
+    created_at: Annotated[datetime, Field(description="Дата и время получения запроса")]
+
+    @classmethod
+    def from_db(cls, row: "MockRequestLog") -> "RecordedRequest":
+        """Создает модель из записи таблицы `mock_request_log`.
+
+        Args:
+            row (MockRequestLog): Запись журнала запросов.
+
+        Returns:
+            RecordedRequest: Модель записи журнала.
+        """
+        body = row.body or b""
+        return cls(
+            id=row.id,
+            mock_uuid=row.mock_uuid,
+            method=row.method,
+            path=row.path,
+            query=row.query,
+            headers=row.headers,
+            body=body.decode("utf-8", errors="replace"),
+            body_size=row.body_size,
+            body_truncated=len(body) < row.body_size,
+            status_code=row.status_code,
+            created_at=row.created_at,
+        )
+
+
+class RecordedRequestPage(BaseModel):
+    """Модель страницы журнала запросов.
+
+    Attributes:
+        items (list[RecordedRequest]): Записи журнала на странице от новых к старым.
+        next_cursor (int | None): Курсор следующей страницы, либо None, если страница последняя.
+    """
+
+    items: Annotated[list[RecordedRequest], Field(description="Записи журнала на странице от новых к старым")]
+    next_cursor: Annotated[
+        int | None, Field(description="Курсор следующей страницы, либо null, если страница последняя", examples=[42])
+    ]
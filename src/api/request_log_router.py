@@ -0,0 +1,61 @@
+"""Модуль роутера журнала входящих запросов к мокам."""
+
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter
+from fastapi.params import Query
+from fastapi.responses import JSONResponse
+
+from src.api.models.request_log_model import RecordedRequestPage
+from src.services.request_journal import flush_request_journal, request_journal
+from src.services.request_log_service import clear_request_log, get_request_log_page
+
+router = APIRouter()
+
+DEFAULT_PAGE_SIZE = 100
+"""Размер страницы журнала запросов по умолчанию."""
+
+
+@router.get("/mock/requests", response_model=RecordedRequestPage)
+async def get_recorded_requests(
+    mock_uuid: Annotated[UUID | None, Query(description="Фильтр по UUID мока")] = None,
+    method: Annotated[str | None, Query(description="Фильтр по HTTP методу")] = None,
+    path_prefix: Annotated[str | None, Query(description="Фильтр по префиксу пути запроса")] = None,
+    limit: Annotated[int, Query(ge=1, le=1000, description="Размер страницы")] = DEFAULT_PAGE_SIZE,
+    cursor: Annotated[int | None, Query(description="Курсор следующей страницы")] = None,
+) -> RecordedRequestPage:
+    """
+    Получить страницу журнала запросов к мокам от новых записей к старым.
+
+    Перед чтением сохраняет несохраненные записи журнала текущего воркера. При запуске нескольких
+    воркеров записи других воркеров появляются в журнале в течение JOURNAL_FLUSH_INTERVAL.
+
+    Args:
+        mock_uuid (UUID | None): Фильтр по UUID мока, выбранного для запроса.
+        method (str | None): Фильтр по HTTP методу.
+        path_prefix (str | None): Фильтр по префиксу пути запроса.
+        limit (int): Размер страницы.
+        cursor (int | None): Курсор следующей страницы из предыдущего ответа.
+
+    Returns:
+        RecordedRequestPage: Страница журнала запросов.
+    """
+    await flush_request_journal()
+    items, next_cursor = await get_request_log_page(
+        limit=limit, cursor=cursor, mock_uuid=mock_uuid, method=method, path_prefix=path_prefix
+    )
+    return RecordedRequestPage(items=items, next_cursor=next_cursor)
+
+
+@router.delete("/mock/requests")
+async def delete_recorded_requests() -> JSONResponse:
+    """
+    Очистить журнал запросов к мокам.
+
+    Returns:
+        JSONResponse: 200 после удаления записей журнала.
+    """
+    request_journal.clear()
+    await clear_request_log()
+    return JSONResponse(status_code=200, content=None)
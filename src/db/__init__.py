@@ -6,6 +6,7 @@
 from src.settings import config
 
 from .db_manager import DBManager
+from .engine_options import DB_PRESETS, EngineOptions, is_in_memory_sqlite, resolve_engine_options
 
 
 async def initialize_db() -> DBManager:
@@ -15,8 +16,30 @@ async def initialize_db() -> DBManager:
         DBManager: Экземпляр менеджера базы данных с установленным соединением.
     """
     db = DBManager()
-    await db.initialize(config.DB_HOST)
+    await db.initialize(config.DB_HOST, resolve_engine_options(config, config.DB_HOST))
     return db
 
 
-__all__ = ["initialize_db", "DBManager"]
+async def prepare_db_schema(db_url: str) -> None:
+    """Создает схему базы данных и закрывает подключение.
+
+    Используется главным процессом перед запуском воркеров, чтобы воркеры не создавали
+    таблицы одновременно.
+
+    Args:
+        db_url (str): URL для подключения к базе данных в формате SQLAlchemy.
+    """
+    db = DBManager()
+    await db.initialize(db_url, resolve_engine_options(config, db_url))
+    await db.close()
+
+
+__all__ = [
+    "DB_PRESETS",
+    "EngineOptions",
+    "initialize_db",
+    "is_in_memory_sqlite",
+    "prepare_db_schema",
+    "resolve_engine_options",
+    "DBManager",
+]
@@ -4,13 +4,20 @@
 Реализует паттерн Singleton для управления соединением и сессиями базы данных.
 """
 
+import asyncio
+import time
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from functools import wraps
-from typing import Awaitable, Callable, Concatenate, ParamSpec, Self, TypeVar
+from typing import Any, Awaitable, Callable, Concatenate, ParamSpec, Self, TypeVar
+from weakref import WeakKeyDictionary
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from src.metrics import metrics
+
+from .engine_options import DB_PRESETS, EngineOptions, default_preset, is_in_memory_sqlite
+from .migrations import run_migrations
 from .models.mock_data import Base
 
 T = TypeVar("T")
@@ -26,6 +33,8 @@ class DBManager:
         _instance (DBManager | None): Единственный экземпляр класса.
         _engine: Асинхронный движок SQLAlchemy.
         _async_session_maker: Фабрика создания асинхронных сессий.
+        _single_connection (bool): База данных работает через единственное соединение.
+        _task_sessions (WeakKeyDictionary): Открытые сессии задач для повторного использования во вложенных сессиях.
 
     Пример:
         Использование декоратора with_session::
@@ -39,6 +48,8 @@ class DBManager:
     _instance = None
     _engine = None
     _async_session_maker = None
+    _single_connection = False
+    _task_sessions: WeakKeyDictionary[asyncio.Task[Any], AsyncSession] = WeakKeyDictionary()
 
     def __new__(cls) -> Self:
         """Создает или возвращает единственный экземпляр класса DBManager.
@@ -56,18 +67,16 @@ class DBManager:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    async def initialize(self, db_url: str) -> None:
-        """Инициализирует подключение к базе данных и создает таблицы.
+    async def initialize(self, db_url: str, options: EngineOptions | None = None) -> None:
+        """Инициализирует подключение к базе данных, создает таблицы и применяет миграции схемы.
 
         Args:
             db_url (str): URL для подключения к базе данных в формате SQLAlchemy.
+            options (EngineOptions | None): Параметры движка и пула соединений; по умолчанию
+                используется набор параметров, выбранный по строке подключения.
         """
         if not self._engine:
-            self._engine = create_async_engine(
-                db_url,
-                echo=True,
-                future=True,
-            )
+            self._engine = (options or DB_PRESETS[default_preset(db_url)]).create_engine(db_url)
 
             self._async_session_maker = async_sessionmaker(
                 self._engine,
@@ -77,14 +86,31 @@ class DBManager:
                 autoflush=False,
             )
 
-            async with self._engine.begin() as conn:
-                await conn.run_sync(Base.metadata.create_all)
+        self._single_connection = is_in_memory_sqlite(db_url)
+
+        async with self._engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(run_migrations)
+
+    async def close(self) -> None:
+        """Закрывает все соединения с базой данных и сбрасывает состояние менеджера."""
+        if self._engine:
+            await self._engine.dispose()
+        self._engine = None
+        self._async_session_maker = None
+        self._single_connection = False
 
     @asynccontextmanager
-    async def session(self) -> AsyncGenerator[AsyncSession, None]:
+    async def session(self, operation: str = "session") -> AsyncGenerator[AsyncSession, None]:
         """Асинхронный контекстный менеджер для работы сессией базы данных.
 
         Автоматически управляет жизненным циклом сессии, включая commit и rollback.
+        Для базы данных SQLite в памяти сессии получают ее единственное соединение по очереди,
+        а вложенная сессия той же задачи использует внешнюю сессию и ее транзакцию.
+        Время работы сессии записывается в метрику `db_session_duration_seconds`.
+
+        Args:
+            operation (str): Название операции для метки метрики.
 
         Yields:
             AsyncSession: Асинхронная сессия SQLAlchemy.
@@ -103,15 +129,30 @@ class DBManager:
         if not self._async_session_maker:
             raise RuntimeError("Database not initialized. Call initialize() first")
 
-        async with self._async_session_maker() as session:
-            try:
-                yield session
-                await session.commit()
-            except Exception:
-                await session.rollback()
-                raise
-            finally:
-                await session.close()
+        task = asyncio.current_task()
+        current = self._task_sessions.get(task) if self._single_connection and task is not None else None
+        if current is not None:
+            yield current
+            return
+
+        started = time.perf_counter()
+        try:
+            async with self._async_session_maker() as session:
+                owner = task if self._single_connection else None
+                if owner is not None:
+                    self._task_sessions[owner] = session
+                try:
+                    yield session
+                    await session.commit()
+                except Exception:
+                    await session.rollback()
+                    raise
+                finally:
+                    if owner is not None:
+                        self._task_sessions.pop(owner, None)
+                    await session.close()
+        finally:
+            metrics.observe("db_session_duration_seconds", time.perf_counter() - started, (("operation", operation),))
 
     @classmethod
     def with_session(cls, func: Callable[Concatenate[AsyncSession, P], Awaitable[T]]) -> Callable[P, Awaitable[T]]:
@@ -122,6 +163,7 @@ class DBManager:
 
         Returns:
             Callable: Обертка, автоматически создающая и передающая сессию.
+                Время работы сессии записывается в метрику с именем функции в качестве операции.
 
         Пример:
             Использование декоратора::
@@ -134,7 +176,7 @@ class DBManager:
         @wraps(func)
         async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
             db = cls()
-            async with db.session() as session:
+            async with db.session(func.__name__) as session:
                 return await func(session, *args, **kwargs)
 
         return wrapper
@@ -0,0 +1,197 @@
+"""Модуль параметров движка базы данных.
+
+Собирает параметры `create_async_engine`, пула соединений и PRAGMA SQLite из настроек приложения.
+Значения берутся из набора параметров (`DB_PRESET`), явно заданные настройки имеют приоритет:
+
+    - memory-fast: SQLite в памяти с журналом в памяти и без синхронизации с диском;
+    - durable-sqlite: файловая SQLite в режиме WAL с полной синхронизацией, доступная нескольким воркерам;
+    - server: серверная СУБД с пулом соединений, проверкой соединений и кешем подготовленных запросов.
+
+Если набор не указан, он выбирается по строке подключения.
+"""
+
+from dataclasses import dataclass, field, replace
+from typing import Any, Literal
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.settings.settings import Settings
+
+DBPreset = Literal["memory-fast", "durable-sqlite", "server"]
+
+
+def is_in_memory_sqlite(db_url: str) -> bool:
+    """Проверяет, указывает ли строка подключения на базу SQLite в памяти процесса.
+
+    Args:
+        db_url (str): URL для подключения к базе данных в формате SQLAlchemy.
+
+    Returns:
+        bool: True, если база данных SQLite хранится в памяти, иначе False.
+    """
+    url = make_url(db_url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+@dataclass(frozen=True, slots=True)
+class EngineOptions:
+    """Параметры движка базы данных.
+
+    Attributes:
+        echo (bool): Логировать SQL-запросы.
+        pool_size (int | None): Количество постоянных соединений пула.
+        max_overflow (int | None): Количество дополнительных соединений сверх pool_size.
+        pool_recycle (int | None): Время жизни соединения в секундах.
+        pool_timeout (float | None): Время ожидания свободного соединения в секундах.
+        pool_pre_ping (bool): Проверять соединение перед выдачей из пула.
+        statement_cache_size (int | None): Размер кеша подготовленных запросов драйвера.
+        sqlite_pragmas (dict[str, str]): PRAGMA, выполняемые для каждого соединения SQLite.
+    """
+
+    echo: bool = False
+    pool_size: int | None = None
+    max_overflow: int | None = None
+    pool_recycle: int | None = None
+    pool_timeout: float | None = None
+    pool_pre_ping: bool = False
+    statement_cache_size: int | None = None
+    sqlite_pragmas: dict[str, str] = field(default_factory=dict)
+
+    def engine_kwargs(self, db_url: str) -> tuple[str, dict[str, Any]]:
+        """Формирует строку подключения и аргументы `create_async_engine`.
+
+        База данных SQLite в памяти существует, пока открыто ее соединение, поэтому для нее пул
+        держит ровно одно соединение и выдает его сессиям по очереди: общий для всех сессий
+        StaticPool смешивает их транзакции. Остальные параметры пула для нее не передаются.
+        Кеш подготовленных запросов передается драйверу: `cached_statements` для SQLite,
+        `prepared_statement_cache_size` для asyncpg.
+
+        Args:
+            db_url (str): URL для подключения к базе данных в формате SQLAlchemy.
+
+        Returns:
+            tuple[str, dict[str, Any]]: Строка подключения и именованные аргументы движка.
+        """
+        url = make_url(db_url)
+        kwargs: dict[str, Any] = {"echo": self.echo}
+        if is_in_memory_sqlite(db_url):
+            kwargs.update({"poolclass": AsyncAdaptedQueuePool, "pool_size": 1, "max_overflow": 0})
+            if self.pool_timeout is not None:
+                kwargs["pool_timeout"] = self.pool_timeout
+        else:
+            pool = {
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                "pool_recycle": self.pool_recycle,
+                "pool_timeout": self.pool_timeout,
+            }
+            kwargs.update({key: value for key, value in pool.items() if value is not None})
+            kwargs["pool_pre_ping"] = self.pool_pre_ping
+
+        if self.statement_cache_size is not None:
+            if url.get_backend_name() == "sqlite":
+                kwargs["connect_args"] = {"cached_statements": self.statement_cache_size}
+            elif url.get_driver_name() == "asyncpg":
+                url = url.update_query_dict({"prepared_statement_cache_size": str(self.statement_cache_size)})
+        return url.render_as_string(hide_password=False), kwargs
+
+    def create_engine(self, db_url: str) -> AsyncEngine:
+        """Создает асинхронный движок и настраивает выполнение PRAGMA для соединений SQLite.
+
+        Args:
+            db_url (str): URL для подключения к базе данных в формате SQLAlchemy.
+
+        Returns:
+            AsyncEngine: Асинхронный движок SQLAlchemy.
+        """
+        url, kwargs = self.engine_kwargs(db_url)
+        engine = create_async_engine(url, future=True, **kwargs)
+        if engine.dialect.name == "sqlite" and self.sqlite_pragmas:
+            pragmas = [f"PRAGMA {name}={value}" for name, value in self.sqlite_pragmas.items()]
+
+            @event.listens_for(engine.sync_engine, "connect")
+            def _set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+                cursor = dbapi_connection.cursor()
+                for pragma in pragmas:
+                    cursor.execute(pragma)
+                cursor.close()
+
+        return engine
+
+
+DB_PRESETS: dict[DBPreset, EngineOptions] = {
+    "memory-fast": EngineOptions(
+        # journal_mode=OFF быстрее, но ломает откат транзакций, поэтому журнал хранится в памяти.
+        sqlite_pragmas={"journal_mode": "MEMORY", "synchronous": "OFF", "temp_store": "MEMORY"},
+    ),
+    "durable-sqlite": EngineOptions(
+        sqlite_pragmas={
+            "journal_mode": "WAL",
+            "synchronous": "FULL",
+            "busy_timeout": "5000",
+            "mmap_size": str(256 * 1024 * 1024),
+        },
+    ),
+    "server": EngineOptions(
+        pool_size=10,
+        max_overflow=20,
+        pool_recycle=1800,
+        pool_timeout=30,
+        pool_pre_ping=True,
+        statement_cache_size=500,
+    ),
+}
+"""Наборы параметров движка базы данных."""
+
+
+def default_preset(db_url: str) -> DBPreset:
+    """Выбирает набор параметров движка по строке подключения.
+
+    Args:
+        db_url (str): URL для подключения к базе данных в формате SQLAlchemy.
+
+    Returns:
+        DBPreset: memory-fast для SQLite в памяти, durable-sqlite для файловой SQLite, иначе server.
+    """
+    if make_url(db_url).get_backend_name() != "sqlite":
+        return "server"
+    return "memory-fast" if is_in_memory_sqlite(db_url) else "durable-sqlite"
+
+
+def resolve_engine_options(settings: Settings, db_url: str) -> EngineOptions:
+    """Собирает параметры движка из набора параметров и явно заданных настроек.
+
+    Args:
+        settings (Settings): Настройки приложения.
+        db_url (str): URL для подключения к базе данных в формате SQLAlchemy.
+
+    Returns:
+        EngineOptions: Параметры движка базы данных.
+    """
+    preset = DB_PRESETS[settings.DB_PRESET or default_preset(db_url)]
+    overrides: dict[str, Any] = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+    pragmas = {
+        "journal_mode": settings.DB_SQLITE_JOURNAL_MODE,
+        "synchronous": settings.DB_SQLITE_SYNCHRONOUS,
+        "mmap_size": settings.DB_SQLITE_MMAP_SIZE,
+        "busy_timeout": settings.DB_SQLITE_BUSY_TIMEOUT,
+    }
+    return replace(
+        preset,
+        echo=settings.DB_ECHO,
+        **{key: value for key, value in overrides.items() if value is not None},
+        sqlite_pragmas={
+            **preset.sqlite_pragmas,
+            **{key: str(value) for key, value in pragmas.items() if value is not None},
+        },
+    )
@@ -0,0 +1,197 @@
+"""Модуль миграций схемы базы данных.
+
+`Base.metadata.create_all` создает только отсутствующие таблицы и не меняет уже существующие,
+поэтому изменения схемы для файловых баз данных, созданных предыдущими версиями сервера,
+описываются здесь в виде упорядоченного списка идемпотентных миграций.
+
+Текущая версия схемы хранится в таблице `schema_version`.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import Column, Connection, Integer, Table, inspect, literal_column, select, text
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.sql.elements import ColumnClause
+
+from .models.mock_data import Base, MockDbData, route_match_key
+
+schema_version = Table("schema_version", Base.metadata, Column("version", Integer, nullable=False))
+"""Таблица с текущей версией схемы базы данных."""
+
+Migration = Callable[[Connection], None]
+
+mock_data_table: Table = Base.metadata.tables[MockDbData.__tablename__]
+
+
+def _create_indexes(table: Table, *names: str) -> Migration:
+    """Создает миграцию, добавляющую указанные индексы таблицы, если их еще нет.
+
+    Args:
+        table (Table): Таблица SQLAlchemy.
+        *names (str): Имена индексов, объявленных в модели таблицы.
+
+    Returns:
+        Migration: Функция миграции.
+    """
+    by_name = {str(index.name): index for index in table.indexes}
+    indexes = [by_name[name] for name in names]
+
+    def migrate(conn: Connection) -> None:
+        existing = {index["name"] for index in inspect(conn).get_indexes(table.name)}
+        for index in indexes:
+            if index.name not in existing:
+                index.create(conn)
+
+    return migrate
+
+
+def _add_columns(table: Table, *names: str) -> Migration:
+    """Создает миграцию, добавляющую указанные колонки таблицы, если их еще нет.
+
+    Колонки должны быть nullable или иметь значение по умолчанию на стороне базы данных.
+
+    Args:
+        table (Table): Таблица SQLAlchemy.
+        *names (str): Имена колонок, объявленных в модели таблицы.
+
+    Returns:
+        Migration: Функция миграции.
+    """
+    columns = [table.columns[name] for name in names]
+
+    def migrate(conn: Connection) -> None:
+        existing = {column["name"] for column in inspect(conn).get_columns(table.name)}
+        table_name = conn.dialect.identifier_preparer.format_table(table)
+        for column in columns:
+            if column.name not in existing:
+                column_spec = CreateColumn(column).compile(dialect=conn.dialect)
+                conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_spec}"))
+
+    return migrate
+
+
+def _sequence(*migrations: Migration) -> Migration:
+    """Создает миграцию, последовательно выполняющую несколько миграций.
+
+    Args:
+        *migrations (Migration): Функции миграций.
+
+    Returns:
+        Migration: Функция миграции.
+    """
+
+    def migrate(conn: Connection) -> None:
+        for migration in migrations:
+            migration(conn)
+
+    return migrate
+
+
+def _fill_match_keys(conn: Connection) -> None:
+    """Заполняет ключи условий выбора мока перед созданием уникального индекса маршрута.
+
+    Ключ маршрута получают последние созданные мок-данные; более старые мок-данные с тем же
+    маршрутом и условиями, которые ими перекрыты, сохраняются с ключом, уникальным по UUID.
+    UUID читается и сравнивается без преобразования типа: строки старых версий сервера
+    могут хранить значения, которые не разбираются как UUID.
+    """
+    table = mock_data_table
+    raw_uuid: ColumnClause[Any] = literal_column("uuid")
+    rows = conn.execute(
+        select(raw_uuid, table.c.method, table.c.uri, table.c.match)
+        .select_from(table)
+        .order_by(table.c.created_at.desc())
+    )
+    seen: set[tuple[str, str, str]] = set()
+    for uuid, method, uri, match in rows.all():
+        key = route_match_key(match)
+        if (method, uri, key) in seen:
+            key = route_match_key({"shadowed_by_route": str(uuid), "match": match})
+        seen.add((method, uri, key))
+        if key:
+            conn.execute(table.update().where(raw_uuid == uuid).values(match_key=key))
+
+
+MIGRATIONS: list[tuple[int, str, Migration]] = [
+    (
+        1,
+        "Составной индекс (method, uri, created_at) для mock_data",
+        _create_indexes(mock_data_table, "ix_mock_data_method_uri_created_at"),
+    ),
+    (
+        2,
+        "Индекс (created_at, uuid) для постраничного чтения mock_data",
+        _create_indexes(mock_data_table, "ix_mock_data_created_at_uuid"),
+    ),
+    (3, "Колонка match с условиями выбора мока", _add_columns(mock_data_table, "match")),
+    (
+        4,
+        "Колонки latency и stream с профилем задержки и потоковой отдачей",
+        _add_columns(mock_data_table, "latency", "stream"),
+    ),
+    (
+        5,
+        "Колонка body_ref со ссылкой на тело ответа в хранилище тел ответов",
+        _add_columns(mock_data_table, "body_ref"),
+    ),
+    (6, "Колонка template с параметрами шаблонизации ответа", _add_columns(mock_data_table, "template")),
+    (7, "Колонка sequence со сценарием последовательных ответов", _add_columns(mock_data_table, "sequence")),
+    # Таблицу mock_data_history создает Base.metadata.create_all.
+    (8, "Колонка version с версией мок-данных; таблица mock_data_history", _add_columns(mock_data_table, "version")),
+    (
+        9,
+        "Колонки expires_at и max_hits со сроком жизни мока; индекс по expires_at",
+        _sequence(
+            _add_columns(mock_data_table, "expires_at", "max_hits"),
+            _create_indexes(mock_data_table, "ix_mock_data_expires_at"),
+        ),
+    ),
+    (
+        10,
+        "Колонка match_key и уникальный индекс (method, uri, match_key): один мок на маршрут и условия",
+        _sequence(
+            _add_columns(mock_data_table, "match_key"),
+            _fill_match_keys,
+            _create_indexes(mock_data_table, "ix_mock_data_method_uri_match_key"),
+        ),
+    ),
+]
+"""Упорядоченный список миграций: (версия, описание, функция миграции)."""
+
+
+def get_schema_version(conn: Connection) -> int:
+    """Возвращает текущую версию схемы базы данных.
+
+    Args:
+        conn (Connection): Синхронное соединение SQLAlchemy.
+
+    Returns:
+        int: Версия схемы, либо 0, если миграции еще не применялись.
+    """
+    return conn.execute(select(schema_version.c.version)).scalar_one_or_none() or 0
+
+
+def run_migrations(conn: Connection) -> int:
+    """Применяет к базе данных все миграции, версия которых больше текущей.
+
+    Должна вызываться после `Base.metadata.create_all` в той же транзакции.
+
+    Args:
+        conn (Connection): Синхронное соединение SQLAlchemy.
+
+    Returns:
+        int: Версия схемы после применения миграций.
+    """
+    current = get_schema_version(conn)
+    pending = [(version, migrate) for version, _, migrate in MIGRATIONS if version > current]
+    if not pending:
+        return current
+
+    for version, migrate in pending:
+        migrate(conn)
+        current = version
+
+    conn.execute(schema_version.delete())
+    conn.execute(schema_version.insert().values(version=current))
+    return current
@@ -1,13 +1,47 @@
-from datetime import datetime
+import hashlib
+import json
+from datetime import UTC, datetime
 from typing import Literal, TypeVar
 from uuid import UUID
 
-from sqlalchemy import JSON, DateTime, func
+from sqlalchemy import JSON, DateTime, Index, LargeBinary, String, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 T = TypeVar("T", bound="Base")
 
 
+def utc_now() -> datetime:
+    """
+    Возвращает текущие дату и время в UTC с точностью до микросекунд.
+
+    В отличие от CURRENT_TIMESTAMP в SQLite, сохраняет доли секунды, поэтому записи,
+    созданные в одну секунду, упорядочиваются по времени создания.
+
+    Returns:
+        datetime: Текущие дата и время в UTC.
+    """
+    return datetime.now(UTC)
+
+
+def route_match_key(match: dict[str, object] | None) -> str:
+    """
+    Возвращает ключ условий выбора мока для уникального индекса маршрута.
+
+    Ключ — SHA-256 канонического JSON условий, поэтому индекс не зависит от их размера;
+    для мока без условий ключ пустой.
+
+    Args:
+        match (dict[str, object] | None): Условия выбора мока в формате JSON.
+
+    Returns:
+        str: Ключ условий выбора мока.
+    """
+    if not match:
+        return ""
+    document = json.dumps(match, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(document.encode()).hexdigest()
+
+
 class Base(DeclarativeBase):
     """
     Базовый класс для всех моделей SQLAlchemy.
@@ -27,12 +61,28 @@ class MockDbData(Base):
         status_code (int): HTTP статус-код ответа.
         headers (dict[str, str] | None): Заголовки ответа в формате JSON.
         body (dict[str, object] | None): Тело ответа в формате JSON.
+        body_ref (dict[str, object] | None): Ссылка на тело ответа в хранилище тел ответов в формате JSON.
         delay (int | None): Задержка ответа в миллисекундах.
+        match (dict[str, object] | None): Условия выбора мока по запросу в формате JSON.
+        match_key (str): Ключ условий выбора мока; маршрут (method, uri, match_key) принадлежит одному моку.
+        latency (dict[str, object] | None): Профиль задержки ответа в формате JSON.
+        stream (dict[str, object] | None): Параметры потоковой отдачи тела ответа в формате JSON.
+        template (dict[str, object] | None): Параметры шаблонизации ответа в формате JSON.
+        sequence (dict[str, object] | None): Сценарий последовательных ответов в формате JSON.
+        version (int): Версия мок-данных, увеличивается при каждом изменении.
+        expires_at (datetime | None): Время, после которого мок удаляется.
+        max_hits (int | None): Количество ответов, после которого мок удаляется.
         created_at (datetime): Дата и время создания записи.
         updated_at (datetime): Дата и время последнего обновления записи.
     """
 
     __tablename__ = "mock_data"
+    __table_args__ = (
+        Index("ix_mock_data_method_uri_created_at", "method", "uri", "created_at"),
+        Index("ix_mock_data_created_at_uuid", "created_at", "uuid"),
+        Index("ix_mock_data_expires_at", "expires_at"),
+        Index("ix_mock_data_method_uri_match_key", "method", "uri", "match_key", unique=True),
+    )
 
     uuid: Mapped[UUID] = mapped_column(primary_key=True, index=True)
     uri: Mapped[str] = mapped_column(nullable=False)
@@ -40,8 +90,103 @@ class MockDbData(Base):
     status_code: Mapped[int] = mapped_column(nullable=False)
     headers: Mapped[dict[str, str]] = mapped_column(JSON, nullable=True)
     body: Mapped[dict[str, object]] = mapped_column(JSON, nullable=True)
+    body_ref: Mapped[dict[str, object]] = mapped_column(JSON, nullable=True)
     delay: Mapped[int] = mapped_column(nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    match: Mapped[dict[str, object]] = mapped_column(JSON, nullable=True)
+    match_key: Mapped[str] = mapped_column(String(64), nullable=False, default="", server_default="")
+    latency: Mapped[dict[str, object]] = mapped_column(JSON, nullable=True)
+    stream: Mapped[dict[str, object]] = mapped_column(JSON, nullable=True)
+    template: Mapped[dict[str, object]] = mapped_column(JSON, nullable=True)
+    sequence: Mapped[dict[str, object]] = mapped_column(JSON, nullable=True)
+    version: Mapped[int] = mapped_column(nullable=False, default=1, server_default="1")
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    max_hits: Mapped[int] = mapped_column(nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utc_now, server_default=func.now(), nullable=False
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+        DateTime(timezone=True), default=utc_now, server_default=func.now(), onupdate=utc_now, nullable=False
     )
+
+
+class MockDataHistory(Base):
+    """
+    История изменений мок-данных.
+
+    Таблица только пополняется: при каждом изменении мок-данных предыдущая версия сохраняется
+    в ней целиком, а строка `mock_data` изменяется на месте. Для каждого мока хранится
+    ограниченное количество последних версий.
+
+    Атрибуты:
+        id (int): Монотонно возрастающий идентификатор записи.
+        uuid (UUID): UUID мок-данных.
+        version (int): Версия мок-данных.
+        data (dict[str, object]): Мок-данные версии в формате JSON.
+        created_at (datetime): Дата и время замены версии новой.
+    """
+
+    __tablename__ = "mock_data_history"
+    __table_args__ = (Index("ix_mock_data_history_uuid_version", "uuid", "version", unique=True),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    uuid: Mapped[UUID] = mapped_column(nullable=False)
+    version: Mapped[int] = mapped_column(nullable=False)
+    data: Mapped[dict[str, object]] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now, nullable=False)
+
+
+class MockChangeLog(Base):
+    """
+    Журнал изменений мок-данных.
+
+    Используется для распространения изменений между процессами-воркерами: каждый воркер
+    периодически читает новые записи журнала и обновляет свою in-memory таблицу маршрутов.
+
+    Атрибуты:
+        id (int): Монотонно возрастающий идентификатор изменения.
+        uuid (UUID): UUID измененных мок-данных.
+        action (Literal): Тип изменения ("upsert" или "delete").
+        created_at (datetime): Дата и время изменения.
+    """
+
+    __tablename__ = "mock_change_log"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    uuid: Mapped[UUID] = mapped_column(nullable=False)
+    action: Mapped[Literal["upsert", "delete"]] = mapped_column(nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class MockRequestLog(Base):
+    """
+    Журнал входящих запросов, обработанных middleware моков.
+
+    Записи добавляются пакетами из кольцевого буфера воркера, тело запроса хранится
+    с ограничением размера.
+
+    Атрибуты:
+        id (int): Монотонно возрастающий идентификатор записи.
+        mock_uuid (UUID | None): UUID мока, ответившего на запрос, либо None, если мок не найден.
+        method (str): HTTP-метод запроса.
+        path (str): Путь запроса.
+        query (str): Строка query-параметров запроса.
+        headers (dict[str, str]): Заголовки запроса.
+        body (bytes | None): Начало тела запроса не длиннее JOURNAL_BODY_LIMIT байт.
+        body_size (int): Полный размер тела запроса в байтах.
+        status_code (int | None): HTTP код ответа.
+        created_at (datetime): Дата и время получения запроса.
+    """
+
+    __tablename__ = "mock_request_log"
+    __table_args__ = (Index("ix_mock_request_log_mock_uuid_id", "mock_uuid", "id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    mock_uuid: Mapped[UUID | None] = mapped_column(nullable=True)
+    method: Mapped[str] = mapped_column(nullable=False)
+    path: Mapped[str] = mapped_column(nullable=False)
+    query: Mapped[str] = mapped_column(nullable=False, default="")
+    headers: Mapped[dict[str, str]] = mapped_column(JSON, nullable=False)
+    body: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    body_size: Mapped[int] = mapped_column(nullable=False, default=0)
+    status_code: Mapped[int | None] = mapped_column(nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
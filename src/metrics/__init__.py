@@ -0,0 +1,27 @@
+"""Модуль метрик приложения.
+
+Содержит реестр метрик процесса, формирование страницы в текстовом формате Prometheus
+и обмен снимками метрик между воркерами.
+"""
+
+from .registry import DEFAULT_BUCKETS, MetricsRegistry, MetricsSnapshot, merge_snapshots, metrics, render_prometheus
+from .store import MetricsFileStore, MetricsFlusher
+
+METRICS_PATH = "/metrics"
+"""Путь страницы метрик, которая никогда не перехватывается моками."""
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+"""Тип содержимого страницы метрик в текстовом формате Prometheus."""
+
+__all__ = [
+    "CONTENT_TYPE",
+    "DEFAULT_BUCKETS",
+    "METRICS_PATH",
+    "MetricsFileStore",
+    "MetricsFlusher",
+    "MetricsRegistry",
+    "MetricsSnapshot",
+    "merge_snapshots",
+    "metrics",
+    "render_prometheus",
+]
@@ -0,0 +1,330 @@
+"""Модуль реестра метрик процесса.
+
+Предоставляет счетчики и гистограммы в формате Prometheus. Запись метрик выполняется
+в единственном цикле событий воркера без блокировок: счетчик — это значение в словаре,
+наблюдение гистограммы — бинарный поиск корзины и два сложения.
+
+Снимок реестра (`snapshot`) сериализуется в JSON, поэтому снимки нескольких воркеров
+можно объединить (`merge_snapshots`) и отдать одной страницей `/metrics`.
+"""
+
+from bisect import bisect_left
+from collections.abc import Iterable
+from typing import Literal, TypedDict
+
+Labels = tuple[tuple[str, str], ...]
+MetricType = Literal["counter", "histogram"]
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+"""Границы корзин гистограмм в секундах: от десятков микросекунд для поиска мока до секунд для БД."""
+
+METRICS: dict[str, tuple[MetricType, str]] = {
+    "mock_requests_total": ("counter", "Запросы, обработанные middleware моков, по результату (match, miss, error)."),
+    "mock_hits_total": ("counter", "Ответы, отданные каждым моком."),
+    "mock_lookup_duration_seconds": ("histogram", "Время поиска мока в таблице маршрутов."),
+    "mock_request_duration_seconds": ("histogram", "Время обработки запроса без настроенной задержки мока."),
+    "db_session_duration_seconds": ("histogram", "Время работы сессии базы данных по операциям."),
+    "request_journal_saved_total": ("counter", "Записи журнала запросов, сохраненные в базу данных."),
+    "request_journal_dropped_total": ("counter", "Записи журнала запросов, вытесненные из буфера до сохранения."),
+}
+"""Тип и описание метрик реестра."""
+
+
+class HistogramSnapshot(TypedDict):
+    """Снимок гистограммы: количества по корзинам (последняя — +Inf), сумма и количество наблюдений."""
+
+    counts: list[int]
+    sum: float
+    count: int
+
+
+class MetricsSnapshot(TypedDict):
+    """Снимок реестра, пригодный для сериализации в JSON.
+
+    Метки серии записываются строкой в формате Prometheus (`outcome="match"`).
+    """
+
+    counters: dict[str, dict[str, float]]
+    histograms: dict[str, dict[str, HistogramSnapshot]]
+
+
+class Counter:
+    """Счетчик одной серии.
+
+    Attributes:
+        value (float): Текущее значение счетчика.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        """Создает счетчик с нулевым значением."""
+        self.value = 0.0
+
+    def inc(self, value: float = 1) -> None:
+        """Увеличивает счетчик.
+
+        Args:
+            value (float): Приращение.
+        """
+        self.value += value
+
+
+class Histogram:
+    """Гистограмма с фиксированными корзинами.
+
+    Attributes:
+        buckets (tuple[float, ...]): Верхние границы корзин.
+        counts (list[int]): Количество наблюдений в каждой корзине, последняя корзина — +Inf.
+        sum (float): Сумма наблюдений.
+        count (int): Количество наблюдений.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """Создает пустую гистограмму.
+
+        Args:
+            buckets (tuple[float, ...]): Верхние границы корзин по возрастанию.
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Добавляет наблюдение.
+
+        Args:
+            value (float): Наблюдаемое значение.
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def reset(self) -> None:
+        """Сбрасывает наблюдения."""
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+def _escape_label_value(value: str) -> str:
+    """Экранирует значение метки по правилам текстового формата Prometheus."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: Labels) -> str:
+    """Форматирует метки серии в формате Prometheus.
+
+    Args:
+        labels (Labels): Пары (имя, значение).
+
+    Returns:
+        str: Метки вида `name="value",...` без фигурных скобок.
+    """
+    return ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels)
+
+
+class MetricsRegistry:
+    """Реестр метрик процесса.
+
+    Для горячего пути серии можно получить заранее (`counter`, `histogram`) и записывать
+    значения напрямую, без поиска серии по имени и меткам при каждом запросе.
+
+    Пример:
+        Запись и вывод метрик::
+
+            metrics.inc("mock_requests_total", (("outcome", "match"),))
+            lookup = metrics.histogram("mock_lookup_duration_seconds")
+            lookup.observe(0.00002)
+            text = render_prometheus(metrics.snapshot())
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """Создает пустой реестр.
+
+        Args:
+            buckets (tuple[float, ...]): Границы корзин гистограмм.
+        """
+        self.buckets = buckets
+        self._counters: dict[str, dict[Labels, Counter]] = {}
+        self._histograms: dict[str, dict[Labels, Histogram]] = {}
+
+    def counter(self, name: str, labels: Labels = ()) -> Counter:
+        """Возвращает счетчик серии, создавая его при необходимости.
+
+        Args:
+            name (str): Имя метрики.
+            labels (Labels): Метки серии.
+
+        Returns:
+            Counter: Счетчик серии.
+        """
+        series = self._counters.setdefault(name, {})
+        counter = series.get(labels)
+        if counter is None:
+            counter = series[labels] = Counter()
+        return counter
+
+    def histogram(self, name: str, labels: Labels = ()) -> Histogram:
+        """Возвращает гистограмму серии, создавая ее при необходимости.
+
+        Args:
+            name (str): Имя метрики.
+            labels (Labels): Метки серии.
+
+        Returns:
+            Histogram: Гистограмма серии.
+        """
+        series = self._histograms.setdefault(name, {})
+        histogram = series.get(labels)
+        if histogram is None:
+            histogram = series[labels] = Histogram(self.buckets)
+        return histogram
+
+    def inc(self, name: str, labels: Labels = (), value: float = 1) -> None:
+        """Увеличивает счетчик.
+
+        Args:
+            name (str): Имя метрики.
+            labels (Labels): Метки серии.
+            value (float): Приращение.
+        """
+        self.counter(name, labels).inc(value)
+
+    def observe(self, name: str, value: float, labels: Labels = ()) -> None:
+        """Добавляет наблюдение в гистограмму.
+
+        Args:
+            name (str): Имя метрики.
+            value (float): Наблюдаемое значение в секундах.
+            labels (Labels): Метки серии.
+        """
+        self.histogram(name, labels).observe(value)
+
+    def snapshot(self) -> MetricsSnapshot:
+        """Возвращает снимок реестра.
+
+        Returns:
+            MetricsSnapshot: Значения всех счетчиков и гистограмм.
+        """
+        return {
+            "counters": {
+                name: {format_labels(labels): counter.value for labels, counter in series.items()}
+                for name, series in self._counters.items()
+            },
+            "histograms": {
+                name: {
+                    format_labels(labels): {"counts": list(item.counts), "sum": item.sum, "count": item.count}
+                    for labels, item in series.items()
+                }
+                for name, series in self._histograms.items()
+            },
+        }
+
+    def clear(self) -> None:
+        """Сбрасывает значения всех метрик.
+
+        Серии не удаляются, поэтому полученные ранее счетчики и гистограммы остаются действительными.
+        """
+        for counters in self._counters.values():
+            for counter in counters.values():
+                counter.value = 0.0
+        for histograms in self._histograms.values():
+            for histogram in histograms.values():
+                histogram.reset()
+
+
+def merge_snapshots(snapshots: Iterable[MetricsSnapshot]) -> MetricsSnapshot:
+    """Объединяет снимки реестров нескольких процессов суммированием серий.
+
+    Args:
+        snapshots (Iterable[MetricsSnapshot]): Снимки реестров с одинаковыми корзинами гистограмм.
+
+    Returns:
+        MetricsSnapshot: Объединенный снимок.
+    """
+    merged: MetricsSnapshot = {"counters": {}, "histograms": {}}
+    for snapshot in snapshots:
+        for name, counter_series in snapshot["counters"].items():
+            merged_counters = merged["counters"].setdefault(name, {})
+            for labels, value in counter_series.items():
+                merged_counters[labels] = merged_counters.get(labels, 0) + value
+        for name, histogram_series in snapshot["histograms"].items():
+            merged_histograms = merged["histograms"].setdefault(name, {})
+            for labels, histogram in histogram_series.items():
+                target = merged_histograms.get(labels)
+                if target is None:
+                    merged_histograms[labels] = {
+                        "counts": list(histogram["counts"]),
+                        "sum": histogram["sum"],
+                        "count": histogram["count"],
+                    }
+                    continue
+                target["counts"] = [a + b for a, b in zip(target["counts"], histogram["counts"], strict=True)]
+                target["sum"] += histogram["sum"]
+                target["count"] += histogram["count"]
+    return merged
+
+
+def _format_number(value: float) -> str:
+    """Форматирует число для текстового формата Prometheus."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_prometheus(snapshot: MetricsSnapshot, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> str:
+    """Формирует страницу метрик в текстовом формате Prometheus 0.0.4.
+
+    Args:
+        snapshot (MetricsSnapshot): Снимок реестра.
+        buckets (tuple[float, ...]): Границы корзин гистограмм снимка.
+
+    Returns:
+        str: Текст страницы метрик.
+    """
+    lines = []
+    for name, (metric_type, description) in METRICS.items():
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        if metric_type == "counter":
+            for labels, value in sorted(snapshot["counters"].get(name, {}).items()):
+                lines.append(
+                    f"{name}{{{labels}}} {_format_number(value)}" if labels else f"{name} {_format_number(value)}"
+                )
+            continue
+
+        for labels, histogram in sorted(snapshot["histograms"].get(name, {}).items()):
+            prefix = f"{labels}," if labels else ""
+            cumulative = 0
+            for bound, count in zip((*map(repr, buckets), "+Inf"), histogram["counts"], strict=True):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{name}_sum{suffix} {_format_number(histogram['sum'])}")
+            lines.append(f"{name}_count{suffix} {histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+"""Реестр метрик текущего процесса."""
@@ -0,0 +1,117 @@
+"""Модуль обмена метриками между воркерами.
+
+Каждый воркер периодически сохраняет снимок своего реестра в файл `<pid>.json` общего каталога,
+а страница `/metrics` любого воркера объединяет снимки всех файлов. Файлы завершившихся воркеров
+не удаляются, поэтому счетчики не уменьшаются при перезапуске воркера.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+from pathlib import Path
+
+from .registry import MetricsRegistry, MetricsSnapshot, merge_snapshots
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsFileStore:
+    """Каталог снимков метрик воркеров.
+
+    Атрибуты:
+        directory (Path): Каталог со снимками.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        """Создает хранилище снимков.
+
+        Args:
+            directory (str | Path): Каталог со снимками; создается при необходимости.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def write(self, snapshot: MetricsSnapshot, pid: int | None = None) -> None:
+        """Атомарно сохраняет снимок реестра воркера.
+
+        Args:
+            snapshot (MetricsSnapshot): Снимок реестра.
+            pid (int | None): Идентификатор процесса воркера, по умолчанию текущий.
+        """
+        path = self.directory / f"{pid or os.getpid()}.json"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(snapshot, separators=(",", ":")))
+        tmp_path.replace(path)
+
+    def read_all(self) -> MetricsSnapshot:
+        """Объединяет снимки всех воркеров.
+
+        Returns:
+            MetricsSnapshot: Объединенный снимок.
+        """
+        snapshots = []
+        for path in self.directory.glob("*.json"):
+            try:
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                logger.warning("Не удалось прочитать снимок метрик %s", path)
+        return merge_snapshots(snapshots)
+
+    def clear(self) -> None:
+        """Удаляет все снимки."""
+        for path in (*self.directory.glob("*.json"), *self.directory.glob("*.tmp")):
+            path.unlink(missing_ok=True)
+
+
+class MetricsFlusher:
+    """Фоновое сохранение снимков реестра воркера.
+
+    Пример:
+        Запуск и остановка сохранения::
+
+            flusher = MetricsFlusher(metrics, MetricsFileStore("/tmp/metrics"), interval=1.0)
+            flusher.start()
+            ...
+            await flusher.stop()
+    """
+
+    def __init__(self, registry: MetricsRegistry, store: MetricsFileStore, interval: float) -> None:
+        """Создает объект сохранения снимков.
+
+        Args:
+            registry (MetricsRegistry): Реестр метрик воркера.
+            store (MetricsFileStore): Хранилище снимков.
+            interval (float): Интервал сохранения в секундах.
+        """
+        self.registry = registry
+        self.store = store
+        self.interval = interval
+        self._task: asyncio.Task[None] | None = None
+
+    def flush(self) -> None:
+        """Сохраняет текущий снимок реестра."""
+        self.store.write(self.registry.snapshot())
+
+    def start(self) -> None:
+        """Запускает периодическое сохранение снимков."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает периодическое сохранение и сохраняет последний снимок."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        self.flush()
+
+    async def _run(self) -> None:
+        """Периодически сохраняет снимки до отмены задачи."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.flush()
+            except OSError:
+                logger.exception("Не удалось сохранить снимок метрик")
@@ -1,79 +1,273 @@
+import time
 from uuid import UUID
 
-from fastapi import FastAPI, Request, Response, status
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import RequestResponseEndpoint
+from fastapi import FastAPI, status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from src.api.models.error_model import ErrorModel
-from src.services.handle_mock_request import handle_mock_request
-from src.services.mock_service import get_last_mock_data_by_uri_and_method, get_mock_data_by_uuid
+from src.metrics import METRICS_PATH, metrics
+from src.services.compiled_response import CompiledMockResponse
+from src.services.handle_mock_request import handle_mock_request, render_mock_response, send_error
+from src.services.mock_proxy import MockProxy, mock_proxy
+from src.services.mock_reaper import MockReaper, mock_reaper
+from src.services.mock_request import MockRequest
+from src.services.mock_route_table import MockRouteEntry, route_table
+from src.services.request_journal import JournalEntry, RequestBodyCapture, RequestJournal, request_journal
+from src.services.response_cache import CacheKey, ResponseCache, is_cacheable, response_cache
+from src.settings import config
 
+ADMIN_PATH_PREFIX = "/api/v1/mock"
+"""Префикс путей административного API, которые никогда не перехватываются моками."""
 
-def setup_dynamic_mock_middleware(app: FastAPI) -> None:
+# Серии метрик горячего пути получаются один раз при импорте модуля.
+_LOOKUP_DURATION = metrics.histogram("mock_lookup_duration_seconds")
+_OUTCOMES = {
+    outcome: (
+        metrics.counter("mock_requests_total", (("outcome", outcome),)),
+        metrics.histogram("mock_request_duration_seconds", (("outcome", outcome),)),
+    )
+    for outcome in ("match", "miss", "proxy", "error")
+}
+
+
+def _record_request(outcome: str, started: float, delay: float = 0.0) -> None:
+    """Записывает результат и время обработки запроса без учета задержки мока."""
+    requests, duration = _OUTCOMES[outcome]
+    requests.inc()
+    duration.observe(time.perf_counter() - started - delay)
+
+
+class DynamicMockMiddleware:
     """
-    Регистрирует middleware для динамической обработки mock-запросов.
+    ASGI-middleware для динамической обработки mock-запросов.
 
-    Middleware перехватывает все HTTP-запросы и пытается найти подходящий mock-ответ:
+    Работает напрямую с ASGI `scope` и не создает объекты Request/Response FastAPI:
         - Если в заголовке запроса присутствует 'x-req-id', ищет mock по UUID.
         - Если mock по UUID не найден, возвращает ошибку 404.
         - Если UUID некорректен, возвращает ошибку 400.
         - Если mock по UUID найден, возвращает соответствующий mock-ответ.
-        - Если UUID не указан, ищет последний mock по URI и HTTP-методу.
+        - Если UUID не указан, ищет последний mock по URI и HTTP-методу, в том числе
+          по шаблонам URI с параметрами и wildcard.
+        - Среди моков маршрута выбирается мок, условия `match` которого выполнены для
+          query-параметров, заголовков и тела запроса; тело читается только при необходимости.
         - Если найден mock по URI и методу, возвращает mock-ответ.
-        - Если ни один mock не найден, передаёт запрос дальше по цепочке.
+        - Если ни один mock не найден, передаёт запрос дальше по цепочке без изменений,
+          а при запущенном прокси — upstream-серверу с записью его ответа в мок-данные.
+        - Выбранный мок и ответ условных и шаблонизированных моков сохраняются в кеше ответов
+          по отпечатку запроса; повторные такие же запросы получают ответ из кеша.
+        - Ответы моков с ограничением `max_hits` учитываются объектом удаления истекших моков;
+          мок с исчерпанными ответами удаляется из таблицы маршрутов, и мок выбирается заново.
 
-    Args:
-        app (FastAPI): Экземпляр FastAPI-приложения, к которому добавляется middleware.
+    Запросы к административному API, к документации и к странице метрик не перехватываются.
+    Для остальных запросов записываются метрики: результат (match, miss, proxy, error), время поиска мока,
+    общее время обработки без настроенной задержки и количество ответов каждого мока.
+    Если задан журнал запросов, после отправки ответа в него добавляется запись о запросе:
+    метод, путь, query-строка, заголовки, начало тела не длиннее лимита журнала, размер тела,
+    UUID выбранного мока и код ответа. Тело при этом не буферизуется целиком.
 
-    Returns:
-        None
+    Attributes:
+        app (ASGIApp): Следующее ASGI-приложение в цепочке.
+        excluded_paths (frozenset[str]): Пути, которые всегда передаются дальше.
+        excluded_prefixes (tuple[str, ...]): Префиксы путей, которые всегда передаются дальше.
+        journal (RequestJournal | None): Журнал запросов, либо None, если запросы не записываются.
+        proxy (MockProxy | None): Прокси на upstream-сервер для запросов без моков; используется, пока запущен.
+        cache (ResponseCache | None): Кеш ответов условных и шаблонизированных моков.
+        reaper (MockReaper | None): Объект удаления истекших моков, учитывающий ответы моков с `max_hits`.
     """
 
-    @app.middleware("http")
-    async def dynamic_mock_middleware(request: Request, call_next: RequestResponseEndpoint) -> Response:
+    def __init__(
+        self,
+        app: ASGIApp,
+        excluded_paths: frozenset[str] = frozenset(),
+        excluded_prefixes: tuple[str, ...] = (),
+        journal: RequestJournal | None = None,
+        proxy: MockProxy | None = None,
+        cache: ResponseCache | None = None,
+        reaper: MockReaper | None = None,
+    ) -> None:
         """
-        Middleware для динамической обработки mock-запросов.
+        Создает middleware.
 
         Args:
-            request (Request): Входящий HTTP-запрос.
-            call_next (RequestResponseEndpoint): Следующий обработчик запроса в цепочке middleware.
+            app (ASGIApp): Следующее ASGI-приложение в цепочке.
+            excluded_paths (frozenset[str]): Пути, которые всегда передаются дальше.
+            excluded_prefixes (tuple[str, ...]): Префиксы путей, которые всегда передаются дальше.
+            journal (RequestJournal | None): Журнал запросов, либо None, если запросы не записываются.
+            proxy (MockProxy | None): Прокси на upstream-сервер для запросов без моков; используется, пока запущен.
+            cache (ResponseCache | None): Кеш ответов условных и шаблонизированных моков.
+            reaper (MockReaper | None): Объект удаления истекших моков, учитывающий ответы моков с `max_hits`.
+        """
+        self.app = app
+        self.excluded_paths = excluded_paths
+        self.excluded_prefixes = excluded_prefixes
+        self.journal = journal
+        self.proxy = proxy
+        self.cache = cache
+        self.reaper = reaper
 
-        Returns:
-            Response: Ответ mock-сервера или результат следующего middleware/обработчика.
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
+        Обрабатывает ASGI-вызов.
+
+        Args:
+            scope (Scope): ASGI scope запроса.
+            receive (Receive): Канал получения сообщений ASGI.
+            send (Send): Канал отправки сообщений ASGI.
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path: str = scope["path"]
+        if path in self.excluded_paths or path.startswith(self.excluded_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        journal = self.journal
+        if journal is None:
+            await self._dispatch(MockRequest(scope, receive), send)
+            return
+
+        # Тело не буферизуется целиком: копируется только его начало по мере чтения.
+        capture = RequestBodyCapture(receive, journal.body_limit)
+        request = MockRequest(scope, capture.receive)
+        entry, status_code = None, None
         try:
-            mock_uuid = request.headers.get("x-req-id")
+            entry, status_code = await self._dispatch(request, send)
+        finally:
+            await capture.drain()
+            journal.append(
+                JournalEntry(
+                    time.time(),
+                    entry.mock.uuid if entry is not None else None,
+                    request.method,
+                    path,
+                    scope.get("query_string", b""),
+                    scope["headers"],
+                    capture.body,
+                    capture.size,
+                    status_code,
+                )
+            )
+
+    async def _dispatch(self, request: MockRequest, send: Send) -> tuple[MockRouteEntry | None, int | None]:
+        """
+        Отправляет ответ мока либо передает запрос дальше по цепочке.
+
+        Код ответа приложения для запросов, не найденных среди моков, отслеживается только при включенном журнале.
+
+        Args:
+            request (MockRequest): Входящий запрос.
+            send (Send): Канал отправки сообщений ASGI.
 
-            if mock_uuid:
+        Returns:
+            tuple[MockRouteEntry | None, int | None]: Запись таблицы маршрутов выбранного мока, либо None,
+                если мок не найден, и HTTP код отправленного ответа.
+        """
+        scope = request.scope
+        started = time.perf_counter()
+        mock_uuid = None
+        response: CompiledMockResponse | None = None
+        store: tuple[ResponseCache, CacheKey, dict[str, str]] | None = None
+        for key, value in scope["headers"]:
+            if key == b"x-req-id":
+                mock_uuid = value.decode("latin-1")
+                break
+
+        if mock_uuid:
+            try:
                 uuid = UUID(mock_uuid)
-                mock_data = await get_mock_data_by_uuid(uuid)
-                if not mock_data:
-                    error = ErrorModel(detail=f"Mock with UUID {mock_uuid} not found")
-                    return JSONResponse(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        content=error.model_dump(),
-                    )
-                return await handle_mock_request(request, mock_data)
-
-            mock_data = await get_last_mock_data_by_uri_and_method(
-                uri=request.url.path,
-                method=request.method,
-            )
+            except ValueError:
+                await send_error(send, status.HTTP_400_BAD_REQUEST, f"Invalid UUID format: {mock_uuid}")
+                _record_request("error", started)
+                return None, status.HTTP_400_BAD_REQUEST
+            entry = route_table.get_by_uuid(uuid)
+            _LOOKUP_DURATION.observe(time.perf_counter() - started)
+            if not entry:
+                await send_error(send, status.HTTP_404_NOT_FOUND, f"Mock with UUID {mock_uuid} not found")
+                _record_request("error", started)
+                return None, status.HTTP_404_NOT_FOUND
+        else:
+            cache = self.cache
+            cache_key = await cache.fingerprint(request) if cache is not None else None
+            cached = cache.get(cache_key) if cache is not None and cache_key is not None else None
+            if cached is not None:
+                _LOOKUP_DURATION.observe(time.perf_counter() - started)
+                entry, response = cached
+            else:
+                matched = await route_table.resolve(request)
+                _LOOKUP_DURATION.observe(time.perf_counter() - started)
+                if matched is None:
+                    if self.proxy is not None and self.proxy.running:
+                        try:
+                            return None, await self.proxy.forward(request, send)
+                        finally:
+                            _record_request("proxy", started)
+                    status_code = None
 
-            if mock_data:
-                return await handle_mock_request(request, mock_data)
+                    async def send_tracked(message: Message) -> None:
+                        nonlocal status_code
+                        if message["type"] == "http.response.start":
+                            status_code = message["status"]
+                        await send(message)
 
-            return await call_next(request)
+                    try:
+                        await self.app(scope, request.receive, send if self.journal is None else send_tracked)
+                    finally:
+                        _record_request("miss", started)
+                    return None, status_code
+                entry, params = matched
+                if cache is not None and cache_key is not None and is_cacheable(entry):
+                    store = cache, cache_key, params
 
-        except ValueError:
-            error = ErrorModel(detail=f"Invalid UUID format: {mock_uuid}")
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content=error.model_dump(),
-            )
+        reaper = self.reaper if entry.mock.max_hits is not None else None
+        if reaper is not None and not reaper.available(entry.mock):
+            return await self._dispatch(request, send)
+
+        entry = entry.next_step()
+        try:
+            if store is not None:
+                cache, cache_key, params = store
+                response = await render_mock_response(request, entry, params)
+                cache.put(cache_key, entry, response)
+            status_code, served, delay = await handle_mock_request(request, send, entry, response)
         except Exception as e:
-            error = ErrorModel(detail=f"An error occurred: {str(e)}")
-            return JSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content=error.model_dump(),
-            )
+            await send_error(send, status.HTTP_500_INTERNAL_SERVER_ERROR, f"An error occurred: {str(e)}")
+            _record_request("error", started)
+            return entry, status.HTTP_500_INTERNAL_SERVER_ERROR
+
+        if not served:
+            _record_request("error", started)
+            return entry, status_code
+        if reaper is not None:
+            reaper.consume(entry.mock)
+        metrics.inc("mock_hits_total", entry.metric_labels)
+        _record_request("match", started, delay)
+        return entry, status_code
+
+
+def setup_dynamic_mock_middleware(app: FastAPI) -> None:
+    """
+    Регистрирует ASGI-middleware для динамической обработки mock-запросов.
+
+    Из обработки исключаются административный API моков, страница метрик и страницы документации приложения.
+    Если включен журнал запросов (JOURNAL_ENABLED), запросы записываются в журнал текущего процесса.
+
+    Args:
+        app (FastAPI): Экземпляр FastAPI-приложения, к которому добавляется middleware.
+
+    Returns:
+        None
+    """
+    excluded_paths = frozenset(path for path in (app.docs_url, app.redoc_url, app.openapi_url) if path)
+    if app.docs_url and app.swagger_ui_oauth2_redirect_url:
+        excluded_paths |= {app.swagger_ui_oauth2_redirect_url}
+
+    app.add_middleware(
+        DynamicMockMiddleware,
+        excluded_paths=excluded_paths | {ADMIN_PATH_PREFIX, METRICS_PATH},
+        excluded_prefixes=(f"{ADMIN_PATH_PREFIX}/",),
+        journal=request_journal if config.JOURNAL_ENABLED else None,
+        proxy=mock_proxy,
+        cache=response_cache,
+        reaper=mock_reaper,
+    )
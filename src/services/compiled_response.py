@@ -0,0 +1,201 @@
+"""Модуль предварительной сборки mock-ответов.
+
+Предоставляет функции для однократного кодирования тела и заголовков mock-ответа
+при создании или загрузке мока, чтобы при обработке запроса отдавать готовые байты.
+Тело из хранилища тел ответов не читается в память процесса: файл тела отображается в память.
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from datetime import UTC
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import cast
+
+from src.api.models.error_model import ErrorModel
+from src.api.models.mock_model import MockBodyRef, MockModelWithDate, MockWithUUID
+from src.settings import config
+from src.storage.blob_store import MappedBlob, blob_store
+
+logger = logging.getLogger(__name__)
+
+JsonEncoder = Callable[[object], bytes]
+
+
+def _encode_json_stdlib(content: object) -> bytes:
+    """Кодирует объект в JSON стандартной библиотекой так же, как это делает JSONResponse.
+
+    Args:
+        content (object): Кодируемый объект.
+
+    Returns:
+        bytes: JSON в кодировке UTF-8.
+    """
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def get_json_encoder(name: str) -> JsonEncoder:
+    """Возвращает функцию кодирования JSON по ее имени из настроек.
+
+    Args:
+        name (str): Имя кодировщика: "json" или "orjson".
+
+    Returns:
+        JsonEncoder: Функция, кодирующая объект в байты JSON.
+
+    Raises:
+        RuntimeError: Если выбран orjson, но пакет не установлен.
+        ValueError: Если имя кодировщика неизвестно.
+    """
+    if name == "json":
+        return _encode_json_stdlib
+    if name == "orjson":
+        try:
+            orjson = importlib.import_module("orjson")
+        except ImportError as e:
+            raise RuntimeError("JSON_ENCODER=orjson требует установленного пакета orjson") from e
+        return cast(JsonEncoder, orjson.dumps)
+    raise ValueError(f"Неизвестный JSON-кодировщик: {name}")
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledMockResponse:
+    """Предварительно собранный mock-ответ.
+
+    Attributes:
+        status_code (int): HTTP код ответа.
+        body (bytes): Закодированное тело ответа.
+        raw_headers (tuple[tuple[bytes, bytes], ...]): Заголовки ответа в формате ASGI, включая Content-Length.
+        blob (MappedBlob | None): Тело из хранилища тел ответов, отдаваемое вместо body.
+        etag (bytes | None): Значение заголовка ETag ответа для проверки условных запросов.
+        modified_at (int | None): Время изменения ответа (Unix-время в секундах) для проверки условных запросов.
+        variants (tuple[tuple[str, CompiledMockResponse], ...]): Предварительно сжатые варианты ответа
+            по кодировкам сжатия в порядке предпочтения.
+    """
+
+    status_code: int
+    body: bytes
+    raw_headers: tuple[tuple[bytes, bytes], ...]
+    blob: MappedBlob | None = None
+    etag: bytes | None = None
+    modified_at: int | None = None
+    variants: tuple[tuple[str, "CompiledMockResponse"], ...] = ()
+
+    def content(self) -> memoryview:
+        """Возвращает тело ответа без копирования.
+
+        Returns:
+            memoryview: Представление тела body или отображенного в память тела blob.
+        """
+        return self.blob.view() if self.blob is not None else memoryview(self.body)
+
+
+def _compile_headers(mock_data: MockWithUUID, length: int, content_type: str) -> tuple[tuple[bytes, bytes], ...]:
+    """Кодирует заголовки мока, добавляя Content-Length и Content-Type, если они не заданы в моке."""
+    raw_headers = [
+        (key.lower().encode("latin-1"), value.encode("latin-1")) for key, value in (mock_data.headers or {}).items()
+    ]
+    header_names = {key for key, _ in raw_headers}
+    status_code = mock_data.status_code
+    if b"content-length" not in header_names and not (status_code < 200 or status_code in (204, 304)):
+        raw_headers.append((b"content-length", str(length).encode("latin-1")))
+    if b"content-type" not in header_names:
+        raw_headers.append((b"content-type", content_type.encode("latin-1")))
+    return tuple(raw_headers)
+
+
+def _compile_blob_response(mock_data: MockWithUUID, body_ref: MockBodyRef) -> CompiledMockResponse:
+    """Собирает ответ с телом из хранилища тел ответов, отображая файл тела в память.
+
+    Если файл тела не найден, собирается ответ 500 с описанием ошибки.
+    """
+    try:
+        blob = blob_store.map(body_ref.digest)
+    except FileNotFoundError:
+        logger.warning("Тело ответа %s мока %s не найдено в хранилище", body_ref.digest, mock_data.uuid)
+        body = _encode_json_stdlib(ErrorModel(detail=f"Тело ответа {body_ref.digest} не найдено").model_dump())
+        headers = ((b"content-length", str(len(body)).encode("latin-1")), (b"content-type", b"application/json"))
+        return CompiledMockResponse(status_code=500, body=body, raw_headers=headers)
+    return CompiledMockResponse(
+        status_code=mock_data.status_code,
+        body=b"",
+        raw_headers=_compile_headers(mock_data, blob.size, body_ref.content_type),
+        blob=blob,
+    )
+
+
+def add_validators(response: CompiledMockResponse, mock_data: MockModelWithDate) -> CompiledMockResponse:
+    """Добавляет к собранному ответу заголовки ETag и Last-Modified для условных запросов.
+
+    ETag вычисляется один раз как хеш кода, заголовков и тела ответа; для тела из хранилища
+    тел ответов вместо содержимого используется его SHA-256 из ссылки body_ref. Last-Modified
+    берется из даты изменения мока. Заданные в моке заголовки ETag и Last-Modified сохраняются
+    и используются для проверки условных запросов. Ответы с кодом вне 2xx не получают валидаторов:
+    условные запросы к ним не проверяются.
+
+    Args:
+        response (CompiledMockResponse): Собранный ответ мока.
+        mock_data (MockModelWithDate): Данные мока с датой изменения.
+
+    Returns:
+        CompiledMockResponse: Ответ с заголовками и значениями валидаторов.
+    """
+    if not 200 <= response.status_code < 300:
+        return response
+    headers = dict(response.raw_headers)
+    etag = headers.get(b"etag")
+    if etag is None:
+        content = mock_data.body_ref.digest.encode() if mock_data.body_ref is not None else response.body
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(response.status_code).encode())
+        for name, value in response.raw_headers:
+            digest.update(b"\0" + name + b":" + value)
+        digest.update(b"\0" + content)
+        etag = b'"' + digest.hexdigest().encode() + b'"'
+
+    last_modified = headers.get(b"last-modified")
+    if last_modified is None:
+        updated_at = mock_data.updated_at
+        updated_at = updated_at.astimezone(UTC) if updated_at.tzinfo else updated_at.replace(tzinfo=UTC)
+        modified_at: int | None = int(updated_at.timestamp())
+        last_modified = format_datetime(updated_at, usegmt=True).encode("latin-1")
+    else:
+        try:
+            modified_at = int(parsedate_to_datetime(last_modified.decode("latin-1")).timestamp())
+        except (TypeError, ValueError):
+            modified_at = None
+
+    raw_headers = [*response.raw_headers]
+    raw_headers.extend(
+        (name, value) for name, value in ((b"etag", etag), (b"last-modified", last_modified)) if name not in headers
+    )
+    return replace(response, raw_headers=tuple(raw_headers), etag=etag, modified_at=modified_at)
+
+
+def compile_mock_response(mock_data: MockWithUUID, encoder: JsonEncoder | None = None) -> CompiledMockResponse:
+    """Кодирует тело и заголовки мока в готовый к отправке ответ.
+
+    Повторяет поведение JSONResponse: тело кодируется в компактный JSON, а заголовки
+    Content-Length и Content-Type добавляются, если не заданы в моке. Тело из хранилища
+    тел ответов (body_ref) отображается в память, Content-Type берется из ссылки на тело.
+
+    Args:
+        mock_data (MockWithUUID): Данные мока.
+        encoder (JsonEncoder | None): Кодировщик JSON. По умолчанию выбирается по config.JSON_ENCODER.
+
+    Returns:
+        CompiledMockResponse: Собранный ответ.
+    """
+    if mock_data.body_ref is not None:
+        return _compile_blob_response(mock_data, mock_data.body_ref)
+
+    encode = encoder or get_json_encoder(config.JSON_ENCODER)
+    body = encode(mock_data.body if mock_data.body else None)
+    return CompiledMockResponse(
+        status_code=mock_data.status_code,
+        body=body,
+        raw_headers=_compile_headers(mock_data, len(body), "application/json"),
+    )
@@ -1,49 +1,312 @@
 import asyncio
+from email.utils import parsedate_to_datetime
+from typing import NamedTuple
 
-from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi import status
+from starlette.types import Scope, Send
 
 from src.api.models.error_model import ErrorModel
-from src.api.models.mock_model import MockWithUUID
+from src.services.compiled_response import CompiledMockResponse, get_json_encoder
+from src.services.mock_request import MockRequest
+from src.services.mock_route_table import MockRouteEntry
+from src.services.response_compression import (
+    Codec,
+    accept_encoding,
+    encoded_headers,
+    is_compressible,
+    negotiate,
+    response_codecs,
+    select_variant,
+)
+from src.services.response_profile import send_streamed_response
+from src.settings import config
 
+BLOB_CHUNK_SIZE = 256 * 1024
+"""Размер части тела из хранилища тел ответов, отправляемой одним сообщением ASGI."""
 
-async def handle_mock_request(req: Request, mock_data: MockWithUUID) -> JSONResponse:
+NOT_MODIFIED_HEADERS = frozenset(
+    {b"etag", b"last-modified", b"cache-control", b"expires", b"vary", b"content-location", b"date"}
+)
+"""Заголовки ответа мока, передаваемые в ответе 304 Not Modified."""
+
+
+class MockResponseResult(NamedTuple):
+    """Результат обработки запроса моком.
+
+    Attributes:
+        status_code (int): HTTP код отправленного ответа.
+        served (bool): Отправлен ответ мока, а не ошибка.
+        delay (float): Выдержанная перед ответом задержка мока в секундах, включая задержку по профилю latency.
+    """
+
+    status_code: int
+    served: bool
+    delay: float = 0.0
+
+
+def _strip_weak(tag: bytes) -> bytes:
+    """Возвращает значение ETag без признака слабого сравнения."""
+    return tag[2:] if tag.startswith(b"W/") else tag
+
+
+def is_not_modified(request: MockRequest, response: CompiledMockResponse) -> bool:
     """
-    Обрабатывает входящий HTTP-запрос и возвращает ответ на основе предоставленных данных мока.
+    Проверяет условия If-None-Match и If-Modified-Since запроса для ответа мока.
+
+    If-None-Match сравнивается с ETag ответа по правилам слабого сравнения и имеет приоритет:
+    если он передан, If-Modified-Since не проверяется. Условия проверяются только для GET и HEAD
+    и только для ответов с кодом 2xx.
 
     Args:
-        req (Request): Входящий HTTP-запрос FastAPI.
-        mock_data (MockWithUUID): Данные мока, содержащие параметры для ответа.
+        request (MockRequest): Входящий HTTP-запрос.
+        response (CompiledMockResponse): Собранный ответ мока.
 
     Returns:
-        JSONResponse: Ответ, соответствующий данным мока или сообщение об ошибке.
+        bool: True, если клиенту можно ответить 304 Not Modified.
+    """
+    if request.method not in ("GET", "HEAD") or not 200 <= response.status_code < 300:
+        return False
+    if response.etag is None and response.modified_at is None:
+        return False
+    if_none_match = if_modified_since = None
+    for key, value in request.scope["headers"]:
+        if key == b"if-none-match":
+            if_none_match = value if if_none_match is None else if_none_match + b"," + value
+        elif key == b"if-modified-since":
+            if_modified_since = value
+
+    if if_none_match is not None:
+        if response.etag is None:
+            return False
+        etag = _strip_weak(response.etag)
+        return any(
+            tag == b"*" or _strip_weak(tag) == etag for tag in (tag.strip() for tag in if_none_match.split(b","))
+        )
+    if if_modified_since is None or response.modified_at is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since.decode("latin-1"))
+    except (TypeError, ValueError):
+        return False
+    return since.tzinfo is not None and int(since.timestamp()) >= response.modified_at
+
+
+async def send_compiled_response(send: Send, response: CompiledMockResponse) -> None:
+    """
+    Отправляет предварительно собранный ответ через ASGI-канал.
+
+    Args:
+        send (Send): Канал отправки сообщений ASGI.
+        response (CompiledMockResponse): Собранный ответ.
+    """
+    await send({"type": "http.response.start", "status": response.status_code, "headers": list(response.raw_headers)})
+    await send({"type": "http.response.body", "body": response.body})
+
+
+async def send_blob_response(scope: Scope, send: Send, response: CompiledMockResponse) -> None:
+    """
+    Отправляет ответ с телом из хранилища тел ответов без чтения файла тела в память процесса.
+
+    Если сервер поддерживает расширение ASGI `http.response.pathsend`, файл тела передается серверу
+    по пути и отправляется им без копирования (sendfile). Иначе тело отправляется частями
+    по BLOB_CHUNK_SIZE байт из отображенного в память файла.
+
+    Args:
+        scope (Scope): ASGI scope входящего HTTP-запроса.
+        send (Send): Канал отправки сообщений ASGI.
+        response (CompiledMockResponse): Собранный ответ с телом blob.
+    """
+    await send({"type": "http.response.start", "status": response.status_code, "headers": list(response.raw_headers)})
+    if response.blob is not None and "http.response.pathsend" in scope.get("extensions", {}):
+        await send({"type": "http.response.pathsend", "path": str(response.blob.path)})
+        return
+
+    body = response.content()
+    if not body:
+        await send({"type": "http.response.body", "body": b""})
+        return
+    for offset in range(0, len(body), BLOB_CHUNK_SIZE):
+        more_body = offset + BLOB_CHUNK_SIZE < len(body)
+        await send(
+            {
+                "type": "http.response.body",
+                "body": bytes(body[offset : offset + BLOB_CHUNK_SIZE]),
+                "more_body": more_body,
+            }
+        )
+
+
+async def send_compressed_response(send: Send, response: CompiledMockResponse, codec: Codec) -> None:
+    """
+    Сжимает тело ответа потоково и отправляет сжатые части без Content-Length.
+
+    Тело подается компрессору частями по BLOB_CHUNK_SIZE байт, и каждая готовая часть сжатых данных
+    отправляется сразу, без сборки сжатого тела целиком.
+
+    Args:
+        send (Send): Канал отправки сообщений ASGI.
+        response (CompiledMockResponse): Собранный ответ.
+        codec (Codec): Кодировка сжатия.
+    """
+    headers = encoded_headers(response, codec.name)
+    await send({"type": "http.response.start", "status": response.status_code, "headers": headers})
+    compressor = codec.compressor()
+    body = response.content()
+    for offset in range(0, len(body), BLOB_CHUNK_SIZE):
+        chunk = compressor.compress(bytes(body[offset : offset + BLOB_CHUNK_SIZE]))
+        if chunk:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    await send({"type": "http.response.body", "body": compressor.flush()})
+
+
+async def send_not_modified(send: Send, response: CompiledMockResponse) -> None:
+    """
+    Отправляет ответ 304 Not Modified с заголовками-валидаторами ответа мока и без тела.
+
+    Args:
+        send (Send): Канал отправки сообщений ASGI.
+        response (CompiledMockResponse): Собранный ответ мока.
+    """
+    headers = [header for header in response.raw_headers if header[0] in NOT_MODIFIED_HEADERS]
+    await send({"type": "http.response.start", "status": status.HTTP_304_NOT_MODIFIED, "headers": headers})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def send_head_response(send: Send, response: CompiledMockResponse, chunked: bool = False) -> None:
+    """
+    Отправляет заголовки ответа мока без тела в ответ на HEAD-запрос.
+
+    Args:
+        send (Send): Канал отправки сообщений ASGI.
+        response (CompiledMockResponse): Собранный ответ мока.
+        chunked (bool): Ответ на GET-запрос отдается без Content-Length.
+    """
+    headers = [header for header in response.raw_headers if not (chunked and header[0] == b"content-length")]
+    await send({"type": "http.response.start", "status": response.status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def send_error(send: Send, status_code: int, detail: str) -> None:
+    """
+    Отправляет ответ с ошибкой в формате ErrorModel.
+
+    Args:
+        send (Send): Канал отправки сообщений ASGI.
+        status_code (int): HTTP код ответа.
+        detail (str): Описание ошибки.
+    """
+    body = get_json_encoder(config.JSON_ENCODER)(ErrorModel(detail=detail).model_dump())
+    headers = ((b"content-length", str(len(body)).encode("latin-1")), (b"content-type", b"application/json"))
+    await send_compiled_response(send, CompiledMockResponse(status_code=status_code, body=body, raw_headers=headers))
+
+
+async def render_mock_response(
+    request: MockRequest, entry: MockRouteEntry, params: dict[str, str]
+) -> CompiledMockResponse:
+    """
+    Возвращает ответ мока для запроса: собранный при добавлении мока, либо собранный по шаблону.
+
+    Args:
+        request (MockRequest): Входящий HTTP-запрос.
+        entry (MockRouteEntry): Запись таблицы маршрутов.
+        params (dict[str, str]): Параметры пути запроса.
+
+    Returns:
+        CompiledMockResponse: Ответ мока.
+    """
+    if entry.response_template is None:
+        return entry.response
+    return await entry.response_template.render(request, params)
+
+
+def _stream_codec(request: MockRequest, entry: MockRouteEntry, response: CompiledMockResponse) -> Codec | None:
+    """Выбирает кодировку потокового сжатия шаблонизированного ответа без потоковой отдачи."""
+    if entry.response_template is None or entry.stream is not None or not response_codecs:
+        return None
+    if not is_compressible(response, config.COMPRESSION_MIN_SIZE):
+        return None
+    encoding = negotiate(accept_encoding(request.scope["headers"]), (codec.name for codec in response_codecs))
+    return next((codec for codec in response_codecs if codec.name == encoding), None)
+
+
+async def handle_mock_request(
+    request: MockRequest, send: Send, entry: MockRouteEntry, response: CompiledMockResponse | None = None
+) -> MockResponseResult:
+    """
+    Обрабатывает входящий HTTP-запрос и отправляет ответ на основе предоставленных данных мока.
+
+    Работает напрямую с ASGI-сообщениями. Тело и заголовки ответа не кодируются заново:
+    отдаются байты, собранные при добавлении мока в таблицу маршрутов. Перед ответом выдерживается
+    задержка delay и задержка по профилю latency; при заданном stream тело отдается частями.
+    Тело из хранилища тел ответов отдается из отображенного в память файла. Шаблонизированный
+    ответ собирается из скомпилированных сегментов со значениями запроса, если готовый ответ
+    (например, из кеша ответов) не передан.
+
+    Сжатый вариант ответа выбирается по заголовку Accept-Encoding; шаблонизированный ответ
+    сжимается потоково при отправке. Если условия If-None-Match или If-Modified-Since выполнены
+    для ETag и Last-Modified ответа, отправляется 304 Not Modified без тела. HEAD-запрос к GET-моку
+    получает заголовки ответа без тела; тело шаблонизированного ответа при этом не собирается.
+
+    Args:
+        request (MockRequest): Входящий HTTP-запрос.
+        send (Send): Канал отправки сообщений ASGI.
+        entry (MockRouteEntry): Запись таблицы маршрутов с данными мока и собранным ответом.
+        response (CompiledMockResponse | None): Готовый ответ на запрос.
+
+    Returns:
+        MockResponseResult: HTTP код отправленного ответа, признак того, что отправлен ответ мока, а не ошибка,
+            и выдержанная задержка.
 
     Raises:
         None
 
     Примеры:
-        >>> await handle_mock_request(request, mock_data)
-        <JSONResponse ...>
-    """
-    if req.method != mock_data.method:
-        error = ErrorModel(detail=f"Method {req.method} not allowed for this endpoint")
-        return JSONResponse(
-            status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
-            content=error.model_dump(),
-        )
+        >>> await handle_mock_request(request, send, entry)
+    """
+    mock_data = entry.mock
+    method = request.method
+    path = request.path
 
-    if req.url.path != mock_data.uri:
-        error = ErrorModel(detail=f"Path {req.url.path} not allowed for this endpoint")
-        return JSONResponse(
-            status_code=status.HTTP_404_NOT_FOUND,
-            content=error.model_dump(),
-        )
+    if method != mock_data.method and not (method == "HEAD" and mock_data.method == "GET"):
+        await send_error(send, status.HTTP_405_METHOD_NOT_ALLOWED, f"Method {method} not allowed for this endpoint")
+        return MockResponseResult(status.HTTP_405_METHOD_NOT_ALLOWED, False)
+
+    params = entry.match_path(path)
+    if params is None:
+        await send_error(send, status.HTTP_404_NOT_FOUND, f"Path {path} not allowed for this endpoint")
+        return MockResponseResult(status.HTTP_404_NOT_FOUND, False)
+
+    delay = mock_data.delay / 1000 if mock_data.delay else 0.0
+    if entry.latency is not None:
+        delay += entry.latency()
+    if delay:
+        await asyncio.sleep(delay)
+
+    if response is None and entry.response_template is None:
+        response = entry.response
+    if response is not None:
+        response = select_variant(request.scope["headers"], response)
+    if response is not None and is_not_modified(request, response):
+        await send_not_modified(send, response)
+        return MockResponseResult(status.HTTP_304_NOT_MODIFIED, True, delay)
+
+    if method == "HEAD":
+        if response is None and entry.response_template is not None:
+            response = await entry.response_template.render_headers(request, params)
+        response = response or entry.response
+        await send_head_response(send, response, entry.stream is not None and entry.stream.chunked)
+        return MockResponseResult(response.status_code, True, delay)
 
-    if mock_data.delay:
-        await asyncio.sleep(mock_data.delay / 1000)
+    if response is None:
+        response = await render_mock_response(request, entry, params)
 
-    return JSONResponse(
-        status_code=mock_data.status_code,
-        content=mock_data.body if mock_data.body else None,
-        headers=mock_data.headers if mock_data.headers else None,
-    )
+    codec = _stream_codec(request, entry, response)
+    if codec is not None:
+        await send_compressed_response(send, response, codec)
+    elif entry.stream is not None:
+        await send_streamed_response(send, response, entry.stream)
+    elif response.blob is not None:
+        await send_blob_response(request.scope, send, response)
+    else:
+        await send_compiled_response(send, response)
+    return MockResponseResult(response.status_code, True, delay)
@@ -0,0 +1,144 @@
+"""Модуль массового импорта и экспорта mock-данных.
+
+Предоставляет функции для потокового разбора NDJSON, пакетной загрузки моков
+с отчетом об ошибках отдельных элементов и потоковой выгрузки всех моков.
+"""
+
+import logging
+from collections.abc import AsyncIterable, AsyncIterator
+
+from pydantic import ValidationError
+
+from src.api.models.bulk_model import BulkImportError, BulkImportResult
+from src.api.models.mock_model import MockData, MockModelWithDate
+from src.services.mock_service import create_mock_data_batch, iter_mock_data
+
+logger = logging.getLogger(__name__)
+
+
+async def iter_ndjson_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """
+    Разбить поток байтов NDJSON на отдельные непустые строки.
+
+    Args:
+        chunks (AsyncIterable[bytes]): Поток фрагментов тела запроса.
+
+    Yields:
+        bytes: Строки NDJSON без символа перевода строки.
+    """
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    """
+    Сформировать краткое описание ошибки валидации элемента.
+
+    Args:
+        error (ValidationError): Ошибка валидации pydantic.
+
+    Returns:
+        str: Описание ошибок в формате "поле: сообщение; ...".
+    """
+    return "; ".join(
+        f"{'.'.join(map(str, item['loc']))}: {item['msg']}" if item["loc"] else item["msg"] for item in error.errors()
+    )
+
+
+async def import_mock_data(items: AsyncIterable[bytes | object], batch_size: int) -> BulkImportResult:
+    """
+    Импортировать mock-данные пакетами.
+
+    Каждый элемент валидируется моделью MockData. Валидные элементы сохраняются в базу
+    данных пакетами по `batch_size` в отдельных транзакциях, ошибки валидации и сохранения
+    возвращаются для каждого элемента отдельно. Элемент для маршрута с условиями match, занятого
+    существующим моком или предыдущим элементом, изменяет этот мок как новую версию.
+
+    Args:
+        items (AsyncIterable[bytes | object]): Элементы для импорта: строки JSON или уже разобранные объекты.
+        batch_size (int): Количество моков, сохраняемых в одной транзакции.
+
+    Returns:
+        BulkImportResult: Результат импорта.
+    """
+    result = BulkImportResult(created=0, updated=0, failed=0, uuids=[], errors=[])
+    batch: list[tuple[int, MockData]] = []
+
+    async def flush() -> None:
+        try:
+            created = await create_mock_data_batch([mock_data for _, mock_data in batch])
+        except Exception as e:
+            logger.exception("Не удалось сохранить пакет моков")
+            result.errors.extend(BulkImportError(index=index, detail=f"An error occurred: {e}") for index, _ in batch)
+        else:
+            result.uuids.extend(mock.uuid for mock in created)
+            result.updated += sum(mock.version > 1 for mock in created)
+        batch.clear()
+
+    index = 0
+    async for item in items:
+        try:
+            mock_data = MockData.model_validate_json(item) if isinstance(item, bytes) else MockData.model_validate(item)
+        except ValidationError as e:
+            result.errors.append(BulkImportError(index=index, detail=_format_validation_error(e)))
+        else:
+            batch.append((index, mock_data))
+            if len(batch) >= batch_size:
+                await flush()
+        index += 1
+
+    if batch:
+        await flush()
+
+    result.created = len(result.uuids) - result.updated
+    result.failed = len(result.errors)
+    result.errors.sort(key=lambda error: error.index)
+    return result
+
+
+async def encode_mock_stream(mocks: AsyncIterable[MockModelWithDate], ndjson: bool) -> AsyncIterator[bytes]:
+    """
+    Закодировать поток mock-данных в формат NDJSON или JSON-массива.
+
+    Args:
+        mocks (AsyncIterable[MockModelWithDate]): Поток mock-данных.
+        ndjson (bool): True для NDJSON, False для JSON-массива.
+
+    Yields:
+        bytes: Фрагменты тела ответа.
+    """
+    separator = b"\n" if ndjson else b","
+    first = True
+    if not ndjson:
+        yield b"["
+    async for mock in mocks:
+        line = mock.model_dump_json().encode()
+        if ndjson:
+            yield line + separator
+        else:
+            yield line if first else separator + line
+        first = False
+    if not ndjson:
+        yield b"]"
+
+
+async def export_mock_data(batch_size: int, ndjson: bool) -> AsyncIterator[bytes]:
+    """
+    Выгрузить все mock-данные потоком в формате NDJSON или JSON-массива.
+
+    Args:
+        batch_size (int): Количество строк, читаемых из курсора базы данных за один раз.
+        ndjson (bool): True для NDJSON, False для JSON-массива.
+
+    Yields:
+        bytes: Фрагменты тела ответа.
+    """
+    async for chunk in encode_mock_stream(iter_mock_data(batch_size), ndjson):
+        yield chunk
@@ -0,0 +1,176 @@
+"""Модуль выбора мока маршрута по условиям запроса.
+
+Предоставляет класс MockMatcher, который индексирует моки одного маршрута по значению
+дискриминирующего условия (query-параметра, заголовка или поля тела, которое встречается
+в условиях чаще всего). Поэтому даже при сотнях вариантов проверяются только варианты
+с подходящим значением ключа и варианты, в которых этот ключ не задан.
+"""
+
+import json
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Literal
+
+from src.services.mock_request import MISSING, MockRequest
+
+if TYPE_CHECKING:
+    from src.services.mock_route_table import MockRouteEntry
+
+PredicateSource = Literal["query", "header", "body"]
+PredicateKey = tuple[PredicateSource, str]
+
+
+def lookup_json_path(document: object, path: str) -> object:
+    """Возвращает значение поля JSON-документа по пути через точку.
+
+    Args:
+        document (object): Разобранный JSON-документ.
+        path (str): Путь к полю, например "user.id" или "items.0.sku".
+
+    Returns:
+        object: Значение поля, либо MISSING, если поле не найдено.
+    """
+    value = document
+    for part in path.split("."):
+        if isinstance(value, dict):
+            value = value.get(part, MISSING)
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return MISSING
+        if value is MISSING:
+            return MISSING
+    return value
+
+
+def _index_value(source: PredicateSource, value: object) -> object:
+    """Приводит значение условия к хешируемому виду для индекса."""
+    return json.dumps(value, sort_keys=True) if source == "body" else value
+
+
+async def _request_value(request: MockRequest, key: PredicateKey) -> object:
+    """Возвращает значение запроса для ключа условия.
+
+    Args:
+        request (MockRequest): Входящий запрос.
+        key (PredicateKey): Источник и имя значения.
+
+    Returns:
+        object: Значение, либо MISSING, если оно отсутствует в запросе.
+    """
+    source, name = key
+    if source == "query":
+        return request.query.get(name, MISSING)
+    if source == "header":
+        return request.headers.get(name, MISSING)
+    document = await request.json()
+    return MISSING if document is MISSING else lookup_json_path(document, name)
+
+
+@dataclass(frozen=True, slots=True)
+class _Variant:
+    """Мок маршрута с разобранными условиями."""
+
+    entry: "MockRouteEntry"
+    predicates: tuple[tuple[PredicateSource, str, object], ...]
+    rank: tuple[int, datetime]
+
+    async def matches(self, request: MockRequest) -> bool:
+        """Проверяет, выполняются ли все условия мока для запроса.
+
+        Условия по query-параметрам и заголовкам проверяются раньше условий по телу,
+        поэтому тело запроса читается, только если остальные условия выполнены.
+        """
+        for source, name, expected in self.predicates:
+            if await _request_value(request, (source, name)) != expected:
+                return False
+        return True
+
+
+def _parse_variant(entry: "MockRouteEntry") -> _Variant:
+    """Разбирает условия мока в упорядоченный список предикатов."""
+    predicates: list[tuple[PredicateSource, str, object]] = []
+    match = entry.mock.match
+    if match is not None:
+        predicates.extend(("query", name, value) for name, value in (match.query or {}).items())
+        predicates.extend(("header", name.lower(), value) for name, value in (match.headers or {}).items())
+        predicates.extend(("body", name, value) for name, value in (match.body or {}).items())
+    return _Variant(entry=entry, predicates=tuple(predicates), rank=(len(predicates), entry.mock.created_at))
+
+
+class MockMatcher:
+    """Индекс моков одного маршрута по условиям запроса.
+
+    Атрибуты:
+        fallback (MockRouteEntry | None): Последний созданный мок маршрута без условий.
+        key (PredicateKey | None): Дискриминирующий ключ индекса.
+
+    Пример:
+        Выбор мока для запроса::
+
+            matcher = MockMatcher(entries)
+            entry = await matcher.resolve(request)
+    """
+
+    def __init__(self, entries: Iterable["MockRouteEntry"]) -> None:
+        """Строит индекс моков маршрута.
+
+        Args:
+            entries (Iterable[MockRouteEntry]): Моки маршрута в порядке создания.
+        """
+        self.fallback: MockRouteEntry | None = None
+        variants = []
+        for entry in entries:
+            variant = _parse_variant(entry)
+            if variant.predicates:
+                variants.append(variant)
+            else:
+                self.fallback = entry
+
+        counts = Counter((source, name) for variant in variants for source, name, _ in variant.predicates)
+        # Ключи query и заголовков предпочтительнее ключей тела: их проверка не требует чтения тела.
+        self.key: PredicateKey | None = max(counts, key=lambda key: (counts[key], key[0] != "body")) if counts else None
+
+        self._index: dict[object, list[_Variant]] = {}
+        self._rest: list[_Variant] = []
+        for variant in variants:
+            value = next(
+                (value for source, name, value in variant.predicates if (source, name) == self.key),
+                MISSING,
+            )
+            if self.key is None or value is MISSING:
+                self._rest.append(variant)
+            else:
+                self._index.setdefault(_index_value(self.key[0], value), []).append(variant)
+
+        for candidates in (*self._index.values(), self._rest):
+            candidates.sort(key=lambda variant: variant.rank, reverse=True)
+
+    async def resolve(self, request: MockRequest) -> "MockRouteEntry | None":
+        """Выбирает мок маршрута для запроса.
+
+        Args:
+            request (MockRequest): Входящий запрос.
+
+        Returns:
+            MockRouteEntry | None: Подходящий мок с условиями, мок без условий, либо None.
+        """
+        best: _Variant | None = None
+        if self.key is not None and self._index:
+            value = await _request_value(request, self.key)
+            if value is not MISSING:
+                for variant in self._index.get(_index_value(self.key[0], value), ()):
+                    if await variant.matches(request):
+                        best = variant
+                        break
+
+        for variant in self._rest:
+            if best is not None and variant.rank <= best.rank:
+                break
+            if await variant.matches(request):
+                best = variant
+                break
+
+        return best.entry if best is not None else self.fallback
@@ -0,0 +1,240 @@
+"""Модуль проксирования запросов без моков на upstream-сервер с записью ответов.
+
+Запрос, для которого не найден мок, передается на upstream-сервер через пул keep-alive соединений
+httpx, а ответ upstream-сервера потоком отправляется клиенту. Отправленный ответ в фоне сохраняется
+как новые мок-данные, поэтому следующие такие же запросы обслуживаются локально. Запись не задерживает
+проксируемый ответ: она начинается после отправки последней части тела.
+"""
+
+import asyncio
+import importlib
+import json
+import logging
+from typing import TYPE_CHECKING, Any
+
+from fastapi import status
+from starlette.types import Send
+
+from src.api.models.mock_model import MockData
+from src.services.handle_mock_request import send_error
+from src.services.mock_request import MockRequest
+from src.services.mock_service import create_mock_data
+from src.storage import blob_store
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+HOP_BY_HOP_HEADERS = frozenset(
+    {
+        b"connection",
+        b"keep-alive",
+        b"proxy-authenticate",
+        b"proxy-authorization",
+        b"proxy-connection",
+        b"te",
+        b"trailer",
+        b"transfer-encoding",
+        b"upgrade",
+    }
+)
+"""Заголовки соединения, которые не передаются через прокси."""
+
+_NOT_RECORDED_HEADERS = frozenset({"content-length", "date"})
+
+
+def _json_object(body: bytes, headers: dict[str, str]) -> dict[str, object] | None:
+    """Разбирает тело ответа как JSON-объект, если тело не сжато и имеет тип JSON."""
+    if headers.get("content-encoding", "identity") != "identity":
+        return None
+    if "json" not in headers.get("content-type", ""):
+        return None
+    try:
+        document = json.loads(body)
+    except ValueError:
+        return None
+    return document if isinstance(document, dict) and document else None
+
+
+class MockProxy:
+    """Прокси на upstream-сервер для запросов, не найденных среди моков.
+
+    Атрибуты:
+        record (bool): Сохранять ответы upstream-сервера как мок-данные.
+        record_limit (int): Максимальный размер сохраняемого тела ответа в байтах.
+
+    Пример:
+        Запуск и остановка прокси::
+
+            await mock_proxy.start("http://upstream:8080")
+            ...
+            await mock_proxy.stop()
+    """
+
+    def __init__(self) -> None:
+        """Создает остановленный прокси."""
+        self.record = True
+        self.record_limit = 0
+        self._client: httpx.AsyncClient | None = None
+        self._httpx: Any = None
+        self._recordings: set[asyncio.Task[None]] = set()
+        self._recording_keys: set[tuple[str, str, bytes]] = set()
+
+    @property
+    def running(self) -> bool:
+        """Запущен ли прокси."""
+        return self._client is not None
+
+    async def start(
+        self,
+        upstream_url: str,
+        timeout: float = 30.0,
+        max_connections: int = 100,
+        record: bool = True,
+        record_limit: int = 10 * 1024 * 1024,
+        transport: "httpx.AsyncBaseTransport | None" = None,
+    ) -> None:
+        """Создает пул соединений с upstream-сервером.
+
+        Args:
+            upstream_url (str): Базовый URL upstream-сервера.
+            timeout (float): Таймаут операций с upstream-сервером в секундах.
+            max_connections (int): Максимальное количество соединений с upstream-сервером.
+            record (bool): Сохранять ответы upstream-сервера как мок-данные.
+            record_limit (int): Максимальный размер сохраняемого тела ответа в байтах.
+            transport (httpx.AsyncBaseTransport | None): Транспорт httpx, например для тестового upstream-приложения.
+
+        Raises:
+            RuntimeError: Если пакет httpx не установлен.
+        """
+        try:
+            self._httpx = importlib.import_module("httpx")
+        except ImportError as e:
+            raise RuntimeError("PROXY_URL требует установленного пакета httpx") from e
+        await self.stop()
+        self.record = record
+        self.record_limit = record_limit
+        self._client = self._httpx.AsyncClient(
+            base_url=upstream_url,
+            timeout=timeout,
+            limits=self._httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport,
+            follow_redirects=False,
+        )
+
+    async def stop(self) -> None:
+        """Дожидается фоновых записей и закрывает пул соединений."""
+        await self.flush()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def flush(self) -> None:
+        """Дожидается завершения фоновых записей ответов."""
+        while self._recordings:
+            await asyncio.gather(*self._recordings, return_exceptions=True)
+
+    async def forward(self, request: MockRequest, send: Send) -> int:
+        """Передает запрос upstream-серверу и потоком отправляет его ответ клиенту.
+
+        Если upstream-сервер недоступен, отправляется ответ 502. Ответы с кодом меньше 500
+        после отправки сохраняются в фоне как мок-данные.
+
+        Args:
+            request (MockRequest): Входящий запрос.
+            send (Send): Канал отправки сообщений ASGI.
+
+        Returns:
+            int: HTTP код отправленного ответа.
+        """
+        client = self._client
+        if client is None:
+            raise RuntimeError("Прокси не запущен")
+        scope = request.scope
+        target = (scope.get("raw_path") or request.path.encode()).decode("latin-1")
+        query_string: bytes = scope.get("query_string", b"")
+        if query_string:
+            target = f"{target}?{query_string.decode('latin-1')}"
+        headers = [(key, value) for key, value in scope["headers"] if key not in HOP_BY_HOP_HEADERS and key != b"host"]
+
+        upstream_request = client.build_request(request.method, target, headers=headers, content=await request.body())
+        try:
+            response = await client.send(upstream_request, stream=True)
+        except self._httpx.HTTPError as e:
+            logger.warning("Upstream-сервер не ответил на %s %s: %s", request.method, target, e)
+            await send_error(send, status.HTTP_502_BAD_GATEWAY, f"Upstream request failed: {e}")
+            return status.HTTP_502_BAD_GATEWAY
+
+        key = (request.method, request.path, query_string)
+        recording = self.record and response.status_code < 500 and key not in self._recording_keys
+        try:
+            response_headers = [
+                (name.lower(), value) for name, value in response.headers.raw if name.lower() not in HOP_BY_HOP_HEADERS
+            ]
+            await send({"type": "http.response.start", "status": response.status_code, "headers": response_headers})
+            chunks: list[bytes] = []
+            size = 0
+            async for chunk in response.aiter_raw():
+                if not chunk:
+                    continue
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                if recording:
+                    size += len(chunk)
+                    recording = size <= self.record_limit
+                    chunks.append(chunk)
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            await response.aclose()
+
+        if recording:
+            self._recording_keys.add(key)
+            task = asyncio.create_task(self._record(request, response.status_code, response_headers, b"".join(chunks)))
+            self._recordings.add(task)
+            task.add_done_callback(lambda done: self._finish_recording(done, key))
+        return response.status_code
+
+    def _finish_recording(self, task: asyncio.Task[None], key: tuple[str, str, bytes]) -> None:
+        """Удаляет завершенную запись из списка фоновых записей."""
+        self._recordings.discard(task)
+        self._recording_keys.discard(key)
+
+    async def _record(
+        self, request: MockRequest, status_code: int, headers: list[tuple[bytes, bytes]], body: bytes
+    ) -> None:
+        """Сохраняет ответ upstream-сервера как мок-данные.
+
+        JSON-объект сохраняется в теле мока, остальные тела — в хранилище тел ответов без изменений.
+        Query-параметры запроса становятся условиями `match` мока.
+        """
+        mock_headers: dict[str, str] = {}
+        for raw_name, raw_value in headers:
+            name, value = raw_name.decode("latin-1"), raw_value.decode("latin-1")
+            if name not in _NOT_RECORDED_HEADERS:
+                mock_headers[name] = f"{mock_headers[name]}, {value}" if name in mock_headers else value
+
+        data: dict[str, object] = {
+            "uri": request.path,
+            "method": request.method,
+            "status_code": status_code,
+            "headers": mock_headers or None,
+        }
+        if request.query:
+            data["match"] = {"query": request.query}
+        document = _json_object(body, mock_headers)
+        try:
+            if document is not None:
+                data["body"] = document
+            else:
+                content_type = mock_headers.pop("content-type", "application/octet-stream")
+                digest = await blob_store.put(body)
+                data["body_ref"] = {"digest": digest, "size": len(body), "content_type": content_type}
+            mock = await create_mock_data(MockData.model_validate(data))
+        except Exception:
+            logger.exception("Не удалось записать ответ upstream-сервера на %s %s", request.method, request.path)
+            return
+        logger.info("Записан ответ upstream-сервера на %s %s: мок %s", request.method, request.path, mock.uuid)
+
+
+#: Глобальный прокси процесса.
+mock_proxy = MockProxy()
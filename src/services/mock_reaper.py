@@ -0,0 +1,218 @@
+"""Модуль удаления моков с истекшим сроком жизни.
+
+Мок со временем истечения `expires_at` (или временем жизни `ttl_seconds`) перестает отвечать
+и удаляется в момент истечения, мок с ограничением `max_hits` — после последнего разрешенного ответа.
+
+MockReaper получает от таблицы маршрутов все добавленные в нее мок-данные и хранит время
+истечения моков в двоичной куче: добавление и извлечение ближайшего истекающего мока выполняются
+за O(log n), поэтому фоновая задача спит ровно до ближайшего истечения и не перебирает моки.
+Записи кучи не удаляются при изменении мока: устаревшая запись распознается по несовпадению
+с актуальным временем истечения и пропускается, а когда устаревших записей становится больше
+актуальных, куча перестраивается.
+
+Истекший мок сразу удаляется из таблицы маршрутов воркера, а из хранилища — пакетами
+по MOCK_REAPER_BATCH_SIZE. Каждый воркер удаляет истекшие моки своей таблицы маршрутов сам;
+удаление уже удаленных другим воркером мок-данных ничего не делает.
+"""
+
+import asyncio
+import contextlib
+import heapq
+import logging
+import time
+from collections.abc import Callable
+from datetime import datetime
+from itertools import islice
+from uuid import UUID
+
+from src.api.models.mock_model import MockModelWithDate
+from src.metrics import metrics
+from src.services.mock_route_table import MockRouteTable, route_table
+from src.services.mock_sequence import mock_hit_counters
+from src.services.mock_service import delete_mock_data_batch, get_mock_expirations
+from src.settings import config
+
+logger = logging.getLogger(__name__)
+
+_EXPIRED = metrics.counter("mock_expired_total")
+
+
+class MockReaper:
+    """Фоновое удаление моков с истекшим временем жизни или исчерпанным количеством ответов.
+
+    Атрибуты:
+        batch_size (int): Максимальное количество мок-данных в одном удалении из хранилища.
+        interval (float): Максимальный интервал между проверками в секундах.
+        expired (int): Количество мок-данных, удаленных воркером из хранилища.
+
+    Пример:
+        Запуск и остановка удаления::
+
+            await mock_reaper.start()
+            ...
+            await mock_reaper.stop()
+    """
+
+    def __init__(
+        self, table: MockRouteTable, batch_size: int, interval: float, clock: Callable[[], float] = time.time
+    ) -> None:
+        """Создает остановленный объект удаления и подписывает его на мок-данные таблицы маршрутов.
+
+        Args:
+            table (MockRouteTable): Таблица маршрутов, из которой удаляются истекшие моки.
+            batch_size (int): Максимальное количество мок-данных в одном удалении из хранилища.
+            interval (float): Максимальный интервал между проверками в секундах.
+            clock (Callable[[], float]): Источник времени в секундах от начала эпохи.
+        """
+        self.batch_size = batch_size
+        self.interval = interval
+        self.expired = 0
+        self._table = table
+        self._clock = clock
+        self._heap: list[tuple[float, UUID]] = []
+        self._deadlines: dict[UUID, float] = {}
+        self._pending: dict[UUID, None] = {}
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task[None] | None = None
+        table.watch(self.schedule)
+
+    def __len__(self) -> int:
+        """Возвращает количество ожидающих истечения мок-данных."""
+        return len(self._deadlines)
+
+    async def start(self) -> None:
+        """Запускает фоновое удаление истекших моков."""
+        await self.stop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(self._wakeup))
+
+    async def stop(self) -> None:
+        """Останавливает фоновое удаление истекших моков."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        self._wakeup = None
+
+    def schedule(self, mock: MockModelWithDate) -> None:
+        """Запоминает время истечения добавленных в таблицу маршрутов мок-данных.
+
+        Args:
+            mock (MockModelWithDate): Мок-данные.
+        """
+        if mock.expires_at is None:
+            self._deadlines.pop(mock.uuid, None)
+            return
+        self._push(mock.uuid, mock.expires_at)
+
+    def _push(self, uuid: UUID, expires_at: datetime) -> None:
+        """Добавляет время истечения в кучу и будит фоновую задачу, если оно стало ближайшим."""
+        deadline = expires_at.timestamp()
+        if self._deadlines.get(uuid) == deadline:
+            return
+        self._deadlines[uuid] = deadline
+        if len(self._heap) > 2 * len(self._deadlines):
+            self._heap = [(value, key) for key, value in self._deadlines.items()]
+            heapq.heapify(self._heap)
+        else:
+            heapq.heappush(self._heap, (deadline, uuid))
+        if self._wakeup is not None and self._heap[0] == (deadline, uuid):
+            self._wakeup.set()
+
+    def available(self, mock: MockModelWithDate) -> bool:
+        """Проверяет, может ли мок с ограничением количества ответов ответить на запрос.
+
+        Мок, ответы которого уже исчерпаны, сразу удаляется из таблицы маршрутов.
+
+        Args:
+            mock (MockModelWithDate): Мок-данные.
+
+        Returns:
+            bool: True, если ответы мока не ограничены или еще не исчерпаны.
+        """
+        if mock.max_hits is None:
+            return True
+        if mock_hit_counters.position(mock.uuid) < mock.max_hits:
+            return True
+        self.expire(mock.uuid)
+        return False
+
+    def consume(self, mock: MockModelWithDate) -> None:
+        """Учитывает отправленный ответ мока с ограничением количества ответов.
+
+        Вызывается только после отправки ответа мока, поэтому запросы, завершившиеся ошибкой
+        (например, 405 или 404), ответы не расходуют. Счетчик ответов общий для воркеров, если открыт
+        общий файл счетчиков. Мок, ответ которого был последним разрешенным, сразу удаляется
+        из таблицы маршрутов; запросы, уже начавшие обработку, еще получают его ответ.
+
+        Args:
+            mock (MockModelWithDate): Мок-данные.
+        """
+        if mock.max_hits is None:
+            return
+        if mock_hit_counters.advance(mock.uuid) + 1 >= mock.max_hits:
+            self.expire(mock.uuid)
+
+    def expire(self, uuid: UUID) -> None:
+        """Удаляет мок-данные из таблицы маршрутов и ставит их в очередь на удаление из хранилища.
+
+        Args:
+            uuid (UUID): UUID мок-данных.
+        """
+        self._deadlines.pop(uuid, None)
+        self._table.remove(uuid)
+        self._pending[uuid] = None
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def reap(self) -> int:
+        """Удаляет истекшие мок-данные и мок-данные, ожидающие удаления.
+
+        Returns:
+            int: Количество мок-данных, удаленных из хранилища.
+        """
+        now = self._clock()
+        while self._heap and self._heap[0][0] <= now:
+            deadline, uuid = heapq.heappop(self._heap)
+            if self._deadlines.get(uuid) == deadline:
+                self.expire(uuid)
+
+        deleted = 0
+        while self._pending:
+            batch = list(islice(self._pending, self.batch_size))
+            removed = await delete_mock_data_batch(batch)
+            for uuid in batch:
+                self._pending.pop(uuid, None)
+            deleted += len(removed)
+        if deleted:
+            self.expired += deleted
+            _EXPIRED.inc(deleted)
+            logger.info("Удалено истекших моков: %s", deleted)
+        return deleted
+
+    def _timeout(self) -> float:
+        """Возвращает время до ближайшего истечения, но не больше интервала проверок."""
+        if self._pending or not self._heap:
+            return self.interval
+        return min(max(self._heap[0][0] - self._clock(), 0.0), self.interval)
+
+    async def _run(self, wakeup: asyncio.Event) -> None:
+        """Удаляет истекшие моки при каждом истечении до отмены задачи."""
+        try:
+            for uuid, expires_at in await get_mock_expirations():
+                self._push(uuid, expires_at)
+        except Exception:
+            logger.exception("Не удалось прочитать время истечения мок-данных")
+        while True:
+            try:
+                await self.reap()
+            except Exception:
+                logger.exception("Не удалось удалить истекшие мок-данные")
+            wakeup.clear()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(wakeup.wait(), self._timeout())
+
+
+#: Глобальный объект удаления истекших моков процесса.
+mock_reaper = MockReaper(route_table, config.MOCK_REAPER_BATCH_SIZE, config.MOCK_REAPER_INTERVAL)
@@ -0,0 +1,126 @@
+"""Модуль ленивого представления входящего запроса для сопоставления с моками.
+
+Предоставляет класс MockRequest, который разбирает query-параметры, заголовки и тело
+запроса из ASGI `scope` только при первом обращении. Тело запроса читается, только если
+оно действительно нужно одному из условий мока, и может быть повторно передано приложению.
+"""
+
+import json
+from urllib.parse import parse_qsl
+
+from starlette.types import Message, Receive, Scope
+
+MISSING = object()
+"""Маркер отсутствующего значения в запросе."""
+
+
+class MockRequest:
+    """Ленивое представление входящего HTTP-запроса.
+
+    Attributes:
+        scope (Scope): ASGI scope запроса.
+        method (str): HTTP-метод запроса.
+        path (str): Путь запроса.
+    """
+
+    __slots__ = ("scope", "method", "path", "_receive", "_query", "_headers", "_body", "_json")
+
+    def __init__(self, scope: Scope, receive: Receive) -> None:
+        """Создает представление запроса.
+
+        Args:
+            scope (Scope): ASGI scope запроса.
+            receive (Receive): Канал получения сообщений ASGI.
+        """
+        self.scope = scope
+        self.method: str = scope["method"]
+        self.path: str = scope["path"]
+        self._receive = receive
+        self._query: dict[str, str] | None = None
+        self._headers: dict[str, str] | None = None
+        self._body: bytes | None = None
+        self._json: object = MISSING
+
+    @property
+    def query(self) -> dict[str, str]:
+        """Query-параметры запроса. При повторении параметра используется первое значение."""
+        if self._query is None:
+            query: dict[str, str] = {}
+            for key, value in parse_qsl(self.scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True):
+                query.setdefault(key, value)
+            self._query = query
+        return self._query
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """Заголовки запроса с именами в нижнем регистре."""
+        if self._headers is None:
+            self._headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in self.scope["headers"]}
+        return self._headers
+
+    @property
+    def body_consumed(self) -> bool:
+        """Было ли прочитано тело запроса."""
+        return self._body is not None
+
+    async def body(self) -> bytes:
+        """Читает и кеширует тело запроса.
+
+        Returns:
+            bytes: Тело запроса.
+        """
+        if self._body is None:
+            message = await self._receive()
+            if message["type"] != "http.request":
+                self._body = b""
+            elif not message.get("more_body", False):
+                # Обычно тело приходит одним сообщением, и байты сообщения используются без копирования.
+                body: bytes = message.get("body", b"")
+                self._body = body
+            else:
+                chunks = [message.get("body", b"")]
+                more_body = True
+                while more_body:
+                    message = await self._receive()
+                    if message["type"] != "http.request":
+                        break
+                    chunks.append(message.get("body", b""))
+                    more_body = message.get("more_body", False)
+                self._body = b"".join(chunks)
+        return self._body
+
+    async def json(self) -> object:
+        """Разбирает тело запроса как JSON.
+
+        Returns:
+            object: Разобранное тело, либо MISSING, если тело пустое или не является JSON.
+        """
+        if self._json is MISSING:
+            body = await self.body()
+            try:
+                self._json = json.loads(body) if body else MISSING
+            except ValueError:
+                self._json = MISSING
+        return self._json
+
+    @property
+    def receive(self) -> Receive:
+        """Канал получения сообщений для передачи запроса дальше по цепочке.
+
+        Если тело уже прочитано, первым сообщением повторно отдается прочитанное тело.
+        """
+        if self._body is None:
+            return self._receive
+
+        body = self._body
+        receive = self._receive
+        replayed = False
+
+        async def replay() -> Message:
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return replay
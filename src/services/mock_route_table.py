@@ -0,0 +1,456 @@
+"""Модуль in-memory таблицы маршрутов мок-данных.
+
+Предоставляет класс MockRouteTable, который хранит актуальные мок-данные в памяти процесса
+вместе с предварительно собранными ответами и позволяет находить их по UUID или по паре
+(HTTP-метод, URI) без обращения к базе данных.
+"""
+
+from bisect import insort
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, replace
+from itertools import accumulate
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from src.api.models.mock_model import MockModelWithDate
+from src.services.compiled_response import CompiledMockResponse, add_validators, compile_mock_response
+from src.services.mock_matcher import MockMatcher
+from src.services.mock_request import MockRequest
+from src.services.mock_sequence import SequencePlan, sequence_cursors
+from src.services.response_compression import add_variants, response_codecs
+from src.services.response_profile import LatencySampler, StreamPlan, compile_latency, compile_stream
+from src.services.response_template import ResponseTemplate, compile_response_template
+from src.services.route_trie import RouteTemplate, RouteTrie, is_route_template
+from src.settings import config
+
+if TYPE_CHECKING:
+    from src.services.mock_snapshot import MockSnapshot
+
+RouteListener = Callable[[tuple[str, str] | None], None]
+"""Обработчик изменения маршрута (метод, URI) таблицы; None означает изменение всей таблицы."""
+
+MockListener = Callable[[MockModelWithDate], None]
+"""Обработчик мок-данных, добавленных в индексы таблицы."""
+
+
+@dataclass(frozen=True, slots=True)
+class MockRouteEntry:
+    """Запись таблицы маршрутов.
+
+    Attributes:
+        mock (MockModelWithDate): Мок-данные.
+        response (CompiledMockResponse): Предварительно собранный ответ мока.
+        template (RouteTemplate | None): Скомпилированный шаблон URI, если URI мока содержит параметры или wildcard.
+        metric_labels (tuple[tuple[str, str], ...]): Метки мока в метриках, вычисленные один раз при добавлении.
+        latency (LatencySampler | None): Функция выбора задержки ответа по профилю задержки мока.
+        stream (StreamPlan | None): План потоковой отдачи тела ответа.
+        response_template (ResponseTemplate | None): Скомпилированный шаблон ответа, если ответ шаблонизирован.
+        sequence (SequencePlan | None): Скомпилированный сценарий, если мок отвечает последовательностью ответов.
+    """
+
+    mock: MockModelWithDate
+    response: CompiledMockResponse
+    template: RouteTemplate | None = None
+    metric_labels: tuple[tuple[str, str], ...] = ()
+    latency: LatencySampler | None = None
+    stream: StreamPlan | None = None
+    response_template: ResponseTemplate | None = None
+    sequence: SequencePlan | None = None
+
+    def match_path(self, path: str) -> dict[str, str] | None:
+        """Проверяет, соответствует ли путь запроса URI мока.
+
+        Args:
+            path (str): Путь запроса.
+
+        Returns:
+            dict[str, str] | None: Параметры пути, либо None, если путь не соответствует URI мока.
+        """
+        if self.template is not None:
+            return self.template.match(path)
+        return {} if path == self.mock.uri else None
+
+    def next_step(self) -> "MockRouteEntry":
+        """Возвращает запись, отвечающую на текущий запрос.
+
+        Для мока со сценарием продвигает позицию сценария и возвращает запись очередного шага,
+        для остальных моков возвращает саму запись.
+
+        Returns:
+            MockRouteEntry: Запись с ответом на запрос.
+        """
+        if self.sequence is None:
+            return self
+        return self.sequence.step(sequence_cursors.advance(self.mock.uuid))
+
+
+def _compile_entry(mock: MockModelWithDate, template: RouteTemplate | None) -> MockRouteEntry:
+    """Собирает запись таблицы маршрутов с ответом мока без учета сценария."""
+    response = compile_mock_response(mock)
+    if mock.template is None:
+        response = add_variants(add_validators(response, mock), response_codecs, config.COMPRESSION_MIN_SIZE)
+    return MockRouteEntry(
+        mock=mock,
+        response=response,
+        template=template,
+        metric_labels=(("uuid", str(mock.uuid)),),
+        latency=compile_latency(mock.latency) if mock.latency else None,
+        stream=compile_stream(mock.stream) if mock.stream else None,
+        response_template=compile_response_template(mock, response) if mock.template else None,
+    )
+
+
+def _compile_sequence(mock: MockModelWithDate, template: RouteTemplate | None) -> SequencePlan | None:
+    """Собирает записи шагов сценария мока: поля шага заменяют соответствующие поля мока."""
+    if mock.sequence is None:
+        return None
+    steps = []
+    for step in mock.sequence.steps:
+        update: dict[str, object] = {"sequence": None}
+        for field in ("status_code", "headers", "body", "delay"):
+            value = getattr(step, field)
+            if value is not None:
+                update[field] = value
+        if step.body is not None:
+            update["body_ref"] = None
+        steps.append(_compile_entry(mock.model_copy(update=update), template))
+    return SequencePlan(
+        mode=mock.sequence.mode,
+        steps=tuple(steps),
+        ends=tuple(accumulate(step.repeat for step in mock.sequence.steps)),
+    )
+
+
+class MockRouteTable:
+    """In-memory таблица маршрутов мок-данных.
+
+    Хранит два индекса: по UUID и по паре (метод, URI). Для каждого маршрута хранится список
+    записей в порядке создания, последний элемент списка является актуальным ответом.
+    Ответ мока собирается один раз при добавлении в таблицу вместе со сжатыми вариантами тела.
+
+    URI с параметрами (`/users/{id}`) и wildcard (`/files/*`) дополнительно индексируются
+    в посегментном дереве своего HTTP-метода. Точное совпадение пути всегда имеет наивысший приоритет.
+
+    Для моков со сценарием дополнительно собираются ответы всех шагов сценария.
+
+    Для маршрутов, у которых есть моки с условиями `match`, строится MockMatcher,
+    выбирающий мок по query-параметрам, заголовкам и телу запроса.
+
+    Таблица может быть загружена из снимка мок-данных (`load_snapshot`): маршруты снимка
+    переносятся в индексы при первом обращении к ним, маршруты с шаблонами URI — сразу.
+
+    Обработчики, подписанные через `subscribe`, получают маршрут каждого добавленного
+    или удаленного мока, а при замене всего содержимого таблицы — None. Обработчики,
+    подписанные через `watch`, получают мок-данные, добавленные в индексы таблицы.
+
+    Атрибуты:
+        version (int): Номер версии содержимого, увеличивается при каждом изменении таблицы.
+        _by_uuid (dict[UUID, MockRouteEntry]): Индекс записей по UUID.
+        _by_route (dict[tuple[str, str], list[MockRouteEntry]]): Индекс записей по (метод, URI).
+        _tries (dict[str, RouteTrie]): Деревья шаблонов URI по HTTP-методам.
+        _matchers (dict[tuple[str, str], MockMatcher]): Индексы условий маршрутов с условными моками.
+        _snapshot (MockSnapshot | None): Снимок, маршруты которого еще не перенесены в индексы.
+        _faulted (set[tuple[str, str]]): Маршруты снимка, перенесенные в индексы.
+        _snapshot_pending (int): Количество мок-данных снимка, не перенесенных в индексы.
+        _listeners (list[RouteListener]): Обработчики изменений маршрутов.
+        _watchers (list[MockListener]): Обработчики добавленных мок-данных.
+
+    Пример:
+        Поиск мока по маршруту::
+
+            entry = route_table.get_last_by_route("GET", "/api/v1/users")
+    """
+
+    def __init__(self) -> None:
+        """Создает пустую таблицу маршрутов."""
+        self._by_uuid: dict[UUID, MockRouteEntry] = {}
+        self._by_route: dict[tuple[str, str], list[MockRouteEntry]] = {}
+        self._tries: dict[str, RouteTrie] = {}
+        self._matchers: dict[tuple[str, str], MockMatcher] = {}
+        self._snapshot: MockSnapshot | None = None
+        self._faulted: set[tuple[str, str]] = set()
+        self._snapshot_pending = 0
+        self._listeners: list[RouteListener] = []
+        self._watchers: list[MockListener] = []
+        self.version = 0
+
+    def subscribe(self, listener: RouteListener) -> None:
+        """Подписывает обработчик на изменения маршрутов таблицы.
+
+        Args:
+            listener (RouteListener): Обработчик, получающий маршрут (метод, URI) измененного мока,
+                либо None при замене всего содержимого таблицы.
+        """
+        self._listeners.append(listener)
+
+    def watch(self, listener: MockListener) -> None:
+        """Подписывает обработчик на мок-данные, добавленные в индексы таблицы.
+
+        Обработчик вызывается для новых и измененных мок-данных, в том числе при загрузке
+        таблицы и переносе маршрутов из снимка.
+
+        Args:
+            listener (MockListener): Обработчик, получающий добавленные мок-данные.
+        """
+        self._watchers.append(listener)
+
+    def _notify(self, key: tuple[str, str] | None) -> None:
+        """Сообщает обработчикам об изменении маршрута."""
+        for listener in self._listeners:
+            listener(key)
+
+    def load(self, mocks: Iterable[MockModelWithDate]) -> None:
+        """Полностью заменяет содержимое таблицы.
+
+        Args:
+            mocks (Iterable[MockModelWithDate]): Мок-данные, упорядоченные по дате создания.
+        """
+        self.clear()
+        for mock in mocks:
+            self._add(mock)
+        for key in self._by_route:
+            self._rebuild_matcher(key)
+
+    def load_snapshot(self, snapshot: "MockSnapshot") -> None:
+        """Полностью заменяет содержимое таблицы мок-данными снимка без их декодирования.
+
+        Args:
+            snapshot (MockSnapshot): Снимок мок-данных.
+        """
+        self.clear()
+        self._snapshot = snapshot
+        self._snapshot_pending = len(snapshot)
+        for key in snapshot.template_routes():
+            self._fault_in(key)
+
+    def _fault_in(self, key: tuple[str, str]) -> None:
+        """Переносит мок-данные маршрута из снимка в индексы, если они еще не перенесены."""
+        if self._snapshot is None or key in self._faulted:
+            return
+        mocks = self._snapshot.route(*key)
+        if not mocks:
+            return
+        self._faulted.add(key)
+        self._snapshot_pending -= len(mocks)
+        for mock in mocks:
+            self._add(mock)
+        self._rebuild_matcher(key)
+
+    def _route_entries(self, key: tuple[str, str]) -> list[MockRouteEntry] | None:
+        """Возвращает записи маршрута, при необходимости перенося их из снимка."""
+        entries = self._by_route.get(key)
+        if entries is None and self._snapshot is not None:
+            self._fault_in(key)
+            entries = self._by_route.get(key)
+        return entries
+
+    def add(self, mock: MockModelWithDate) -> None:
+        """Добавляет мок-данные в таблицу маршрутов.
+
+        Записи маршрута упорядочиваются по дате создания, при равных датах новая запись
+        считается более поздней. Повторное добавление неизмененных мок-данных ничего не делает.
+
+        Args:
+            mock (MockModelWithDate): Добавляемые мок-данные.
+        """
+        if self._snapshot is not None:
+            self.get_by_uuid(mock.uuid)
+            self._fault_in((mock.method, mock.uri))
+        if self._add(mock):
+            self._rebuild_matcher((mock.method, mock.uri))
+            self.version += 1
+            self._notify((mock.method, mock.uri))
+
+    def _add(self, mock: MockModelWithDate) -> bool:
+        """Добавляет мок-данные в индексы без перестроения индекса условий.
+
+        Returns:
+            bool: True, если таблица изменилась, иначе False.
+        """
+        existing = self._by_uuid.get(mock.uuid)
+        if existing is not None:
+            if existing.mock == mock:
+                return False
+            self.remove(mock.uuid)
+        template = RouteTemplate.compile(mock.uri) if is_route_template(mock.uri) else None
+        entry = _compile_entry(mock, template)
+        if mock.sequence is not None:
+            entry = replace(entry, sequence=_compile_sequence(mock, template))
+        self._by_uuid[mock.uuid] = entry
+        entries = self._by_route.setdefault((mock.method, mock.uri), [])
+        if not entries and template is not None:
+            self._tries.setdefault(mock.method, RouteTrie()).insert(template)
+        insort(entries, entry, key=lambda item: item.mock.created_at)
+        for watcher in self._watchers:
+            watcher(mock)
+        return True
+
+    def _rebuild_matcher(self, key: tuple[str, str]) -> None:
+        """Перестраивает индекс условий маршрута после изменения его записей."""
+        entries = self._by_route.get(key)
+        if entries and any(entry.mock.match is not None for entry in entries):
+            self._matchers[key] = MockMatcher(entries)
+        else:
+            self._matchers.pop(key, None)
+
+    def remove(self, uuid: UUID) -> bool:
+        """Удаляет мок-данные из таблицы по UUID.
+
+        Args:
+            uuid (UUID): UUID удаляемых мок-данных.
+
+        Returns:
+            bool: True, если мок-данные были в таблице, иначе False.
+        """
+        if self.get_by_uuid(uuid) is None:
+            return False
+        entry = self._by_uuid.pop(uuid)
+
+        key = (entry.mock.method, entry.mock.uri)
+        entries = [item for item in self._by_route.get(key, []) if item.mock.uuid != uuid]
+        if entries:
+            self._by_route[key] = entries
+        else:
+            self._by_route.pop(key, None)
+            if entry.template is not None:
+                self._tries[entry.mock.method].remove(entry.template)
+        self._rebuild_matcher(key)
+        self.version += 1
+        self._notify(key)
+        return True
+
+    def clear(self) -> None:
+        """Очищает таблицу маршрутов."""
+        self._by_uuid = {}
+        self._by_route = {}
+        self._tries = {}
+        self._matchers = {}
+        self._snapshot = None
+        self._faulted = set()
+        self._snapshot_pending = 0
+        self.version += 1
+        self._notify(None)
+
+    def get_by_uuid(self, uuid: UUID) -> MockRouteEntry | None:
+        """Возвращает запись таблицы по UUID мок-данных.
+
+        Args:
+            uuid (UUID): UUID мок-данных.
+
+        Returns:
+            MockRouteEntry | None: Запись таблицы, либо None, если не найдена.
+        """
+        entry = self._by_uuid.get(uuid)
+        if entry is None and self._snapshot is not None:
+            key = self._snapshot.route_of(uuid)
+            if key is not None:
+                self._fault_in(key)
+                entry = self._by_uuid.get(uuid)
+        return entry
+
+    def get_last_by_route(self, method: str, uri: str) -> MockRouteEntry | None:
+        """Возвращает запись последних созданных мок-данных для маршрута.
+
+        Args:
+            method (str): HTTP-метод.
+            uri (str): URI эндпоинта.
+
+        Returns:
+            MockRouteEntry | None: Запись таблицы, либо None, если не найдена.
+        """
+        entries = self._route_entries((method, uri))
+        return entries[-1] if entries else None
+
+    def match(self, method: str, path: str) -> tuple[MockRouteEntry, dict[str, str]] | None:
+        """Находит запись последних мок-данных, URI которых соответствует пути запроса.
+
+        Сначала проверяется точное совпадение URI, затем шаблоны URI в порядке приоритета:
+        статический сегмент > параметр > wildcard. Условия `match` не учитываются.
+
+        Args:
+            method (str): HTTP-метод.
+            path (str): Путь запроса.
+
+        Returns:
+            tuple[MockRouteEntry, dict[str, str]] | None: Запись таблицы и параметры пути, либо None.
+        """
+        entries = self._route_entries((method, path))
+        if entries:
+            return entries[-1], {}
+
+        trie = self._tries.get(method)
+        if trie is None:
+            return None
+        candidates = [(self._by_route[(method, template.uri)][-1], params) for template, params in trie.match(path)]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda candidate: candidate[0].mock.created_at)
+
+    def candidates(self, method: str, path: str) -> list[MockRouteEntry]:
+        """Возвращает записи всех маршрутов, URI которых соответствует пути запроса.
+
+        Args:
+            method (str): HTTP-метод.
+            path (str): Путь запроса.
+
+        Returns:
+            list[MockRouteEntry]: Записи точного маршрута и маршрутов с подходящими шаблонами URI.
+        """
+        entries = list(self._route_entries((method, path)) or ())
+        trie = self._tries.get(method)
+        if trie is not None:
+            for template, _ in trie.match(path):
+                entries.extend(self._by_route[(method, template.uri)])
+        return entries
+
+    async def resolve(self, request: MockRequest) -> tuple[MockRouteEntry, dict[str, str]] | None:
+        """Находит запись мок-данных для запроса с учетом условий `match`.
+
+        Порядок поиска маршрутов совпадает с `match`. Внутри маршрута выбирается мок
+        с выполненными условиями (при нескольких подходящих — с большим числом условий,
+        затем последний созданный), иначе последний мок без условий. Если точный маршрут
+        не содержит подходящего мока, поиск продолжается по шаблонам URI. HEAD-запрос
+        без HEAD-мока обслуживается GET-моком того же пути.
+
+        Args:
+            request (MockRequest): Входящий запрос.
+
+        Returns:
+            tuple[MockRouteEntry, dict[str, str]] | None: Запись таблицы и параметры пути, либо None.
+        """
+        matched = await self._resolve(request, request.method)
+        if matched is None and request.method == "HEAD":
+            matched = await self._resolve(request, "GET")
+        return matched
+
+    async def _resolve(self, request: MockRequest, method: str) -> tuple[MockRouteEntry, dict[str, str]] | None:
+        """Находит запись мок-данных маршрутов метода для запроса."""
+        entry = await self._select((method, request.path), request)
+        if entry is not None:
+            return entry, {}
+
+        trie = self._tries.get(method)
+        if trie is None:
+            return None
+        best: tuple[MockRouteEntry, dict[str, str]] | None = None
+        for template, params in trie.match(request.path):
+            entry = await self._select((method, template.uri), request)
+            if entry is not None and (best is None or entry.mock.created_at > best[0].mock.created_at):
+                best = entry, params
+        return best
+
+    async def _select(self, key: tuple[str, str], request: MockRequest) -> MockRouteEntry | None:
+        """Выбирает запись маршрута для запроса."""
+        entries = self._route_entries(key)
+        if not entries:
+            return None
+        matcher = self._matchers.get(key)
+        return entries[-1] if matcher is None else await matcher.resolve(request)
+
+    def __len__(self) -> int:
+        """Возвращает количество мок-данных в таблице."""
+        return len(self._by_uuid) + self._snapshot_pending
+
+
+#: Глобальная таблица маршрутов мок-данных процесса.
+route_table = MockRouteTable()
@@ -0,0 +1,274 @@
+"""Модуль сценариев моков.
+
+Сценарий мока — упорядоченная последовательность ответов: каждый запрос к моку получает
+ответ очередного шага. Позиция сценария (количество запросов, обработанных мок-данными)
+хранится в SequenceCursors: в памяти процесса, либо, при нескольких воркерах, в общем файле,
+отображенном в память. Изменения позиций в файле выполняются под блокировкой файла, поэтому
+воркеры продвигают общую позицию сценария атомарно и без пропусков.
+
+Так же, отдельным экземпляром SequenceCursors, считаются ответы моков с ограничением
+количества ответов `max_hits`.
+"""
+
+import fcntl
+import logging
+import mmap
+import os
+import struct
+from bisect import bisect_right
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from src.services.mock_route_table import MockRouteEntry
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"MRSSEQ01"
+_HEADER = struct.Struct("<8sI4x")
+_SLOT = struct.Struct("<16sQ")
+_EMPTY_KEY = bytes(16)
+
+DEFAULT_CURSOR_CAPACITY = 65536
+"""Количество позиций сценариев в общем файле (24 байта на позицию)."""
+
+
+@dataclass(frozen=True, slots=True)
+class SequencePlan:
+    """Скомпилированный сценарий мока.
+
+    Attributes:
+        mode (Literal["stick", "cycle"]): Поведение после последнего шага.
+        steps (tuple[MockRouteEntry, ...]): Записи таблицы маршрутов с собранными ответами шагов.
+        ends (tuple[int, ...]): Позиция, следующая за последним запросом каждого шага, с учетом повторов.
+    """
+
+    mode: Literal["stick", "cycle"]
+    steps: tuple["MockRouteEntry", ...]
+    ends: tuple[int, ...]
+
+    def step(self, position: int) -> "MockRouteEntry":
+        """Возвращает шаг сценария для позиции.
+
+        Args:
+            position (int): Количество запросов, обработанных сценарием до текущего.
+
+        Returns:
+            MockRouteEntry: Запись шага.
+        """
+        total = self.ends[-1]
+        position = position % total if self.mode == "cycle" else min(position, total - 1)
+        return self.steps[bisect_right(self.ends, position)]
+
+
+class SharedCursorFile:
+    """Позиции сценариев в файле, общем для нескольких процессов.
+
+    Файл состоит из заголовка и таблицы с открытой адресацией: слот хранит UUID мок-данных
+    и позицию сценария. Слот, занятый UUID, не освобождается, поэтому смещение слота кэшируется
+    процессом после первого поиска. Чтение и изменение позиции выполняются под блокировкой
+    `fcntl.lockf`.
+
+    Атрибуты:
+        path (Path): Путь к файлу.
+        capacity (int): Количество слотов.
+    """
+
+    def __init__(self, path: str | Path, capacity: int = DEFAULT_CURSOR_CAPACITY) -> None:
+        """Открывает файл позиций, создавая его при необходимости.
+
+        Args:
+            path (str | Path): Путь к файлу.
+            capacity (int): Количество слотов нового файла; для существующего файла берется из заголовка.
+
+        Raises:
+            ValueError: Если файл существует, но не является файлом позиций сценариев.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            with self._lock():
+                if os.fstat(self._fd).st_size == 0:
+                    os.ftruncate(self._fd, _HEADER.size + capacity * _SLOT.size)
+                    os.pwrite(self._fd, _HEADER.pack(_MAGIC, capacity), 0)
+                magic, stored_capacity = _HEADER.unpack(os.pread(self._fd, _HEADER.size, 0))
+            self.capacity: int = stored_capacity
+            if magic != _MAGIC or os.fstat(self._fd).st_size != _HEADER.size + self.capacity * _SLOT.size:
+                raise ValueError(f"Файл {self.path} не является файлом позиций сценариев")
+            self._map = mmap.mmap(self._fd, 0)
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self._offsets: dict[UUID, int] = {}
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        """Захватывает исключительную блокировку файла."""
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    def _offset(self, uuid: UUID, create: bool) -> int | None:
+        """Находит смещение слота UUID, при create занимая свободный слот. Вызывается под блокировкой."""
+        offset = self._offsets.get(uuid)
+        if offset is not None:
+            return offset
+        key = uuid.bytes
+        start = uuid.int % self.capacity
+        for probe in range(self.capacity):
+            offset = _HEADER.size + (start + probe) % self.capacity * _SLOT.size
+            slot_key = self._map[offset : offset + 16]
+            if slot_key == key:
+                self._offsets[uuid] = offset
+                return offset
+            if slot_key == _EMPTY_KEY:
+                if not create:
+                    return None
+                _SLOT.pack_into(self._map, offset, key, 0)
+                self._offsets[uuid] = offset
+                return offset
+        return None
+
+    def advance(self, uuid: UUID) -> int | None:
+        """Увеличивает позицию сценария на единицу.
+
+        Args:
+            uuid (UUID): UUID мок-данных.
+
+        Returns:
+            int | None: Позиция до увеличения, либо None, если в файле нет свободных слотов.
+        """
+        with self._lock():
+            offset = self._offset(uuid, create=True)
+            if offset is None:
+                return None
+            position: int = _SLOT.unpack_from(self._map, offset)[1]
+            _SLOT.pack_into(self._map, offset, uuid.bytes, position + 1)
+        return position
+
+    def position(self, uuid: UUID) -> int:
+        """Возвращает позицию сценария.
+
+        Args:
+            uuid (UUID): UUID мок-данных.
+
+        Returns:
+            int: Количество запросов, обработанных сценарием.
+        """
+        with self._lock():
+            offset = self._offset(uuid, create=False)
+            return 0 if offset is None else int(_SLOT.unpack_from(self._map, offset)[1])
+
+    def reset(self, uuid: UUID | None = None) -> None:
+        """Сбрасывает позицию сценария мок-данных или позиции всех сценариев.
+
+        Args:
+            uuid (UUID | None): UUID мок-данных; если не указан, сбрасываются все позиции.
+        """
+        with self._lock():
+            if uuid is not None:
+                offset = self._offset(uuid, create=False)
+                if offset is not None:
+                    _SLOT.pack_into(self._map, offset, uuid.bytes, 0)
+                return
+            for offset in range(_HEADER.size, len(self._map), _SLOT.size):
+                if self._map[offset : offset + 16] != _EMPTY_KEY:
+                    self._map[offset + 16 : offset + _SLOT.size] = bytes(8)
+
+    def close(self) -> None:
+        """Закрывает файл."""
+        self._map.close()
+        os.close(self._fd)
+
+
+class SequenceCursors:
+    """Позиции сценариев мок-данных.
+
+    По умолчанию позиции хранятся в памяти процесса: продвижение позиции не содержит точек
+    переключения event loop и поэтому атомарно для конкурентных запросов. После `open` позиции
+    хранятся в общем файле и согласованы между воркерами.
+
+    Пример:
+        Выбор шага сценария для запроса::
+
+            entry = plan.step(sequence_cursors.advance(entry.mock.uuid))
+    """
+
+    def __init__(self) -> None:
+        """Создает позиции в памяти процесса."""
+        self._local: dict[UUID, int] = {}
+        self._shared: SharedCursorFile | None = None
+
+    def open(self, path: str | Path) -> None:
+        """Переносит хранение позиций в общий файл.
+
+        Args:
+            path (str | Path): Путь к файлу позиций.
+        """
+        self.close()
+        self._shared = SharedCursorFile(path)
+
+    def close(self) -> None:
+        """Закрывает общий файл и возвращает хранение позиций в память процесса."""
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+        self._local.clear()
+
+    def advance(self, uuid: UUID) -> int:
+        """Возвращает позицию сценария и увеличивает ее на единицу.
+
+        Args:
+            uuid (UUID): UUID мок-данных.
+
+        Returns:
+            int: Позиция до увеличения.
+        """
+        if self._shared is not None and uuid not in self._local:
+            position = self._shared.advance(uuid)
+            if position is not None:
+                return position
+            logger.warning("Файл позиций сценариев заполнен, позиция %s хранится в памяти воркера", uuid)
+        position = self._local.get(uuid, 0)
+        self._local[uuid] = position + 1
+        return position
+
+    def position(self, uuid: UUID) -> int:
+        """Возвращает позицию сценария.
+
+        Args:
+            uuid (UUID): UUID мок-данных.
+
+        Returns:
+            int: Количество запросов, обработанных сценарием.
+        """
+        if self._shared is not None and uuid not in self._local:
+            return self._shared.position(uuid)
+        return self._local.get(uuid, 0)
+
+    def reset(self, uuid: UUID | None = None) -> None:
+        """Сбрасывает позицию сценария мок-данных или позиции всех сценариев.
+
+        Args:
+            uuid (UUID | None): UUID мок-данных; если не указан, сбрасываются все позиции.
+        """
+        if uuid is None:
+            self._local.clear()
+        else:
+            self._local.pop(uuid, None)
+        if self._shared is not None:
+            self._shared.reset(uuid)
+
+
+#: Глобальные позиции сценариев процесса.
+sequence_cursors = SequenceCursors()
+
+#: Глобальные счетчики ответов моков с ограничением количества ответов.
+mock_hit_counters = SequenceCursors()
@@ -1,116 +1,497 @@
-from uuid import UUID, uuid4
+import asyncio
+import base64
+import binascii
+import json
+from collections.abc import AsyncGenerator, Collection
+from datetime import datetime
+from typing import Any
+from uuid import UUID
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import ValidationError
 
-from src.api.models.mock_model import MockData, MockModelWithDate
-from src.db import DBManager
-from src.db.models.mock_data import MockDbData
+from src.api.models.mock_model import MockBodyRef, MockData, MockModelWithDate
+from src.services.compiled_response import get_json_encoder
+from src.services.mock_route_table import route_table
+from src.services.mock_sequence import mock_hit_counters, sequence_cursors
+from src.services.mock_snapshot import mock_snapshot_store
+from src.settings import config
+from src.storage import MockStorage, blob_store, get_storage
 
 
-@DBManager.with_session
-async def get_all_mock_data(session: AsyncSession) -> list[MockModelWithDate] | None:
+class MockVersionConflictError(Exception):
+    """Версия мок-данных изменилась: мок-данные изменены другим запросом."""
+
+
+async def _ready_storage() -> MockStorage:
+    """Возвращает текущее хранилище после окончания его восстановления из снимка мок-данных."""
+    await mock_snapshot_store.wait_restored()
+    return get_storage()
+
+
+async def store_mock_body(mock_data: MockData) -> MockData:
     """
-    Получить все mock-данные из базы данных.
+    Подготовить тело ответа мока к сохранению.
+
+    JSON-тело, закодированное в больше чем BLOB_INLINE_LIMIT байт, переносится в хранилище тел ответов
+    и заменяется ссылкой body_ref, поэтому строки мок-данных остаются небольшими. Для ссылки
+    на тело проверяется наличие тела в хранилище и заполняется его размер.
 
     Args:
-        session (AsyncSession): Асинхронная сессия SQLAlchemy.
+        mock_data (MockData): Данные мока.
 
     Returns:
-        list[MockModelWithDate] | None: Список моделей mock-данных с датой, либо None, если данных нет.
+        MockData: Данные мока с телом, готовым к сохранению.
+
+    Raises:
+        ValueError: Если тело по ссылке body_ref не найдено в хранилище тел ответов.
+    """
+    if mock_data.body_ref is not None:
+        size = await asyncio.to_thread(blob_store.size, mock_data.body_ref.digest)
+        if size is None:
+            raise ValueError(f"Тело ответа {mock_data.body_ref.digest} не найдено в хранилище тел ответов")
+        body_ref = mock_data.body_ref.model_copy(update={"size": size})
+        return mock_data.model_copy(update={"body_ref": body_ref})
+
+    if mock_data.body and config.BLOB_INLINE_LIMIT:
+        body = get_json_encoder(config.JSON_ENCODER)(mock_data.body)
+        if len(body) > config.BLOB_INLINE_LIMIT:
+            digest = await blob_store.put(body)
+            body_ref = MockBodyRef(digest=digest, size=len(body), content_type="application/json")
+            return mock_data.model_copy(update={"body": None, "body_ref": body_ref})
+    return mock_data
+
+
+async def get_all_mock_data() -> list[MockModelWithDate] | None:
     """
-    res = await session.execute(select(MockDbData))
-    db_mocks_data = res.scalars().all()
+    Получить все mock-данные из хранилища.
 
-    return [MockModelWithDate.model_validate(mock) for mock in db_mocks_data] if db_mocks_data else None
+    Returns:
+        list[MockModelWithDate] | None: Список моделей mock-данных с датой, либо None, если данных нет.
+    """
+    storage = await _ready_storage()
+    return await storage.get_all_mock_data() or None
 
 
-@DBManager.with_session
-async def get_mock_data_by_uuid(session: AsyncSession, uuid: UUID) -> MockModelWithDate | None:
+async def get_mock_data_by_uuid(uuid: UUID) -> MockModelWithDate | None:
     """
     Получить mock-данные по UUID.
 
     Args:
-        session (AsyncSession): Асинхронная сессия SQLAlchemy.
         uuid (UUID): UUID mock-данных.
 
     Returns:
         MockModelWithDate | None: Модель mock-данных с датой, либо None, если не найдено.
     """
-    res = await session.execute(select(MockDbData).where(MockDbData.uuid == uuid))
-    db_mock_data = res.scalar_one_or_none()
-    return MockModelWithDate.model_validate(db_mock_data) if db_mock_data else None
+    storage = await _ready_storage()
+    return await storage.get_mock_data_by_uuid(uuid)
 
 
-@DBManager.with_session
-async def get_last_mock_data_by_uri_and_method(
-    session: AsyncSession, uri: str, method: str
-) -> MockModelWithDate | None:
+async def get_last_mock_data_by_uri_and_method(uri: str, method: str) -> MockModelWithDate | None:
     """
     Получить последние mock-данные по URI и методу.
 
     Args:
-        session (AsyncSession): Асинхронная сессия SQLAlchemy.
         uri (str): URI mock-данных.
         method (str): Метод mock-данных.
 
     Returns:
         MockModelWithDate | None: Модель mock-данных, либо None, если не найдено.
     """
-    res = await session.execute(
-        select(MockDbData)
-        .where(MockDbData.uri == uri)
-        .where(MockDbData.method == method)
-        .order_by(MockDbData.created_at.desc())
-    )
-    db_mock_data = res.scalar_one_or_none()
-    return MockModelWithDate.model_validate(db_mock_data) if db_mock_data else None
+    storage = await _ready_storage()
+    return await storage.get_last_mock_data_by_uri_and_method(uri, method)
+
 
+def _publish_mock(mock: MockModelWithDate) -> None:
+    """Подключает записанные мок-данные к таблице маршрутов; для новой версии сбрасывает сценарий и счетчик ответов."""
+    route_table.add(mock)
+    if mock.version > 1:
+        sequence_cursors.reset(mock.uuid)
+        mock_hit_counters.reset(mock.uuid)
 
-@DBManager.with_session
-async def create_mock_data(session: AsyncSession, mock_data: MockData) -> MockModelWithDate:
+
+async def create_mock_data(mock_data: MockData) -> MockModelWithDate:
     """
-    Создать новые mock-данные в базе данных.
+    Создать новые mock-данные в хранилище.
+
+    Маршрут с теми же условиями выбора match принадлежит одним мок-данным: если он занят,
+    хранилище изменяет существующие мок-данные как новую версию, сохраняя предыдущую в истории.
 
     Args:
-        session (AsyncSession): Асинхронная сессия SQLAlchemy.
         mock_data (MockData): Данные для создания mock-объекта.
 
     Returns:
-        MockModelWithDate: Созданная модель mock-данных с датой.
+        MockModelWithDate: Созданная или измененная модель mock-данных с датой.
+
+    Raises:
+        ValueError: Если тело по ссылке body_ref не найдено в хранилище тел ответов.
+    """
+    storage = await _ready_storage()
+    mock_data = await store_mock_body(mock_data)
+    mock = await storage.create_mock_data(mock_data, config.MOCK_HISTORY_LIMIT)
+    _publish_mock(mock)
+    return mock
+
+
+async def create_mock_data_batch(mocks_data: list[MockData]) -> list[MockModelWithDate]:
+    """
+    Создать или изменить несколько mock-данных атомарно.
+
+    Элементы применяются по порядку, как последовательные вызовы create_mock_data: элемент
+    для занятого маршрута, в том числе занятого предыдущим элементом пакета, изменяет его мок-данные.
+
+    Args:
+        mocks_data (list[MockData]): Данные для создания mock-объектов.
+
+    Returns:
+        list[MockModelWithDate]: Созданные или измененные модели mock-данных в порядке входных данных.
+
+    Raises:
+        ValueError: Если тело по ссылке body_ref не найдено в хранилище тел ответов.
+    """
+    mocks_data = [await store_mock_body(mock_data) for mock_data in mocks_data]
+    storage = await _ready_storage()
+    mocks = await storage.create_mock_data_batch(mocks_data, config.MOCK_HISTORY_LIMIT)
+    for mock in mocks:
+        _publish_mock(mock)
+    return mocks
+
+
+async def update_mock_data(uuid: UUID, mock_data: MockData, version: int | None = None) -> MockModelWithDate | None:
+    """
+    Изменить mock-данные на месте, увеличив их версию.
+
+    Предыдущая версия сохраняется в истории изменений (не больше MOCK_HISTORY_LIMIT версий на мок),
+    позиция сценария и счетчик ответов мока сбрасываются.
+
+    Args:
+        uuid (UUID): UUID mock-данных.
+        mock_data (MockData): Новые данные мока.
+        version (int | None): Ожидаемая текущая версия mock-данных; если не указана, не проверяется.
+
+    Returns:
+        MockModelWithDate | None: Измененные mock-данные, либо None, если mock-данные не найдены.
+
+    Raises:
+        MockVersionConflictError: Если текущая версия mock-данных не совпадает с ожидаемой.
+        MockRouteConflictError: Если новый маршрут с теми же условиями занят другими мок-данными.
+        ValueError: Если тело по ссылке body_ref не найдено в хранилище тел ответов.
+    """
+    storage = await _ready_storage()
+    mock_data = await store_mock_body(mock_data)
+    mock = await storage.update_mock_data(uuid, mock_data, version, config.MOCK_HISTORY_LIMIT)
+    if mock is None:
+        if version is not None and await storage.get_mock_data_by_uuid(uuid) is not None:
+            raise MockVersionConflictError(f"Версия мок-данных {uuid} не равна {version}")
+        return None
+    _publish_mock(mock)
+    return mock
+
+
+async def patch_mock_data(uuid: UUID, changes: dict[str, Any], version: int | None = None) -> MockModelWithDate | None:
+    """
+    Изменить отдельные поля mock-данных.
+
+    Поля из changes заменяют поля текущей версии, значение null очищает поле. Тело ответа
+    в body заменяет ссылку body_ref и наоборот, время жизни ttl_seconds заменяет время
+    истечения expires_at. Изменение применяется только к версии,
+    на основе которой оно собрано.
+
+    Args:
+        uuid (UUID): UUID mock-данных.
+        changes (dict[str, Any]): Изменяемые поля MockData.
+        version (int | None): Ожидаемая текущая версия mock-данных; если не указана, используется прочитанная.
+
+    Returns:
+        MockModelWithDate | None: Измененные mock-данные, либо None, если mock-данные не найдены.
+
+    Raises:
+        pydantic.ValidationError: Если changes содержит неизвестные поля или поля после изменения
+            не проходят проверку MockData.
+        MockVersionConflictError: Если mock-данные изменены после чтения или их версия не совпадает с ожидаемой.
+        MockRouteConflictError: Если новый маршрут с теми же условиями занят другими мок-данными.
+        ValueError: Если тело по ссылке body_ref не найдено в хранилище тел ответов.
+    """
+    unknown = [key for key in changes if key not in MockData.model_fields]
+    if unknown:
+        raise ValidationError.from_exception_data(
+            MockData.__name__,
+            [{"type": "extra_forbidden", "loc": (key,), "input": changes[key]} for key in unknown],
+        )
+    storage = await _ready_storage()
+    current = await storage.get_mock_data_by_uuid(uuid)
+    if current is None:
+        return None
+    fields = current.model_dump(include=set(MockData.model_fields))
+    if "body" in changes:
+        fields["body_ref"] = None
+    if "body_ref" in changes:
+        fields["body"] = None
+    if "ttl_seconds" in changes:
+        fields["expires_at"] = None
+    mock_data = MockData.model_validate({**fields, **changes})
+    return await update_mock_data(uuid, mock_data, current.version if version is None else version)
+
+
+async def get_mock_history(uuid: UUID) -> list[MockModelWithDate] | None:
+    """
+    Получить сохраненные предыдущие версии mock-данных.
+
+    Args:
+        uuid (UUID): UUID mock-данных.
+
+    Returns:
+        list[MockModelWithDate] | None: Версии от новых к старым, либо None, если mock-данные не найдены.
+    """
+    storage = await _ready_storage()
+    if await storage.get_mock_data_by_uuid(uuid) is None:
+        return None
+    return await storage.get_mock_history(uuid)
+
+
+async def rollback_mock_data(uuid: UUID, version: int | None = None) -> MockModelWithDate | None:
+    """
+    Вернуть mock-данные к предыдущей версии.
+
+    Откат записывается как новая версия с данными выбранной версии, поэтому его тоже можно отменить.
+
+    Args:
+        uuid (UUID): UUID mock-данных.
+        version (int | None): Версия из истории; если не указана, используется предшествующая текущей.
+
+    Returns:
+        MockModelWithDate | None: Mock-данные после отката, либо None, если mock-данные или версия не найдены.
+
+    Raises:
+        MockVersionConflictError: Если mock-данные изменены во время отката.
+        MockRouteConflictError: Если маршрут версии с теми же условиями занят другими мок-данными.
     """
-    db_mock = MockDbData(
-        uuid=uuid4(),
-        uri=mock_data.uri,
-        method=mock_data.method,
-        status_code=mock_data.status_code,
-        headers=mock_data.headers,
-        body=mock_data.body,
-        delay=mock_data.delay,
-    )
-    session.add(db_mock)
-    await session.flush()
-    await session.refresh(db_mock)
+    storage = await _ready_storage()
+    current = await storage.get_mock_data_by_uuid(uuid)
+    if current is None:
+        return None
+    target = await storage.get_mock_version(uuid, current.version - 1 if version is None else version)
+    if target is None:
+        return None
+    return await update_mock_data(uuid, MockData.model_validate(target.model_dump()), current.version)
 
-    return MockModelWithDate.model_validate(db_mock)
+
+def encode_mock_cursor(mock: MockModelWithDate) -> str:
+    """
+    Закодировать позицию mock-данных в непрозрачный курсор страницы.
+
+    Args:
+        mock (MockModelWithDate): Последние mock-данные на странице.
+
+    Returns:
+        str: Курсор в формате base64url.
+    """
+    payload = json.dumps({"c": mock.created_at.isoformat(), "u": str(mock.uuid)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
 
 
-@DBManager.with_session
-async def delete_mock_data(session: AsyncSession, uuid: UUID) -> bool:
+def decode_mock_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Раскодировать курсор страницы в позицию (created_at, uuid).
+
+    Args:
+        cursor (str): Курсор в формате base64url.
+
+    Returns:
+        tuple[datetime, UUID]: Дата создания и UUID последних mock-данных предыдущей страницы.
+
+    Raises:
+        ValueError: Если курсор имеет некорректный формат.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(payload["c"]), UUID(payload["u"])
+    except (binascii.Error, json.JSONDecodeError, KeyError, TypeError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+async def get_mock_data_page(
+    limit: int,
+    cursor: str | None = None,
+    method: str | None = None,
+    uri_prefix: str | None = None,
+    status_code: int | None = None,
+    include_body: bool = True,
+) -> tuple[list[MockModelWithDate], str | None]:
+    """
+    Получить страницу mock-данных с keyset-пагинацией по (created_at, uuid).
+
+    Args:
+        limit (int): Максимальное количество mock-данных на странице.
+        cursor (str | None): Курсор, полученный с предыдущей страницы.
+        method (str | None): Фильтр по HTTP-методу.
+        uri_prefix (str | None): Фильтр по префиксу URI.
+        status_code (int | None): Фильтр по HTTP коду ответа.
+        include_body (bool): Загружать тело ответа; при False поле body равно None.
+
+    Returns:
+        tuple[list[MockModelWithDate], str | None]: Mock-данные страницы и курсор следующей страницы.
+
+    Raises:
+        ValueError: Если курсор имеет некорректный формат.
+    """
+    after = decode_mock_cursor(cursor) if cursor is not None else None
+    storage = await _ready_storage()
+    mocks = await storage.get_mock_data_page(limit + 1, after, method, uri_prefix, status_code, include_body)
+    if len(mocks) > limit:
+        mocks = mocks[:limit]
+        return mocks, encode_mock_cursor(mocks[-1])
+    return mocks, None
+
+
+async def iter_mock_data(
+    batch_size: int,
+    method: str | None = None,
+    uri_prefix: str | None = None,
+    status_code: int | None = None,
+    include_body: bool = True,
+) -> AsyncGenerator[MockModelWithDate, None]:
+    """
+    Последовательно прочитать mock-данные из хранилища.
+
+    Данные читаются пачками по `batch_size`, поэтому в памяти не хранится вся таблица.
+
+    Args:
+        batch_size (int): Количество строк, читаемых из курсора за один раз.
+        method (str | None): Фильтр по HTTP-методу.
+        uri_prefix (str | None): Фильтр по префиксу URI.
+        status_code (int | None): Фильтр по HTTP коду ответа.
+        include_body (bool): Загружать тело ответа; при False поле body равно None.
+
+    Yields:
+        MockModelWithDate: Модели mock-данных в порядке создания.
+    """
+    storage = await _ready_storage()
+    async for mock in storage.iter_mock_data(batch_size, method, uri_prefix, status_code, include_body):
+        yield mock
+
+
+async def delete_mock_data(uuid: UUID) -> bool:
     """
     Удалить mock-данные по UUID.
 
     Args:
-        session (AsyncSession): Асинхронная сессия SQLAlchemy.
         uuid (UUID): UUID mock-данных для удаления.
 
     Returns:
         bool: True, если удаление прошло успешно, иначе False.
     """
-    res = await session.execute(select(MockDbData).where(MockDbData.uuid == uuid))
-    db_mock_data = res.scalar_one_or_none()
-    if db_mock_data:
-        await session.delete(db_mock_data)
-        await session.commit()
-        return True
-    return False
+    storage = await _ready_storage()
+    if not await storage.delete_mock_data(uuid):
+        return False
+    route_table.remove(uuid)
+    sequence_cursors.reset(uuid)
+    mock_hit_counters.reset(uuid)
+    return True
+
+
+async def delete_mock_data_batch(uuids: list[UUID]) -> list[UUID]:
+    """
+    Удалить несколько mock-данных одной операцией хранилища.
+
+    Args:
+        uuids (list[UUID]): UUID mock-данных для удаления.
+
+    Returns:
+        list[UUID]: UUID найденных и удаленных mock-данных.
+    """
+    storage = await _ready_storage()
+    deleted = await storage.delete_mock_data_batch(uuids)
+    for uuid in deleted:
+        route_table.remove(uuid)
+        sequence_cursors.reset(uuid)
+        mock_hit_counters.reset(uuid)
+    return deleted
+
+
+async def get_mock_expirations() -> list[tuple[UUID, datetime]]:
+    """
+    Получить время истечения mock-данных со сроком жизни.
+
+    Returns:
+        list[tuple[UUID, datetime]]: UUID и время истечения mock-данных.
+    """
+    storage = await _ready_storage()
+    return await storage.get_mock_expirations()
+
+
+def reset_mock_sequence(uuid: UUID | None = None) -> bool:
+    """
+    Сбросить позицию сценария mock-данных или позиции всех сценариев.
+
+    Args:
+        uuid (UUID | None): UUID mock-данных со сценарием; если не указан, сбрасываются все сценарии.
+
+    Returns:
+        bool: True, если позиции сброшены, False, если mock-данные со сценарием не найдены.
+    """
+    if uuid is not None:
+        entry = route_table.get_by_uuid(uuid)
+        if entry is None or entry.sequence is None:
+            return False
+    sequence_cursors.reset(uuid)
+    return True
+
+
+async def load_mock_route_table() -> int:
+    """
+    Загрузить все mock-данные из хранилища в in-memory таблицу маршрутов.
+
+    Returns:
+        int: Количество загруженных mock-данных.
+    """
+    storage = await _ready_storage()
+    route_table.load(await storage.get_all_mock_data())
+    return len(route_table)
+
+
+async def get_mock_data_by_uuids(uuids: list[UUID]) -> list[MockModelWithDate]:
+    """
+    Получить mock-данные по списку UUID.
+
+    Args:
+        uuids (list[UUID]): UUID mock-данных.
+
+    Returns:
+        list[MockModelWithDate]: Найденные модели mock-данных, упорядоченные по дате создания.
+    """
+    storage = await _ready_storage()
+    return await storage.get_mock_data_by_uuids(uuids)
+
+
+async def get_mock_change_bounds() -> tuple[int, int]:
+    """
+    Получить минимальный и максимальный идентификаторы записей журнала изменений.
+
+    Returns:
+        tuple[int, int]: Минимальный и максимальный идентификаторы, либо (0, 0), если журнал пуст.
+    """
+    return await get_storage().get_mock_change_bounds()
+
+
+async def get_mock_changes(after_id: int, missing_ids: Collection[int] = ()) -> list[tuple[int, UUID, str]]:
+    """
+    Получить записи журнала изменений mock-данных после указанного идентификатора.
+
+    Args:
+        after_id (int): Идентификатор последней обработанной записи.
+        missing_ids (Collection[int]): Пропущенные идентификаторы меньше `after_id`, которые нужно проверить снова.
+
+    Returns:
+        list[tuple[int, UUID, str]]: Записи журнала (id, uuid, action) в порядке возрастания id.
+    """
+    return await get_storage().get_mock_changes(after_id, missing_ids)
+
+
+async def prune_mock_changes(keep_last: int) -> None:
+    """
+    Удалить старые записи журнала изменений mock-данных.
+
+    Args:
+        keep_last (int): Количество последних записей, которые необходимо сохранить.
+    """
+    await get_storage().prune_mock_changes(keep_last)
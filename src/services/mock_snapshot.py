@@ -0,0 +1,394 @@
+"""Модуль снимков мок-данных для быстрого перезапуска сервера.
+
+Хранилище в памяти процесса теряет мок-данные при остановке сервера. MockSnapshotStore
+периодически и при остановке сохраняет все мок-данные в компактный двоичный файл, а при запуске
+отображает его в память (mmap) и подключает к таблице маршрутов без разбора записей:
+мок-данные маршрута декодируются при первом запросе к нему. Хранилище восстанавливается
+из снимка в фоне, административные операции ожидают окончания восстановления.
+
+Формат файла (little-endian):
+
+    - заголовок `_HEADER`: сигнатура, количество записей, размеры хеш-таблиц маршрутов и UUID,
+      количество маршрутов с шаблонами URI;
+    - индекс записей `_RECORD`: смещение, длина JSON и длина ключа маршрута каждой записи
+      в порядке (created_at, uuid);
+    - хеш-таблица маршрутов `_ROUTE` с открытой адресацией по CRC32 ключа "METHOD uri":
+      начало и количество номеров записей маршрута в массиве участников;
+    - хеш-таблица UUID `_UUID_SLOT`: UUID и номер записи;
+    - массив участников маршрутов (номера записей, сгруппированные по маршрутам);
+    - номера слотов маршрутов с шаблонами URI, которые подключаются к таблице маршрутов сразу;
+    - данные записей: ключ маршрута и JSON мок-данных.
+"""
+
+import asyncio
+import contextlib
+import logging
+import mmap
+import os
+import struct
+import time
+import zlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Self
+from uuid import UUID
+
+from src.api.models.mock_model import MockModelWithDate
+from src.services.mock_route_table import route_table
+from src.services.route_trie import is_route_template
+from src.settings import config
+from src.storage import MockStorage, get_storage
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"MOCKSNP1"
+"""Сигнатура и версия формата файла снимка."""
+
+_HEADER = struct.Struct("<8sIIII")
+_RECORD = struct.Struct("<QIH")
+_ROUTE = struct.Struct("<II")
+_UUID_SLOT = struct.Struct("<16sI")
+_INDEX = struct.Struct("<I")
+_EMPTY_SLOT = 0xFFFFFFFF
+
+RouteKey = tuple[str, str]
+
+
+def _route_key(method: str, uri: str) -> bytes:
+    """Кодирует маршрут в ключ хеш-таблицы снимка."""
+    return f"{method} {uri}".encode()
+
+
+def _table_size(count: int) -> int:
+    """Возвращает размер хеш-таблицы: степень двойки, не меньше удвоенного количества ключей."""
+    size = 1
+    while size < count * 2:
+        size *= 2
+    return size
+
+
+def write_mock_snapshot(path: str | Path, mocks: Iterable[MockModelWithDate]) -> int:
+    """Атомарно сохраняет мок-данные в файл снимка.
+
+    Args:
+        path (str | Path): Путь к файлу снимка.
+        mocks (Iterable[MockModelWithDate]): Сохраняемые мок-данные.
+
+    Returns:
+        int: Количество сохраненных мок-данных.
+    """
+    ordered = sorted(mocks, key=lambda mock: (mock.created_at, mock.uuid))
+    routes: dict[RouteKey, list[int]] = {}
+    for index, mock in enumerate(ordered):
+        routes.setdefault((mock.method, mock.uri), []).append(index)
+
+    records = bytearray()
+    data = bytearray()
+    for mock in ordered:
+        key = _route_key(mock.method, mock.uri)
+        payload = mock.model_dump_json().encode()
+        records += _RECORD.pack(len(data), len(payload), len(key))
+        data += key + payload
+
+    route_slots = [(0, 0)] * _table_size(len(routes))
+    members = bytearray()
+    templates = bytearray()
+    for (method, uri), indexes in routes.items():
+        slot = zlib.crc32(_route_key(method, uri)) & (len(route_slots) - 1)
+        while route_slots[slot][1]:
+            slot = (slot + 1) & (len(route_slots) - 1)
+        route_slots[slot] = (len(members) // _INDEX.size, len(indexes))
+        members += b"".join(_INDEX.pack(index) for index in indexes)
+        if is_route_template(uri):
+            templates += _INDEX.pack(slot)
+
+    uuid_slots = [(b"", _EMPTY_SLOT)] * _table_size(len(ordered))
+    for index, mock in enumerate(ordered):
+        slot = zlib.crc32(mock.uuid.bytes) & (len(uuid_slots) - 1)
+        while uuid_slots[slot][1] != _EMPTY_SLOT:
+            slot = (slot + 1) & (len(uuid_slots) - 1)
+        uuid_slots[slot] = (mock.uuid.bytes, index)
+
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with tmp_path.open("wb") as file:
+        file.write(
+            _HEADER.pack(SNAPSHOT_MAGIC, len(ordered), len(route_slots), len(uuid_slots), len(templates) // _INDEX.size)
+        )
+        file.write(records)
+        file.write(b"".join(_ROUTE.pack(*slot) for slot in route_slots))
+        file.write(b"".join(_UUID_SLOT.pack(*slot) for slot in uuid_slots))
+        file.write(members)
+        file.write(templates)
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    tmp_path.replace(path)
+    return len(ordered)
+
+
+class MockSnapshot:
+    """Файл снимка мок-данных, отображенный в память.
+
+    Открытие снимка читает только заголовок; записи декодируются по запросу.
+
+    Пример:
+        Поиск мок-данных маршрута::
+
+            snapshot = MockSnapshot.open("/var/lib/mock-rest-server/mocks.snapshot")
+            mocks = snapshot.route("GET", "/api/v1/users")
+    """
+
+    def __init__(self, buffer: mmap.mmap) -> None:
+        """Создает снимок из отображенного в память файла.
+
+        Args:
+            buffer (mmap.mmap): Содержимое файла снимка.
+
+        Raises:
+            ValueError: Если файл не является снимком мок-данных или поврежден.
+        """
+        if len(buffer) < _HEADER.size:
+            raise ValueError("Файл снимка мок-данных поврежден")
+        magic, count, route_slots, uuid_slots, template_count = _HEADER.unpack_from(buffer)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Неизвестный формат файла снимка мок-данных")
+
+        self._buffer = buffer
+        self._count: int = count
+        self._route_slots: int = route_slots
+        self._uuid_slots: int = uuid_slots
+        self._records_offset = _HEADER.size
+        self._routes_offset = self._records_offset + self._count * _RECORD.size
+        self._uuids_offset = self._routes_offset + self._route_slots * _ROUTE.size
+        self._members_offset = self._uuids_offset + self._uuid_slots * _UUID_SLOT.size
+        self._templates_offset = self._members_offset + self._count * _INDEX.size
+        self._template_count = template_count
+        self._data_offset = self._templates_offset + template_count * _INDEX.size
+        if self._data_offset > len(buffer):
+            raise ValueError("Файл снимка мок-данных поврежден")
+
+    @classmethod
+    def open(cls, path: str | Path) -> Self:
+        """Отображает файл снимка в память.
+
+        Args:
+            path (str | Path): Путь к файлу снимка.
+
+        Returns:
+            Self: Снимок мок-данных.
+
+        Raises:
+            OSError: Если файл не удалось открыть.
+            ValueError: Если файл не является снимком мок-данных или поврежден.
+        """
+        with Path(path).open("rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                raise ValueError("Файл снимка мок-данных пуст")
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self) -> int:
+        """Возвращает количество мок-данных в снимке."""
+        return self._count
+
+    def _record_key(self, index: int) -> bytes:
+        """Возвращает ключ маршрута записи."""
+        offset, _, key_length = _RECORD.unpack_from(self._buffer, self._records_offset + index * _RECORD.size)
+        start = self._data_offset + offset
+        return self._buffer[start : start + key_length]
+
+    def _decode(self, index: int) -> MockModelWithDate:
+        """Декодирует мок-данные записи."""
+        offset, length, key_length = _RECORD.unpack_from(self._buffer, self._records_offset + index * _RECORD.size)
+        start = self._data_offset + offset + key_length
+        return MockModelWithDate.model_validate_json(self._buffer[start : start + length])
+
+    def _members(self, start: int, count: int) -> list[MockModelWithDate]:
+        """Декодирует мок-данные маршрута по диапазону массива участников."""
+        offset = self._members_offset + start * _INDEX.size
+        members = self._buffer[offset : offset + count * _INDEX.size]
+        return [self._decode(index) for (index,) in _INDEX.iter_unpack(members)]
+
+    def route(self, method: str, uri: str) -> list[MockModelWithDate]:
+        """Возвращает мок-данные маршрута в порядке создания.
+
+        Args:
+            method (str): HTTP-метод.
+            uri (str): URI эндпоинта.
+
+        Returns:
+            list[MockModelWithDate]: Мок-данные маршрута, либо пустой список.
+        """
+        key = _route_key(method, uri)
+        mask = self._route_slots - 1
+        slot = zlib.crc32(key) & mask
+        while True:
+            start, count = _ROUTE.unpack_from(self._buffer, self._routes_offset + slot * _ROUTE.size)
+            if not count:
+                return []
+            first = _INDEX.unpack_from(self._buffer, self._members_offset + start * _INDEX.size)[0]
+            if self._record_key(first) == key:
+                return self._members(start, count)
+            slot = (slot + 1) & mask
+
+    def route_of(self, uuid: UUID) -> RouteKey | None:
+        """Возвращает маршрут мок-данных по UUID без декодирования записи.
+
+        Args:
+            uuid (UUID): UUID мок-данных.
+
+        Returns:
+            RouteKey | None: Пара (метод, URI), либо None, если мок-данных нет в снимке.
+        """
+        mask = self._uuid_slots - 1
+        slot = zlib.crc32(uuid.bytes) & mask
+        while True:
+            value, index = _UUID_SLOT.unpack_from(self._buffer, self._uuids_offset + slot * _UUID_SLOT.size)
+            if index == _EMPTY_SLOT:
+                return None
+            if value == uuid.bytes:
+                method, uri = self._record_key(index).decode().split(" ", 1)
+                return method, uri
+            slot = (slot + 1) & mask
+
+    def template_routes(self) -> list[RouteKey]:
+        """Возвращает маршруты, URI которых содержат параметры или wildcard."""
+        routes = []
+        for (slot,) in _INDEX.iter_unpack(
+            self._buffer[self._templates_offset : self._templates_offset + self._template_count * _INDEX.size]
+        ):
+            start, _ = _ROUTE.unpack_from(self._buffer, self._routes_offset + slot * _ROUTE.size)
+            first = _INDEX.unpack_from(self._buffer, self._members_offset + start * _INDEX.size)[0]
+            method, uri = self._record_key(first).decode().split(" ", 1)
+            routes.append((method, uri))
+        return routes
+
+    def iter_batches(self, batch_size: int) -> Iterator[list[MockModelWithDate]]:
+        """Последовательно декодирует все мок-данные снимка в порядке создания.
+
+        Args:
+            batch_size (int): Количество мок-данных в пачке.
+
+        Yields:
+            list[MockModelWithDate]: Пачка мок-данных.
+        """
+        for start in range(0, self._count, batch_size):
+            yield [self._decode(index) for index in range(start, min(start + batch_size, self._count))]
+
+
+class MockSnapshotStore:
+    """Сохранение мок-данных в файл снимка и восстановление из него при запуске.
+
+    Атрибуты:
+        path (str | None): Путь к файлу снимка; None отключает снимки.
+        interval (float): Интервал периодического сохранения в секундах; 0 — только при остановке.
+
+    Пример:
+        Запуск и остановка::
+
+            await mock_snapshot_store.start(storage)
+            ...
+            await mock_snapshot_store.stop()
+    """
+
+    def __init__(self, path: str | None, interval: float) -> None:
+        """Создает объект сохранения снимков.
+
+        Args:
+            path (str | None): Путь к файлу снимка; None отключает снимки.
+            interval (float): Интервал периодического сохранения в секундах; 0 — только при остановке.
+        """
+        self.path = path
+        self.interval = interval
+        self._saved_version = -1
+        self._restore: asyncio.Task[None] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self, storage: MockStorage) -> None:
+        """Подключает снимок к таблице маршрутов, запускает восстановление хранилища и периодическое сохранение.
+
+        Поврежденный или отсутствующий снимок не мешает запуску: сервер стартует без мок-данных.
+
+        Args:
+            storage (MockStorage): Пустое хранилище, в которое восстанавливаются мок-данные.
+        """
+        if self.path is None:
+            return
+        started = time.perf_counter()
+        snapshot = None
+        try:
+            snapshot = MockSnapshot.open(self.path)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError):
+            logger.exception("Не удалось открыть снимок мок-данных %s", self.path)
+
+        if snapshot is not None:
+            route_table.load_snapshot(snapshot)
+            self._restore = asyncio.create_task(self._restore_storage(snapshot, storage))
+            logger.info(
+                "Снимок мок-данных подключен: %d моков за %.1f мс",
+                len(snapshot),
+                (time.perf_counter() - started) * 1000,
+            )
+        self._saved_version = route_table.version
+        if self.interval:
+            self._task = asyncio.create_task(self._run())
+
+    async def wait_restored(self) -> None:
+        """Ожидает окончания восстановления хранилища из снимка."""
+        if self._restore is not None and not self._restore.done():
+            await asyncio.wait({self._restore})
+
+    async def save(self) -> None:
+        """Сохраняет мок-данные хранилища в снимок, если таблица маршрутов изменилась после прошлого сохранения."""
+        if self.path is None:
+            return
+        await self.wait_restored()
+        version = route_table.version
+        if version == self._saved_version:
+            return
+        mocks = await get_storage().get_all_mock_data()
+        await asyncio.to_thread(write_mock_snapshot, self.path, mocks)
+        self._saved_version = version
+
+    async def stop(self) -> None:
+        """Останавливает периодическое сохранение и сохраняет последний снимок."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.save()
+        self._restore = None
+
+    async def _restore_storage(self, snapshot: MockSnapshot, storage: MockStorage) -> None:
+        """Восстанавливает хранилище из снимка, отдавая управление обработке запросов между пачками декодирования."""
+        started = time.perf_counter()
+        try:
+            mocks = []
+            for batch in snapshot.iter_batches(config.BULK_BATCH_SIZE):
+                mocks.extend(batch)
+                await asyncio.sleep(0)
+            await storage.restore_mock_data(mocks)
+        except Exception:
+            logger.exception("Не удалось восстановить хранилище из снимка мок-данных")
+            return
+        logger.info(
+            "Хранилище восстановлено из снимка: %d моков за %.1f мс",
+            len(snapshot),
+            (time.perf_counter() - started) * 1000,
+        )
+
+    async def _run(self) -> None:
+        """Периодически сохраняет снимки до отмены задачи."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.save()
+            except OSError:
+                logger.exception("Не удалось сохранить снимок мок-данных")
+
+
+#: Глобальный объект снимков мок-данных процесса.
+mock_snapshot_store = MockSnapshotStore(config.SNAPSHOT_PATH, config.SNAPSHOT_INTERVAL)
@@ -0,0 +1,132 @@
+"""Модуль синхронизации in-memory таблицы маршрутов между процессами.
+
+Предоставляет класс MockRouteTableSync, который в фоне читает журнал изменений мок-данных
+из общей базы данных и применяет изменения, сделанные другими воркерами, к таблице маршрутов
+текущего процесса.
+
+Идентификаторы записей журнала выдаются при вставке, а видимыми становятся при фиксации
+транзакции, поэтому на серверных базах данных запись с меньшим идентификатором может появиться
+позже записи с большим. Пропущенные идентификаторы ниже последней прочитанной записи запоминаются
+и проверяются при каждом опросе, пока не появятся или не пройдет MOCK_SYNC_GAP_TIMEOUT секунд.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Callable
+
+from src.services.mock_route_table import route_table
+from src.services.mock_service import (
+    get_mock_change_bounds,
+    get_mock_changes,
+    get_mock_data_by_uuids,
+    load_mock_route_table,
+    prune_mock_changes,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class MockRouteTableSync:
+    """Фоновая синхронизация таблицы маршрутов по журналу изменений.
+
+    Атрибуты:
+        interval (float): Интервал опроса журнала изменений в секундах.
+        retention (int): Количество записей журнала, сохраняемых при очистке.
+        gap_timeout (float): Время ожидания пропущенных записей журнала в секундах.
+        last_change_id (int): Идентификатор последней примененной записи журнала.
+
+    Пример:
+        Запуск и остановка синхронизации::
+
+            sync = MockRouteTableSync(interval=0.5, retention=10000, gap_timeout=30)
+            await sync.start()
+            ...
+            await sync.stop()
+    """
+
+    def __init__(
+        self, interval: float, retention: int, gap_timeout: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """Создает объект синхронизации.
+
+        Args:
+            interval (float): Интервал опроса журнала изменений в секундах.
+            retention (int): Количество записей журнала, сохраняемых при очистке.
+            gap_timeout (float): Время ожидания пропущенных записей журнала в секундах.
+            clock (Callable[[], float]): Источник монотонного времени в секундах.
+        """
+        self.interval = interval
+        self.retention = retention
+        self.gap_timeout = gap_timeout
+        self.last_change_id = 0
+        self._clock = clock
+        self._gaps: dict[int, float] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """Загружает таблицу маршрутов и запускает фоновый опрос журнала изменений."""
+        _, self.last_change_id = await get_mock_change_bounds()
+        self._gaps.clear()
+        await load_mock_route_table()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает фоновый опрос журнала изменений."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def poll(self) -> int:
+        """Применяет к таблице маршрутов новые записи журнала изменений.
+
+        Вместе с новыми записями читаются ранее пропущенные. Если нужные записи уже удалены
+        из журнала, таблица маршрутов перезагружается целиком. Когда журнал вырастает вдвое
+        больше лимита хранения, старые записи удаляются.
+
+        Returns:
+            int: Количество примененных записей журнала.
+        """
+        now = self._clock()
+        self._gaps = {change_id: seen for change_id, seen in self._gaps.items() if now - seen <= self.gap_timeout}
+        changes = await get_mock_changes(self.last_change_id, self._gaps.keys())
+        if not changes:
+            return 0
+
+        min_id, max_id = await get_mock_change_bounds()
+        expected = self.last_change_id + 1
+        if min_id > expected:
+            self._gaps.clear()
+            expected = min_id
+            await load_mock_route_table()
+        else:
+            upserted = {uuid for _, uuid, action in changes if action == "upsert"}
+            mocks = {mock.uuid: mock for mock in await get_mock_data_by_uuids(list(upserted))} if upserted else {}
+            for _, uuid, action in changes:
+                mock = mocks.get(uuid)
+                if action == "upsert" and mock is not None:
+                    route_table.add(mock)
+                else:
+                    route_table.remove(uuid)
+        for change_id, _, _ in changes:
+            self._gaps.pop(change_id, None)
+            if change_id >= expected:
+                self._gaps.update(dict.fromkeys(range(expected, change_id), now))
+                expected = change_id + 1
+        self.last_change_id = max(self.last_change_id, changes[-1][0])
+
+        if max_id - min_id + 1 > 2 * self.retention:
+            await prune_mock_changes(self.retention)
+        return len(changes)
+
+    async def _run(self) -> None:
+        """Периодически опрашивает журнал изменений до отмены задачи."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.poll()
+            except Exception:
+                logger.exception("Не удалось синхронизировать таблицу маршрутов")
@@ -0,0 +1,313 @@
+"""Модуль журнала входящих запросов к мокам.
+
+Middleware моков добавляет запись о каждом запросе в кольцевой буфер воркера `RequestJournal`
+уже после отправки ответа: запись — кортеж из ссылок на данные ASGI `scope`, добавление
+не выделяет память под буфер и не обращается к базе данных.
+Фоновая задача `RequestJournalFlusher` пакетами сохраняет накопленные записи в таблицу
+`mock_request_log`. Если сохранение не успевает за потоком запросов, самые старые записи
+буфера вытесняются новыми, а их количество учитывается метрикой `request_journal_dropped_total`.
+
+Тело запроса не буферизуется целиком: `RequestBodyCapture` копирует начало тела не длиннее лимита
+журнала по мере того, как его читают мок или приложение, и считает полный размер тела.
+"""
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any, NamedTuple
+from uuid import UUID
+
+from starlette.types import Message, Receive
+
+from src.metrics import metrics
+from src.services.request_log_service import prune_request_log, save_request_log
+from src.settings import config
+
+logger = logging.getLogger(__name__)
+
+_DROPPED = metrics.counter("request_journal_dropped_total")
+_SAVED = metrics.counter("request_journal_saved_total")
+
+
+class JournalEntry(NamedTuple):
+    """Запись журнала о входящем запросе.
+
+    Заголовки и query-строка хранятся в исходном виде ASGI `scope` и разбираются только при сохранении.
+
+    Attributes:
+        timestamp (float): Время получения запроса, секунды Unix.
+        mock_uuid (UUID | None): UUID мока, выбранного для запроса, либо None, если мок не найден.
+        method (str): HTTP-метод запроса.
+        path (str): Путь запроса.
+        query_string (bytes): Строка query-параметров запроса.
+        headers (list[tuple[bytes, bytes]]): Заголовки запроса.
+        body (bytes): Начало тела запроса не длиннее лимита журнала.
+        body_size (int): Полный размер тела запроса в байтах.
+        status_code (int | None): HTTP код ответа, либо None, если ответ не был отправлен.
+    """
+
+    timestamp: float
+    mock_uuid: UUID | None
+    method: str
+    path: str
+    query_string: bytes
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    body_size: int
+    status_code: int | None
+
+    def as_row(self) -> dict[str, Any]:
+        """Возвращает значения столбцов записи таблицы `mock_request_log`.
+
+        Повторяющиеся заголовки объединяются через запятую, как допускает RFC 9110.
+        """
+        headers: dict[str, str] = {}
+        for key, value in self.headers:
+            name = key.decode("latin-1")
+            headers[name] = (
+                f"{headers[name]}, {value.decode('latin-1')}" if name in headers else value.decode("latin-1")
+            )
+        return {
+            "mock_uuid": self.mock_uuid,
+            "method": self.method,
+            "path": self.path,
+            "query": self.query_string.decode("latin-1"),
+            "headers": headers,
+            "body": self.body or None,
+            "body_size": self.body_size,
+            "status_code": self.status_code,
+            "created_at": datetime.fromtimestamp(self.timestamp, UTC),
+        }
+
+
+class RequestBodyCapture:
+    """Копия начала тела запроса, снимаемая по мере чтения тела.
+
+    Оборачивает канал получения сообщений ASGI: каждая часть тела передается читателю без изменений,
+    а в копию попадает только начало тела не длиннее лимита.
+
+    Attributes:
+        limit (int): Максимальный размер копии тела в байтах.
+        size (int): Количество полученных байтов тела.
+        complete (bool): Получено ли тело целиком.
+    """
+
+    __slots__ = ("limit", "size", "complete", "_receive", "_chunks", "_captured")
+
+    def __init__(self, receive: Receive, limit: int) -> None:
+        """Создает копию тела запроса.
+
+        Args:
+            receive (Receive): Канал получения сообщений ASGI.
+            limit (int): Максимальный размер копии тела в байтах.
+        """
+        self.limit = limit
+        self.size = 0
+        self.complete = False
+        self._receive = receive
+        self._chunks: list[bytes] = []
+        self._captured = 0
+
+    @property
+    def body(self) -> bytes:
+        """Начало тела запроса не длиннее лимита."""
+        return b"".join(self._chunks)
+
+    async def receive(self) -> Message:
+        """Получает очередное сообщение запроса, копируя начало тела.
+
+        Returns:
+            Message: Сообщение ASGI без изменений.
+        """
+        message = await self._receive()
+        if message["type"] != "http.request":
+            self.complete = True
+            return message
+        chunk: bytes = message.get("body", b"")
+        self.size += len(chunk)
+        if self._captured < self.limit and chunk:
+            part = chunk[: self.limit - self._captured]
+            self._chunks.append(part)
+            self._captured += len(part)
+        self.complete = not message.get("more_body", False)
+        return message
+
+    async def drain(self) -> None:
+        """Дочитывает непрочитанную часть тела, сохраняя в копии только ее начало."""
+        while not self.complete:
+            await self.receive()
+
+
+class RequestJournal:
+    """Кольцевой буфер записей журнала запросов воркера.
+
+    Буфер выделяется один раз при создании. Добавление и извлечение записей выполняются за O(1)
+    в единственном цикле событий воркера без блокировок.
+
+    Attributes:
+        capacity (int): Емкость буфера.
+        body_limit (int): Максимальный размер сохраняемого тела запроса в байтах.
+        dropped (int): Количество записей, вытесненных до сохранения.
+        on_batch (Callable[[], None] | None): Вызывается, когда в буфере накопился пакет записей.
+        batch_size (int): Размер пакета записей для вызова `on_batch`.
+    """
+
+    def __init__(self, capacity: int, body_limit: int, batch_size: int) -> None:
+        """Создает пустой буфер.
+
+        Args:
+            capacity (int): Емкость буфера.
+            body_limit (int): Максимальный размер сохраняемого тела запроса в байтах.
+            batch_size (int): Размер пакета записей для вызова `on_batch`.
+        """
+        self.capacity = capacity
+        self.body_limit = body_limit
+        self.batch_size = batch_size
+        self.dropped = 0
+        self.on_batch: Callable[[], None] | None = None
+        self._buffer: list[JournalEntry | None] = [None] * capacity
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Возвращает количество несохраненных записей."""
+        return self._size
+
+    def append(self, entry: JournalEntry) -> None:
+        """Добавляет запись, при заполненном буфере вытесняя самую старую.
+
+        Args:
+            entry (JournalEntry): Запись журнала.
+        """
+        if self._size == self.capacity:
+            self._buffer[self._head] = entry
+            self._head = (self._head + 1) % self.capacity
+            self.dropped += 1
+            _DROPPED.inc()
+        else:
+            self._buffer[(self._head + self._size) % self.capacity] = entry
+            self._size += 1
+        if self._size == self.batch_size and self.on_batch is not None:
+            self.on_batch()
+
+    def drain(self, limit: int) -> list[JournalEntry]:
+        """Извлекает самые старые записи.
+
+        Args:
+            limit (int): Максимальное количество извлекаемых записей.
+
+        Returns:
+            list[JournalEntry]: Записи в порядке добавления.
+        """
+        count = min(limit, self._size)
+        entries: list[JournalEntry] = []
+        for _ in range(count):
+            entry = self._buffer[self._head]
+            self._buffer[self._head] = None
+            self._head = (self._head + 1) % self.capacity
+            if entry is not None:
+                entries.append(entry)
+        self._size -= count
+        return entries
+
+    def clear(self) -> None:
+        """Удаляет все несохраненные записи."""
+        self._buffer = [None] * self.capacity
+        self._head = 0
+        self._size = 0
+
+
+request_journal = RequestJournal(config.JOURNAL_CAPACITY, config.JOURNAL_BODY_LIMIT, config.JOURNAL_BATCH_SIZE)
+"""Журнал запросов текущего процесса."""
+
+
+async def flush_request_journal(journal: RequestJournal = request_journal) -> int:
+    """Сохраняет все несохраненные записи журнала в базу данных пакетами.
+
+    Args:
+        journal (RequestJournal): Журнал запросов.
+
+    Returns:
+        int: Количество сохраненных записей.
+    """
+    saved = 0
+    while entries := journal.drain(journal.batch_size):
+        await save_request_log([entry.as_row() for entry in entries])
+        saved += len(entries)
+        _SAVED.inc(len(entries))
+    return saved
+
+
+class RequestJournalFlusher:
+    """Фоновое сохранение журнала запросов в базу данных.
+
+    Журнал сохраняется каждые `interval` секунд или сразу, как только в буфере накопился пакет записей.
+    После сохранения каждой десятой части лимита хранения старые записи таблицы удаляются.
+
+    Пример:
+        Запуск и остановка сохранения::
+
+            flusher = RequestJournalFlusher(request_journal, interval=1.0, retention=100000)
+            flusher.start()
+            ...
+            await flusher.stop()
+    """
+
+    def __init__(self, journal: RequestJournal, interval: float, retention: int) -> None:
+        """Создает объект сохранения журнала.
+
+        Args:
+            journal (RequestJournal): Журнал запросов.
+            interval (float): Интервал сохранения в секундах.
+            retention (int): Количество хранимых записей журнала в базе данных.
+        """
+        self.journal = journal
+        self.interval = interval
+        self.retention = retention
+        self._saved_since_prune = 0
+        self._task: asyncio.Task[None] | None = None
+
+    async def flush(self) -> int:
+        """Сохраняет несохраненные записи и при необходимости удаляет старые записи таблицы.
+
+        Returns:
+            int: Количество сохраненных записей.
+        """
+        saved = await flush_request_journal(self.journal)
+        self._saved_since_prune += saved
+        if self._saved_since_prune >= max(self.retention // 10, 1):
+            await prune_request_log(self.retention)
+            self._saved_since_prune = 0
+        return saved
+
+    def start(self) -> None:
+        """Запускает фоновое сохранение журнала."""
+        wakeup = asyncio.Event()
+        self.journal.on_batch = wakeup.set
+        self._task = asyncio.create_task(self._run(wakeup))
+
+    async def stop(self) -> None:
+        """Останавливает фоновое сохранение и сохраняет оставшиеся записи."""
+        self.journal.on_batch = None
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Не удалось сохранить журнал запросов")
+
+    async def _run(self, wakeup: asyncio.Event) -> None:
+        """Сохраняет журнал по интервалу или по накоплению пакета до отмены задачи."""
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(wakeup.wait(), self.interval)
+            wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Не удалось сохранить журнал запросов")
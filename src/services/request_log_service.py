@@ -0,0 +1,64 @@
+"""Модуль хранения журнала входящих запросов к мокам.
+
+Предоставляет функции пакетного сохранения записей журнала, чтения страниц журнала
+с фильтрами и удаления старых записей в текущем хранилище.
+"""
+
+from typing import Any
+from uuid import UUID
+
+from src.api.models.request_log_model import RecordedRequest
+from src.storage import get_storage
+
+
+async def save_request_log(rows: list[dict[str, Any]]) -> None:
+    """
+    Сохранить пакет записей журнала запросов одной транзакцией.
+
+    Args:
+        rows (list[dict[str, Any]]): Значения столбцов записей таблицы `mock_request_log`.
+    """
+    await get_storage().save_request_log(rows)
+
+
+async def get_request_log_page(
+    limit: int,
+    cursor: int | None = None,
+    mock_uuid: UUID | None = None,
+    method: str | None = None,
+    path_prefix: str | None = None,
+) -> tuple[list[RecordedRequest], int | None]:
+    """
+    Получить страницу журнала запросов от новых записей к старым.
+
+    Args:
+        limit (int): Максимальное количество записей на странице.
+        cursor (int | None): Идентификатор, записи до которого возвращаются на странице.
+        mock_uuid (UUID | None): Фильтр по UUID мока.
+        method (str | None): Фильтр по HTTP-методу.
+        path_prefix (str | None): Фильтр по префиксу пути запроса.
+
+    Returns:
+        tuple[list[RecordedRequest], int | None]: Записи страницы и курсор следующей страницы.
+    """
+    return await get_storage().get_request_log_page(limit, cursor, mock_uuid, method, path_prefix)
+
+
+async def clear_request_log() -> int:
+    """
+    Удалить все записи журнала запросов.
+
+    Returns:
+        int: Количество удаленных записей.
+    """
+    return await get_storage().clear_request_log()
+
+
+async def prune_request_log(keep_last: int) -> None:
+    """
+    Удалить старые записи журнала запросов.
+
+    Args:
+        keep_last (int): Количество последних записей, которые необходимо сохранить.
+    """
+    await get_storage().prune_request_log(keep_last)
@@ -0,0 +1,340 @@
+"""Модуль кеша ответов условных и шаблонизированных моков.
+
+Выбор мока по условиям `match` и сборка шаблонизированного ответа зависят только от метода, пути
+и небольшой части запроса: query-параметров, заголовков и тела, на которые ссылаются условия
+и выражения шаблонов моков маршрута. Кеш хранит выбранную запись таблицы маршрутов и собранный
+ответ по отпечатку этой части запроса, поэтому повторные такие же запросы не выбирают мок
+и не собирают ответ заново.
+
+Записи вытесняются по давности использования (LRU) при превышении количества или суммарного
+размера и устаревают через заданное время. Таблица маршрутов сообщает кешу о каждом добавленном
+и удаленном моке, и кеш удаляет записи только тех путей, которым соответствует URI мока.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from src.metrics import metrics
+from src.services.compiled_response import CompiledMockResponse
+from src.services.mock_request import MockRequest
+from src.services.mock_route_table import MockRouteEntry, MockRouteTable, route_table
+from src.services.route_trie import RouteTemplate, is_route_template
+from src.settings import config
+
+_GENERATED_SOURCES = frozenset({"uuid", "now", "timestamp", "timestamp_ms"})
+
+_HITS = metrics.counter("mock_response_cache_requests_total", (("result", "hit"),))
+_MISSES = metrics.counter("mock_response_cache_requests_total", (("result", "miss"),))
+
+
+@dataclass(frozen=True, slots=True)
+class RouteInputs:
+    """Части запроса, от которых зависят выбор мока и ответ для пути.
+
+    Attributes:
+        query (tuple[str, ...]): Имена query-параметров.
+        headers (tuple[str, ...]): Имена заголовков в нижнем регистре.
+        body (bool): Зависит ли выбор мока или ответ от тела запроса.
+    """
+
+    query: tuple[str, ...]
+    headers: tuple[str, ...]
+    body: bool
+
+
+@dataclass(frozen=True, slots=True)
+class CacheKey:
+    """Отпечаток запроса.
+
+    Attributes:
+        route (tuple[str, str]): Метод и путь запроса.
+        values (tuple[object, ...]): Значения query-параметров, заголовков и хеш тела запроса.
+        epoch (int): Поколение кеша на момент вычисления отпечатка; не участвует в сравнении.
+    """
+
+    route: tuple[str, str]
+    values: tuple[object, ...]
+    epoch: int = field(default=0, compare=False)
+
+
+@dataclass(slots=True)
+class _CacheItem:
+    """Запись кеша."""
+
+    entry: MockRouteEntry
+    response: CompiledMockResponse
+    size: int
+    expires_at: float
+
+
+def _response_size(response: CompiledMockResponse) -> int:
+    """Оценивает занимаемую ответом и его сжатыми вариантами память; тела из хранилища тел ответов не учитываются."""
+    size = len(response.body) + sum(len(name) + len(value) for name, value in response.raw_headers)
+    return size + sum(_response_size(variant) for _, variant in response.variants)
+
+
+def is_cacheable(entry: MockRouteEntry) -> bool:
+    """Проверяет, можно ли повторно отдавать собранный ответ мока.
+
+    Ответы сценариев и шаблонов с генерируемыми значениями (uuid, now, timestamp) различаются
+    для одинаковых запросов и не кешируются.
+
+    Args:
+        entry (MockRouteEntry): Запись таблицы маршрутов.
+
+    Returns:
+        bool: True, если ответ зависит только от запроса.
+    """
+    if entry.sequence is not None:
+        return False
+    template = entry.response_template
+    return template is None or not any(expression.source in _GENERATED_SOURCES for expression in template.expressions())
+
+
+def route_inputs(entries: list[MockRouteEntry]) -> RouteInputs | None:
+    """Собирает части запроса, на которые ссылаются условия и шаблоны моков.
+
+    Args:
+        entries (list[MockRouteEntry]): Записи маршрутов, соответствующих пути.
+
+    Returns:
+        RouteInputs | None: Части запроса, либо None, если среди моков нет условных и шаблонизированных
+            и кешировать нечего.
+    """
+    if not any(entry.mock.match is not None or entry.response_template is not None for entry in entries):
+        return None
+    query: set[str] = set()
+    headers: set[str] = set()
+    body = False
+    for entry in entries:
+        match = entry.mock.match
+        if match is not None:
+            query.update(match.query or ())
+            headers.update(name.lower() for name in match.headers or ())
+            body = body or bool(match.body)
+        if entry.response_template is not None:
+            for expression in entry.response_template.expressions():
+                if expression.source == "query":
+                    query.add(expression.name)
+                elif expression.source == "headers":
+                    headers.add(expression.name)
+                elif expression.source == "body":
+                    body = True
+    return RouteInputs(query=tuple(sorted(query)), headers=tuple(sorted(headers)), body=body)
+
+
+class ResponseCache:
+    """LRU-кеш ответов с ограничением количества, размера и времени жизни записей.
+
+    Атрибуты:
+        max_entries (int): Максимальное количество записей; 0 отключает кеш.
+        max_bytes (int): Максимальный суммарный размер ответов в байтах.
+        ttl (float): Время жизни записи в секундах; 0 — без ограничения.
+        bytes (int): Суммарный размер ответов в кеше.
+        hits (int): Количество запросов, ответ на которые найден в кеше.
+        misses (int): Количество запросов, ответ на которые не найден в кеше.
+        evictions (int): Количество записей, вытесненных из-за ограничений количества и размера.
+
+    Пример:
+        Поиск и сохранение ответа::
+
+            key = await response_cache.fingerprint(request)
+            cached = response_cache.get(key) if key is not None else None
+            if cached is None and key is not None:
+                response_cache.put(key, entry, response)
+    """
+
+    def __init__(
+        self,
+        table: MockRouteTable,
+        max_entries: int,
+        max_bytes: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Создает кеш и подписывает его на изменения таблицы маршрутов.
+
+        Args:
+            table (MockRouteTable): Таблица маршрутов, моки которой кешируются.
+            max_entries (int): Максимальное количество записей; 0 отключает кеш.
+            max_bytes (int): Максимальный суммарный размер ответов в байтах.
+            ttl (float): Время жизни записи в секундах; 0 — без ограничения.
+            clock (Callable[[], float]): Источник монотонного времени.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._table = table
+        self._clock = clock
+        self._items: OrderedDict[CacheKey, _CacheItem] = OrderedDict()
+        self._keys_by_route: dict[tuple[str, str], set[CacheKey]] = {}
+        self._inputs: dict[tuple[str, str], RouteInputs | None] = {}
+        self._epoch = 0
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        table.subscribe(self.invalidate)
+
+    @property
+    def enabled(self) -> bool:
+        """Включен ли кеш."""
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def __len__(self) -> int:
+        """Возвращает количество записей в кеше."""
+        return len(self._items)
+
+    def _route_inputs(self, route: tuple[str, str]) -> RouteInputs | None:
+        """Возвращает части запроса, от которых зависит ответ для пути, запоминая их до изменения маршрутов."""
+        if route in self._inputs:
+            return self._inputs[route]
+        entries = self._table.candidates(*route)
+        if not entries:
+            return None
+        inputs = route_inputs(entries)
+        if len(self._inputs) >= self.max_entries:
+            del self._inputs[next(iter(self._inputs))]
+        self._inputs[route] = inputs
+        return inputs
+
+    async def fingerprint(self, request: MockRequest) -> CacheKey | None:
+        """Вычисляет отпечаток запроса.
+
+        Args:
+            request (MockRequest): Входящий запрос.
+
+        Returns:
+            CacheKey | None: Отпечаток, либо None, если ответы для пути запроса не кешируются.
+        """
+        if not self.enabled:
+            return None
+        route = (request.method, request.path)
+        inputs = self._route_inputs(route)
+        if inputs is None:
+            return None
+        values: list[object] = [request.query.get(name) for name in inputs.query]
+        values.extend(request.headers.get(name) for name in inputs.headers)
+        if inputs.body:
+            values.append(hashlib.blake2b(await request.body(), digest_size=16).digest())
+        return CacheKey(route, tuple(values), self._epoch)
+
+    def get(self, key: CacheKey) -> tuple[MockRouteEntry, CompiledMockResponse] | None:
+        """Возвращает запись таблицы маршрутов и ответ по отпечатку запроса.
+
+        Args:
+            key (CacheKey): Отпечаток запроса.
+
+        Returns:
+            tuple[MockRouteEntry, CompiledMockResponse] | None: Выбранный мок и собранный ответ, либо None.
+        """
+        item = self._items.get(key)
+        if item is not None and item.expires_at and item.expires_at <= self._clock():
+            self._discard(key)
+            item = None
+        if item is None:
+            self.misses += 1
+            _MISSES.inc()
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        _HITS.inc()
+        return item.entry, item.response
+
+    def put(self, key: CacheKey, entry: MockRouteEntry, response: CompiledMockResponse) -> bool:
+        """Сохраняет ответ мока для отпечатка запроса.
+
+        Ответ не сохраняется, если таблица маршрутов изменилась после вычисления отпечатка
+        или ответ больше ограничения размера кеша.
+
+        Args:
+            key (CacheKey): Отпечаток запроса.
+            entry (MockRouteEntry): Выбранная запись таблицы маршрутов.
+            response (CompiledMockResponse): Собранный ответ.
+
+        Returns:
+            bool: True, если ответ сохранен.
+        """
+        size = _response_size(response)
+        if key.epoch != self._epoch or size > self.max_bytes or not is_cacheable(entry):
+            return False
+        self._discard(key)
+        expires_at = self._clock() + self.ttl if self.ttl else 0.0
+        self._items[key] = _CacheItem(entry, response, size, expires_at)
+        self._keys_by_route.setdefault(key.route, set()).add(key)
+        self.bytes += size
+        while len(self._items) > self.max_entries or self.bytes > self.max_bytes:
+            self._discard(next(iter(self._items)))
+            self.evictions += 1
+        return True
+
+    def _discard(self, key: CacheKey) -> None:
+        """Удаляет запись кеша."""
+        item = self._items.pop(key, None)
+        if item is None:
+            return
+        self.bytes -= item.size
+        keys = self._keys_by_route.get(key.route)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_route[key.route]
+
+    def invalidate(self, route: tuple[str, str] | None) -> None:
+        """Удаляет записи путей, которым соответствует URI измененного мока.
+
+        Args:
+            route (tuple[str, str] | None): Метод и URI добавленного или удаленного мока,
+                либо None для удаления всех записей.
+        """
+        self._epoch += 1
+        if route is None:
+            self.clear()
+            return
+        method, uri = route
+        if is_route_template(uri):
+            template = RouteTemplate.compile(uri)
+            affected = [
+                key
+                for key in {*self._inputs, *self._keys_by_route}
+                if key[0] == method and template.match(key[1]) is not None
+            ]
+        else:
+            affected = [route]
+        for key in affected:
+            self._inputs.pop(key, None)
+            for cache_key in list(self._keys_by_route.get(key, ())):
+                self._discard(cache_key)
+
+    def clear(self) -> None:
+        """Удаляет все записи кеша."""
+        self._epoch += 1
+        self._items.clear()
+        self._keys_by_route.clear()
+        self._inputs.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict[str, float]:
+        """Возвращает статистику кеша воркера.
+
+        Returns:
+            dict[str, float]: Количество записей, их размер, попадания, промахи, доля попаданий и вытеснения.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._items),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+#: Глобальный кеш ответов процесса.
+response_cache = ResponseCache(
+    route_table, config.RESPONSE_CACHE_SIZE, config.RESPONSE_CACHE_BYTES, config.RESPONSE_CACHE_TTL
+)
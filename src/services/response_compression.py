@@ -0,0 +1,336 @@
+"""Модуль сжатия mock-ответов.
+
+Тело ответа мока без шаблона сжимается один раз при добавлении мока в таблицу маршрутов:
+сжатые варианты хранятся в собранном ответе рядом с исходным телом, а для тел из хранилища
+тел ответов — в файлах хранилища рядом с исходным телом. При обработке запроса вариант
+выбирается по заголовку Accept-Encoding. Шаблонизированный ответ сжимается потоково
+при отправке, так как его тело различается для разных запросов.
+
+Сжатие gzip доступно всегда, br требует пакета brotli, zstd — Python 3.14 или пакета zstandard.
+"""
+
+import gzip
+import importlib
+import logging
+import zlib
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, replace
+from types import ModuleType
+from typing import Any, Protocol, cast
+
+from src.services.compiled_response import CompiledMockResponse
+from src.settings import config
+from src.storage.blob_store import blob_store
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = ("text/", "json", "xml", "javascript", "ecmascript", "svg", "csv", "yaml", "graphql")
+"""Части типов содержимого, тела которых сжимаются."""
+
+_VARIANT_HEADERS = frozenset({b"content-length", b"etag", b"vary"})
+
+
+class StreamCompressor(Protocol):
+    """Потоковый компрессор."""
+
+    def compress(self, data: bytes, /) -> bytes:
+        """Сжимает очередную часть тела и возвращает готовую часть сжатых данных."""
+
+    def flush(self) -> bytes:
+        """Завершает сжатие и возвращает оставшиеся сжатые данные."""
+
+
+@dataclass(frozen=True, slots=True)
+class Codec:
+    """Кодировка сжатия.
+
+    Attributes:
+        name (str): Имя кодировки в заголовках Accept-Encoding и Content-Encoding.
+        compress (Callable[[bytes], bytes]): Сжатие тела целиком с высокой степенью для предварительно сжатых вариантов.
+        compressor (Callable[[], StreamCompressor]): Создание быстрого потокового компрессора.
+    """
+
+    name: str
+    compress: Callable[[bytes], bytes]
+    compressor: Callable[[], StreamCompressor]
+
+
+class _BrotliCompressor:
+    """Потоковый компрессор brotli с интерфейсом StreamCompressor."""
+
+    def __init__(self, brotli: Any) -> None:
+        """Создает компрессор."""
+        self._compressor = brotli.Compressor(quality=5)
+
+    def compress(self, data: bytes, /) -> bytes:
+        """Сжимает очередную часть тела."""
+        return cast(bytes, self._compressor.process(data))
+
+    def flush(self) -> bytes:
+        """Завершает сжатие."""
+        return cast(bytes, self._compressor.finish())
+
+
+def _gzip_codec() -> Codec:
+    """Создает кодировку gzip стандартной библиотеки."""
+    return Codec(
+        name="gzip",
+        compress=lambda data: gzip.compress(data, compresslevel=9, mtime=0),
+        compressor=lambda: zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS),
+    )
+
+
+def _brotli_codec() -> Codec | None:
+    """Создает кодировку br, если установлен пакет brotli."""
+    try:
+        brotli = importlib.import_module("brotli")
+    except ImportError:
+        return None
+    return Codec(
+        name="br",
+        compress=lambda data: cast(bytes, brotli.compress(data, quality=9)),
+        compressor=lambda: _BrotliCompressor(brotli),
+    )
+
+
+def _zstd_codec() -> Codec | None:
+    """Создает кодировку zstd из стандартной библиотеки Python 3.14 или пакета zstandard."""
+    zstd: ModuleType
+    try:
+        zstd = importlib.import_module("compression.zstd")
+        return Codec(
+            name="zstd",
+            compress=lambda data: cast(bytes, zstd.compress(data, level=10)),
+            compressor=lambda: cast(StreamCompressor, zstd.ZstdCompressor(level=3)),
+        )
+    except ImportError:
+        pass
+    try:
+        zstd = importlib.import_module("zstandard")
+    except ImportError:
+        return None
+    return Codec(
+        name="zstd",
+        compress=lambda data: cast(bytes, zstd.ZstdCompressor(level=10).compress(data)),
+        compressor=lambda: cast(StreamCompressor, zstd.ZstdCompressor(level=3).compressobj()),
+    )
+
+
+_CODEC_FACTORIES: dict[str, Callable[[], Codec | None]] = {
+    "gzip": _gzip_codec,
+    "br": _brotli_codec,
+    "zstd": _zstd_codec,
+}
+
+
+def load_codecs(names: Iterable[str]) -> tuple[Codec, ...]:
+    """Создает кодировки сжатия по именам из настроек.
+
+    Кодировки, пакеты которых не установлены, пропускаются. Имя none отключает сжатие.
+
+    Args:
+        names (Iterable[str]): Имена кодировок в порядке предпочтения.
+
+    Returns:
+        tuple[Codec, ...]: Доступные кодировки в порядке предпочтения.
+
+    Raises:
+        ValueError: Если имя кодировки неизвестно.
+    """
+    codecs = []
+    for name in names:
+        if name == "none":
+            return ()
+        factory = _CODEC_FACTORIES.get(name)
+        if factory is None:
+            raise ValueError(f"Неизвестная кодировка сжатия: {name}")
+        codec = factory()
+        if codec is None:
+            logger.info("Кодировка сжатия %s недоступна: пакет не установлен", name)
+            continue
+        codecs.append(codec)
+    return tuple(codecs)
+
+
+def negotiate(accept_encoding: bytes | None, available: Iterable[str]) -> str | None:
+    """Выбирает кодировку сжатия по заголовку Accept-Encoding.
+
+    Выбирается кодировка с наибольшим весом q; при равных весах — в порядке предпочтения
+    сервера. Кодировки с q=0 и не указанные в заголовке (если в нем нет `*`) не выбираются.
+
+    Args:
+        accept_encoding (bytes | None): Значение заголовка Accept-Encoding.
+        available (Iterable[str]): Доступные кодировки в порядке предпочтения.
+
+    Returns:
+        str | None: Имя кодировки, либо None, если ответ не сжимается.
+    """
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for item in accept_encoding.decode("latin-1").lower().split(","):
+        name, _, params = item.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip()] = weight
+
+    best, best_weight = None, 0.0
+    for name in available:
+        weight = weights.get(name, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = name, weight
+    return best
+
+
+def _header(response: CompiledMockResponse, name: bytes) -> bytes | None:
+    """Возвращает значение заголовка собранного ответа."""
+    for key, value in response.raw_headers:
+        if key == name:
+            return value
+    return None
+
+
+def _vary(response: CompiledMockResponse) -> bytes:
+    """Возвращает значение заголовка Vary, дополненное Accept-Encoding."""
+    vary = _header(response, b"vary")
+    if vary is None:
+        return b"accept-encoding"
+    if b"accept-encoding" in vary.lower() or vary.strip() == b"*":
+        return vary
+    return vary + b", accept-encoding"
+
+
+def is_compressible(response: CompiledMockResponse, min_size: int) -> bool:
+    """Проверяет, нужно ли сжимать тело ответа.
+
+    Args:
+        response (CompiledMockResponse): Собранный ответ.
+        min_size (int): Размер тела в байтах, меньше которого тело не сжимается.
+
+    Returns:
+        bool: True, если тело не меньше min_size, еще не сжато и имеет текстовый тип содержимого.
+    """
+    size = response.blob.size if response.blob is not None else len(response.body)
+    if not size or size < min_size or _header(response, b"content-encoding") is not None:
+        return False
+    content_type = (_header(response, b"content-type") or b"").decode("latin-1").lower()
+    return any(part in content_type for part in COMPRESSIBLE_TYPES)
+
+
+def encoded_headers(response: CompiledMockResponse, encoding: str) -> list[tuple[bytes, bytes]]:
+    """Возвращает заголовки сжатого ответа без Content-Length.
+
+    Args:
+        response (CompiledMockResponse): Исходный ответ.
+        encoding (str): Кодировка сжатия.
+
+    Returns:
+        list[tuple[bytes, bytes]]: Заголовки с Content-Encoding и Vary.
+    """
+    headers = [(name, value) for name, value in response.raw_headers if name not in _VARIANT_HEADERS]
+    headers.extend(((b"content-encoding", encoding.encode("latin-1")), (b"vary", _vary(response))))
+    return headers
+
+
+def _variant(response: CompiledMockResponse, codec: Codec) -> CompiledMockResponse | None:
+    """Сжимает ответ кодировкой; возвращает None, если сжатие не уменьшает тело."""
+    if response.blob is not None:
+        digest = response.blob.path.name
+        try:
+            blob = blob_store.map_variant(digest, codec.name, codec.compress)
+        except OSError as e:
+            logger.warning("Не удалось сжать тело ответа %s кодировкой %s: %s", digest, codec.name, e)
+            return None
+        body, size = b"", blob.size
+        if size >= response.blob.size:
+            return None
+    else:
+        body, blob = codec.compress(response.body), None
+        size = len(body)
+        if size >= len(response.body):
+            return None
+
+    headers = encoded_headers(response, codec.name)
+    if _header(response, b"content-length") is not None:
+        headers.append((b"content-length", str(size).encode("latin-1")))
+    etag = response.etag
+    if etag is not None:
+        etag = etag[:-1] + f'-{codec.name}"'.encode("latin-1") if etag.endswith(b'"') else etag
+        headers.append((b"etag", etag))
+    return CompiledMockResponse(
+        status_code=response.status_code,
+        body=body,
+        raw_headers=tuple(headers),
+        blob=blob,
+        etag=etag,
+        modified_at=response.modified_at,
+    )
+
+
+def add_variants(response: CompiledMockResponse, codecs: Iterable[Codec], min_size: int) -> CompiledMockResponse:
+    """Добавляет к собранному ответу предварительно сжатые варианты.
+
+    Сжатый вариант получает заголовки Content-Encoding, Vary и собственный ETag; исходный ответ —
+    заголовок Vary: Accept-Encoding. Варианты, не уменьшающие тело, не сохраняются.
+
+    Args:
+        response (CompiledMockResponse): Собранный ответ мока.
+        codecs (Iterable[Codec]): Кодировки сжатия в порядке предпочтения.
+        min_size (int): Размер тела в байтах, меньше которого тело не сжимается.
+
+    Returns:
+        CompiledMockResponse: Ответ со сжатыми вариантами, либо исходный ответ.
+    """
+    if not is_compressible(response, min_size):
+        return response
+    variants = []
+    for codec in codecs:
+        variant = _variant(response, codec)
+        if variant is not None:
+            variants.append((codec.name, variant))
+    if not variants:
+        return response
+    headers = [(name, value) for name, value in response.raw_headers if name != b"vary"]
+    headers.append((b"vary", _vary(response)))
+    return replace(response, raw_headers=tuple(headers), variants=tuple(variants))
+
+
+def accept_encoding(headers: Iterable[tuple[bytes, bytes]]) -> bytes | None:
+    """Возвращает значение заголовка Accept-Encoding запроса.
+
+    Args:
+        headers (Iterable[tuple[bytes, bytes]]): Заголовки запроса в формате ASGI.
+
+    Returns:
+        bytes | None: Значение заголовка, либо None.
+    """
+    for key, value in headers:
+        if key == b"accept-encoding":
+            return value
+    return None
+
+
+def select_variant(headers: Iterable[tuple[bytes, bytes]], response: CompiledMockResponse) -> CompiledMockResponse:
+    """Выбирает предварительно сжатый вариант ответа по заголовку Accept-Encoding запроса.
+
+    Args:
+        headers (Iterable[tuple[bytes, bytes]]): Заголовки запроса в формате ASGI.
+        response (CompiledMockResponse): Собранный ответ мока.
+
+    Returns:
+        CompiledMockResponse: Сжатый вариант, либо исходный ответ.
+    """
+    if not response.variants:
+        return response
+    encoding = negotiate(accept_encoding(headers), (name for name, _ in response.variants))
+    return next((variant for name, variant in response.variants if name == encoding), response)
+
+
+#: Кодировки сжатия ответов процесса в порядке предпочтения.
+response_codecs = load_codecs(name.strip() for name in config.COMPRESSION_ENCODINGS.split(",") if name.strip())
@@ -0,0 +1,131 @@
+"""Модуль профилей задержки и потоковой отдачи mock-ответов.
+
+Профили мока компилируются один раз при добавлении в таблицу маршрутов: профиль задержки
+превращается в функцию выбора случайной задержки, параметры потоковой отдачи — в план StreamPlan.
+Все ожидания выполняются таймерами цикла событий без потоков, тело ответа не копируется целиком:
+части отдаются срезами собранного тела или отображенного в память файла тела из хранилища тел ответов.
+"""
+
+import asyncio
+import random
+from bisect import bisect_right
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from starlette.types import Send
+
+from src.api.models.mock_model import MAX_LATENCY_MS, MockLatency, MockStreaming
+from src.services.compiled_response import CompiledMockResponse
+
+LatencySampler = Callable[[], float]
+"""Функция, возвращающая случайную задержку в секундах."""
+
+_random = random.Random()  # noqa: S311 - задержки не требуют криптостойкого генератора
+
+
+def compile_latency(profile: MockLatency) -> LatencySampler:
+    """Компилирует профиль задержки в функцию выбора задержки.
+
+    Args:
+        profile (MockLatency): Профиль задержки в миллисекундах.
+
+    Returns:
+        LatencySampler: Функция, возвращающая задержку в секундах.
+    """
+    low = profile.min if profile.min is not None else 0.0
+    high = profile.max if profile.max is not None else float(MAX_LATENCY_MS)
+
+    if profile.distribution == "fixed" and profile.value is not None:
+        value = profile.value / 1000
+        return lambda: value
+    if profile.distribution == "uniform":
+        return lambda: _random.uniform(low, high) / 1000
+    if profile.distribution == "normal" and profile.mean is not None and profile.stddev is not None:
+        mean, stddev = profile.mean, profile.stddev
+        return lambda: min(max(_random.gauss(mean, stddev), low), high) / 1000
+    if profile.distribution == "percentiles" and profile.percentiles:
+        points = sorted(profile.percentiles.items())
+        ranks = [rank for rank, _ in points]
+        values = [value for _, value in points]
+
+        def sample() -> float:
+            rank = _random.random() * 100
+            index = bisect_right(ranks, rank)
+            if index == 0:
+                return values[0] / 1000
+            if index == len(ranks):
+                return values[-1] / 1000
+            left, right = ranks[index - 1], ranks[index]
+            ratio = (rank - left) / (right - left)
+            return (values[index - 1] + (values[index] - values[index - 1]) * ratio) / 1000
+
+        return sample
+    raise ValueError(f"Некорректный профиль задержки: {profile}")
+
+
+@dataclass(frozen=True, slots=True)
+class StreamPlan:
+    """План потоковой отдачи тела ответа.
+
+    Attributes:
+        chunk_size (int): Размер части тела в байтах.
+        rate (int | None): Скорость отдачи в байтах в секунду.
+        chunk_delay (LatencySampler | None): Функция выбора задержки перед каждой следующей частью.
+        chunked (bool): Отдавать ответ без Content-Length (Transfer-Encoding: chunked).
+    """
+
+    chunk_size: int
+    rate: int | None
+    chunk_delay: LatencySampler | None
+    chunked: bool
+
+
+def compile_stream(stream: MockStreaming) -> StreamPlan:
+    """Компилирует параметры потоковой отдачи мока в план.
+
+    Args:
+        stream (MockStreaming): Параметры потоковой отдачи.
+
+    Returns:
+        StreamPlan: План потоковой отдачи.
+    """
+    return StreamPlan(
+        chunk_size=stream.chunk_size,
+        rate=stream.rate,
+        chunk_delay=compile_latency(stream.chunk_delay) if stream.chunk_delay else None,
+        chunked=stream.chunked,
+    )
+
+
+async def send_streamed_response(send: Send, response: CompiledMockResponse, plan: StreamPlan) -> None:
+    """Отправляет тело ответа частями с ограничением скорости и задержками между частями.
+
+    Время отправки каждой части отсчитывается от общего расписания, а не от окончания предыдущей
+    отправки, поэтому средняя скорость не снижается из-за накладных расходов. Задержки между частями
+    сдвигают расписание.
+
+    Args:
+        send (Send): Канал отправки сообщений ASGI.
+        response (CompiledMockResponse): Собранный ответ мока.
+        plan (StreamPlan): План потоковой отдачи.
+    """
+    headers = [header for header in response.raw_headers if not (plan.chunked and header[0] == b"content-length")]
+    await send({"type": "http.response.start", "status": response.status_code, "headers": headers})
+    body = response.content()
+    if not body:
+        await send({"type": "http.response.body", "body": b""})
+        return
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time()
+    for offset in range(0, len(body), plan.chunk_size):
+        if offset and plan.chunk_delay is not None:
+            deadline += plan.chunk_delay()
+        wait = deadline - loop.time()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        chunk = body[offset : offset + plan.chunk_size]
+        more_body = offset + plan.chunk_size < len(body)
+        await send({"type": "http.response.body", "body": bytes(chunk), "more_body": more_body})
+        if plan.rate:
+            deadline += len(chunk) / plan.rate
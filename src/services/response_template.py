@@ -0,0 +1,300 @@
+"""Модуль шаблонизации mock-ответов.
+
+Шаблон ответа компилируется один раз при добавлении мока в таблицу маршрутов: тело кодируется
+в JSON с маркерами на месте вставок, после чего закодированные байты разрезаются на готовые
+сегменты и вставки. При обработке запроса тело собирается склейкой сегментов со значениями
+вставок, без повторного разбора и кодирования дерева JSON тела.
+"""
+
+import json
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Literal
+from uuid import uuid4
+
+from src.services.compiled_response import CompiledMockResponse, JsonEncoder, get_json_encoder
+from src.services.mock_matcher import lookup_json_path
+from src.services.mock_request import MISSING, MockRequest
+from src.services.template_expression import TemplateExpression, find_template_expressions
+from src.settings import config
+
+if TYPE_CHECKING:
+    from src.api.models.mock_model import MockWithUUID
+
+InsertMode = Literal["json", "string", "header"]
+
+
+class TemplateContext:
+    """Значения вставок шаблона для одного запроса.
+
+    Генерируемые значения (uuid, now) вычисляются один раз на запрос, поэтому несколько
+    вставок одного выражения в ответе получают одинаковое значение.
+
+    Attributes:
+        request (MockRequest): Входящий запрос.
+        params (dict[str, str]): Параметры пути запроса.
+        document (object): Разобранное JSON-тело запроса, либо MISSING.
+    """
+
+    __slots__ = ("request", "params", "document", "_uuid", "_now")
+
+    def __init__(self, request: MockRequest, params: dict[str, str], document: object) -> None:
+        """Создает контекст.
+
+        Args:
+            request (MockRequest): Входящий запрос.
+            params (dict[str, str]): Параметры пути запроса.
+            document (object): Разобранное JSON-тело запроса, либо MISSING.
+        """
+        self.request = request
+        self.params = params
+        self.document = document
+        self._uuid: str | None = None
+        self._now: datetime | None = None
+
+    def _current_time(self) -> datetime:
+        """Возвращает время запроса, одинаковое для всех вставок ответа."""
+        if self._now is None:
+            self._now = datetime.now(UTC)
+        return self._now
+
+    def value(self, expression: TemplateExpression) -> object:
+        """Возвращает значение выражения.
+
+        Args:
+            expression (TemplateExpression): Выражение шаблона.
+
+        Returns:
+            object: Значение, либо MISSING, если его нет в запросе.
+        """
+        source, name = expression.source, expression.name
+        if source == "path":
+            return self.params.get(name, MISSING)
+        if source == "query":
+            return self.request.query.get(name, MISSING)
+        if source == "headers":
+            return self.request.headers.get(name, MISSING)
+        if source == "body":
+            if not name or self.document is MISSING:
+                return self.document
+            return lookup_json_path(self.document, name)
+        if source == "request":
+            return self.request.method if name == "method" else self.request.path
+        if source == "uuid":
+            if self._uuid is None:
+                self._uuid = str(uuid4())
+            return self._uuid
+        if source == "now":
+            return self._current_time().isoformat()
+        if source == "timestamp":
+            return int(self._current_time().timestamp())
+        return int(self._current_time().timestamp() * 1000)
+
+
+def _as_text(value: object) -> str:
+    """Приводит значение вставки к тексту: строки без изменений, остальные значения — компактным JSON."""
+    if value is MISSING or value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+@dataclass(frozen=True, slots=True)
+class TemplateInsert:
+    """Вставка значения выражения в ответ.
+
+    Attributes:
+        expression (TemplateExpression): Выражение шаблона.
+        mode (InsertMode): Способ кодирования значения: JSON-значение вместо строки тела ("json"),
+            текст внутри строки тела ("string") или текст значения заголовка ("header").
+        encode (JsonEncoder): Кодировщик JSON-значений.
+    """
+
+    expression: TemplateExpression
+    mode: InsertMode
+    encode: JsonEncoder
+
+    def render(self, context: TemplateContext) -> bytes:
+        """Кодирует значение выражения для вставки.
+
+        Args:
+            context (TemplateContext): Значения вставок запроса.
+
+        Returns:
+            bytes: Закодированное значение.
+        """
+        value = context.value(self.expression)
+        if self.mode == "json":
+            return b"null" if value is MISSING else self.encode(value)
+        if self.mode == "string":
+            return json.dumps(_as_text(value), ensure_ascii=False)[1:-1].encode()
+        return _as_text(value).encode("latin-1", errors="replace")
+
+
+Segment = bytes | TemplateInsert
+
+
+def _render(segments: tuple[Segment, ...], context: TemplateContext) -> bytes:
+    """Склеивает готовые сегменты со значениями вставок."""
+    return b"".join(segment if isinstance(segment, bytes) else segment.render(context) for segment in segments)
+
+
+def _compile_body(body: dict[str, object] | None, encode: JsonEncoder) -> tuple[Segment, ...]:
+    """Компилирует тело ответа в сегменты.
+
+    Строки с выражениями заменяются маркерами, тело кодируется в JSON один раз, и закодированные
+    байты разрезаются по маркерам. Строка из одного выражения заменяется вместе с кавычками.
+    """
+    token = uuid4().hex
+    inserts: list[TemplateInsert] = []
+
+    def marker(expression: TemplateExpression, mode: InsertMode) -> str:
+        inserts.append(TemplateInsert(expression, mode, encode))
+        return f"{token}{len(inserts) - 1:06d}"
+
+    def mark(value: object) -> object:
+        if isinstance(value, dict):
+            return {key: mark(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [mark(item) for item in value]
+        if not isinstance(value, str):
+            return value
+        found = find_template_expressions(value)
+        if len(found) == 1 and found[0][:2] == (0, len(value)):
+            return marker(found[0][2], "json")
+        parts: list[str] = []
+        position = 0
+        for start, end, expression in found:
+            parts.extend((value[position:start], marker(expression, "string")))
+            position = end
+        parts.append(value[position:])
+        return "".join(parts)
+
+    encoded = encode(mark(body) if body else None)
+    segments: list[Segment] = []
+    position = 0
+    for match in re.finditer(token.encode() + rb"(\d{6})", encoded):
+        insert = inserts[int(match.group(1))]
+        start, end = match.span()
+        if insert.mode == "json":
+            start, end = start - 1, end + 1
+        segments.extend((encoded[position:start], insert))
+        position = end
+    segments.append(encoded[position:])
+    return tuple(segment for segment in segments if segment != b"")
+
+
+def _compile_header(value: str, encode: JsonEncoder) -> tuple[Segment, ...]:
+    """Компилирует значение заголовка в сегменты."""
+    segments: list[Segment] = []
+    position = 0
+    for start, end, expression in find_template_expressions(value):
+        segments.extend((value[position:start].encode("latin-1"), TemplateInsert(expression, "header", encode)))
+        position = end
+    segments.append(value[position:].encode("latin-1"))
+    return tuple(segment for segment in segments if segment != b"")
+
+
+def _reads_body(segments: Iterable[Segment]) -> bool:
+    """Проверяет, используют ли вставки тело запроса."""
+    return any(isinstance(segment, TemplateInsert) and segment.expression.source == "body" for segment in segments)
+
+
+@dataclass(frozen=True, slots=True)
+class ResponseTemplate:
+    """Скомпилированный шаблон ответа.
+
+    Attributes:
+        status_code (int): HTTP код ответа.
+        body (tuple[Segment, ...]): Сегменты тела ответа.
+        headers (tuple[tuple[bytes, tuple[Segment, ...]], ...]): Имена и сегменты значений заголовков
+            без Content-Length.
+        content_length (bool): Добавлять заголовок Content-Length по длине собранного тела.
+        reads_body (bool): Используют ли вставки JSON-тело запроса.
+    """
+
+    status_code: int
+    body: tuple[Segment, ...]
+    headers: tuple[tuple[bytes, tuple[Segment, ...]], ...]
+    content_length: bool
+    reads_body: bool
+
+    def expressions(self) -> set[TemplateExpression]:
+        """Возвращает выражения всех вставок шаблона.
+
+        Returns:
+            set[TemplateExpression]: Выражения вставок тела и заголовков.
+        """
+        segments = [*self.body, *(segment for _, value in self.headers for segment in value)]
+        return {segment.expression for segment in segments if isinstance(segment, TemplateInsert)}
+
+    async def render_headers(self, request: MockRequest, params: dict[str, str]) -> CompiledMockResponse:
+        """Собирает заголовки ответа без тела и без Content-Length, например для HEAD-запроса.
+
+        Args:
+            request (MockRequest): Входящий запрос.
+            params (dict[str, str]): Параметры пути запроса.
+
+        Returns:
+            CompiledMockResponse: Ответ с пустым телом.
+        """
+        reads_body = any(_reads_body(value) for _, value in self.headers)
+        context = TemplateContext(request, params, await request.json() if reads_body else MISSING)
+        raw_headers = tuple((name, _render(value, context)) for name, value in self.headers)
+        return CompiledMockResponse(status_code=self.status_code, body=b"", raw_headers=raw_headers)
+
+    async def render(self, request: MockRequest, params: dict[str, str]) -> CompiledMockResponse:
+        """Собирает ответ для запроса.
+
+        Args:
+            request (MockRequest): Входящий запрос.
+            params (dict[str, str]): Параметры пути запроса.
+
+        Returns:
+            CompiledMockResponse: Собранный ответ.
+        """
+        document = await request.json() if self.reads_body else MISSING
+        context = TemplateContext(request, params, document)
+        body = _render(self.body, context)
+        raw_headers = [(name, _render(value, context)) for name, value in self.headers]
+        if self.content_length:
+            raw_headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        return CompiledMockResponse(status_code=self.status_code, body=body, raw_headers=tuple(raw_headers))
+
+
+def compile_response_template(
+    mock_data: "MockWithUUID", response: CompiledMockResponse, encoder: JsonEncoder | None = None
+) -> ResponseTemplate:
+    """Компилирует шаблон ответа мока.
+
+    Args:
+        mock_data (MockWithUUID): Данные мока с параметрами шаблонизации template.
+        response (CompiledMockResponse): Собранный без подстановок ответ мока.
+        encoder (JsonEncoder | None): Кодировщик JSON. По умолчанию выбирается по config.JSON_ENCODER.
+
+    Returns:
+        ResponseTemplate: Скомпилированный шаблон.
+    """
+    encode = encoder or get_json_encoder(config.JSON_ENCODER)
+    template = mock_data.template
+    render_body = template is not None and template.body
+    render_headers = template is not None and template.headers
+
+    body = _compile_body(mock_data.body, encode) if render_body else (response.body,)
+    explicit_length = any(key.lower() == "content-length" for key in mock_data.headers or {})
+    content_length = not explicit_length and any(name == b"content-length" for name, _ in response.raw_headers)
+    headers = tuple(
+        (name, _compile_header(value.decode("latin-1"), encode) if render_headers else (value,))
+        for name, value in response.raw_headers
+        if not (content_length and name == b"content-length")
+    )
+    return ResponseTemplate(
+        status_code=response.status_code,
+        body=body,
+        headers=headers,
+        content_length=content_length,
+        reads_body=_reads_body(body) or any(_reads_body(value) for _, value in headers),
+    )
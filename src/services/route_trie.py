@@ -0,0 +1,246 @@
+"""Модуль сопоставления путей запросов с шаблонами URI моков.
+
+Шаблон URI состоит из сегментов трех видов:
+    - статический сегмент, например `users`;
+    - параметр `{name}`, совпадающий с одним любым сегментом пути;
+    - wildcard `*` в конце шаблона, совпадающий с одним или несколькими оставшимися сегментами.
+
+Шаблоны одного HTTP-метода хранятся в посегментном дереве (trie), поэтому стоимость поиска
+зависит от глубины пути, а не от количества моков. При совпадении нескольких шаблонов
+приоритет определяется посегментно: статический сегмент > параметр > wildcard.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+PARAM_SEGMENT_REGEX = re.compile(r"^\{([A-Za-z_][A-Za-z0-9_]*)\}$")
+WILDCARD_SEGMENT = "*"
+WILDCARD_PARAM = "*"
+"""Имя параметра, в который попадает часть пути, совпавшая с wildcard."""
+
+
+def is_route_template(uri: str) -> bool:
+    """Проверяет, содержит ли URI параметры или wildcard.
+
+    Args:
+        uri (str): URI мока.
+
+    Returns:
+        bool: True, если URI является шаблоном, иначе False.
+    """
+    return "{" in uri or WILDCARD_SEGMENT in uri
+
+
+def validate_route_template(uri: str) -> None:
+    """Проверяет корректность шаблона URI.
+
+    Args:
+        uri (str): URI мока.
+
+    Raises:
+        ValueError: Если параметр или wildcard записаны некорректно.
+    """
+    segments = uri.split("/")[1:]
+    names: set[str] = set()
+    for index, segment in enumerate(segments):
+        if segment == WILDCARD_SEGMENT:
+            if index != len(segments) - 1:
+                raise ValueError("Wildcard '*' допускается только последним сегментом URI")
+            continue
+        if "{" in segment or "}" in segment or WILDCARD_SEGMENT in segment:
+            match = PARAM_SEGMENT_REGEX.match(segment)
+            if not match:
+                raise ValueError(f"Некорректный сегмент шаблона URI: {segment}")
+            if match.group(1) in names:
+                raise ValueError(f"Параметр {match.group(1)} указан в URI несколько раз")
+            names.add(match.group(1))
+
+
+@dataclass(frozen=True, slots=True)
+class RouteTemplate:
+    """Скомпилированный шаблон URI.
+
+    Attributes:
+        uri (str): Исходный шаблон URI.
+        segments (tuple[str, ...]): Сегменты шаблона.
+        param_names (tuple[str | None, ...]): Имена параметров по позициям сегментов (None для статических).
+        wildcard (bool): Заканчивается ли шаблон wildcard-сегментом.
+    """
+
+    uri: str
+    segments: tuple[str, ...]
+    param_names: tuple[str | None, ...]
+    wildcard: bool
+
+    @classmethod
+    def compile(cls, uri: str) -> "RouteTemplate":
+        """Компилирует шаблон URI.
+
+        Args:
+            uri (str): Шаблон URI.
+
+        Returns:
+            RouteTemplate: Скомпилированный шаблон.
+        """
+        segments = tuple(uri.split("/")[1:])
+        wildcard = bool(segments) and segments[-1] == WILDCARD_SEGMENT
+        if wildcard:
+            segments = segments[:-1]
+        param_names = tuple(
+            match.group(1) if (match := PARAM_SEGMENT_REGEX.match(segment)) else None for segment in segments
+        )
+        return cls(uri=uri, segments=segments, param_names=param_names, wildcard=wildcard)
+
+    def bind(self, path_segments: list[str], values: list[str]) -> dict[str, str]:
+        """Сопоставляет значения параметров, найденные при поиске в дереве, с их именами.
+
+        Args:
+            path_segments (list[str]): Сегменты пути запроса.
+            values (list[str]): Значения параметров в порядке следования в пути.
+
+        Returns:
+            dict[str, str]: Параметры пути по именам.
+        """
+        params = dict(zip((name for name in self.param_names if name), values, strict=True))
+        if self.wildcard:
+            params[WILDCARD_PARAM] = "/".join(path_segments[len(self.segments) :])
+        return params
+
+    def match(self, path: str) -> dict[str, str] | None:
+        """Сопоставляет путь запроса с одним шаблоном.
+
+        Args:
+            path (str): Путь запроса.
+
+        Returns:
+            dict[str, str] | None: Параметры пути, либо None, если путь не совпадает с шаблоном.
+        """
+        path_segments = path.split("/")[1:]
+        if len(path_segments) < len(self.segments) + self.wildcard:
+            return None
+        if not self.wildcard and len(path_segments) != len(self.segments):
+            return None
+
+        values = []
+        for segment, expected, name in zip(path_segments, self.segments, self.param_names, strict=False):
+            if name is not None:
+                if not segment:
+                    return None
+                values.append(segment)
+            elif segment != expected:
+                return None
+        return self.bind(path_segments, values)
+
+
+@dataclass(slots=True)
+class _RouteNode:
+    """Узел дерева шаблонов URI.
+
+    Шаблоны, отличающиеся только именами параметров, оканчиваются в одном узле,
+    поэтому узел хранит их словарем по исходному URI.
+    """
+
+    static: dict[str, "_RouteNode"] = field(default_factory=dict)
+    param: "_RouteNode | None" = None
+    templates: dict[str, RouteTemplate] = field(default_factory=dict)
+    wildcards: dict[str, RouteTemplate] = field(default_factory=dict)
+
+
+class RouteTrie:
+    """Посегментное дерево шаблонов URI одного HTTP-метода.
+
+    Пример:
+        Поиск шаблона по пути::
+
+            trie = RouteTrie()
+            trie.insert(RouteTemplate.compile("/users/{id}"))
+            trie.match("/users/42")  # [(RouteTemplate(uri="/users/{id}", ...), {"id": "42"})]
+    """
+
+    def __init__(self) -> None:
+        """Создает пустое дерево."""
+        self._root = _RouteNode()
+        self._size = 0
+
+    def insert(self, template: RouteTemplate) -> None:
+        """Добавляет шаблон в дерево.
+
+        Args:
+            template (RouteTemplate): Скомпилированный шаблон URI.
+        """
+        node = self._root
+        for segment, name in zip(template.segments, template.param_names, strict=True):
+            if name is not None:
+                if node.param is None:
+                    node.param = _RouteNode()
+                node = node.param
+            else:
+                node = node.static.setdefault(segment, _RouteNode())
+
+        templates = node.wildcards if template.wildcard else node.templates
+        if template.uri not in templates:
+            self._size += 1
+        templates[template.uri] = template
+
+    def remove(self, template: RouteTemplate) -> None:
+        """Удаляет шаблон из дерева.
+
+        Args:
+            template (RouteTemplate): Скомпилированный шаблон URI.
+        """
+        node: _RouteNode | None = self._root
+        for segment, name in zip(template.segments, template.param_names, strict=True):
+            if node is None:
+                return
+            node = node.param if name is not None else node.static.get(segment)
+        if node is None:
+            return
+
+        templates = node.wildcards if template.wildcard else node.templates
+        if templates.pop(template.uri, None) is not None:
+            self._size -= 1
+
+    def match(self, path: str) -> list[tuple[RouteTemplate, dict[str, str]]]:
+        """Находит шаблоны с наивысшим приоритетом для пути запроса.
+
+        Возвращает несколько шаблонов, только если они отличаются лишь именами параметров.
+
+        Args:
+            path (str): Путь запроса.
+
+        Returns:
+            list[tuple[RouteTemplate, dict[str, str]]]: Шаблоны и параметры пути, либо пустой список.
+        """
+        segments = path.split("/")[1:]
+        values: list[str] = []
+        templates = self._match(self._root, segments, 0, values)
+        if not templates:
+            return []
+        return [(template, template.bind(segments, values)) for template in templates.values()]
+
+    def _match(
+        self, node: _RouteNode, segments: list[str], index: int, values: list[str]
+    ) -> dict[str, RouteTemplate] | None:
+        """Рекурсивно ищет шаблоны, перебирая варианты в порядке приоритета."""
+        if index == len(segments):
+            return node.templates or None
+
+        segment = segments[index]
+        child = node.static.get(segment)
+        if child is not None:
+            templates = self._match(child, segments, index + 1, values)
+            if templates:
+                return templates
+
+        if node.param is not None and segment:
+            values.append(segment)
+            templates = self._match(node.param, segments, index + 1, values)
+            if templates:
+                return templates
+            values.pop()
+
+        return node.wildcards or None
+
+    def __len__(self) -> int:
+        """Возвращает количество шаблонов в дереве."""
+        return self._size
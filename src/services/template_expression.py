@@ -0,0 +1,75 @@
+"""Модуль разбора выражений шаблонов mock-ответов.
+
+Выражение записывается в строке тела или значении заголовка ответа как `{{ выражение }}`
+и ссылается на данные запроса (`path.id`, `query.page`, `headers.x-tenant`, `body.user.id`)
+или на генерируемое значение (`uuid`, `now`, `timestamp`, `timestamp_ms`).
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Literal, cast
+
+TEMPLATE_PATTERN = re.compile(r"\{\{\s*(.*?)\s*\}\}")
+"""Регулярное выражение вставки `{{ выражение }}`."""
+
+ExpressionSource = Literal["path", "query", "headers", "body", "request", "uuid", "now", "timestamp", "timestamp_ms"]
+
+_GENERATED = frozenset({"uuid", "now", "timestamp", "timestamp_ms"})
+_NAMED = frozenset({"path", "query", "headers"})
+_REQUEST_FIELDS = frozenset({"method", "path"})
+
+
+@dataclass(frozen=True, slots=True)
+class TemplateExpression:
+    """Разобранное выражение шаблона.
+
+    Attributes:
+        source (ExpressionSource): Источник значения.
+        name (str): Имя параметра, заголовка (в нижнем регистре), поля запроса или путь к полю тела;
+            пустая строка для генерируемых значений и всего тела запроса.
+    """
+
+    source: ExpressionSource
+    name: str = ""
+
+
+def parse_template_expression(text: str) -> TemplateExpression:
+    """Разбирает выражение шаблона.
+
+    Args:
+        text (str): Выражение без фигурных скобок, например "path.id" или "uuid".
+
+    Returns:
+        TemplateExpression: Разобранное выражение.
+
+    Raises:
+        ValueError: Если выражение некорректно.
+    """
+    source, separator, name = text.partition(".")
+    if source in _GENERATED and not separator:
+        return TemplateExpression(cast(ExpressionSource, source))
+    if source == "body" and (not separator or all(name.split("."))):
+        return TemplateExpression("body", name)
+    if source in _NAMED and name:
+        return TemplateExpression(cast(ExpressionSource, source), name.lower() if source == "headers" else name)
+    if source == "request" and name in _REQUEST_FIELDS:
+        return TemplateExpression("request", name)
+    raise ValueError(f"Некорректное выражение шаблона: {{{{ {text} }}}}")
+
+
+def find_template_expressions(value: str) -> list[tuple[int, int, TemplateExpression]]:
+    """Находит и разбирает выражения шаблона в строке.
+
+    Args:
+        value (str): Строка значения тела или заголовка ответа.
+
+    Returns:
+        list[tuple[int, int, TemplateExpression]]: Начало и конец каждой вставки в строке и ее выражение.
+
+    Raises:
+        ValueError: Если одно из выражений некорректно.
+    """
+    return [
+        (match.start(), match.end(), parse_template_expression(match.group(1)))
+        for match in TEMPLATE_PATTERN.finditer(value)
+    ]
@@ -1,3 +1,7 @@
+import tempfile
+from pathlib import Path
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -14,10 +18,54 @@ class Settings(BaseSettings):
         APP_DESCRIPTION (str): Описание приложения.
         SERVER_HOST (str): Хост сервера.
         SERVER_PORT (int): Порт сервера.
-        SERVER_RELOAD (bool): Перезапускать сервер при изменениях.
+        SERVER_RELOAD (bool): Перезапускать сервер при изменениях; только с одним воркером.
         SERVER_WORKERS (int): Количество воркеров сервера.
-        DB_TYPE (str): Тип используемой базы данных.
+        DB_TYPE (str): Тип хранилища мок-данных: sqlite3 и sqlalchemy (база данных DB_HOST) или memory.
         DB_HOST (str): Строка подключения к базе данных.
+        DB_SHARED_HOST (str | None): Строка подключения к общей базе данных для нескольких воркеров.
+        DB_PRESET (str | None): Набор параметров движка базы данных.
+        DB_ECHO (bool): Логировать SQL-запросы.
+        DB_POOL_SIZE (int | None): Количество постоянных соединений пула.
+        DB_MAX_OVERFLOW (int | None): Количество дополнительных соединений пула.
+        DB_POOL_RECYCLE (int | None): Время жизни соединения пула в секундах.
+        DB_POOL_TIMEOUT (float | None): Время ожидания свободного соединения пула в секундах.
+        DB_POOL_PRE_PING (bool | None): Проверять соединение перед выдачей из пула.
+        DB_STATEMENT_CACHE_SIZE (int | None): Размер кеша подготовленных запросов драйвера.
+        DB_SQLITE_JOURNAL_MODE (str | None): PRAGMA journal_mode SQLite.
+        DB_SQLITE_SYNCHRONOUS (str | None): PRAGMA synchronous SQLite.
+        DB_SQLITE_MMAP_SIZE (int | None): PRAGMA mmap_size SQLite в байтах.
+        DB_SQLITE_BUSY_TIMEOUT (int | None): PRAGMA busy_timeout SQLite в миллисекундах.
+        JSON_ENCODER (str): Кодировщик JSON для предварительной сборки mock-ответов.
+        MOCK_SYNC_INTERVAL (float): Интервал синхронизации мок-данных между воркерами в секундах.
+        MOCK_SYNC_GAP_TIMEOUT (float): Время ожидания пропущенных записей журнала изменений в секундах.
+        MOCK_CHANGE_LOG_RETENTION (int): Количество хранимых записей журнала изменений мок-данных.
+        MOCK_HISTORY_LIMIT (int): Количество хранимых предыдущих версий каждого мока.
+        MOCK_REAPER_INTERVAL (float): Максимальный интервал проверки истекших моков в секундах.
+        MOCK_REAPER_BATCH_SIZE (int): Максимальное количество моков в одном удалении истекших моков.
+        BULK_BATCH_SIZE (int): Размер пакета при массовом импорте и экспорте мок-данных.
+        SNAPSHOT_PATH (str | None): Файл снимка мок-данных для восстановления после перезапуска.
+        SNAPSHOT_INTERVAL (float): Интервал сохранения снимка мок-данных в секундах.
+        BLOB_DIR (str): Каталог хранилища тел ответов.
+        BLOB_INLINE_LIMIT (int): Размер JSON-тела мока, больше которого тело сохраняется в хранилище тел ответов.
+        SEQUENCE_CURSORS_PATH (str | None): Файл позиций сценариев моков, общий для воркеров.
+        RESPONSE_CACHE_SIZE (int): Максимальное количество ответов в кеше ответов воркера.
+        RESPONSE_CACHE_BYTES (int): Максимальный суммарный размер ответов в кеше ответов воркера в байтах.
+        RESPONSE_CACHE_TTL (float): Время жизни ответа в кеше ответов в секундах.
+        COMPRESSION_ENCODINGS (str): Кодировки сжатия ответов через запятую в порядке предпочтения.
+        COMPRESSION_MIN_SIZE (int): Размер тела ответа в байтах, меньше которого тело не сжимается.
+        PROXY_URL (str | None): Базовый URL upstream-сервера для запросов, не найденных среди моков.
+        PROXY_RECORD (bool): Сохранять ответы upstream-сервера как мок-данные.
+        PROXY_RECORD_LIMIT (int): Максимальный размер сохраняемого тела ответа upstream-сервера в байтах.
+        PROXY_TIMEOUT (float): Таймаут операций с upstream-сервером в секундах.
+        PROXY_MAX_CONNECTIONS (int): Максимальное количество соединений воркера с upstream-сервером.
+        METRICS_DIR (str | None): Каталог обмена снимками метрик между воркерами.
+        METRICS_FLUSH_INTERVAL (float): Интервал сохранения снимка метрик воркера в секундах.
+        JOURNAL_ENABLED (bool): Записывать входящие запросы к мокам в журнал запросов.
+        JOURNAL_CAPACITY (int): Емкость кольцевого буфера журнала запросов воркера.
+        JOURNAL_BODY_LIMIT (int): Максимальный размер сохраняемого тела запроса в байтах.
+        JOURNAL_FLUSH_INTERVAL (float): Интервал сохранения журнала запросов в базу данных в секундах.
+        JOURNAL_BATCH_SIZE (int): Количество записей журнала запросов, сохраняемых в одной транзакции.
+        JOURNAL_RETENTION (int): Количество хранимых записей журнала запросов.
     """
 
     model_config = SettingsConfigDict(
@@ -35,9 +83,222 @@ class Settings(BaseSettings):
     # Настройки сервера
     SERVER_HOST: str = Field(default="localhost", description="Хост, на котором запускается сервер.")
     SERVER_PORT: int = Field(default=8000, description="Порт, на котором запускается сервер.")
-    SERVER_RELOAD: bool = Field(default=True, description="Перезапускать сервер при изменениях кода.")
+    SERVER_RELOAD: bool = Field(
+        default=False, description="Перезапускать сервер при изменениях кода; только при SERVER_WORKERS=1."
+    )
     SERVER_WORKERS: int = Field(default=4, description="Количество воркеров для обработки запросов.")
 
     # Настройки базы данных
-    DB_TYPE: str = Field(default="sqlite3", description="Тип используемой базы данных.")
+    DB_TYPE: Literal["sqlite3", "sqlalchemy", "memory"] = Field(
+        default="sqlite3",
+        description=(
+            "Тип хранилища мок-данных: sqlite3 и sqlalchemy используют базу данных DB_HOST через SQLAlchemy, "
+            "memory хранит мок-данные в памяти процесса без ORM."
+        ),
+    )
     DB_HOST: str = Field(default="sqlite+aiosqlite:///:memory:", description="Строка подключения к базе данных.")
+    DB_SHARED_HOST: str | None = Field(
+        default=None,
+        description=(
+            "Файловая база данных, используемая вместо базы в памяти при запуске нескольких воркеров; "
+            "по умолчанию при каждом запуске создается новая база во временном каталоге. "
+            "Заданная база данных не очищается."
+        ),
+    )
+    DB_PRESET: Literal["memory-fast", "durable-sqlite", "server"] | None = Field(
+        default=None,
+        description=(
+            "Набор параметров движка базы данных; по умолчанию выбирается по строке подключения. "
+            "Заданные ниже параметры переопределяют значения набора."
+        ),
+    )
+    DB_ECHO: bool = Field(default=False, description="Логировать SQL-запросы (замедляет каждый запрос к базе данных).")
+    DB_POOL_SIZE: int | None = Field(default=None, ge=1, description="Количество постоянных соединений пула.")
+    DB_MAX_OVERFLOW: int | None = Field(
+        default=None, ge=0, description="Количество дополнительных соединений пула сверх DB_POOL_SIZE."
+    )
+    DB_POOL_RECYCLE: int | None = Field(default=None, description="Время жизни соединения пула в секундах.")
+    DB_POOL_TIMEOUT: float | None = Field(
+        default=None, gt=0, description="Время ожидания свободного соединения пула в секундах."
+    )
+    DB_POOL_PRE_PING: bool | None = Field(default=None, description="Проверять соединение перед выдачей из пула.")
+    DB_STATEMENT_CACHE_SIZE: int | None = Field(
+        default=None,
+        ge=0,
+        description="Размер кеша подготовленных запросов драйвера (cached_statements SQLite, asyncpg).",
+    )
+    DB_SQLITE_JOURNAL_MODE: Literal["DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"] | None = Field(
+        default=None, description="PRAGMA journal_mode SQLite."
+    )
+    DB_SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] | None = Field(
+        default=None, description="PRAGMA synchronous SQLite."
+    )
+    DB_SQLITE_MMAP_SIZE: int | None = Field(default=None, ge=0, description="PRAGMA mmap_size SQLite в байтах.")
+    DB_SQLITE_BUSY_TIMEOUT: int | None = Field(
+        default=None, ge=0, description="PRAGMA busy_timeout SQLite в миллисекундах."
+    )
+
+    # Настройки mock-ответов
+    JSON_ENCODER: Literal["json", "orjson"] = Field(
+        default="json",
+        description="Кодировщик JSON для тел mock-ответов (orjson требует установки extra 'orjson').",
+    )
+    MOCK_SYNC_INTERVAL: float = Field(
+        default=0.5,
+        ge=0,
+        description="Интервал синхронизации мок-данных между воркерами в секундах (0 отключает синхронизацию).",
+    )
+    MOCK_SYNC_GAP_TIMEOUT: float = Field(
+        default=30.0,
+        ge=0,
+        description="Время ожидания записей журнала изменений, зафиксированных не по порядку, в секундах.",
+    )
+    MOCK_CHANGE_LOG_RETENTION: int = Field(
+        default=10000,
+        ge=1,
+        description="Количество хранимых записей журнала изменений мок-данных.",
+    )
+    MOCK_HISTORY_LIMIT: int = Field(
+        default=10,
+        ge=0,
+        description="Количество хранимых предыдущих версий каждого мока для отката; 0 — не хранить историю.",
+    )
+    MOCK_REAPER_INTERVAL: float = Field(
+        default=1.0,
+        gt=0,
+        description=(
+            "Максимальный интервал проверки истекших моков в секундах; "
+            "мок со сроком жизни удаляется в момент истечения, а повторная попытка после ошибки — через интервал."
+        ),
+    )
+    MOCK_REAPER_BATCH_SIZE: int = Field(
+        default=1000,
+        ge=1,
+        description="Максимальное количество моков в одном удалении истекших моков.",
+    )
+    BULK_BATCH_SIZE: int = Field(
+        default=500,
+        ge=1,
+        description="Размер пакета при массовом импорте и экспорте мок-данных.",
+    )
+    SNAPSHOT_PATH: str | None = Field(
+        default=None,
+        description=(
+            "Файл снимка мок-данных хранилища, не разделяемого между процессами: снимок сохраняется периодически "
+            "и при остановке и загружается при запуске."
+        ),
+    )
+    SNAPSHOT_INTERVAL: float = Field(
+        default=60.0,
+        ge=0,
+        description="Интервал сохранения снимка мок-данных в секундах; 0 — только при остановке сервера.",
+    )
+    BLOB_DIR: str = Field(
+        default=str(Path(tempfile.gettempdir()) / "mock-rest-server-blobs"),
+        description="Каталог хранилища тел ответов: файлы с именами по SHA-256 содержимого.",
+    )
+    BLOB_INLINE_LIMIT: int = Field(
+        default=64 * 1024,
+        ge=0,
+        description=(
+            "Размер закодированного JSON-тела мока в байтах, больше которого тело сохраняется в хранилище тел ответов "
+            "вместо строки базы данных; 0 — хранить тела в базе данных."
+        ),
+    )
+
+    # Настройки сценариев
+    SEQUENCE_CURSORS_PATH: str | None = Field(
+        default=None,
+        description=(
+            "Файл позиций сценариев моков, общий для воркеров (задается автоматически для нескольких воркеров); "
+            "если не задан, позиции хранятся в памяти процесса."
+        ),
+    )
+
+    # Настройки кеша ответов
+    RESPONSE_CACHE_SIZE: int = Field(
+        default=10000,
+        ge=0,
+        description=(
+            "Максимальное количество ответов условных и шаблонизированных моков в кеше ответов воркера; "
+            "0 отключает кеш."
+        ),
+    )
+    RESPONSE_CACHE_BYTES: int = Field(
+        default=64 * 1024 * 1024, ge=0, description="Максимальный суммарный размер ответов в кеше воркера в байтах."
+    )
+    RESPONSE_CACHE_TTL: float = Field(
+        default=60.0, ge=0, description="Время жизни ответа в кеше в секундах; 0 — без ограничения."
+    )
+
+    # Настройки сжатия ответов
+    COMPRESSION_ENCODINGS: str = Field(
+        default="br,zstd,gzip",
+        description=(
+            "Кодировки сжатия ответов через запятую в порядке предпочтения (br требует пакета brotli, zstd — "
+            "Python 3.14 или пакета zstandard; недоступные пропускаются); none отключает сжатие."
+        ),
+    )
+    COMPRESSION_MIN_SIZE: int = Field(
+        default=1024, ge=0, description="Размер тела ответа в байтах, меньше которого тело не сжимается."
+    )
+
+    # Настройки прокси
+    PROXY_URL: str | None = Field(
+        default=None,
+        description=(
+            "Базовый URL upstream-сервера: запросы, не найденные среди моков, передаются ему, "
+            "а его ответы записываются в мок-данные (требует пакета httpx)."
+        ),
+    )
+    PROXY_RECORD: bool = Field(default=True, description="Сохранять ответы upstream-сервера как мок-данные.")
+    PROXY_RECORD_LIMIT: int = Field(
+        default=10 * 1024 * 1024,
+        ge=0,
+        description=(
+            "Максимальный размер сохраняемого тела ответа upstream-сервера в байтах; большие ответы не записываются."
+        ),
+    )
+    PROXY_TIMEOUT: float = Field(default=30.0, gt=0, description="Таймаут операций с upstream-сервером в секундах.")
+    PROXY_MAX_CONNECTIONS: int = Field(
+        default=100, ge=1, description="Максимальное количество keep-alive соединений воркера с upstream-сервером."
+    )
+
+    # Настройки метрик
+    METRICS_DIR: str | None = Field(
+        default=None,
+        description="Каталог обмена снимками метрик между воркерами (задается автоматически для нескольких воркеров).",
+    )
+    METRICS_FLUSH_INTERVAL: float = Field(
+        default=1.0,
+        gt=0,
+        description="Интервал сохранения снимка метрик воркера в каталог METRICS_DIR в секундах.",
+    )
+
+    # Настройки журнала запросов
+    JOURNAL_ENABLED: bool = Field(default=True, description="Записывать входящие запросы к мокам в журнал запросов.")
+    JOURNAL_CAPACITY: int = Field(
+        default=10000,
+        ge=1,
+        description="Емкость кольцевого буфера журнала запросов воркера; при переполнении вытесняются старые записи.",
+    )
+    JOURNAL_BODY_LIMIT: int = Field(
+        default=65536,
+        ge=0,
+        description="Максимальный размер сохраняемого тела запроса в байтах; остаток тела отбрасывается.",
+    )
+    JOURNAL_FLUSH_INTERVAL: float = Field(
+        default=1.0,
+        gt=0,
+        description="Интервал сохранения журнала запросов воркера в базу данных в секундах.",
+    )
+    JOURNAL_BATCH_SIZE: int = Field(
+        default=500,
+        ge=1,
+        description="Количество записей журнала запросов, сохраняемых в одной транзакции.",
+    )
+    JOURNAL_RETENTION: int = Field(
+        default=100000,
+        ge=1,
+        description="Количество хранимых записей журнала запросов в базе данных.",
+    )
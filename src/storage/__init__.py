@@ -0,0 +1,85 @@
+"""Модуль хранилищ мок-данных.
+
+Хранилище выбирается настройкой `DB_TYPE`:
+
+    - sqlite3, sqlalchemy: база данных по строке подключения `DB_HOST` через SQLAlchemy;
+    - memory: словари в памяти процесса без ORM и драйвера базы данных.
+
+Сервисный слой получает текущее хранилище функцией `get_storage`. Двоичные и большие тела
+ответов хранятся отдельно от мок-данных в файловом хранилище тел ответов `blob_store`.
+"""
+
+from src.db import resolve_engine_options
+from src.settings import config
+from src.settings.settings import Settings
+
+from .base import MockRouteConflictError, MockStorage
+from .blob_store import BlobStore, MappedBlob, blob_store
+from .memory_storage import MemoryMockStorage
+from .sql_storage import SQLAlchemyMockStorage
+
+_storage: MockStorage | None = None
+
+
+def create_storage(settings: Settings) -> MockStorage:
+    """Создает хранилище мок-данных по настройкам приложения.
+
+    Args:
+        settings (Settings): Настройки приложения.
+
+    Returns:
+        MockStorage: Неинициализированное хранилище.
+    """
+    if settings.DB_TYPE == "memory":
+        return MemoryMockStorage()
+    return SQLAlchemyMockStorage(settings.DB_HOST, resolve_engine_options(settings, settings.DB_HOST))
+
+
+def get_storage() -> MockStorage:
+    """Возвращает текущее хранилище мок-данных, создавая его по настройкам при первом обращении.
+
+    Returns:
+        MockStorage: Хранилище мок-данных.
+    """
+    global _storage
+    if _storage is None:
+        _storage = create_storage(config)
+    return _storage
+
+
+def set_storage(storage: MockStorage | None) -> None:
+    """Заменяет текущее хранилище мок-данных.
+
+    Args:
+        storage (MockStorage | None): Инициализированное хранилище; None сбрасывает текущее хранилище,
+            и следующее обращение создаст его по настройкам.
+    """
+    global _storage
+    _storage = storage
+
+
+async def initialize_storage() -> MockStorage:
+    """Создает хранилище мок-данных по настройкам, инициализирует его и делает текущим.
+
+    Returns:
+        MockStorage: Инициализированное хранилище.
+    """
+    storage = create_storage(config)
+    await storage.initialize()
+    set_storage(storage)
+    return storage
+
+
+__all__ = [
+    "BlobStore",
+    "MappedBlob",
+    "MemoryMockStorage",
+    "MockRouteConflictError",
+    "MockStorage",
+    "SQLAlchemyMockStorage",
+    "blob_store",
+    "create_storage",
+    "get_storage",
+    "initialize_storage",
+    "set_storage",
+]
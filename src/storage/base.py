@@ -0,0 +1,213 @@
+"""Модуль интерфейса хранилища мок-данных.
+
+Определяет абстрактный класс MockStorage, который реализуют хранилище в базе данных
+через SQLAlchemy и хранилище в памяти процесса. Сервисный слой работает только с этим
+интерфейсом и не зависит от выбранного хранилища.
+
+Маршрут (метод, URI и условия выбора match) принадлежит одним мок-данным: создание мок-данных
+для занятого маршрута изменяет существующие мок-данные как новую версию.
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Collection
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from src.api.models.mock_model import MockData, MockModelWithDate
+from src.api.models.request_log_model import RecordedRequest
+from src.db.models.mock_data import route_match_key
+
+RouteMatchKey = tuple[str, str, str]
+
+
+class MockRouteConflictError(Exception):
+    """Маршрут и условия выбора мока уже принадлежат другим мок-данным."""
+
+
+def mock_route_key(mock_data: MockData) -> RouteMatchKey:
+    """Возвращает маршрут мок-данных с ключом условий выбора: (method, uri, match_key).
+
+    Args:
+        mock_data (MockData): Мок-данные.
+
+    Returns:
+        RouteMatchKey: Метод, URI и ключ условий выбора мока.
+    """
+    match = mock_data.match.model_dump(mode="json", exclude_none=True) if mock_data.match else None
+    return mock_data.method, mock_data.uri, route_match_key(match)
+
+
+class MockStorage(ABC):
+    """Хранилище мок-данных, журнала изменений и журнала запросов.
+
+    Attributes:
+        shared (bool): Могут ли мок-данные изменяться другими процессами. Если да, таблица маршрутов
+            воркера синхронизируется по журналу изменений.
+    """
+
+    shared: bool = False
+
+    async def initialize(self) -> None:  # noqa: B027
+        """Подготавливает хранилище к работе."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Удаляет все данные хранилища."""
+
+    # Мок-данные
+
+    @abstractmethod
+    async def get_all_mock_data(self) -> list[MockModelWithDate]:
+        """Возвращает все мок-данные в порядке создания."""
+
+    @abstractmethod
+    async def get_mock_data_by_uuid(self, uuid: UUID) -> MockModelWithDate | None:
+        """Возвращает мок-данные по UUID, либо None, если они не найдены."""
+
+    @abstractmethod
+    async def get_mock_data_by_uuids(self, uuids: list[UUID]) -> list[MockModelWithDate]:
+        """Возвращает найденные мок-данные по списку UUID в порядке создания."""
+
+    @abstractmethod
+    async def get_last_mock_data_by_uri_and_method(self, uri: str, method: str) -> MockModelWithDate | None:
+        """Возвращает последние созданные мок-данные маршрута, либо None, если они не найдены."""
+
+    @abstractmethod
+    async def create_mock_data(self, mock_data: MockData, history_limit: int = 0) -> MockModelWithDate:
+        """Создает мок-данные с новым UUID, либо изменяет мок-данные занятого маршрута как новую версию.
+
+        Args:
+            mock_data (MockData): Данные мока.
+            history_limit (int): Количество хранимых предыдущих версий мока.
+        """
+
+    @abstractmethod
+    async def create_mock_data_batch(
+        self, mocks_data: list[MockData], history_limit: int = 0
+    ) -> list[MockModelWithDate]:
+        """Создает или изменяет несколько мок-данных атомарно, как последовательные вызовы `create_mock_data`.
+
+        Новые мок-данные получают время создания в порядке входных данных.
+        """
+
+    @abstractmethod
+    async def restore_mock_data(self, mocks: list[MockModelWithDate]) -> None:
+        """Добавляет мок-данные с сохраненными UUID и датами, например, из снимка, не записывая журнал изменений."""
+
+    @abstractmethod
+    async def get_mock_data_page(
+        self,
+        limit: int,
+        after: tuple[datetime, UUID] | None = None,
+        method: str | None = None,
+        uri_prefix: str | None = None,
+        status_code: int | None = None,
+        include_body: bool = True,
+    ) -> list[MockModelWithDate]:
+        """Возвращает до `limit` мок-данных после позиции `after` в порядке (created_at, uuid).
+
+        Args:
+            limit (int): Максимальное количество мок-данных.
+            after (tuple[datetime, UUID] | None): Позиция (created_at, uuid) последних мок-данных
+                предыдущей страницы.
+            method (str | None): Фильтр по HTTP-методу.
+            uri_prefix (str | None): Фильтр по префиксу URI.
+            status_code (int | None): Фильтр по HTTP коду ответа.
+            include_body (bool): Загружать тело ответа; при False поле body мок-данных равно None.
+        """
+
+    @abstractmethod
+    def iter_mock_data(
+        self,
+        batch_size: int,
+        method: str | None = None,
+        uri_prefix: str | None = None,
+        status_code: int | None = None,
+        include_body: bool = True,
+    ) -> AsyncIterator[MockModelWithDate]:
+        """Последовательно отдает мок-данные с фильтрами в порядке создания, читая их пачками по `batch_size`.
+
+        При `include_body=False` тело ответа не загружается, поле body мок-данных равно None.
+        """
+
+    @abstractmethod
+    async def update_mock_data(
+        self, uuid: UUID, mock_data: MockData, expected_version: int | None = None, history_limit: int = 0
+    ) -> MockModelWithDate | None:
+        """Изменяет мок-данные на месте, увеличивая их версию.
+
+        Предыдущая версия сохраняется в истории изменений, если `history_limit` больше нуля;
+        в истории остается не больше `history_limit` последних версий мока.
+
+        Args:
+            uuid (UUID): UUID мок-данных.
+            mock_data (MockData): Новые данные мока.
+            expected_version (int | None): Ожидаемая текущая версия; при несовпадении мок-данные не изменяются.
+            history_limit (int): Количество хранимых предыдущих версий мока.
+
+        Returns:
+            MockModelWithDate | None: Измененные мок-данные, либо None, если мок-данные не найдены
+                или их версия не совпадает с ожидаемой.
+
+        Raises:
+            MockRouteConflictError: Если новый маршрут и условия выбора заняты другими мок-данными.
+        """
+
+    @abstractmethod
+    async def get_mock_history(self, uuid: UUID) -> list[MockModelWithDate]:
+        """Возвращает сохраненные предыдущие версии мок-данных от новых к старым."""
+
+    @abstractmethod
+    async def get_mock_version(self, uuid: UUID, version: int) -> MockModelWithDate | None:
+        """Возвращает предыдущую версию мок-данных из истории, либо None, если она не сохранена."""
+
+    @abstractmethod
+    async def delete_mock_data(self, uuid: UUID) -> bool:
+        """Удаляет мок-данные и их историю по UUID и возвращает True, если они были найдены."""
+
+    @abstractmethod
+    async def delete_mock_data_batch(self, uuids: list[UUID]) -> list[UUID]:
+        """Удаляет несколько мок-данных и их историю одной операцией и возвращает UUID найденных мок-данных."""
+
+    @abstractmethod
+    async def get_mock_expirations(self) -> list[tuple[UUID, datetime]]:
+        """Возвращает UUID и время истечения мок-данных, для которых задано время истечения."""
+
+    # Журнал изменений
+
+    async def get_mock_change_bounds(self) -> tuple[int, int]:
+        """Возвращает минимальный и максимальный идентификаторы журнала изменений, либо (0, 0)."""
+        return 0, 0
+
+    async def get_mock_changes(self, after_id: int, missing_ids: Collection[int] = ()) -> list[tuple[int, UUID, str]]:
+        """Возвращает записи журнала изменений (id, uuid, action) после указанного идентификатора и из `missing_ids`."""
+        return []
+
+    async def prune_mock_changes(self, keep_last: int) -> None:  # noqa: B027
+        """Удаляет старые записи журнала изменений, сохраняя `keep_last` последних."""
+
+    # Журнал запросов
+
+    @abstractmethod
+    async def save_request_log(self, rows: list[dict[str, Any]]) -> None:
+        """Сохраняет пакет записей журнала запросов со значениями столбцов `mock_request_log`."""
+
+    @abstractmethod
+    async def get_request_log_page(
+        self,
+        limit: int,
+        cursor: int | None = None,
+        mock_uuid: UUID | None = None,
+        method: str | None = None,
+        path_prefix: str | None = None,
+    ) -> tuple[list[RecordedRequest], int | None]:
+        """Возвращает страницу журнала запросов от новых записей к старым и курсор следующей страницы."""
+
+    @abstractmethod
+    async def clear_request_log(self) -> int:
+        """Удаляет все записи журнала запросов и возвращает их количество."""
+
+    @abstractmethod
+    async def prune_request_log(self, keep_last: int) -> None:
+        """Удаляет старые записи журнала запросов, сохраняя `keep_last` последних."""
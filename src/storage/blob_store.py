@@ -0,0 +1,206 @@
+"""Модуль хранилища тел ответов.
+
+Двоичные и большие тела mock-ответов хранятся вне строк базы данных в файлах каталога
+`BLOB_DIR`. Имя файла совпадает с SHA-256 содержимого, поэтому файл никогда не изменяется
+после записи, а одинаковые тела разных моков хранятся один раз. Для отдачи тела файл
+отображается в память (mmap) один раз при сборке ответа мока.
+"""
+
+import asyncio
+import hashlib
+import mmap
+import os
+import re
+from collections.abc import AsyncIterable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import uuid4
+
+from src.api.models.mock_model import DIGEST_REGEX
+from src.settings import config
+
+
+@dataclass(frozen=True, slots=True)
+class MappedBlob:
+    """Тело ответа, отображенное в память.
+
+    Attributes:
+        path (Path): Путь к файлу тела.
+        size (int): Размер тела в байтах.
+        data (mmap.mmap | None): Отображение файла в память; None для пустого тела.
+    """
+
+    path: Path
+    size: int
+    data: mmap.mmap | None
+
+    def view(self) -> memoryview:
+        """Возвращает содержимое тела без копирования.
+
+        Returns:
+            memoryview: Представление отображенного в память файла.
+        """
+        return memoryview(self.data) if self.data is not None else memoryview(b"")
+
+
+def _map_file(path: Path) -> MappedBlob:
+    """Отображает файл в память только для чтения."""
+    with path.open("rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+    return MappedBlob(path=path, size=size, data=data)
+
+
+class BlobStore:
+    """Файловое хранилище тел ответов с адресацией по содержимому.
+
+    Файл тела хранится по пути `<root>/<первые два символа SHA-256>/<SHA-256>`. Запись выполняется
+    во временный файл с последующим переименованием, поэтому читатели не видят недописанных файлов.
+
+    Attributes:
+        root (Path): Каталог хранилища.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        """Создает хранилище.
+
+        Args:
+            root (str | Path): Каталог хранилища; создается при первой записи.
+        """
+        self.root = Path(root)
+
+    def path(self, digest: str) -> Path:
+        """Возвращает путь к файлу тела.
+
+        Args:
+            digest (str): SHA-256 содержимого тела.
+
+        Returns:
+            Path: Путь к файлу тела.
+
+        Raises:
+            ValueError: Если digest не является SHA-256 в шестнадцатеричном виде.
+        """
+        if not re.fullmatch(DIGEST_REGEX, digest):
+            raise ValueError(f"Некорректный SHA-256 тела ответа: {digest}")
+        return self.root / digest[:2] / digest
+
+    def size(self, digest: str) -> int | None:
+        """Возвращает размер тела в байтах, либо None, если тело не найдено."""
+        try:
+            return self.path(digest).stat().st_size
+        except FileNotFoundError:
+            return None
+
+    def _commit(self, tmp_path: Path, digest: str) -> None:
+        """Переносит записанный временный файл на место файла тела."""
+        path = self.path(digest)
+        if path.exists():
+            tmp_path.unlink()
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.replace(path)
+
+    def _write(self, digest: str, data: bytes) -> None:
+        """Записывает тело в файл, если тело с таким содержимым еще не сохранено."""
+        if self.path(digest).exists():
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.root / f"{uuid4().hex}.tmp"
+        tmp_path.write_bytes(data)
+        self._commit(tmp_path, digest)
+
+    async def put(self, data: bytes) -> str:
+        """Сохраняет тело, находящееся в памяти.
+
+        Args:
+            data (bytes): Содержимое тела.
+
+        Returns:
+            str: SHA-256 содержимого тела.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        await asyncio.to_thread(self._write, digest, data)
+        return digest
+
+    async def put_stream(self, chunks: AsyncIterable[bytes]) -> tuple[str, int]:
+        """Сохраняет тело, поступающее частями, не накапливая его в памяти.
+
+        Args:
+            chunks (AsyncIterable[bytes]): Части тела.
+
+        Returns:
+            tuple[str, int]: SHA-256 содержимого и размер тела в байтах.
+        """
+        await asyncio.to_thread(self.root.mkdir, parents=True, exist_ok=True)
+        tmp_path = self.root / f"{uuid4().hex}.tmp"
+        sha256 = hashlib.sha256()
+        size = 0
+        file = await asyncio.to_thread(tmp_path.open, "wb")
+        try:
+            async for chunk in chunks:
+                sha256.update(chunk)
+                size += len(chunk)
+                await asyncio.to_thread(file.write, chunk)
+            await asyncio.to_thread(file.close)
+            digest = sha256.hexdigest()
+            await asyncio.to_thread(self._commit, tmp_path, digest)
+        except BaseException:
+            file.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return digest, size
+
+    def map(self, digest: str) -> MappedBlob:
+        """Отображает файл тела в память только для чтения.
+
+        Args:
+            digest (str): SHA-256 содержимого тела.
+
+        Returns:
+            MappedBlob: Отображенное в память тело.
+
+        Raises:
+            FileNotFoundError: Если тело не найдено.
+        """
+        path = self.path(digest)
+        return _map_file(path)
+
+    def variant_path(self, digest: str, encoding: str) -> Path:
+        """Возвращает путь к файлу сжатого варианта тела.
+
+        Args:
+            digest (str): SHA-256 содержимого исходного тела.
+            encoding (str): Кодировка сжатия (gzip, br, zstd).
+
+        Returns:
+            Path: Путь к файлу рядом с файлом исходного тела.
+        """
+        return self.path(digest).with_name(f"{digest}.{encoding}")
+
+    def map_variant(self, digest: str, encoding: str, compress: Callable[[bytes], bytes]) -> MappedBlob:
+        """Отображает в память сжатый вариант тела, сжимая и сохраняя его при первом обращении.
+
+        Вариант зависит только от содержимого тела и кодировки, поэтому сохраненный файл
+        используется всеми моками и воркерами с тем же телом.
+
+        Args:
+            digest (str): SHA-256 содержимого исходного тела.
+            encoding (str): Кодировка сжатия.
+            compress (Callable[[bytes], bytes]): Функция сжатия тела.
+
+        Returns:
+            MappedBlob: Отображенный в память сжатый вариант.
+
+        Raises:
+            FileNotFoundError: Если исходное тело не найдено.
+        """
+        path = self.variant_path(digest, encoding)
+        if not path.exists():
+            tmp_path = self.root / f"{uuid4().hex}.tmp"
+            tmp_path.write_bytes(compress(self.path(digest).read_bytes()))
+            tmp_path.replace(path)
+        return _map_file(path)
+
+
+blob_store = BlobStore(config.BLOB_DIR)
@@ -0,0 +1,372 @@
+"""Модуль хранилища мок-данных в памяти процесса.
+
+Хранилище не использует ORM, сессии и поток драйвера базы данных: мок-данные хранятся
+в словарях неизменяемого снимка `_MockSnapshot`. Операции записи собирают новый снимок
+и заменяют ссылку на него одним присваиванием (copy-on-write), поэтому читатели, в том числе
+постраничный список и потоковая выгрузка между точками await, видят согласованное состояние
+без блокировок.
+
+Данные не разделяются между процессами и теряются при остановке сервера.
+"""
+
+from bisect import bisect_right
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import UUID, uuid4
+
+from src.api.models.mock_model import MockData, MockModelWithDate
+from src.api.models.request_log_model import RecordedRequest
+from src.db.models.mock_data import utc_now
+
+from .base import MockRouteConflictError, MockStorage, RouteMatchKey, mock_route_key
+
+RouteKey = tuple[str, str]
+
+
+def _position(mock: MockModelWithDate) -> tuple[datetime, UUID]:
+    """Возвращает позицию мок-данных в порядке (created_at, uuid)."""
+    return mock.created_at, mock.uuid
+
+
+@dataclass(frozen=True, slots=True)
+class _MockSnapshot:
+    """Неизменяемый снимок мок-данных хранилища.
+
+    Attributes:
+        by_uuid (dict[UUID, MockModelWithDate]): Мок-данные по UUID.
+        ordered (tuple[MockModelWithDate, ...]): Мок-данные в порядке (created_at, uuid).
+        latest (dict[RouteKey, MockModelWithDate]): Последние мок-данные каждого маршрута (method, uri).
+        routes (dict[RouteMatchKey, UUID]): UUID мок-данных маршрута с условиями выбора (method, uri, match_key).
+    """
+
+    by_uuid: dict[UUID, MockModelWithDate]
+    ordered: tuple[MockModelWithDate, ...]
+    latest: dict[RouteKey, MockModelWithDate]
+    routes: dict[RouteMatchKey, UUID]
+
+
+_EMPTY = _MockSnapshot(by_uuid={}, ordered=(), latest={}, routes={})
+
+
+def _matches(mock: MockModelWithDate, method: str | None, uri_prefix: str | None, status_code: int | None) -> bool:
+    """Проверяет соответствие мок-данных фильтрам списка."""
+    return (
+        (method is None or mock.method == method)
+        and (uri_prefix is None or mock.uri.startswith(uri_prefix))
+        and (status_code is None or mock.status_code == status_code)
+    )
+
+
+def _route_latest(ordered: tuple[MockModelWithDate, ...], route: RouteKey) -> MockModelWithDate | None:
+    """Возвращает последние созданные мок-данные маршрута из упорядоченного списка."""
+    return next((item for item in reversed(ordered) if (item.method, item.uri) == route), None)
+
+
+def _next_version(previous: MockModelWithDate, mock_data: MockData) -> MockModelWithDate:
+    """Возвращает следующую версию мок-данных с прежними UUID и временем создания."""
+    return MockModelWithDate.model_validate(
+        {
+            **dict(mock_data),
+            "uuid": previous.uuid,
+            "version": previous.version + 1,
+            "created_at": previous.created_at,
+            "updated_at": max(utc_now(), previous.updated_at + timedelta(microseconds=1)),
+        }
+    )
+
+
+def _without_body(mock: MockModelWithDate) -> MockModelWithDate:
+    """Возвращает копию мок-данных без тела ответа для списков, не загружающих тела."""
+    return mock.model_copy(update={"body": None}) if mock.body is not None else mock
+
+
+class MemoryMockStorage(MockStorage):
+    """Хранилище мок-данных в памяти процесса с copy-on-write снимками для читателей.
+
+    Чтение по UUID и последнего мока маршрута, а также проверка занятости маршрута с условиями
+    выбора выполняются за O(1), страница списка находится бинарным поиском. Создание, изменение
+    и удаление копируют снимок, что оправдано для редких административных изменений при частых
+    чтениях; пакетное создание копирует снимок один раз.
+    """
+
+    def __init__(self) -> None:
+        """Создает пустое хранилище."""
+        self._snapshot = _EMPTY
+        self._history: dict[UUID, tuple[MockModelWithDate, ...]] = {}
+        self._request_log: list[RecordedRequest] = []
+        self._request_log_id = 0
+
+    async def clear(self) -> None:
+        """Удаляет все мок-данные, их историю и записи журнала запросов."""
+        self._snapshot = _EMPTY
+        self._history = {}
+        self._request_log = []
+
+    async def get_all_mock_data(self) -> list[MockModelWithDate]:
+        """Возвращает все мок-данные в порядке создания."""
+        return list(self._snapshot.ordered)
+
+    async def get_mock_data_by_uuid(self, uuid: UUID) -> MockModelWithDate | None:
+        """Возвращает мок-данные по UUID, либо None, если они не найдены."""
+        return self._snapshot.by_uuid.get(uuid)
+
+    async def get_mock_data_by_uuids(self, uuids: list[UUID]) -> list[MockModelWithDate]:
+        """Возвращает найденные мок-данные по списку UUID в порядке создания."""
+        by_uuid = self._snapshot.by_uuid
+        return sorted((by_uuid[uuid] for uuid in set(uuids) if uuid in by_uuid), key=_position)
+
+    async def get_last_mock_data_by_uri_and_method(self, uri: str, method: str) -> MockModelWithDate | None:
+        """Возвращает последние созданные мок-данные маршрута, либо None, если они не найдены."""
+        return self._snapshot.latest.get((method, uri))
+
+    async def create_mock_data(self, mock_data: MockData, history_limit: int = 0) -> MockModelWithDate:
+        """Создает мок-данные с новым UUID, либо изменяет мок-данные занятого маршрута как новую версию."""
+        return (await self.create_mock_data_batch([mock_data], history_limit))[0]
+
+    async def create_mock_data_batch(
+        self, mocks_data: list[MockData], history_limit: int = 0
+    ) -> list[MockModelWithDate]:
+        """Создает или изменяет несколько мок-данных, публикуя их одним новым снимком.
+
+        Проверка занятости маршрута и запись выполняются без точек await, поэтому конкурентные
+        запросы на один маршрут не создают несколько мок-данных.
+        """
+        snapshot = self._snapshot
+        # Время создания строго возрастает, поэтому новые мок-данные добавляются в конец упорядоченного списка.
+        created_at = utc_now()
+        if snapshot.ordered and created_at <= snapshot.ordered[-1].created_at:
+            created_at = snapshot.ordered[-1].created_at + timedelta(microseconds=1)
+
+        by_uuid = dict(snapshot.by_uuid)
+        routes = dict(snapshot.routes)
+        latest = dict(snapshot.latest)
+        created: dict[UUID, MockModelWithDate] = {}
+        updated: dict[UUID, MockModelWithDate] = {}
+        mocks = []
+        for mock_data in mocks_data:
+            key = mock_route_key(mock_data)
+            uuid = routes.get(key)
+            if uuid is None:
+                timestamp = created_at + timedelta(microseconds=len(created))
+                mock = MockModelWithDate.model_validate(
+                    {**dict(mock_data), "uuid": uuid4(), "created_at": timestamp, "updated_at": timestamp}
+                )
+                routes[key] = mock.uuid
+            else:
+                previous = by_uuid[uuid]
+                mock = _next_version(previous, mock_data)
+                if history_limit:
+                    self._history[uuid] = (*self._history.get(uuid, ()), previous)[-history_limit:]
+            (updated if uuid in snapshot.by_uuid else created)[mock.uuid] = mock
+            by_uuid[mock.uuid] = mock
+            route = (mock.method, mock.uri)
+            if uuid is None or latest[route].uuid == uuid:
+                latest[route] = mock
+            mocks.append(mock)
+
+        ordered = snapshot.ordered
+        if updated:
+            ordered = tuple(updated.get(item.uuid, item) for item in ordered)
+        self._snapshot = _MockSnapshot(
+            by_uuid=by_uuid, ordered=ordered + tuple(created.values()), latest=latest, routes=routes
+        )
+        return mocks
+
+    async def restore_mock_data(self, mocks: list[MockModelWithDate]) -> None:
+        """Добавляет мок-данные с сохраненными UUID и датами, публикуя их одним новым снимком."""
+        snapshot = self._snapshot
+        ordered = tuple(sorted((*snapshot.ordered, *mocks), key=_position))
+        self._snapshot = _MockSnapshot(
+            by_uuid={**snapshot.by_uuid, **{mock.uuid: mock for mock in mocks}},
+            ordered=ordered,
+            latest={(mock.method, mock.uri): mock for mock in ordered},
+            routes={mock_route_key(mock): mock.uuid for mock in ordered},
+        )
+
+    async def get_mock_data_page(
+        self,
+        limit: int,
+        after: tuple[datetime, UUID] | None = None,
+        method: str | None = None,
+        uri_prefix: str | None = None,
+        status_code: int | None = None,
+        include_body: bool = True,
+    ) -> list[MockModelWithDate]:
+        """Возвращает до `limit` мок-данных после позиции `after` в порядке (created_at, uuid)."""
+        ordered = self._snapshot.ordered
+        start = bisect_right(ordered, after, key=_position) if after is not None else 0
+        page = []
+        for mock in ordered[start:]:
+            if _matches(mock, method, uri_prefix, status_code):
+                page.append(mock if include_body else _without_body(mock))
+                if len(page) == limit:
+                    break
+        return page
+
+    async def iter_mock_data(
+        self,
+        batch_size: int,
+        method: str | None = None,
+        uri_prefix: str | None = None,
+        status_code: int | None = None,
+        include_body: bool = True,
+    ) -> AsyncIterator[MockModelWithDate]:
+        """Отдает мок-данные снимка на момент начала чтения; размер пачки не влияет на потребление памяти."""
+        for mock in self._snapshot.ordered:
+            if _matches(mock, method, uri_prefix, status_code):
+                yield mock if include_body else _without_body(mock)
+
+    async def update_mock_data(
+        self, uuid: UUID, mock_data: MockData, expected_version: int | None = None, history_limit: int = 0
+    ) -> MockModelWithDate | None:
+        """Изменяет мок-данные, публикуя новый снимок; позиция мок-данных в порядке создания не меняется.
+
+        Raises:
+            MockRouteConflictError: Если новый маршрут и условия выбора заняты другими мок-данными.
+        """
+        snapshot = self._snapshot
+        previous = snapshot.by_uuid.get(uuid)
+        if previous is None or (expected_version is not None and previous.version != expected_version):
+            return None
+        key = mock_route_key(mock_data)
+        owner = snapshot.routes.get(key, uuid)
+        if owner != uuid:
+            raise MockRouteConflictError(f"Маршрут {mock_data.method} {mock_data.uri} занят мок-данными {owner}")
+        mock = _next_version(previous, mock_data)
+
+        routes = dict(snapshot.routes)
+        if routes.get(mock_route_key(previous)) == uuid:
+            del routes[mock_route_key(previous)]
+        routes[key] = uuid
+        ordered = tuple(mock if item.uuid == uuid else item for item in snapshot.ordered)
+        latest = dict(snapshot.latest)
+        for route in {(previous.method, previous.uri), (mock.method, mock.uri)}:
+            route_mock = _route_latest(ordered, route)
+            if route_mock is None:
+                latest.pop(route, None)
+            else:
+                latest[route] = route_mock
+        if history_limit:
+            self._history[uuid] = (*self._history.get(uuid, ()), previous)[-history_limit:]
+        self._snapshot = _MockSnapshot(
+            by_uuid={**snapshot.by_uuid, uuid: mock}, ordered=ordered, latest=latest, routes=routes
+        )
+        return mock
+
+    async def get_mock_history(self, uuid: UUID) -> list[MockModelWithDate]:
+        """Возвращает сохраненные предыдущие версии мок-данных от новых к старым."""
+        return list(reversed(self._history.get(uuid, ())))
+
+    async def get_mock_version(self, uuid: UUID, version: int) -> MockModelWithDate | None:
+        """Возвращает предыдущую версию мок-данных из истории, либо None, если она не сохранена."""
+        return next((mock for mock in self._history.get(uuid, ()) if mock.version == version), None)
+
+    async def delete_mock_data(self, uuid: UUID) -> bool:
+        """Удаляет мок-данные и их историю по UUID, публикуя новый снимок."""
+        snapshot = self._snapshot
+        mock = snapshot.by_uuid.get(uuid)
+        if mock is None:
+            return False
+
+        by_uuid = dict(snapshot.by_uuid)
+        del by_uuid[uuid]
+        ordered = tuple(item for item in snapshot.ordered if item.uuid != uuid)
+        latest = dict(snapshot.latest)
+        route = (mock.method, mock.uri)
+        if latest.get(route) is mock:
+            previous = _route_latest(ordered, route)
+            if previous is None:
+                del latest[route]
+            else:
+                latest[route] = previous
+        routes = dict(snapshot.routes)
+        if routes.get(mock_route_key(mock)) == uuid:
+            del routes[mock_route_key(mock)]
+        self._snapshot = _MockSnapshot(by_uuid=by_uuid, ordered=ordered, latest=latest, routes=routes)
+        self._history.pop(uuid, None)
+        return True
+
+    async def delete_mock_data_batch(self, uuids: list[UUID]) -> list[UUID]:
+        """Удаляет несколько мок-данных и их историю, публикуя один новый снимок."""
+        snapshot = self._snapshot
+        found = [uuid for uuid in dict.fromkeys(uuids) if uuid in snapshot.by_uuid]
+        if not found:
+            return []
+
+        deleted = set(found)
+        by_uuid = {uuid: mock for uuid, mock in snapshot.by_uuid.items() if uuid not in deleted}
+        ordered = tuple(item for item in snapshot.ordered if item.uuid not in deleted)
+        latest = dict(snapshot.latest)
+        for route in {(snapshot.by_uuid[uuid].method, snapshot.by_uuid[uuid].uri) for uuid in found}:
+            if latest[route].uuid in deleted:
+                previous = _route_latest(ordered, route)
+                if previous is None:
+                    del latest[route]
+                else:
+                    latest[route] = previous
+        routes = {key: uuid for key, uuid in snapshot.routes.items() if uuid not in deleted}
+        self._snapshot = _MockSnapshot(by_uuid=by_uuid, ordered=ordered, latest=latest, routes=routes)
+        for uuid in found:
+            self._history.pop(uuid, None)
+        return found
+
+    async def get_mock_expirations(self) -> list[tuple[UUID, datetime]]:
+        """Возвращает UUID и время истечения мок-данных, для которых задано время истечения."""
+        return [(mock.uuid, mock.expires_at) for mock in self._snapshot.ordered if mock.expires_at is not None]
+
+    async def save_request_log(self, rows: list[dict[str, Any]]) -> None:
+        """Сохраняет пакет записей журнала запросов."""
+        for row in rows:
+            self._request_log_id += 1
+            body: bytes = row["body"] or b""
+            self._request_log.append(
+                RecordedRequest(
+                    id=self._request_log_id,
+                    mock_uuid=row["mock_uuid"],
+                    method=row["method"],
+                    path=row["path"],
+                    query=row["query"],
+                    headers=row["headers"],
+                    body=body.decode("utf-8", errors="replace"),
+                    body_size=row["body_size"],
+                    body_truncated=len(body) < row["body_size"],
+                    status_code=row["status_code"],
+                    created_at=row["created_at"],
+                )
+            )
+
+    async def get_request_log_page(
+        self,
+        limit: int,
+        cursor: int | None = None,
+        mock_uuid: UUID | None = None,
+        method: str | None = None,
+        path_prefix: str | None = None,
+    ) -> tuple[list[RecordedRequest], int | None]:
+        """Возвращает страницу журнала запросов от новых записей к старым и курсор следующей страницы."""
+        items: list[RecordedRequest] = []
+        for item in reversed(self._request_log):
+            if cursor is not None and item.id >= cursor:
+                continue
+            if (
+                (mock_uuid is None or item.mock_uuid == mock_uuid)
+                and (method is None or item.method == method)
+                and (path_prefix is None or item.path.startswith(path_prefix))
+            ):
+                if len(items) == limit:
+                    return items, items[-1].id
+                items.append(item)
+        return items, None
+
+    async def clear_request_log(self) -> int:
+        """Удаляет все записи журнала запросов и возвращает их количество."""
+        count = len(self._request_log)
+        self._request_log = []
+        return count
+
+    async def prune_request_log(self, keep_last: int) -> None:
+        """Удаляет старые записи журнала запросов, сохраняя `keep_last` последних."""
+        if len(self._request_log) > keep_last:
+            self._request_log = self._request_log[-keep_last:]
@@ -0,0 +1,488 @@
+"""Модуль хранилища мок-данных в базе данных через SQLAlchemy.
+
+Каждая операция выполняется в отдельной сессии DBManager; название сессии совпадает
+с названием операции и используется как метка метрики `db_session_duration_seconds`.
+Изменения мок-данных записываются в журнал изменений в той же транзакции, поэтому
+воркеры, работающие с общей базой данных, синхронизируют по нему свои таблицы маршрутов.
+Списки мок-данных читаются явным набором колонок и могут не загружать колонку тела ответа.
+Маршрут с условиями выбора принадлежит одной строке по уникальному индексу (method, uri, match_key):
+создание мок-данных для занятого маршрута изменяет существующую строку. Записи мок-данных процесса
+выполняются по очереди, а вставку, проигравшую гонку с транзакцией другого воркера, хранилище
+повторяет как изменение.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Collection
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import UUID, uuid4
+
+from sqlalchemy import RowMapping, Select, and_, delete, func, insert, or_, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.models.mock_model import MockData, MockModelWithDate
+from src.api.models.request_log_model import RecordedRequest
+from src.db import DBManager, EngineOptions, is_in_memory_sqlite
+from src.db.models.mock_data import Base, MockChangeLog, MockDataHistory, MockDbData, MockRequestLog, utc_now
+from src.settings import config
+
+from .base import MockRouteConflictError, MockStorage, RouteMatchKey, mock_route_key
+
+_MODEL_COLUMNS = ("body_ref", "match", "latency", "stream", "template", "sequence")
+"""JSON-колонки, значения которых хранятся во вложенных моделях мок-данных."""
+
+
+def _model_columns(mock_data: MockData) -> dict[str, Any]:
+    """Возвращает значения JSON-колонок вложенных моделей мок-данных без незаданных полей."""
+    values = {name: getattr(mock_data, name) for name in _MODEL_COLUMNS}
+    return {name: value.model_dump(exclude_none=True) if value else None for name, value in values.items()}
+
+
+def _data_columns(mock_data: MockData) -> dict[str, Any]:
+    """Возвращает значения колонок мок-данных, задаваемых пользователем."""
+    return {
+        "uri": mock_data.uri,
+        "method": mock_data.method,
+        "status_code": mock_data.status_code,
+        "headers": mock_data.headers,
+        "body": mock_data.body,
+        "delay": mock_data.delay,
+        "expires_at": mock_data.expires_at,
+        "max_hits": mock_data.max_hits,
+        "match_key": mock_route_key(mock_data)[2],
+        **_model_columns(mock_data),
+    }
+
+
+def _to_db_mock(mock_data: MockData, created_at: datetime) -> MockDbData:
+    """
+    Создать ORM-объект mock-данных с новым UUID.
+
+    Args:
+        mock_data (MockData): Данные для создания mock-объекта.
+        created_at (datetime): Время создания mock-данных.
+
+    Returns:
+        MockDbData: ORM-объект, готовый к добавлению в сессию.
+    """
+    return MockDbData(uuid=uuid4(), version=1, created_at=created_at, updated_at=created_at, **_data_columns(mock_data))
+
+
+def _write_version(session: AsyncSession, db_mock: MockDbData, mock_data: MockData, history_limit: int) -> None:
+    """
+    Записать в строку mock-данных следующую версию, сохранив текущую версию в историю.
+
+    Args:
+        session (AsyncSession): Сессия транзакции изменения.
+        db_mock (MockDbData): Строка mock-данных.
+        mock_data (MockData): Новые данные мока.
+        history_limit (int): Количество хранимых предыдущих версий мока.
+    """
+    previous = MockModelWithDate.model_validate(db_mock)
+    if history_limit:
+        session.add(MockDataHistory(uuid=db_mock.uuid, version=previous.version, data=previous.model_dump(mode="json")))
+    for name, value in _data_columns(mock_data).items():
+        setattr(db_mock, name, value)
+    db_mock.version = previous.version + 1
+    db_mock.updated_at = utc_now()
+    session.add(MockChangeLog(uuid=db_mock.uuid, action="upsert"))
+
+
+def _filtered_mock_query(
+    method: str | None = None, uri_prefix: str | None = None, status_code: int | None = None, include_body: bool = True
+) -> Select[Any]:
+    """
+    Построить запрос колонок mock-данных с фильтрами, упорядоченный по (created_at, uuid).
+
+    Args:
+        method (str | None): HTTP-метод.
+        uri_prefix (str | None): Префикс URI.
+        status_code (int | None): HTTP код ответа.
+        include_body (bool): Читать колонку тела ответа.
+
+    Returns:
+        Select[Any]: Запрос SQLAlchemy; строки результата преобразуются функцией `_row_to_mock`.
+    """
+    columns = [column for column in MockDbData.__table__.columns if include_body or column.name != "body"]
+    query = select(*columns).order_by(MockDbData.created_at, MockDbData.uuid)
+    if method is not None:
+        query = query.where(MockDbData.method == method)
+    if uri_prefix is not None:
+        query = query.where(MockDbData.uri.startswith(uri_prefix, autoescape=True))
+    if status_code is not None:
+        query = query.where(MockDbData.status_code == status_code)
+    return query
+
+
+def _row_to_mock(row: RowMapping) -> MockModelWithDate:
+    """Преобразует строку запроса `_filtered_mock_query` в модель мок-данных."""
+    return MockModelWithDate.model_validate(dict(row))
+
+
+class SQLAlchemyMockStorage(MockStorage):
+    """Хранилище мок-данных в базе данных через SQLAlchemy.
+
+    Attributes:
+        db_url (str): URL для подключения к базе данных в формате SQLAlchemy.
+        options (EngineOptions | None): Параметры движка базы данных.
+        shared (bool): True, если база данных не находится в памяти процесса.
+    """
+
+    def __init__(self, db_url: str, options: EngineOptions | None = None) -> None:
+        """Создает хранилище.
+
+        Args:
+            db_url (str): URL для подключения к базе данных в формате SQLAlchemy.
+            options (EngineOptions | None): Параметры движка базы данных.
+        """
+        self.db_url = db_url
+        self.options = options
+        self.shared = not is_in_memory_sqlite(db_url)
+        self._db = DBManager()
+        # SQLite не блокирует прочитанные строки, поэтому чтение и запись строки мока
+        # выполняются под блокировкой процесса, чтобы конкурентные запросы не теряли версии.
+        self._write_lock = asyncio.Lock()
+
+    async def initialize(self) -> None:
+        """Инициализирует подключение к базе данных, создает таблицы и применяет миграции схемы."""
+        await self._db.initialize(self.db_url, self.options)
+
+    async def clear(self) -> None:
+        """Удаляет все строки таблиц, если база данных инициализирована."""
+        if self._db._engine is None:
+            return
+        async with self._db.session("clear") as session:
+            for table in reversed(Base.metadata.sorted_tables):
+                await session.execute(table.delete())
+
+    async def get_all_mock_data(self) -> list[MockModelWithDate]:
+        """Возвращает все мок-данные в порядке создания."""
+        async with self._db.session("get_all_mock_data") as session:
+            res = await session.execute(select(MockDbData).order_by(MockDbData.created_at))
+            return [MockModelWithDate.model_validate(mock) for mock in res.scalars()]
+
+    async def get_mock_data_by_uuid(self, uuid: UUID) -> MockModelWithDate | None:
+        """Возвращает мок-данные по UUID, либо None, если они не найдены."""
+        async with self._db.session("get_mock_data_by_uuid") as session:
+            res = await session.execute(select(MockDbData).where(MockDbData.uuid == uuid))
+            db_mock_data = res.scalar_one_or_none()
+            return MockModelWithDate.model_validate(db_mock_data) if db_mock_data else None
+
+    async def get_mock_data_by_uuids(self, uuids: list[UUID]) -> list[MockModelWithDate]:
+        """Возвращает найденные мок-данные по списку UUID в порядке создания."""
+        async with self._db.session("get_mock_data_by_uuids") as session:
+            res = await session.execute(
+                select(MockDbData).where(MockDbData.uuid.in_(uuids)).order_by(MockDbData.created_at)
+            )
+            return [MockModelWithDate.model_validate(mock) for mock in res.scalars()]
+
+    async def get_last_mock_data_by_uri_and_method(self, uri: str, method: str) -> MockModelWithDate | None:
+        """Возвращает последние мок-данные маршрута; запрос читает одну строку по индексу (method, uri, created_at)."""
+        async with self._db.session("get_last_mock_data_by_uri_and_method") as session:
+            res = await session.execute(
+                select(MockDbData)
+                .where(MockDbData.uri == uri)
+                .where(MockDbData.method == method)
+                .order_by(MockDbData.created_at.desc())
+                .limit(1)
+            )
+            db_mock_data = res.scalars().first()
+            return MockModelWithDate.model_validate(db_mock_data) if db_mock_data else None
+
+    async def create_mock_data(self, mock_data: MockData, history_limit: int = 0) -> MockModelWithDate:
+        """Создает мок-данные, либо изменяет строку занятого маршрута, и запись журнала изменений в одной транзакции."""
+        return (await self._upsert_mock_data("create_mock_data", [mock_data], history_limit, refresh=True))[0]
+
+    async def create_mock_data_batch(
+        self, mocks_data: list[MockData], history_limit: int = 0
+    ) -> list[MockModelWithDate]:
+        """Создает или изменяет несколько мок-данных и записи журнала изменений в одной транзакции."""
+        return await self._upsert_mock_data("create_mock_data_batch", mocks_data, history_limit)
+
+    async def _upsert_mock_data(
+        self, name: str, mocks_data: list[MockData], history_limit: int, refresh: bool = False
+    ) -> list[MockModelWithDate]:
+        """Создает или изменяет мок-данные по уникальному индексу маршрута в одной транзакции.
+
+        Если конкурентная транзакция успела вставить строку того же маршрута, уникальный индекс
+        отклоняет вставку, и транзакция повторяется один раз, изменяя вставленную строку.
+
+        Args:
+            name (str): Название сессии.
+            mocks_data (list[MockData]): Данные моков.
+            history_limit (int): Количество хранимых предыдущих версий мока.
+            refresh (bool): Перечитать записанные строки, чтобы вернуть значения в том виде, в котором
+                их возвращает база данных.
+
+        Returns:
+            list[MockModelWithDate]: Мок-данные после записи в порядке входных данных.
+        """
+        async with self._write_lock:
+            try:
+                return await self._write_mock_data(name, mocks_data, history_limit, refresh)
+            except IntegrityError:
+                return await self._write_mock_data(name, mocks_data, history_limit, refresh)
+
+    async def _write_mock_data(
+        self, name: str, mocks_data: list[MockData], history_limit: int, refresh: bool
+    ) -> list[MockModelWithDate]:
+        """Записывает мок-данные, читая занятые маршруты пакета одним запросом с блокировкой строк."""
+        keys = [mock_route_key(mock_data) for mock_data in mocks_data]
+        async with self._db.session(name) as session:
+            res = await session.execute(
+                select(MockDbData)
+                .where(tuple_(MockDbData.method, MockDbData.uri, MockDbData.match_key).in_(set(keys)))
+                .with_for_update()
+            )
+            routes: dict[RouteMatchKey, MockDbData] = {
+                (db_mock.method, db_mock.uri, db_mock.match_key): db_mock for db_mock in res.scalars()
+            }
+            # Время создания назначается явно с шагом в микросекунду: значение по умолчанию
+            # может совпасть у нескольких строк пакета, и тогда порядок входных данных теряется.
+            created_at = utc_now()
+            mocks = []
+            for key, mock_data in zip(keys, mocks_data, strict=True):
+                db_mock = routes.get(key)
+                if db_mock is None:
+                    db_mock = routes[key] = _to_db_mock(mock_data, created_at)
+                    created_at += timedelta(microseconds=1)
+                    session.add(db_mock)
+                    session.add(MockChangeLog(uuid=db_mock.uuid, action="upsert"))
+                else:
+                    _write_version(session, db_mock, mock_data, history_limit)
+                mocks.append(MockModelWithDate.model_validate(db_mock))
+            await session.flush()
+            await self._prune_history(session, mocks, history_limit)
+            if refresh:
+                for db_mock in routes.values():
+                    await session.refresh(db_mock)
+                mocks = [MockModelWithDate.model_validate(routes[key]) for key in keys]
+            await session.commit()
+            return mocks
+
+    @staticmethod
+    async def _prune_history(session: AsyncSession, mocks: list[MockModelWithDate], history_limit: int) -> None:
+        """Удаляет версии истории измененных мок-данных сверх `history_limit` по индексу (uuid, version)."""
+        if not history_limit:
+            return
+        for mock in {mock.uuid: mock for mock in mocks if mock.version > 1}.values():
+            await session.execute(
+                delete(MockDataHistory).where(
+                    MockDataHistory.uuid == mock.uuid, MockDataHistory.version < mock.version - history_limit
+                )
+            )
+
+    async def restore_mock_data(self, mocks: list[MockModelWithDate]) -> None:
+        """Добавляет мок-данные с сохраненными UUID и датами одной транзакцией, вставляя строки пачками."""
+        async with self._db.session("restore_mock_data") as session:
+            for start in range(0, len(mocks), config.BULK_BATCH_SIZE):
+                await session.execute(
+                    insert(MockDbData),
+                    [
+                        {
+                            **mock.model_dump(exclude=set(_MODEL_COLUMNS)),
+                            **_model_columns(mock),
+                            "match_key": mock_route_key(mock)[2],
+                        }
+                        for mock in mocks[start : start + config.BULK_BATCH_SIZE]
+                    ],
+                )
+            await session.commit()
+
+    async def get_mock_data_page(
+        self,
+        limit: int,
+        after: tuple[datetime, UUID] | None = None,
+        method: str | None = None,
+        uri_prefix: str | None = None,
+        status_code: int | None = None,
+        include_body: bool = True,
+    ) -> list[MockModelWithDate]:
+        """Возвращает страницу мок-данных с keyset-пагинацией по (created_at, uuid)."""
+        query = _filtered_mock_query(method, uri_prefix, status_code, include_body)
+        if after is not None:
+            created_at, uuid = after
+            query = query.where(
+                or_(
+                    MockDbData.created_at > created_at,
+                    and_(MockDbData.created_at == created_at, MockDbData.uuid > uuid),
+                )
+            )
+        async with self._db.session("get_mock_data_page") as session:
+            res = await session.execute(query.limit(limit))
+            return [_row_to_mock(row) for row in res.mappings()]
+
+    async def iter_mock_data(
+        self,
+        batch_size: int,
+        method: str | None = None,
+        uri_prefix: str | None = None,
+        status_code: int | None = None,
+        include_body: bool = True,
+    ) -> AsyncIterator[MockModelWithDate]:
+        """Читает мок-данные курсором базы данных, в памяти хранится не больше `batch_size` строк."""
+        query = _filtered_mock_query(method, uri_prefix, status_code, include_body)
+        async with self._db.session("iter_mock_data") as session:
+            res = await session.stream(query.execution_options(yield_per=batch_size))
+            async for row in res.mappings():
+                yield _row_to_mock(row)
+
+    async def update_mock_data(
+        self, uuid: UUID, mock_data: MockData, expected_version: int | None = None, history_limit: int = 0
+    ) -> MockModelWithDate | None:
+        """Изменяет строку мок-данных, сохраняет предыдущую версию в историю и добавляет запись журнала изменений.
+
+        Все изменения выполняются в одной транзакции; старые версии удаляются одним запросом
+        по индексу (uuid, version). Занятость нового маршрута проверяет уникальный индекс маршрута.
+        """
+        try:
+            async with self._write_lock, self._db.session("update_mock_data") as session:
+                res = await session.execute(select(MockDbData).where(MockDbData.uuid == uuid).with_for_update())
+                db_mock = res.scalar_one_or_none()
+                if db_mock is None or (expected_version is not None and db_mock.version != expected_version):
+                    return None
+                _write_version(session, db_mock, mock_data, history_limit)
+                await session.flush()
+                await session.refresh(db_mock)
+                mock = MockModelWithDate.model_validate(db_mock)
+                await self._prune_history(session, [mock], history_limit)
+                await session.commit()
+                return mock
+        except IntegrityError as e:
+            raise MockRouteConflictError(f"Маршрут {mock_data.method} {mock_data.uri} занят другими мок-данными") from e
+
+    async def get_mock_history(self, uuid: UUID) -> list[MockModelWithDate]:
+        """Возвращает сохраненные предыдущие версии мок-данных от новых к старым."""
+        async with self._db.session("get_mock_history") as session:
+            res = await session.execute(
+                select(MockDataHistory.data)
+                .where(MockDataHistory.uuid == uuid)
+                .order_by(MockDataHistory.version.desc())
+            )
+            return [MockModelWithDate.model_validate(data) for data in res.scalars()]
+
+    async def get_mock_version(self, uuid: UUID, version: int) -> MockModelWithDate | None:
+        """Возвращает предыдущую версию мок-данных из истории, либо None, если она не сохранена."""
+        async with self._db.session("get_mock_version") as session:
+            res = await session.execute(
+                select(MockDataHistory.data).where(MockDataHistory.uuid == uuid, MockDataHistory.version == version)
+            )
+            data = res.scalar_one_or_none()
+            return MockModelWithDate.model_validate(data) if data is not None else None
+
+    async def delete_mock_data(self, uuid: UUID) -> bool:
+        """Удаляет мок-данные и их историю и добавляет запись журнала изменений в одной транзакции, не читая строку."""
+        async with self._db.session("delete_mock_data") as session:
+            res = await session.execute(delete(MockDbData).where(MockDbData.uuid == uuid))
+            if not res.rowcount:
+                return False
+            await session.execute(delete(MockDataHistory).where(MockDataHistory.uuid == uuid))
+            session.add(MockChangeLog(uuid=uuid, action="delete"))
+            await session.commit()
+            return True
+
+    async def delete_mock_data_batch(self, uuids: list[UUID]) -> list[UUID]:
+        """Удаляет строки мок-данных и их историю и добавляет записи журнала изменений в одной транзакции.
+
+        Строки удаляются одним запросом по первичному ключу; UUID уже удаленных мок-данных пропускаются.
+        """
+        if not uuids:
+            return []
+        async with self._db.session("delete_mock_data_batch") as session:
+            res = await session.execute(select(MockDbData.uuid).where(MockDbData.uuid.in_(uuids)).with_for_update())
+            found = list(res.scalars())
+            if not found:
+                return []
+            await session.execute(delete(MockDbData).where(MockDbData.uuid.in_(found)))
+            await session.execute(delete(MockDataHistory).where(MockDataHistory.uuid.in_(found)))
+            session.add_all(MockChangeLog(uuid=uuid, action="delete") for uuid in found)
+            await session.commit()
+            return found
+
+    async def get_mock_expirations(self) -> list[tuple[UUID, datetime]]:
+        """Возвращает UUID и время истечения мок-данных, читая только индекс по expires_at."""
+        async with self._db.session("get_mock_expirations") as session:
+            res = await session.execute(
+                select(MockDbData.uuid, MockDbData.expires_at).where(MockDbData.expires_at.is_not(None))
+            )
+            return [(uuid, expires_at) for uuid, expires_at in res.all()]
+
+    async def get_mock_change_bounds(self) -> tuple[int, int]:
+        """Возвращает минимальный и максимальный идентификаторы журнала изменений, либо (0, 0)."""
+        async with self._db.session("get_mock_change_bounds") as session:
+            res = await session.execute(select(func.min(MockChangeLog.id), func.max(MockChangeLog.id)))
+            min_id, max_id = res.one()
+            return min_id or 0, max_id or 0
+
+    async def get_mock_changes(self, after_id: int, missing_ids: Collection[int] = ()) -> list[tuple[int, UUID, str]]:
+        """Возвращает записи журнала изменений (id, uuid, action) в порядке возрастания id.
+
+        Кроме записей после `after_id` возвращаются записи с идентификаторами из `missing_ids`,
+        транзакции которых были зафиксированы позже транзакций с большими идентификаторами.
+        """
+        condition = MockChangeLog.id > after_id
+        if missing_ids:
+            condition = or_(condition, MockChangeLog.id.in_(list(missing_ids)))
+        async with self._db.session("get_mock_changes") as session:
+            res = await session.execute(
+                select(MockChangeLog.id, MockChangeLog.uuid, MockChangeLog.action)
+                .where(condition)
+                .order_by(MockChangeLog.id)
+            )
+            return [(change_id, uuid, action) for change_id, uuid, action in res.all()]
+
+    async def prune_mock_changes(self, keep_last: int) -> None:
+        """Удаляет старые записи журнала изменений, сохраняя `keep_last` последних."""
+        async with self._db.session("prune_mock_changes") as session:
+            max_id = (await session.execute(select(func.max(MockChangeLog.id)))).scalar_one_or_none()
+            if max_id is not None:
+                await session.execute(delete(MockChangeLog).where(MockChangeLog.id <= max_id - keep_last))
+
+    async def save_request_log(self, rows: list[dict[str, Any]]) -> None:
+        """Сохраняет пакет записей журнала запросов одной транзакцией."""
+        async with self._db.session("save_request_log") as session:
+            await session.execute(insert(MockRequestLog), rows)
+            await session.commit()
+
+    async def get_request_log_page(
+        self,
+        limit: int,
+        cursor: int | None = None,
+        mock_uuid: UUID | None = None,
+        method: str | None = None,
+        path_prefix: str | None = None,
+    ) -> tuple[list[RecordedRequest], int | None]:
+        """Возвращает страницу журнала запросов от новых записей к старым и курсор следующей страницы."""
+        query = select(MockRequestLog).order_by(MockRequestLog.id.desc())
+        if cursor is not None:
+            query = query.where(MockRequestLog.id < cursor)
+        if mock_uuid is not None:
+            query = query.where(MockRequestLog.mock_uuid == mock_uuid)
+        if method is not None:
+            query = query.where(MockRequestLog.method == method)
+        if path_prefix is not None:
+            query = query.where(MockRequestLog.path.startswith(path_prefix, autoescape=True))
+
+        async with self._db.session("get_request_log_page") as session:
+            res = await session.execute(query.limit(limit + 1))
+            items = [RecordedRequest.from_db(row) for row in res.scalars()]
+        if len(items) > limit:
+            items = items[:limit]
+            return items, items[-1].id
+        return items, None
+
+    async def clear_request_log(self) -> int:
+        """Удаляет все записи журнала запросов и возвращает их количество."""
+        async with self._db.session("clear_request_log") as session:
+            res = await session.execute(delete(MockRequestLog))
+            await session.commit()
+            return res.rowcount or 0
+
+    async def prune_request_log(self, keep_last: int) -> None:
+        """Удаляет старые записи журнала запросов, сохраняя `keep_last` последних."""
+        async with self._db.session("prune_request_log") as session:
+            max_id = (await session.execute(select(func.max(MockRequestLog.id)))).scalar_one_or_none()
+            if max_id is not None and max_id > keep_last:
+                await session.execute(delete(MockRequestLog).where(MockRequestLog.id <= max_id - keep_last))
+                await session.commit()
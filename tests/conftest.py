@@ -5,6 +5,7 @@ from pathlib import Path
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 
 from src.__main__ import app, lifespan
 
@@ -25,15 +26,32 @@ def test_client(test_app: FastAPI) -> TestClient:
     return TestClient(test_app)
 
 
+@pytest.fixture
+async def async_client(test_app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
+    """Фикстура для создания асинхронного тестового клиента в цикле событий теста."""
+    async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+        yield client
+
+
 @pytest.fixture(autouse=True)
 async def cleanup_database() -> AsyncGenerator[None, None]:
     """Фикстура для очистки БД после каждого теста."""
     yield
     from src.db import DBManager
     from src.db.models.mock_data import Base
-
+    from src.metrics import metrics
+    from src.services.mock_route_table import route_table
+    from src.services.request_journal import request_journal
+    from src.storage import set_storage
+
+    route_table.clear()
+    request_journal.clear()
+    metrics.clear()
+    set_storage(None)
     db_manager = DBManager()
     if db_manager._engine is None:
-        raise ValueError("DBManager's _engine is not initialized.")
+        return
     async with db_manager._engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+    # Пул соединений привязан к циклу событий теста, поэтому движок создается заново для каждого теста.
+    await db_manager.close()
@@ -0,0 +1,37 @@
+import pytest
+from fastapi import FastAPI
+
+from benchmarks.bench_hot_path import SCENARIOS, format_table, run_scenarios
+from benchmarks.load import InProcessTarget, percentile, summarize
+
+
+def test_latency_summary() -> None:
+    """Тест расчета перцентилей и пропускной способности."""
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 0.5) == 50
+    assert percentile(values, 0.99) == 99
+    assert percentile([], 0.5) == 0
+
+    stats = summarize([0.001] * 9 + [0.01], errors=1, elapsed=0.5)
+    assert stats.requests == 10
+    assert stats.rps == 20
+    assert stats.p50_ms == pytest.approx(1)
+    assert stats.p99_ms == pytest.approx(10)
+    assert stats.errors == 1
+
+
+@pytest.mark.asyncio
+async def test_hot_path_scenarios_in_process(test_app: FastAPI) -> None:
+    """Тест выполнения всех сценариев бенчмарка против приложения в процессе."""
+    records = await run_scenarios(InProcessTarget(test_app), list(SCENARIOS), count=20, concurrency=4, large_body_kb=4)
+
+    assert [(record["scenario"], record["operation"]) for record in records] == [
+        ("hit_by_route", "read"),
+        ("hit_by_req_id", "read"),
+        ("miss", "read"),
+        ("large_body", "read"),
+        ("admin_writes_under_reads", "read"),
+        ("admin_writes_under_reads", "write"),
+    ]
+    assert all(record["errors"] == 0 for record in records)
+    assert "rps x" in format_table(records, records)
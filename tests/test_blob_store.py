@@ -0,0 +1,108 @@
+import hashlib
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+from starlette.types import Message
+
+from src.services.compiled_response import CompiledMockResponse
+from src.services.handle_mock_request import send_blob_response
+from src.storage import BlobStore, blob_store
+
+
+@pytest.fixture(autouse=True)
+def blob_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Фикстура отдельного каталога хранилища тел ответов для каждого теста."""
+    monkeypatch.setattr(blob_store, "root", tmp_path / "blobs")
+    return blob_store.root
+
+
+@pytest.mark.asyncio
+async def test_blob_store_is_content_addressed(tmp_path: Path) -> None:
+    """Тест записи тел по содержимому и отображения файла тела в память."""
+    store = BlobStore(tmp_path / "store")
+    data = b"\x89PNG" + bytes(range(256)) * 10
+    digest = await store.put(data)
+    assert digest == hashlib.sha256(data).hexdigest()
+    assert store.path(digest) == tmp_path / "store" / digest[:2] / digest
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for offset in range(0, len(data), 1000):
+            yield data[offset : offset + 1000]
+
+    assert await store.put_stream(chunks()) == (digest, len(data))
+    assert [path.name for path in (tmp_path / "store").rglob("*") if path.is_file()] == [digest]
+    assert store.map(digest).view() == data
+    assert store.size("0" * 64) is None
+    with pytest.raises(ValueError, match="SHA-256"):
+        store.path("../etc/passwd")
+
+
+@pytest.mark.asyncio
+async def test_mock_with_binary_body(async_client: AsyncClient) -> None:
+    """Тест мока с двоичным телом из хранилища тел ответов."""
+    data = bytes(range(256)) * 4096
+    response = await async_client.post("/api/v1/mock/blobs", content=data, headers={"Content-Type": "image/png"})
+    assert response.status_code == 201
+    body_ref = response.json()
+    assert body_ref["size"] == len(data)
+
+    payload = {"uri": "/image.png", "method": "GET", "status_code": 200, "body_ref": body_ref}
+    response = await async_client.post("/api/v1/mock", json=payload)
+    assert response.status_code == 201
+    assert response.json()["body_ref"]["size"] == len(data)
+
+    response = await async_client.get("/image.png")
+    assert response.content == data
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["content-length"] == str(len(data))
+
+    response = await async_client.get(f"/api/v1/mock/blobs/{body_ref['digest']}")
+    assert response.content == data
+
+    payload["body_ref"] = {"digest": "0" * 64}
+    assert (await async_client.post("/api/v1/mock", json=payload)).status_code == 400
+    payload["body"] = {"inline": True}
+    assert (await async_client.post("/api/v1/mock", json=payload)).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_large_json_body_moved_out_of_line(async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Тест переноса большого JSON-тела в хранилище тел ответов и списка без тел."""
+    from src.settings import config
+
+    monkeypatch.setattr(config, "BLOB_INLINE_LIMIT", 1024)
+    body = {"items": [{"id": index, "name": f"item-{index}"} for index in range(500)]}
+    payload = {"uri": "/items", "method": "GET", "status_code": 200, "body": body}
+    created = (await async_client.post("/api/v1/mock", json=payload)).json()
+    assert created["body"] is None
+    assert created["body_ref"]["content_type"] == "application/json"
+
+    response = await async_client.get("/items")
+    assert response.json() == body
+    assert response.headers["content-type"] == "application/json"
+
+    payload = {"uri": "/small", "method": "GET", "status_code": 200, "body": {"small": True}}
+    assert (await async_client.post("/api/v1/mock", json=payload)).json()["body"] == {"small": True}
+    page = (await async_client.get("/api/v1/mock", params={"limit": 10, "include_body": "false"})).json()
+    assert [item["body"] for item in page["items"]] == [None, None]
+    assert page["items"][0]["body_ref"] == created["body_ref"]
+
+
+@pytest.mark.asyncio
+async def test_blob_response_uses_pathsend() -> None:
+    """Тест передачи файла тела серверу с поддержкой расширения http.response.pathsend."""
+    digest = await blob_store.put(b"payload")
+    response = CompiledMockResponse(status_code=200, body=b"", raw_headers=(), blob=blob_store.map(digest))
+    messages: list[Message] = []
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    await send_blob_response({"type": "http", "extensions": {"http.response.pathsend": {}}}, send, response)
+    assert messages[1] == {"type": "http.response.pathsend", "path": str(blob_store.path(digest))}
+
+    messages.clear()
+    await send_blob_response({"type": "http"}, send, response)
+    assert messages[1] == {"type": "http.response.body", "body": b"payload", "more_body": False}
@@ -0,0 +1,53 @@
+from uuid import uuid4
+
+import pytest
+from fastapi.responses import JSONResponse
+from httpx import AsyncClient
+
+from src.api.models.mock_model import MockWithUUID
+from src.services.compiled_response import compile_mock_response, get_json_encoder
+
+
+def make_mock(**kwargs: object) -> MockWithUUID:
+    """Создает мок с UUID для тестов."""
+    data: dict[str, object] = {"uuid": uuid4(), "uri": "/items", "method": "GET", "status_code": 200}
+    data.update(kwargs)
+    return MockWithUUID.model_validate(data)
+
+
+def test_compiled_response_matches_json_response() -> None:
+    """Тест совпадения собранного ответа с ответом JSONResponse."""
+    body = {"items": [{"id": 1, "name": "Ноутбук"}], "total": 1}
+    mock = make_mock(body=body, headers={"X-Trace": "abc"})
+
+    compiled = compile_mock_response(mock)
+    expected = JSONResponse(status_code=200, content=body, headers={"X-Trace": "abc"})
+
+    assert compiled.body == expected.body
+    assert sorted(compiled.raw_headers) == sorted(expected.raw_headers)
+
+
+def test_compiled_response_keeps_custom_content_type() -> None:
+    """Тест сохранения заданного в моке Content-Type и пустого тела."""
+    compiled = compile_mock_response(make_mock(status_code=204, headers={"Content-Type": "text/plain"}))
+
+    assert compiled.body == b"null"
+    assert compiled.raw_headers == ((b"content-type", b"text/plain"),)
+
+
+def test_unknown_json_encoder() -> None:
+    """Тест ошибки при неизвестном кодировщике JSON."""
+    with pytest.raises(ValueError, match="Неизвестный"):
+        get_json_encoder("yaml")
+
+
+@pytest.mark.asyncio
+async def test_non_latin1_headers_rejected_before_saving(async_client: AsyncClient) -> None:
+    """Тест отклонения мока с заголовками вне latin-1 без сохранения в хранилище."""
+    payload = {"uri": "/people", "method": "GET", "status_code": 200, "headers": {"X-Name": "Иван"}}
+    assert (await async_client.post("/api/v1/mock", json=payload)).status_code == 422
+    step = {"uri": "/people", "method": "GET", "status_code": 200, "sequence": {"steps": [{"headers": {"Имя": "x"}}]}}
+    assert (await async_client.post("/api/v1/mock", json=step)).status_code == 422
+    split = {**payload, "headers": {"X-Name": "a\r\nSet-Cookie: b"}}
+    assert (await async_client.post("/api/v1/mock", json=split)).status_code == 422
+    assert (await async_client.get("/api/v1/mock")).status_code == 404
@@ -0,0 +1,90 @@
+import pytest
+from httpx import AsyncClient
+
+
+async def create_mock(async_client: AsyncClient, **fields: object) -> None:
+    """Создает мок GET /catalog."""
+    payload = {"uri": "/catalog", "method": "GET", "status_code": 200, "body": {"items": [1, 2, 3]}, **fields}
+    assert (await async_client.post("/api/v1/mock", json=payload)).status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_if_none_match_and_if_modified_since(async_client: AsyncClient) -> None:
+    """Тест ответа 304 на запросы с совпадающими ETag и Last-Modified."""
+    await create_mock(async_client, headers={"Cache-Control": "max-age=60", "X-Trace": "1"})
+    response = await async_client.get("/catalog")
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+    assert response.status_code == 200
+    assert (await async_client.get("/catalog")).headers["etag"] == etag
+
+    not_modified = await async_client.get("/catalog", headers={"If-None-Match": f'"other", W/{etag}'})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+    assert not_modified.headers["cache-control"] == "max-age=60"
+    assert "x-trace" not in not_modified.headers
+    assert (await async_client.get("/catalog", headers={"If-None-Match": "*"})).status_code == 304
+
+    changed = await async_client.get(
+        "/catalog", headers={"If-None-Match": '"other"', "If-Modified-Since": last_modified}
+    )
+    assert changed.status_code == 200
+    assert (await async_client.get("/catalog", headers={"If-Modified-Since": last_modified})).status_code == 304
+    older = await async_client.get("/catalog", headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+    assert older.status_code == 200
+    assert older.json() == {"items": [1, 2, 3]}
+
+    await create_mock(async_client, body={"items": [4]})
+    updated = await async_client.get("/catalog", headers={"If-None-Match": etag})
+    assert updated.status_code == 200
+    assert updated.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_head_served_by_get_mock(async_client: AsyncClient) -> None:
+    """Тест ответа на HEAD-запрос по GET-моку без тела."""
+    await create_mock(async_client)
+    get = await async_client.get("/catalog")
+    head = await async_client.head("/catalog")
+    assert head.status_code == 200
+    assert head.content == b""
+    assert head.headers["content-length"] == get.headers["content-length"]
+    assert head.headers["etag"] == get.headers["etag"]
+    assert (await async_client.head("/catalog", headers={"If-None-Match": get.headers["etag"]})).status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_templated_mock_without_validators(async_client: AsyncClient) -> None:
+    """Тест шаблонизированного мока: ответ зависит от запроса и не получает ETag."""
+    await create_mock(
+        async_client, headers={"X-Region": "{{ query.region }}"}, body={"region": "{{ query.region }}"}, template={}
+    )
+    response = await async_client.get("/catalog", params={"region": "eu"})
+    assert response.json() == {"region": "eu"}
+    assert "etag" not in response.headers
+
+    head = await async_client.head("/catalog", params={"region": "us"})
+    assert head.status_code == 200
+    assert head.content == b""
+    assert head.headers["x-region"] == "us"
+
+
+@pytest.mark.asyncio
+async def test_conditional_request_to_error_mock(async_client: AsyncClient) -> None:
+    """Тест ответа мока с кодом вне 2xx на условные запросы без 304 и без валидаторов."""
+    await create_mock(async_client, status_code=503, body={"error": "down"}, headers={"ETag": '"fixed"'})
+    for headers in (
+        {"If-None-Match": "*"},
+        {"If-None-Match": '"fixed"'},
+        {"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"},
+    ):
+        response = await async_client.get("/catalog", headers=headers)
+        assert response.status_code == 503
+        assert response.json() == {"error": "down"}
+
+    await create_mock(async_client, status_code=404, body={"error": "missing"})
+    response = await async_client.get("/catalog", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
+    assert "etag" not in response.headers
+    assert "last-modified" not in response.headers
@@ -0,0 +1,39 @@
+import pytest
+from httpx import AsyncClient
+
+MOCK_PAYLOAD = {"uri": "/orders", "method": "GET", "status_code": 202, "body": {"status": "queued"}}
+
+
+@pytest.mark.asyncio
+async def test_unmatched_request_falls_through(async_client: AsyncClient) -> None:
+    """Тест передачи запроса приложению, если мок не найден."""
+    response = await async_client.get("/")
+    assert response.status_code == 200
+    assert response.json() == {"message": "Hello World"}
+
+
+@pytest.mark.asyncio
+async def test_mock_by_request_id(async_client: AsyncClient) -> None:
+    """Тест поиска мока по заголовку x-req-id и ошибок формата UUID."""
+    uuid = (await async_client.post("/api/v1/mock", json=MOCK_PAYLOAD)).json()["uuid"]
+
+    response = await async_client.get("/orders", headers={"x-req-id": uuid})
+    assert response.status_code == 202
+    assert response.json() == {"status": "queued"}
+
+    response = await async_client.get("/orders", headers={"x-req-id": "not-a-uuid"})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid UUID format: not-a-uuid"}
+
+    response = await async_client.get("/orders", headers={"x-req-id": "550e8400-e29b-41d4-a716-446655440000"})
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_admin_api_not_intercepted(async_client: AsyncClient) -> None:
+    """Тест того, что административный API не перехватывается моками."""
+    uuid = (await async_client.post("/api/v1/mock", json=MOCK_PAYLOAD)).json()["uuid"]
+
+    response = await async_client.get("/api/v1/mock", params={"uuid": uuid}, headers={"x-req-id": uuid})
+    assert response.status_code == 200
+    assert response.json()["uuid"] == uuid
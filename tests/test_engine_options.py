@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.db.engine_options import DB_PRESETS, default_preset, resolve_engine_options
+from src.settings.settings import Settings
+
+
+def test_presets_selected_by_url_and_overridden_by_settings() -> None:
+    """Тест выбора набора параметров по строке подключения и переопределения настройками."""
+    assert default_preset("sqlite+aiosqlite:///:memory:") == "memory-fast"
+    assert default_preset("sqlite+aiosqlite:////tmp/mock.sqlite3") == "durable-sqlite"
+    assert default_preset("postgresql+asyncpg://user@db/mock") == "server"
+
+    settings = Settings.model_validate({"DB_PRESET": "server", "DB_POOL_SIZE": 3, "DB_SQLITE_SYNCHRONOUS": "NORMAL"})
+    options = resolve_engine_options(settings, "postgresql+asyncpg://user:secret@db/mock")
+    assert options.echo is False
+    assert options.pool_size == 3
+    assert options.max_overflow == DB_PRESETS["server"].max_overflow
+    assert options.sqlite_pragmas == {"synchronous": "NORMAL"}
+
+    url, kwargs = options.engine_kwargs("postgresql+asyncpg://user:secret@db/mock")
+    assert url == "postgresql+asyncpg://user:secret@db/mock?prepared_statement_cache_size=500"
+    assert kwargs == {
+        "echo": False,
+        "pool_size": 3,
+        "max_overflow": 20,
+        "pool_recycle": 1800,
+        "pool_timeout": 30,
+        "pool_pre_ping": True,
+    }
+
+    _, kwargs = DB_PRESETS["memory-fast"].engine_kwargs("sqlite+aiosqlite:///:memory:")
+    assert kwargs == {"echo": False, "poolclass": AsyncAdaptedQueuePool, "pool_size": 1, "max_overflow": 0}
+
+
+@pytest.mark.asyncio
+async def test_sqlite_pragmas_applied_to_connections(tmp_path: Path) -> None:
+    """Тест выполнения PRAGMA SQLite для соединений файловой базы данных."""
+    db_url = f"sqlite+aiosqlite:///{tmp_path / 'durable.sqlite3'}"
+    settings = Settings.model_validate({"DB_SQLITE_MMAP_SIZE": 1048576, "DB_STATEMENT_CACHE_SIZE": 64})
+    engine = resolve_engine_options(settings, db_url).create_engine(db_url)
+    try:
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+            assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 2
+            assert (await conn.execute(text("PRAGMA mmap_size"))).scalar() == 1048576
+    finally:
+        await engine.dispose()
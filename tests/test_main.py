@@ -71,7 +71,17 @@ async def test_db_initialization(test_app: FastAPI) -> None:
             "status_code",
             "headers",
             "body",
+            "body_ref",
             "delay",
+            "match",
+            "match_key",
+            "latency",
+            "stream",
+            "template",
+            "sequence",
+            "version",
+            "expires_at",
+            "max_hits",
             "created_at",
             "updated_at",
         }
@@ -99,3 +109,15 @@ async def test_routes_registration(test_app: FastAPI) -> None:
     assert "GET" in mock_methods, "GET метод не доступен для /api/v1/mock"
     assert "POST" in mock_methods, "POST метод не доступен для /api/v1/mock"
     assert "DELETE" in mock_methods, "DELETE метод не доступен для /api/v1/mock"
+
+
+def test_main_rejects_reload_with_several_workers(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Тест отказа в запуске с перезагрузкой при изменениях и несколькими воркерами."""
+    from src.__main__ import main
+    from src.settings import config
+
+    assert type(config).model_fields["SERVER_RELOAD"].default is False
+    monkeypatch.setattr(config, "SERVER_RELOAD", True)
+    monkeypatch.setattr(config, "SERVER_WORKERS", 2)
+    with pytest.raises(RuntimeError, match="SERVER_RELOAD"):
+        main()
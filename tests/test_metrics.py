@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+
+from src.metrics import MetricsFileStore, MetricsRegistry, render_prometheus
+from src.settings import config
+
+
+def test_registry_render_and_merge(tmp_path: Path) -> None:
+    """Тест записи метрик, объединения снимков воркеров и текстового формата Prometheus."""
+    first, second = MetricsRegistry(buckets=(0.001, 0.01)), MetricsRegistry(buckets=(0.001, 0.01))
+    first.inc("mock_requests_total", (("outcome", "match"),))
+    first.observe("mock_lookup_duration_seconds", 0.0005)
+    second.inc("mock_requests_total", (("outcome", "match"),), 2)
+    second.observe("mock_lookup_duration_seconds", 0.005)
+    second.observe("mock_lookup_duration_seconds", 1.0)
+
+    store = MetricsFileStore(tmp_path)
+    store.write(first.snapshot(), pid=1)
+    store.write(second.snapshot(), pid=2)
+    text = render_prometheus(store.read_all(), buckets=(0.001, 0.01))
+
+    assert 'mock_requests_total{outcome="match"} 3' in text
+    assert 'mock_lookup_duration_seconds_bucket{le="0.001"} 1' in text
+    assert 'mock_lookup_duration_seconds_bucket{le="0.01"} 2' in text
+    assert 'mock_lookup_duration_seconds_bucket{le="+Inf"} 3' in text
+    assert "mock_lookup_duration_seconds_count 3" in text
+    assert "# TYPE mock_hits_total counter" in text
+
+    store.clear()
+    assert store.read_all() == {"counters": {}, "histograms": {}}
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(async_client: AsyncClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Тест счетчиков результатов, попаданий в моки и метрик сессий базы данных."""
+    payload = {"uri": "/slow", "method": "GET", "status_code": 200, "body": {}, "delay": 50}
+    uuid = (await async_client.post("/api/v1/mock", json=payload)).json()["uuid"]
+    await async_client.get("/slow")
+    await async_client.get("/slow", headers={"x-req-id": uuid})
+    await async_client.get("/")
+    await async_client.get("/", headers={"x-req-id": "broken"})
+
+    response = await async_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert f'mock_hits_total{{uuid="{uuid}"}} 2' in text
+    assert 'mock_requests_total{outcome="match"} 2' in text
+    assert 'mock_requests_total{outcome="miss"} 1' in text
+    assert 'mock_requests_total{outcome="error"} 1' in text
+    assert 'db_session_duration_seconds_count{operation="create_mock_data"} 1' in text
+    # Задержка мока 50 мс не входит в время обработки запроса.
+    assert 'mock_request_duration_seconds_bucket{outcome="match",le="0.05"} 2' in text
+
+    latency = {**payload, "uri": "/latency", "delay": None, "latency": {"distribution": "fixed", "value": 80}}
+    await async_client.post("/api/v1/mock", json=latency)
+    await async_client.get("/latency")
+    # Задержка по профилю latency тоже не входит в время обработки запроса.
+    response = await async_client.get("/metrics")
+    assert 'mock_request_duration_seconds_bucket{outcome="match",le="0.05"} 3' in response.text
+
+    monkeypatch.setattr(config, "METRICS_DIR", str(tmp_path))
+    MetricsFileStore(tmp_path).write(
+        {"counters": {"mock_requests_total": {'outcome="miss"': 5}}, "histograms": {}}, pid=1
+    )
+    response = await async_client.get("/metrics")
+    assert 'mock_requests_total{outcome="miss"} 6' in response.text
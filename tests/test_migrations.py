@@ -0,0 +1,148 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Connection, inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.db.migrations import MIGRATIONS, get_schema_version, run_migrations
+from src.db.models.mock_data import Base
+
+
+@pytest.mark.asyncio
+async def test_migrations_upgrade_existing_database(tmp_path: Path) -> None:
+    """Тест обновления схемы файловой базы данных, созданной предыдущей версией сервера."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.sqlite3'}")
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "CREATE TABLE mock_data (uuid CHAR(32) PRIMARY KEY, uri VARCHAR NOT NULL, "
+                    "method VARCHAR(7) NOT NULL, status_code INTEGER NOT NULL, headers JSON, body JSON, delay INTEGER, "
+                    "created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL, "
+                    "updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL)"
+                )
+            )
+            await conn.execute(
+                text("INSERT INTO mock_data (uuid, uri, method, status_code) VALUES ('0', '/old', 'GET', 200)")
+            )
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            version = await conn.run_sync(run_migrations)
+            indexes = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_indexes("mock_data"))
+            columns = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_columns("mock_data"))
+
+        assert version == MIGRATIONS[-1][0]
+        assert {"name": "ix_mock_data_method_uri_created_at", "column_names": ["method", "uri", "created_at"]} in [
+            {"name": index["name"], "column_names": index["column_names"]} for index in indexes
+        ]
+
+        assert "match" in {column["name"] for column in columns}
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("SELECT version FROM mock_data"))).scalar_one() == 1
+
+        async with engine.begin() as conn:
+            assert await conn.run_sync(run_migrations) == version
+            assert await conn.run_sync(get_schema_version) == version
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_each_migration_adds_only_its_own_schema(tmp_path: Path) -> None:
+    """Тест добавления каждой миграцией только описанных в ней колонок и индексов."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.sqlite3'}")
+    expected_columns = {
+        3: {"match"},
+        4: {"latency", "stream"},
+        5: {"body_ref"},
+        6: {"template"},
+        7: {"sequence"},
+        8: {"version"},
+        9: {"expires_at", "max_hits"},
+        10: {"match_key"},
+    }
+    expected_indexes = {
+        1: {"ix_mock_data_method_uri_created_at"},
+        2: {"ix_mock_data_created_at_uuid"},
+        9: {"ix_mock_data_expires_at"},
+        10: {"ix_mock_data_method_uri_match_key"},
+    }
+
+    def schema(sync_conn: Connection) -> tuple[set[str], set[str]]:
+        inspector = inspect(sync_conn)
+        columns = {column["name"] for column in inspector.get_columns("mock_data")}
+        indexes = {str(index["name"]) for index in inspector.get_indexes("mock_data")}
+        return columns, indexes
+
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "CREATE TABLE mock_data (uuid CHAR(32) PRIMARY KEY, uri VARCHAR NOT NULL, "
+                    "method VARCHAR(7) NOT NULL, status_code INTEGER NOT NULL, headers JSON, body JSON, delay INTEGER, "
+                    "created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL, "
+                    "updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL)"
+                )
+            )
+            columns, indexes = await conn.run_sync(schema)
+            for version, _, migrate in MIGRATIONS:
+                await conn.run_sync(migrate)
+                new_columns, new_indexes = await conn.run_sync(schema)
+                assert new_columns - columns == expected_columns.get(version, set()), version
+                assert new_indexes - indexes == expected_indexes.get(version, set()), version
+                columns, indexes = new_columns, new_indexes
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_migration_keeps_latest_mock_of_duplicate_routes(tmp_path: Path) -> None:
+    """Тест заполнения ключей условий выбора, если в старой базе данных у маршрута несколько мок-данных."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.sqlite3'}")
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "CREATE TABLE mock_data (uuid CHAR(32) PRIMARY KEY, uri VARCHAR NOT NULL, "
+                    "method VARCHAR(7) NOT NULL, status_code INTEGER NOT NULL, headers JSON, body JSON, delay INTEGER, "
+                    "created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+                )
+            )
+            await conn.execute(
+                text(
+                    "INSERT INTO mock_data (uuid, uri, method, status_code, created_at, updated_at) "
+                    "VALUES (:uuid, '/old', 'GET', 200, :created_at, :created_at)"
+                ),
+                [{"uuid": "1" * 32, "created_at": "2024-01-01"}, {"uuid": "2" * 32, "created_at": "2024-01-02"}],
+            )
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(run_migrations)
+            rows = (await conn.execute(text("SELECT uuid, match_key FROM mock_data"))).all()
+            keys: dict[str, str] = {row.uuid: row.match_key for row in rows}
+            indexes = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_indexes("mock_data"))
+
+        assert keys["2" * 32] == ""
+        assert len(keys["1" * 32]) == 64
+        assert {"name": "ix_mock_data_method_uri_match_key", "unique": 1} in [
+            {"name": index["name"], "unique": index["unique"]} for index in indexes
+        ]
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_latest_mock_by_route_with_several_versions(test_app: object) -> None:
+    """Тест выбора последнего мока, если для маршрута создано несколько версий."""
+    from src.api.models.mock_model import MockData
+    from src.services.mock_service import create_mock_data, get_last_mock_data_by_uri_and_method
+
+    payload = {"uri": "/versions", "method": "GET", "status_code": 200}
+    await create_mock_data(MockData.model_validate({**payload, "body": {"version": 1}}))
+    latest = await create_mock_data(MockData.model_validate({**payload, "body": {"version": 2}}))
+
+    mock = await get_last_mock_data_by_uri_and_method(uri="/versions", method="GET")
+    assert mock is not None
+    assert mock.uuid == latest.uuid
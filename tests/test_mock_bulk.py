@@ -0,0 +1,65 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+
+MOCK_PAYLOAD = {"uri": "/bulk", "method": "GET", "status_code": 200, "body": {"ok": True}}
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_ndjson_with_errors(async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Тест массового импорта NDJSON пакетами с ошибками отдельных элементов."""
+    from src.settings import config
+
+    monkeypatch.setattr(config, "BULK_BATCH_SIZE", 2)
+    lines = [json.dumps({**MOCK_PAYLOAD, "uri": f"/bulk/{i}"}) for i in range(4)]
+    lines.insert(1, json.dumps({**MOCK_PAYLOAD, "status_code": "oops"}))
+    lines.insert(3, "{not json")
+    content = ("\n".join(lines) + "\n\n").encode()
+
+    response = await async_client.post(
+        "/api/v1/mock/bulk", content=content, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["created"] == 4
+    assert result["failed"] == 2
+    assert [error["index"] for error in result["errors"]] == [1, 3]
+    assert result["errors"][0]["detail"].startswith("status_code:")
+
+    response = await async_client.get("/bulk/3")
+    assert response.json() == {"ok": True}
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_json_array_and_export(async_client: AsyncClient) -> None:
+    """Тест массового импорта JSON-массива и потоковой выгрузки."""
+    payload = [{**MOCK_PAYLOAD, "uri": f"/bulk/{i}"} for i in range(3)]
+    response = await async_client.post("/api/v1/mock/bulk", json=payload)
+    assert response.json()["created"] == 3
+
+    response = await async_client.get("/api/v1/mock/export")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert [mock["uri"] for mock in exported] == ["/bulk/0", "/bulk/1", "/bulk/2"]
+
+    response = await async_client.get("/api/v1/mock/export", params={"format": "json"})
+    assert [mock["uuid"] for mock in response.json()] == [mock["uuid"] for mock in exported]
+
+    response = await async_client.post("/api/v1/mock/bulk", json={"not": "a list"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_updates_occupied_routes(async_client: AsyncClient) -> None:
+    """Тест массового импорта элементов для занятых маршрутов как новых версий моков."""
+    existing = (await async_client.post("/api/v1/mock", json=MOCK_PAYLOAD)).json()
+    payload = [{**MOCK_PAYLOAD, "status_code": 201}, {**MOCK_PAYLOAD, "uri": "/bulk/new"}, {**MOCK_PAYLOAD, "body": {}}]
+
+    result = (await async_client.post("/api/v1/mock/bulk", json=payload)).json()
+    assert (result["created"], result["updated"]) == (1, 2)
+    assert result["uuids"][0] == result["uuids"][2] == existing["uuid"]
+
+    mock = (await async_client.get("/api/v1/mock", params={"uuid": existing["uuid"]})).json()
+    assert (mock["version"], mock["status_code"], mock["body"]) == (3, 200, {})
+    assert len((await async_client.get("/api/v1/mock")).json()) == 2
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+
+
+async def create_mocks(client: AsyncClient) -> list[dict[str, object]]:
+    """Создает набор моков для проверки списка."""
+    payload = [
+        {"uri": f"/list/{i}", "method": "GET" if i % 2 else "POST", "status_code": 200 if i < 4 else 500}
+        for i in range(6)
+    ]
+    uuids = (await client.post("/api/v1/mock/bulk", json=payload)).json()["uuids"]
+    return [{**item, "uuid": uuid} for item, uuid in zip(payload, uuids, strict=True)]
+
+
+@pytest.mark.asyncio
+async def test_list_mocks_with_cursor_pagination(async_client: AsyncClient) -> None:
+    """Тест постраничного чтения списка моков по курсору."""
+    mocks = await create_mocks(async_client)
+
+    seen: list[str] = []
+    params: dict[str, str | int] = {"limit": 4}
+    while True:
+        page = (await async_client.get("/api/v1/mock", params=params)).json()
+        seen.extend(item["uuid"] for item in page["items"])
+        if page["next_cursor"] is None:
+            break
+        params = {"limit": 4, "cursor": page["next_cursor"]}
+
+    assert seen == [mock["uuid"] for mock in mocks]
+
+    response = await async_client.get("/api/v1/mock", params={"cursor": "broken"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_mocks_with_filters_and_stream(async_client: AsyncClient) -> None:
+    """Тест фильтрации и потоковой выдачи списка моков."""
+    await create_mocks(async_client)
+
+    response = await async_client.get("/api/v1/mock", params={"method": "GET", "status_code": 200})
+    assert [mock["uri"] for mock in response.json()] == ["/list/1", "/list/3"]
+
+    response = await async_client.get("/api/v1/mock", params={"uri_prefix": "/list/5", "stream": True})
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["uri"] for line in response.text.splitlines()] == ["/list/5"]
+
+    response = await async_client.get("/api/v1/mock", params={"uri_prefix": "/missing"})
+    assert response.status_code == 404
@@ -0,0 +1,125 @@
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+from starlette.types import Message
+
+from src.api.models.mock_model import MockMatch, MockModelWithDate
+from src.services.mock_request import MockRequest
+from src.services.mock_route_table import MockRouteTable
+
+BASE_TIME = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def make_mock(offset: int, body: dict[str, object], match: MockMatch | None = None) -> MockModelWithDate:
+    """Создает мок маршрута POST /orders с заданными условиями."""
+    created_at = BASE_TIME + timedelta(seconds=offset)
+    return MockModelWithDate.model_validate(
+        {
+            "uuid": uuid4(),
+            "uri": "/orders",
+            "method": "POST",
+            "status_code": 200,
+            "body": body,
+            "match": match,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+    )
+
+
+def make_request(
+    query: bytes = b"", headers: list[tuple[bytes, bytes]] | None = None, body: bytes = b""
+) -> tuple[MockRequest, list[Message]]:
+    """Создает MockRequest и список сообщений, прочитанных из канала ASGI."""
+    received: list[Message] = []
+
+    async def receive() -> Message:
+        message: Message = {"type": "http.request", "body": body, "more_body": False}
+        received.append(message)
+        return message
+
+    scope = {"type": "http", "method": "POST", "path": "/orders", "query_string": query, "headers": headers or []}
+    return MockRequest(scope, receive), received
+
+
+@pytest.mark.asyncio
+async def test_resolve_by_predicates() -> None:
+    """Тест выбора мока по query-параметрам, заголовкам и телу запроса."""
+    table = MockRouteTable()
+    table.load(
+        [
+            make_mock(0, {"variant": "default"}),
+            make_mock(1, {"variant": "eu"}, MockMatch.model_validate({"query": {"region": "eu"}})),
+            make_mock(2, {"variant": "us"}, MockMatch.model_validate({"query": {"region": "us"}})),
+            make_mock(
+                3,
+                {"variant": "eu-acme"},
+                MockMatch.model_validate({"query": {"region": "eu"}, "headers": {"X-Tenant": "acme"}}),
+            ),
+            make_mock(
+                4,
+                {"variant": "vip"},
+                MockMatch.model_validate({"body": {"customer.tier": "vip", "items.0.sku": "A-1"}}),
+            ),
+        ]
+    )
+
+    async def variant(query: bytes = b"", headers: list[tuple[bytes, bytes]] | None = None, body: bytes = b"") -> str:
+        request, _ = make_request(query, headers, body)
+        matched = await table.resolve(request)
+        assert matched is not None
+        assert matched[0].mock.body is not None
+        return str(matched[0].mock.body["variant"])
+
+    assert await variant(b"region=us") == "us"
+    assert await variant(b"region=eu") == "eu"
+    assert await variant(b"region=eu", [(b"x-tenant", b"acme")]) == "eu-acme"
+    assert await variant(b"region=ap") == "default"
+    assert await variant(body=b'{"customer": {"tier": "vip"}, "items": [{"sku": "A-1"}]}') == "vip"
+    assert await variant(body=b'{"customer": {"tier": "basic"}}') == "default"
+    assert await variant(body=b"not json") == "default"
+
+
+@pytest.mark.asyncio
+async def test_body_read_only_when_needed() -> None:
+    """Тест того, что тело запроса читается только для условий по телу и передается дальше повторно."""
+    table = MockRouteTable()
+    table.load([make_mock(0, {"variant": "eu"}, MockMatch.model_validate({"query": {"region": "eu"}}))])
+
+    request, received = make_request(b"region=us", body=b'{"a": 1}')
+    assert await table.resolve(request) is None
+    assert not request.body_consumed
+    assert request.receive is not None
+
+    table.add(make_mock(1, {"variant": "vip"}, MockMatch.model_validate({"body": {"a": 2}})))
+    request, received = make_request(body=b'{"a": 1}')
+    assert await table.resolve(request) is None
+    assert request.body_consumed
+    assert len(received) == 1
+    assert await request.receive() == {"type": "http.request", "body": b'{"a": 1}', "more_body": False}
+
+
+@pytest.mark.asyncio
+async def test_conditional_mocks_over_http(async_client: AsyncClient) -> None:
+    """Тест выбора условного мока через HTTP и удаления условного варианта."""
+    base = {"uri": "/orders", "method": "POST", "status_code": 200}
+    await async_client.post("/api/v1/mock", json={**base, "body": {"variant": "default"}})
+    uuid = (
+        await async_client.post(
+            "/api/v1/mock", json={**base, "body": {"variant": "vip"}, "match": {"body": {"tier": "vip"}}}
+        )
+    ).json()["uuid"]
+
+    response = await async_client.post("/orders", json={"tier": "vip"})
+    assert response.json() == {"variant": "vip"}
+    response = await async_client.post("/orders", json={"tier": "basic"})
+    assert response.json() == {"variant": "default"}
+
+    response = await async_client.get("/api/v1/mock", params={"uuid": uuid})
+    assert response.json()["match"]["body"] == {"tier": "vip"}
+
+    await async_client.delete("/api/v1/mock", params={"uuid": uuid})
+    response = await async_client.post("/orders", json={"tier": "vip"})
+    assert response.json() == {"variant": "default"}
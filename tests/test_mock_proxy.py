@@ -0,0 +1,100 @@
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import httpx
+import pytest
+from httpx import AsyncClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route
+
+from src.services.mock_proxy import mock_proxy
+from src.storage import blob_store
+
+upstream_hits: list[str] = []
+
+
+async def upstream_endpoint(request: Request) -> Response:
+    """Ответы тестового upstream-сервера."""
+    upstream_hits.append(request.url.path)
+    if request.url.path == "/report.txt":
+        return PlainTextResponse("plain report", headers={"X-Upstream": "yes"})
+    if request.url.path == "/busy":
+        return JSONResponse({"error": "busy"}, status_code=503)
+    return JSONResponse({"path": request.url.path, "page": request.query_params.get("page")})
+
+
+upstream_app = Starlette(routes=[Route("/{path:path}", upstream_endpoint)])
+
+
+@pytest.fixture
+async def proxy(
+    async_client: AsyncClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> AsyncGenerator[None, None]:
+    """Фикстура прокси на тестовое upstream-приложение."""
+    monkeypatch.setattr(blob_store, "root", tmp_path)
+    upstream_hits.clear()
+    await mock_proxy.start("http://upstream", transport=httpx.ASGITransport(app=upstream_app))
+    yield
+    await mock_proxy.stop()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("proxy")
+async def test_proxy_records_and_replays(async_client: AsyncClient) -> None:
+    """Тест проксирования запроса без мока и ответа из записанного мока на повторный запрос."""
+    first = await async_client.get("/users/1", params={"page": "2"})
+    assert first.status_code == 200
+    assert first.json() == {"path": "/users/1", "page": "2"}
+    await mock_proxy.flush()
+
+    replayed = await async_client.get("/users/1", params={"page": "2"})
+    assert replayed.json() == first.json()
+    assert upstream_hits == ["/users/1"]
+
+    assert (await async_client.get("/users/1")).json() == {"path": "/users/1", "page": None}
+    assert upstream_hits == ["/users/1", "/users/1"]
+
+    report = await async_client.get("/report.txt")
+    await mock_proxy.flush()
+    replayed_report = await async_client.get("/report.txt")
+    assert replayed_report.content == report.content == b"plain report"
+    assert replayed_report.headers["content-type"] == report.headers["content-type"]
+    assert replayed_report.headers["x-upstream"] == "yes"
+
+    mocks = (await async_client.get("/api/v1/mock")).json()
+    assert [(mock["uri"], (mock["match"] or {}).get("query")) for mock in mocks] == [
+        ("/users/1", {"page": "2"}),
+        ("/users/1", None),
+        ("/report.txt", None),
+    ]
+    assert upstream_hits == ["/users/1", "/users/1", "/report.txt"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("proxy")
+async def test_proxy_skips_server_errors(async_client: AsyncClient) -> None:
+    """Тест проксирования ответов 5xx без записи."""
+    for _ in range(2):
+        response = await async_client.get("/busy")
+        await mock_proxy.flush()
+        assert response.status_code == 503
+    assert upstream_hits == ["/busy", "/busy"]
+    assert (await async_client.get("/api/v1/mock")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_proxy_upstream_unavailable(async_client: AsyncClient) -> None:
+    """Тест ответа 502, если upstream-сервер недоступен."""
+
+    def refuse(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    await mock_proxy.start("http://upstream", transport=httpx.MockTransport(refuse))
+    try:
+        response = await async_client.get("/anything")
+    finally:
+        await mock_proxy.stop()
+    assert response.status_code == 502
+    assert "Upstream request failed" in response.json()["detail"]
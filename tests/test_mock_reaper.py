@@ -0,0 +1,100 @@
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+
+from src.api.models.mock_model import MockData
+from src.services.mock_reaper import MockReaper, mock_reaper
+from src.services.mock_route_table import MockRouteTable
+from src.services.mock_service import create_mock_data, get_mock_data_by_uuid
+
+PAYLOAD = {"uri": "/status", "method": "GET", "status_code": 200, "body": {"state": "ok"}}
+OVERLAY = {**PAYLOAD, "match": {"headers": {"X-Mode": "test"}}}
+HEADERS = {"X-Mode": "test"}
+
+
+@pytest.mark.asyncio
+async def test_expiring_mock_removed_at_deadline(async_client: AsyncClient) -> None:
+    """Тест удаления мока в момент истечения и замены времени жизни временем истечения."""
+    assert (await async_client.post("/api/v1/mock", json=PAYLOAD)).status_code == 201
+    expires_at = datetime.now(UTC) + timedelta(seconds=0.3)
+    expiring = await async_client.post(
+        "/api/v1/mock", json={**OVERLAY, "body": {"state": "maintenance"}, "expires_at": expires_at.isoformat()}
+    )
+    assert (await async_client.get("/status", headers=HEADERS)).json() == {"state": "maintenance"}
+
+    await asyncio.sleep(0.8)
+    assert (await async_client.get("/status", headers=HEADERS)).json() == {"state": "ok"}
+    assert (await async_client.get("/api/v1/mock", params={"uuid": expiring.json()["uuid"]})).status_code == 404
+
+    with_ttl = (await async_client.post("/api/v1/mock", json={**OVERLAY, "ttl_seconds": 60})).json()
+    assert "ttl_seconds" not in with_ttl
+    remaining = datetime.fromisoformat(with_ttl["expires_at"]) - datetime.now(UTC)
+    assert timedelta(seconds=55) < remaining <= timedelta(seconds=60)
+    both = {**PAYLOAD, "ttl_seconds": 60, "expires_at": expires_at.isoformat()}
+    assert (await async_client.post("/api/v1/mock", json=both)).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_mock_removed_after_max_hits(async_client: AsyncClient) -> None:
+    """Тест удаления мока после последнего разрешенного ответа."""
+    assert (await async_client.post("/api/v1/mock", json=PAYLOAD)).status_code == 201
+    limited = (
+        await async_client.post("/api/v1/mock", json={**OVERLAY, "body": {"state": "once"}, "max_hits": 2})
+    ).json()
+
+    bodies = [(await async_client.get("/status", headers=HEADERS)).json()["state"] for _ in range(3)]
+    assert bodies == ["once", "once", "ok"]
+    by_uuid = await async_client.get("/status", headers={"X-Req-Id": limited["uuid"]})
+    assert by_uuid.status_code == 404
+
+    await mock_reaper.reap()
+    assert (await async_client.get("/api/v1/mock", params={"uuid": limited["uuid"]})).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_failed_requests_do_not_use_up_hits(async_client: AsyncClient) -> None:
+    """Тест запросов к моку с ограничением ответов, завершившихся ошибкой и не расходующих ответы."""
+    limited = (await async_client.post("/api/v1/mock", json={**PAYLOAD, "max_hits": 1})).json()
+    headers = {"X-Req-Id": limited["uuid"]}
+
+    assert (await async_client.post("/status", headers=headers)).status_code == 405
+    assert (await async_client.get("/other", headers=headers)).status_code == 404
+    assert (await async_client.get("/status")).json() == {"state": "ok"}
+    assert (await async_client.get("/status", headers=headers)).status_code == 404
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("test_app")
+async def test_reaper_skips_rescheduled_deadlines() -> None:
+    """Тест удаления по ближайшему времени истечения с пропуском устаревших записей кучи и пакетным удалением."""
+    started = time.time()
+    now = [started]
+    mocks = [
+        await create_mock_data(
+            MockData.model_validate(
+                {**PAYLOAD, "uri": f"/status/{offset}", "expires_at": datetime.fromtimestamp(started + offset, UTC)}
+            )
+        )
+        for offset in (10, 20, 30)
+    ]
+    table = MockRouteTable()
+    reaper = MockReaper(table, batch_size=2, interval=1.0, clock=lambda: now[0])
+    table.load(mocks)
+    rescheduled = mocks[1].model_copy(update={"expires_at": datetime.fromtimestamp(started + 40, UTC), "version": 2})
+    table.add(rescheduled)
+    assert len(reaper) == 3
+
+    now[0] = started + 25
+    assert await reaper.reap() == 1
+    assert table.get_by_uuid(mocks[0].uuid) is None
+    assert table.get_by_uuid(mocks[1].uuid) is not None
+    assert await get_mock_data_by_uuid(mocks[0].uuid) is None
+
+    now[0] = started + 45
+    assert await reaper.reap() == 2
+    assert len(table) == 0
+    assert len(reaper) == 0
+    assert reaper.expired == 3
@@ -0,0 +1,73 @@
+import pytest
+from httpx import AsyncClient
+
+MOCK_PAYLOAD = {
+    "uri": "/api/v1/users",
+    "method": "GET",
+    "status_code": 200,
+    "headers": {"X-Mock": "yes"},
+    "body": {"users": [{"id": 1}]},
+}
+
+
+@pytest.mark.asyncio
+async def test_mock_served_from_route_table(async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Тест обслуживания мока из in-memory таблицы маршрутов без обращения к БД."""
+    from src.services import mock_service
+    from src.services.mock_route_table import route_table
+
+    response = await async_client.post("/api/v1/mock", json=MOCK_PAYLOAD)
+    assert response.status_code == 201
+    uuid = response.json()["uuid"]
+
+    assert route_table.get_last_by_route("GET", "/api/v1/users") is not None
+
+    async def fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("База данных не должна использоваться")
+
+    monkeypatch.setattr(mock_service, "get_mock_data_by_uuid", fail)
+    monkeypatch.setattr(mock_service, "get_last_mock_data_by_uri_and_method", fail)
+
+    response = await async_client.get("/api/v1/users")
+    assert response.status_code == 200
+    assert response.json() == {"users": [{"id": 1}]}
+    assert response.headers["x-mock"] == "yes"
+
+    response = await async_client.post("/anything", headers={"x-req-id": uuid})
+    assert response.status_code == 405
+
+
+@pytest.mark.asyncio
+async def test_route_table_follows_deletes(async_client: AsyncClient) -> None:
+    """Тест обновления таблицы маршрутов при удалении моков."""
+    first = (await async_client.post("/api/v1/mock", json=MOCK_PAYLOAD)).json()
+    empty = {**MOCK_PAYLOAD, "body": {"users": []}, "match": {"headers": {"X-Variant": "empty"}}}
+    second = (await async_client.post("/api/v1/mock", json=empty)).json()
+    headers = {"X-Variant": "empty"}
+
+    response = await async_client.get("/api/v1/users", headers=headers)
+    assert response.json() == {"users": []}
+
+    await async_client.delete("/api/v1/mock", params={"uuid": second["uuid"]})
+    response = await async_client.get("/api/v1/users", headers=headers)
+    assert response.json() == {"users": [{"id": 1}]}
+
+    await async_client.delete("/api/v1/mock", params={"uuid": first["uuid"]})
+    response = await async_client.get("/api/v1/users", headers=headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_route_table_loaded_on_startup(test_app: object) -> None:
+    """Тест загрузки таблицы маршрутов из БД при старте приложения."""
+    from src.api.models.mock_model import MockData
+    from src.services.mock_route_table import route_table
+    from src.services.mock_service import create_mock_data, load_mock_route_table
+
+    mock = await create_mock_data(MockData.model_validate(MOCK_PAYLOAD))
+    route_table.clear()
+
+    assert await load_mock_route_table() == 1
+    entry = route_table.get_by_uuid(mock.uuid)
+    assert entry is not None
+    assert entry.mock == mock
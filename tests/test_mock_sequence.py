@@ -0,0 +1,93 @@
+import multiprocessing
+from pathlib import Path
+from uuid import UUID, uuid4
+
+import pytest
+from httpx import AsyncClient
+
+from src.services.mock_sequence import SequenceCursors, SharedCursorFile
+
+
+def _advance_many(path: str, uuid: UUID, count: int) -> None:
+    """Продвигает позицию сценария в общем файле из отдельного процесса."""
+    shared = SharedCursorFile(path)
+    for _ in range(count):
+        shared.advance(uuid)
+    shared.close()
+
+
+@pytest.mark.asyncio
+async def test_sequence_stick_and_reset(async_client: AsyncClient) -> None:
+    """Тест сценария: повтор шагов, повтор последнего шага и сброс к первому шагу."""
+    payload = {
+        "uri": "/flaky",
+        "method": "GET",
+        "status_code": 200,
+        "body": {"ok": True},
+        "sequence": {"steps": [{"status_code": 503, "body": {"error": "busy"}, "repeat": 2}, {}]},
+    }
+    response = await async_client.post("/api/v1/mock", json=payload)
+    assert response.status_code == 201
+    uuid = response.json()["uuid"]
+
+    responses = [await async_client.get("/flaky") for _ in range(4)]
+    assert [item.status_code for item in responses] == [503, 503, 200, 200]
+    assert responses[0].json() == {"error": "busy"}
+    assert responses[2].json() == {"ok": True}
+
+    assert (await async_client.post("/api/v1/mock/sequence/reset", params={"uuid": uuid})).status_code == 200
+    assert (await async_client.get("/flaky")).status_code == 503
+    assert (await async_client.post("/api/v1/mock/sequence/reset")).status_code == 200
+    assert (await async_client.get("/flaky", headers={"X-Req-Id": uuid})).status_code == 503
+
+    missing = await async_client.post("/api/v1/mock/sequence/reset", params={"uuid": str(uuid4())})
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_sequence_cycle(async_client: AsyncClient) -> None:
+    """Тест циклического сценария с переопределением заголовков шага."""
+    payload = {
+        "uri": "/rotate",
+        "method": "GET",
+        "status_code": 200,
+        "headers": {"X-Step": "base"},
+        "sequence": {
+            "mode": "cycle",
+            "steps": [{"status_code": 201}, {"status_code": 202, "headers": {"X-Step": "2"}}],
+        },
+    }
+    assert (await async_client.post("/api/v1/mock", json=payload)).status_code == 201
+
+    responses = [await async_client.get("/rotate") for _ in range(5)]
+    assert [item.status_code for item in responses] == [201, 202, 201, 202, 201]
+    assert [item.headers["x-step"] for item in responses[:2]] == ["base", "2"]
+
+    payload["sequence"] = {"steps": []}
+    assert (await async_client.post("/api/v1/mock", json=payload)).status_code == 422
+
+
+def test_shared_cursors_consistent_across_processes(tmp_path: Path) -> None:
+    """Тест атомарного продвижения общей позиции сценария несколькими процессами."""
+    path = str(tmp_path / "cursors")
+    uuid = uuid4()
+    cursors = SequenceCursors()
+    cursors.open(path)
+    assert cursors.advance(uuid) == 0
+
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_advance_many, args=(path, uuid, 200)) for _ in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+
+    assert cursors.advance(uuid) == 601
+    cursors.reset(uuid)
+    assert cursors.position(uuid) == 0
+    cursors.close()
+
+    shared = SharedCursorFile(path)
+    assert shared.position(uuid) == 0
+    shared.close()
@@ -0,0 +1,80 @@
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from src.api.models.mock_model import MockModelWithDate
+from src.services.mock_snapshot import MockSnapshot, write_mock_snapshot
+
+
+def _mock(uri: str, body: object, method: str = "GET") -> MockModelWithDate:
+    return MockModelWithDate.model_validate(
+        {
+            "uuid": uuid4(),
+            "uri": uri,
+            "method": method,
+            "status_code": 200,
+            "body": body,
+            "created_at": "2026-01-01T00:00:00+00:00",
+            "updated_at": "2026-01-01T00:00:00+00:00",
+        }
+    )
+
+
+def test_snapshot_lookup(tmp_path: Path) -> None:
+    """Тест поиска мок-данных в снимке по маршруту и UUID без полного декодирования."""
+    mocks = [_mock("/users", {"v": 1}), _mock("/users/{id}", {"v": 2}), _mock("/users", {"v": 3}, "POST")]
+    path = tmp_path / "mocks.snapshot"
+    assert write_mock_snapshot(path, mocks) == 3
+
+    snapshot = MockSnapshot.open(path)
+    assert len(snapshot) == 3
+    assert snapshot.route("GET", "/users") == [mocks[0]]
+    assert snapshot.route("GET", "/orders") == []
+    assert snapshot.route_of(mocks[2].uuid) == ("POST", "/users")
+    assert snapshot.route_of(_mock("/missing", None).uuid) is None
+    assert snapshot.template_routes() == [("GET", "/users/{id}")]
+    assert [len(batch) for batch in snapshot.iter_batches(2)] == [2, 1]
+
+    path.write_bytes(b"not a mock snapshot file at all")
+    with pytest.raises(ValueError, match="формат"):
+        MockSnapshot.open(path)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("db_type", ["memory", "sqlite3"])
+async def test_mocks_survive_restart(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, db_type: str) -> None:
+    """Тест сохранения снимка при остановке и обслуживания моков из снимка после запуска."""
+    from src.__main__ import app, lifespan
+    from src.services.mock_route_table import route_table
+    from src.services.mock_snapshot import mock_snapshot_store
+    from src.settings import config
+    from src.storage import get_storage
+
+    monkeypatch.setattr(config, "DB_TYPE", db_type)
+    monkeypatch.setattr(mock_snapshot_store, "path", str(tmp_path / "mocks.snapshot"))
+    monkeypatch.setattr(mock_snapshot_store, "interval", 0)
+    transport = ASGITransport(app=app)
+
+    async with lifespan(app), AsyncClient(transport=transport, base_url="http://test") as client:
+        payload = {"uri": "/items/{id}", "method": "GET", "status_code": 200, "body": {"item": True}}
+        template_uuid = (await client.post("/api/v1/mock", json=payload)).json()["uuid"]
+        payload = {"uri": "/items", "method": "GET", "status_code": 200, "body": {"items": []}}
+        uuid = (await client.post("/api/v1/mock", json=payload)).json()["uuid"]
+    await get_storage().clear()
+    route_table.clear()
+
+    async with lifespan(app), AsyncClient(transport=transport, base_url="http://test") as client:
+        assert len(route_table) == 2
+        assert (await client.get("/items")).json() == {"items": []}
+        assert (await client.get("/items/7")).json() == {"item": True}
+
+        response = await client.get("/api/v1/mock", params={"uuid": template_uuid})
+        assert response.json()["uri"] == "/items/{id}"
+        assert (await client.delete("/api/v1/mock", params={"uuid": uuid})).status_code == 200
+        assert (await client.get("/items")).status_code == 404
+    await get_storage().clear()
+
+    snapshot = MockSnapshot.open(tmp_path / "mocks.snapshot")
+    assert [str(mock.uuid) for batch in snapshot.iter_batches(10) for mock in batch] == [template_uuid]
@@ -0,0 +1,111 @@
+from itertools import count
+
+import pytest
+from fastapi import FastAPI
+
+from src.api.models.mock_model import MockData
+
+MOCK_PAYLOAD = {"uri": "/shared", "method": "GET", "status_code": 200, "body": {"worker": 1}}
+
+
+def shared_mock(index: int) -> MockData:
+    """Возвращает мок-данные отдельного маршрута /shared/{index}."""
+    return MockData.model_validate({**MOCK_PAYLOAD, "uri": f"/shared/{index}"})
+
+
+@pytest.mark.asyncio
+async def test_sync_applies_changes_from_other_workers(test_app: FastAPI) -> None:
+    """Тест применения изменений, сделанных другим воркером, по журналу изменений."""
+    from src.services.mock_route_table import route_table
+    from src.services.mock_service import create_mock_data, delete_mock_data
+    from src.services.mock_sync import MockRouteTableSync
+
+    sync = MockRouteTableSync(interval=60, retention=100, gap_timeout=30)
+    await sync.start()
+    try:
+        mock = await create_mock_data(MockData.model_validate(MOCK_PAYLOAD))
+        # Изменение другого воркера попадает только в базу данных и журнал.
+        route_table.remove(mock.uuid)
+
+        assert await sync.poll() == 1
+        entry = route_table.get_last_by_route("GET", "/shared")
+        assert entry is not None
+        assert entry.mock.uuid == mock.uuid
+
+        route_table.add(mock)
+        await delete_mock_data(mock.uuid)
+        route_table.add(mock)
+
+        assert await sync.poll() == 1
+        assert route_table.get_by_uuid(mock.uuid) is None
+        assert await sync.poll() == 0
+    finally:
+        await sync.stop()
+
+
+@pytest.mark.asyncio
+async def test_sync_reloads_after_log_pruning(test_app: FastAPI) -> None:
+    """Тест полной перезагрузки таблицы, если журнал изменений был очищен."""
+    from src.services.mock_route_table import route_table
+    from src.services.mock_service import create_mock_data, prune_mock_changes
+    from src.services.mock_sync import MockRouteTableSync
+
+    sync = MockRouteTableSync(interval=60, retention=1, gap_timeout=30)
+    await sync.start()
+    try:
+        mocks = [await create_mock_data(shared_mock(index)) for index in range(3)]
+        await prune_mock_changes(1)
+        route_table.clear()
+
+        assert await sync.poll() == 1
+        assert len(route_table) == len(mocks)
+    finally:
+        await sync.stop()
+
+
+@pytest.mark.asyncio
+async def test_sync_rechecks_changes_committed_out_of_order(test_app: FastAPI) -> None:
+    """Тест применения записи журнала, зафиксированной позже записи с большим идентификатором."""
+    from sqlalchemy import delete, insert
+
+    from src.db import DBManager
+    from src.db.models.mock_data import MockChangeLog
+    from src.services.mock_route_table import route_table
+    from src.services.mock_service import create_mock_data
+    from src.services.mock_sync import MockRouteTableSync
+
+    # Журнал не пуст, поэтому скрытая запись не выглядит удаленной очисткой журнала.
+    await create_mock_data(shared_mock(0))
+    now = [0.0]
+    sync = MockRouteTableSync(interval=60, retention=100, gap_timeout=30, clock=lambda: now[0])
+    await sync.start()
+    indexes = count(1)
+    try:
+
+        async def commit_late() -> int:
+            """Создает два мока и скрывает запись журнала первого, как незафиксированную транзакцию."""
+            first = await create_mock_data(shared_mock(next(indexes)))
+            await create_mock_data(shared_mock(next(indexes)))
+            route_table.clear()
+            change_id = sync.last_change_id + 1
+            async with DBManager().session("test_hide_change") as session:
+                await session.execute(delete(MockChangeLog).where(MockChangeLog.id == change_id))
+            assert await sync.poll() == 1
+            assert route_table.get_by_uuid(first.uuid) is None
+            async with DBManager().session("test_commit_change") as session:
+                await session.execute(insert(MockChangeLog).values(id=change_id, uuid=first.uuid, action="upsert"))
+            return change_id
+
+        await commit_late()
+        now[0] += 10
+        assert await sync.poll() == 1
+        assert len(route_table) == 2
+        assert await sync.poll() == 0
+
+        # Пропуск, не заполненный за gap_timeout, больше не проверяется.
+        await commit_late()
+        now[0] += 31
+        assert await sync.poll() == 0
+        assert len(route_table) == 1
+    finally:
+        await sync.stop()
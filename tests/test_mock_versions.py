@@ -0,0 +1,81 @@
+import pytest
+from httpx import AsyncClient
+
+PAYLOAD = {"uri": "/status", "method": "GET", "status_code": 200, "body": {"state": "ok"}}
+
+
+@pytest.mark.asyncio
+async def test_update_patch_and_rollback(async_client: AsyncClient) -> None:
+    """Тест изменения мока на месте, проверки версии, истории и отката."""
+    created = (await async_client.post("/api/v1/mock", json=PAYLOAD)).json()
+    uuid = created["uuid"]
+    assert created["version"] == 1
+
+    replaced = await async_client.put(
+        "/api/v1/mock", params={"uuid": uuid}, json={**PAYLOAD, "status_code": 503, "body": {"state": "down"}}
+    )
+    assert replaced.status_code == 200
+    assert replaced.json()["version"] == 2
+    assert replaced.json()["created_at"] == created["created_at"]
+    response = await async_client.get("/status")
+    assert response.status_code == 503
+    assert response.json() == {"state": "down"}
+
+    patched = await async_client.patch(
+        "/api/v1/mock", params={"uuid": uuid, "version": 2}, json={"headers": {"Retry-After": "5"}}
+    )
+    assert patched.json()["version"] == 3
+    assert patched.json()["body"] == {"state": "down"}
+    assert (await async_client.get("/status")).headers["retry-after"] == "5"
+
+    stale = await async_client.put("/api/v1/mock", params={"uuid": uuid, "version": 2}, json=PAYLOAD)
+    assert stale.status_code == 409
+    invalid = await async_client.patch("/api/v1/mock", params={"uuid": uuid}, json={"status_code": 42})
+    assert invalid.status_code == 422
+
+    history = (await async_client.get("/api/v1/mock/history", params={"uuid": uuid})).json()
+    assert [item["version"] for item in history] == [2, 1]
+
+    rolled_back = await async_client.post("/api/v1/mock/rollback", params={"uuid": uuid, "version": 1})
+    assert rolled_back.json()["version"] == 4
+    response = await async_client.get("/status")
+    assert response.status_code == 200
+    assert "retry-after" not in response.headers
+    assert len((await async_client.get("/api/v1/mock")).json()) == 1
+
+    undone = await async_client.post("/api/v1/mock/rollback", params={"uuid": uuid})
+    assert undone.json()["status_code"] == 503
+    missing = await async_client.post("/api/v1/mock/rollback", params={"uuid": uuid, "version": 99})
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_update_unknown_mock(async_client: AsyncClient) -> None:
+    """Тест ответа 404 при изменении и просмотре истории несуществующего мока."""
+    uuid = "550e8400-e29b-41d4-a716-446655440000"
+    assert (await async_client.put("/api/v1/mock", params={"uuid": uuid}, json=PAYLOAD)).status_code == 404
+    assert (await async_client.patch("/api/v1/mock", params={"uuid": uuid}, json={})).status_code == 404
+    assert (await async_client.get("/api/v1/mock/history", params={"uuid": uuid})).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_post_to_occupied_route_updates_mock(async_client: AsyncClient) -> None:
+    """Тест создания мока для занятого маршрута как новой версии, конфликта маршрутов и неизвестных полей."""
+    created = (await async_client.post("/api/v1/mock", json=PAYLOAD)).json()
+
+    replaced = await async_client.post("/api/v1/mock", json={**PAYLOAD, "body": {"state": "new"}})
+    assert replaced.status_code == 201
+    assert (replaced.json()["uuid"], replaced.json()["version"]) == (created["uuid"], 2)
+    assert (await async_client.get("/status")).json() == {"state": "new"}
+    history = (await async_client.get("/api/v1/mock/history", params={"uuid": created["uuid"]})).json()
+    assert [(item["version"], item["body"]) for item in history] == [(1, {"state": "ok"})]
+    assert len((await async_client.get("/api/v1/mock")).json()) == 1
+
+    conditional = (await async_client.post("/api/v1/mock", json={**PAYLOAD, "match": {"query": {"v": "1"}}})).json()
+    assert conditional["uuid"] != created["uuid"]
+    moved = await async_client.patch("/api/v1/mock", params={"uuid": conditional["uuid"]}, json={"match": None})
+    assert moved.status_code == 409
+
+    unknown = await async_client.patch("/api/v1/mock", params={"uuid": created["uuid"]}, json={"stauts_code": 503})
+    assert unknown.status_code == 422
+    assert unknown.json()["detail"][0]["type"] == "extra_forbidden"
@@ -0,0 +1,81 @@
+import pytest
+from httpx import AsyncClient
+from starlette.types import Message
+
+from src.services.request_journal import JournalEntry, RequestBodyCapture, RequestJournal, request_journal
+
+
+def test_ring_buffer_overwrites_oldest_entries() -> None:
+    """Тест вытеснения старых записей и извлечения записей в порядке добавления."""
+    journal = RequestJournal(capacity=3, body_limit=4, batch_size=2)
+    batches = []
+    journal.on_batch = lambda: batches.append(len(journal))
+
+    for index in range(5):
+        journal.append(JournalEntry(0.0, None, "GET", f"/items/{index}", b"", [], b"payl", 7, 200))
+
+    assert len(journal) == 3
+    assert journal.dropped == 2
+    assert batches == [2]
+    entries = journal.drain(2)
+    assert [entry.path for entry in entries] == ["/items/2", "/items/3"]
+    assert [entry.path for entry in journal.drain(10)] == ["/items/4"]
+    assert journal.drain(10) == []
+
+
+@pytest.mark.asyncio
+async def test_recorded_requests_filtered_by_mock(async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Тест записи запросов к мокам и чтения журнала с фильтрами."""
+    monkeypatch.setattr(request_journal, "body_limit", 8)
+    payload = {"uri": "/orders", "method": "POST", "status_code": 201, "body": {"status": "created"}}
+    uuid = (await async_client.post("/api/v1/mock", json=payload)).json()["uuid"]
+
+    await async_client.post("/orders", params={"page": "2"}, headers={"x-tenant": "acme"}, json={"sku": "A-1"})
+    await async_client.post("/orders", content=b"\xff")
+    await async_client.get("/")
+    await async_client.get("/api/v1/mock", params={"uuid": uuid})
+
+    response = await async_client.get("/api/v1/mock/requests", params={"mock_uuid": uuid})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["body"] for item in items] == ["�", '{"sku":"']
+    assert items[1]["query"] == "page=2"
+    assert items[1]["headers"]["x-tenant"] == "acme"
+    assert items[1]["status_code"] == 201
+    assert items[1]["body_size"] == 13
+    assert items[1]["body_truncated"] is True
+
+    page = (await async_client.get("/api/v1/mock/requests", params={"limit": 2})).json()
+    assert [(item["method"], item["path"], item["mock_uuid"]) for item in page["items"]] == [
+        ("GET", "/", None),
+        ("POST", "/orders", uuid),
+    ]
+    page = (await async_client.get("/api/v1/mock/requests", params={"cursor": page["next_cursor"]})).json()
+    assert len(page["items"]) == 1
+    assert page["next_cursor"] is None
+
+    assert (await async_client.delete("/api/v1/mock/requests")).status_code == 200
+    assert (await async_client.get("/api/v1/mock/requests")).json()["items"] == []
+    assert len(request_journal) == 0
+
+
+@pytest.mark.asyncio
+async def test_body_capture_keeps_only_limit() -> None:
+    """Тест копирования начала тела по частям и дочитывания непрочитанной части тела."""
+    messages = [
+        {"type": "http.request", "body": b"abc", "more_body": True},
+        {"type": "http.request", "body": b"defgh", "more_body": True},
+        {"type": "http.request", "body": b"ij", "more_body": False},
+    ]
+
+    async def receive() -> Message:
+        return messages.pop(0)
+
+    capture = RequestBodyCapture(receive, limit=5)
+    assert (await capture.receive())["body"] == b"abc"
+    assert not capture.complete
+    await capture.drain()
+    assert capture.complete
+    assert capture.body == b"abcde"
+    assert capture.size == 10
+    assert messages == []
@@ -0,0 +1,122 @@
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+from starlette.types import Message
+
+from src.api.models.mock_model import MockModelWithDate
+from src.services.mock_request import MockRequest
+from src.services.mock_route_table import MockRouteTable
+from src.services.response_cache import ResponseCache
+
+
+def make_mock(uri: str, body: dict[str, object], **fields: object) -> MockModelWithDate:
+    """Создает мок маршрута GET с условием по query-параметру region."""
+    now = datetime.now(UTC)
+    return MockModelWithDate.model_validate(
+        {
+            "uuid": uuid4(),
+            "uri": uri,
+            "method": "GET",
+            "status_code": 200,
+            "body": body,
+            "match": {"query": {"region": "eu"}},
+            "created_at": now,
+            "updated_at": now,
+            **fields,
+        }
+    )
+
+
+def make_request(path: str, query: bytes = b"region=eu") -> MockRequest:
+    """Создает GET-запрос без тела."""
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    return MockRequest({"type": "http", "method": "GET", "path": path, "query_string": query, "headers": []}, receive)
+
+
+async def cache_response(cache: ResponseCache, table: MockRouteTable, path: str) -> bool:
+    """Выбирает мок для пути и сохраняет его ответ в кеше."""
+    request = make_request(path)
+    key = await cache.fingerprint(request)
+    matched = await table.resolve(request)
+    assert key is not None
+    assert matched is not None
+    return cache.put(key, matched[0], matched[0].response)
+
+
+async def is_cached(cache: ResponseCache, path: str) -> bool:
+    """Проверяет, есть ли в кеше ответ для пути."""
+    key = await cache.fingerprint(make_request(path))
+    assert key is not None
+    return cache.get(key) is not None
+
+
+@pytest.mark.asyncio
+async def test_cache_eviction_ttl_and_precise_invalidation() -> None:
+    """Тест вытеснения по количеству и размеру, устаревания и удаления записей измененных маршрутов."""
+    now = [0.0]
+    table = MockRouteTable()
+    table.load([make_mock("/users/{id}", {"user": True}), make_mock("/orders", {"order": True})])
+    cache = ResponseCache(table, max_entries=2, max_bytes=10_000, ttl=5.0, clock=lambda: now[0])
+
+    assert await cache.fingerprint(make_request("/unknown")) is None
+    for path in ("/users/1", "/users/2", "/orders"):
+        assert await cache_response(cache, table, path)
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert not await is_cached(cache, "/users/1")
+    assert await is_cached(cache, "/orders")
+
+    table.add(make_mock("/users/{id}", {"user": "new"}))
+    assert len(cache) == 1
+    assert await is_cached(cache, "/orders")
+
+    now[0] = 10.0
+    assert not await is_cached(cache, "/orders")
+    assert cache.stats()["hit_ratio"] == pytest.approx(2 / 4)
+
+    cache.max_bytes = 10
+    assert not await cache_response(cache, table, "/orders")
+
+
+@pytest.mark.asyncio
+async def test_conditional_mock_served_from_cache(async_client: AsyncClient) -> None:
+    """Тест ответа из кеша на повторный запрос и сброса кеша при создании мока маршрута."""
+    payload = {
+        "uri": "/prices",
+        "method": "GET",
+        "status_code": 200,
+        "headers": {"X-Region": "{{ query.region }}"},
+        "body": {"region": "{{ query.region }}", "currency": "{{ headers.x-currency }}"},
+        "match": {"query": {"region": "eu"}},
+        "template": {},
+    }
+    assert (await async_client.post("/api/v1/mock", json=payload)).status_code == 201
+    before = (await async_client.get("/api/v1/mock/cache")).json()
+
+    first = await async_client.get("/prices", params={"region": "eu"}, headers={"X-Currency": "EUR"})
+    second = await async_client.get("/prices", params={"region": "eu"}, headers={"X-Currency": "EUR"})
+    other = await async_client.get("/prices", params={"region": "eu"}, headers={"X-Currency": "CHF"})
+    assert first.json() == second.json() == {"region": "eu", "currency": "EUR"}
+    assert second.headers["x-region"] == "eu"
+    assert other.json() == {"region": "eu", "currency": "CHF"}
+
+    stats = (await async_client.get("/api/v1/mock/cache")).json()
+    assert stats["hits"] - before["hits"] == 1
+    assert stats["misses"] - before["misses"] == 2
+    assert stats["entries"] == 2
+
+    payload["body"] = {"region": "updated"}
+    assert (await async_client.post("/api/v1/mock", json=payload)).status_code == 201
+    assert (await async_client.get("/api/v1/mock/cache")).json()["entries"] == 0
+    third = await async_client.get("/prices", params={"region": "eu"}, headers={"X-Currency": "EUR"})
+    assert third.json() == {"region": "updated"}
+
+    generated = {**payload, "uri": "/ids", "body": {"id": "{{ uuid }}"}}
+    assert (await async_client.post("/api/v1/mock", json=generated)).status_code == 201
+    ids = [(await async_client.get("/ids", params={"region": "eu"})).json()["id"] for _ in range(2)]
+    assert ids[0] != ids[1]
@@ -0,0 +1,83 @@
+import gzip
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+
+from src.services.compiled_response import CompiledMockResponse
+from src.services.response_compression import add_variants, load_codecs, negotiate, select_variant
+from src.storage import blob_store
+
+BODY = {"items": [{"id": index, "name": f"item-{index}"} for index in range(200)]}
+
+
+def test_negotiate_accept_encoding() -> None:
+    """Тест выбора кодировки по весам Accept-Encoding и порядку предпочтения сервера."""
+    available = ("br", "zstd", "gzip")
+    assert negotiate(b"gzip, deflate, br", available) == "br"
+    assert negotiate(b"br;q=0.5, gzip", available) == "gzip"
+    assert negotiate(b"br;q=0, *;q=0.1", available) == "zstd"
+    assert negotiate(b"identity", available) is None
+    assert negotiate(None, available) is None
+    with pytest.raises(ValueError, match="deflate"):
+        load_codecs(["deflate"])
+
+
+def test_precompressed_variants() -> None:
+    """Тест однократного сжатия тела, порога размера и выбора варианта."""
+    body = b'{"data":"' + b"x" * 4096 + b'"}'
+    headers = ((b"content-length", str(len(body)).encode()), (b"content-type", b"application/json"))
+    response = CompiledMockResponse(status_code=200, body=body, raw_headers=headers, etag=b'"abc"')
+    codecs = load_codecs(["gzip"])
+
+    compressed = add_variants(response, codecs, 1024)
+    assert (b"vary", b"accept-encoding") in compressed.raw_headers
+    variant = select_variant([(b"accept-encoding", b"gzip")], compressed)
+    assert gzip.decompress(variant.body) == body
+    assert variant.etag == b'"abc-gzip"'
+    assert (b"content-encoding", b"gzip") in variant.raw_headers
+    assert (b"content-length", str(len(variant.body)).encode()) in variant.raw_headers
+    assert select_variant([(b"accept-encoding", b"identity")], compressed) is compressed
+
+    assert add_variants(response, codecs, len(body) + 1) is response
+    binary = CompiledMockResponse(status_code=200, body=body, raw_headers=((b"content-type", b"image/png"),))
+    assert add_variants(binary, codecs, 0) is binary
+
+
+@pytest.mark.asyncio
+async def test_compressed_mock_responses(
+    async_client: AsyncClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Тест сжатых ответов встроенного тела, тела из хранилища и шаблонизированного тела."""
+    from src.settings import config
+
+    monkeypatch.setattr(blob_store, "root", tmp_path)
+    payload = {"uri": "/catalog", "method": "GET", "status_code": 200, "body": BODY}
+    assert (await async_client.post("/api/v1/mock", json=payload)).status_code == 201
+
+    plain = await async_client.get("/catalog", headers={"Accept-Encoding": "identity"})
+    response = await async_client.get("/catalog", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in plain.headers
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "accept-encoding"
+    assert int(response.headers["content-length"]) < int(plain.headers["content-length"])
+    assert response.json() == plain.json() == BODY
+    assert response.headers["etag"] != plain.headers["etag"]
+    etag = response.headers["etag"]
+    conditional = {"Accept-Encoding": "gzip", "If-None-Match": etag}
+    assert (await async_client.get("/catalog", headers=conditional)).status_code == 304
+
+    payload = {"uri": "/echo/{id}", "method": "GET", "status_code": 200, "body": {**BODY, "id": "{{ path.id }}"}}
+    assert (await async_client.post("/api/v1/mock", json={**payload, "template": {}})).status_code == 201
+    response = await async_client.get("/echo/7", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.json() == {**BODY, "id": "7"}
+
+    monkeypatch.setattr(config, "BLOB_INLINE_LIMIT", 1024)
+    payload = {"uri": "/large", "method": "GET", "status_code": 200, "body": BODY}
+    digest = (await async_client.post("/api/v1/mock", json=payload)).json()["body_ref"]["digest"]
+    response = await async_client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == BODY
+    assert blob_store.variant_path(digest, "gzip").exists()
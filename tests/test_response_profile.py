@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import pytest
+from httpx import AsyncClient
+from starlette.types import Message
+
+from src.api.models.mock_model import MockLatency, MockStreaming
+from src.services import response_profile
+from src.services.compiled_response import CompiledMockResponse
+from src.services.response_profile import compile_latency, compile_stream, send_streamed_response
+
+
+def test_latency_distributions(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Тест выбора задержки по распределениям профиля."""
+    assert compile_latency(MockLatency.model_validate({"value": 250}))() == 0.25
+
+    uniform = compile_latency(MockLatency.model_validate({"distribution": "uniform", "min": 10, "max": 20}))
+    assert all(0.01 <= uniform() <= 0.02 for _ in range(100))
+
+    normal = MockLatency.model_validate({"distribution": "normal", "mean": 50, "stddev": 100, "min": 40, "max": 60})
+    assert all(0.04 <= value <= 0.06 for value in (compile_latency(normal)() for _ in range(100)))
+
+    percentiles = compile_latency(
+        MockLatency.model_validate({"distribution": "percentiles", "percentiles": {"50": 20, "90": 100, "99": 500}})
+    )
+    monkeypatch.setattr(response_profile._random, "random", lambda: 0.7)
+    assert percentiles() == pytest.approx(0.06)
+    monkeypatch.setattr(response_profile._random, "random", lambda: 0.1)
+    assert percentiles() == pytest.approx(0.02)
+
+    with pytest.raises(ValueError, match="stddev"):
+        MockLatency.model_validate({"distribution": "normal", "mean": 50})
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_paced_by_rate() -> None:
+    """Тест отдачи тела частями по расписанию скорости без Content-Length."""
+    response = CompiledMockResponse(
+        status_code=200, body=b"x" * 40, raw_headers=((b"content-length", b"40"), (b"content-type", b"text/plain"))
+    )
+    plan = compile_stream(MockStreaming.model_validate({"chunk_size": 16, "rate": 800}))
+    messages: list[tuple[float, Message]] = []
+
+    async def send(message: Message) -> None:
+        messages.append((time.perf_counter(), message))
+
+    started = time.perf_counter()
+    await send_streamed_response(send, response, plan)
+
+    assert messages[0][1]["headers"] == [(b"content-type", b"text/plain")]
+    chunks = [message for _, message in messages[1:]]
+    assert [len(message["body"]) for message in chunks] == [16, 16, 8]
+    assert [message["more_body"] for message in chunks] == [True, True, False]
+    assert messages[-1][0] - started >= 0.035
+
+
+@pytest.mark.asyncio
+async def test_mock_with_latency_and_stream(async_client: AsyncClient) -> None:
+    """Тест мока с профилем задержки и потоковой отдачей тела."""
+    payload = {
+        "uri": "/slow",
+        "method": "GET",
+        "status_code": 200,
+        "body": {"data": "y" * 100},
+        "latency": {"distribution": "fixed", "value": 30},
+        "stream": {"chunk_size": 32, "chunk_delay": {"value": 5}},
+    }
+    response = await async_client.post("/api/v1/mock", json=payload)
+    assert response.status_code == 201
+    assert response.json()["stream"]["chunked"] is True
+
+    started = asyncio.get_running_loop().time()
+    response = await async_client.get("/slow")
+    assert asyncio.get_running_loop().time() - started >= 0.045
+    assert response.json() == {"data": "y" * 100}
+    assert "content-length" not in response.headers
+
+    payload["latency"] = {"distribution": "uniform", "min": 20}
+    assert (await async_client.post("/api/v1/mock", json=payload)).status_code == 422
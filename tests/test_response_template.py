@@ -0,0 +1,82 @@
+import pytest
+from httpx import AsyncClient
+
+from src.api.models.mock_model import MockModelWithDate
+from src.services.compiled_response import compile_mock_response
+from src.services.response_template import TemplateInsert, compile_response_template
+
+
+def test_template_compiled_into_segments() -> None:
+    """Тест компиляции шаблона в готовые сегменты байтов и вставки."""
+    mock = MockModelWithDate.model_validate(
+        {
+            "uuid": "550e8400-e29b-41d4-a716-446655440000",
+            "uri": "/users/{id}",
+            "method": "GET",
+            "status_code": 200,
+            "headers": {"Location": "/users/{{ path.id }}"},
+            "body": {"id": "{{ path.id }}", "name": "user-{{ query.name }}", "static": {"list": [1, 2]}},
+            "template": {},
+            "created_at": "2026-01-01T00:00:00+00:00",
+            "updated_at": "2026-01-01T00:00:00+00:00",
+        }
+    )
+    template = compile_response_template(mock, compile_mock_response(mock))
+
+    assert [segment if isinstance(segment, bytes) else segment.mode for segment in template.body] == [
+        b'{"id":',
+        "json",
+        b',"name":"user-',
+        "string",
+        b'","static":{"list":[1,2]}}',
+    ]
+    assert template.headers[0][0] == b"location"
+    assert isinstance(template.headers[0][1][1], TemplateInsert)
+    assert template.content_length
+    assert not template.reads_body
+
+
+@pytest.mark.asyncio
+async def test_templated_mock_echoes_request(async_client: AsyncClient) -> None:
+    """Тест подстановки параметров пути, query-параметров, заголовков и полей тела запроса в ответ."""
+    payload = {
+        "uri": "/orders/{id}",
+        "method": "POST",
+        "status_code": 201,
+        "headers": {"X-Trace": "trace={{ headers.x-trace }}"},
+        "body": {
+            "id": "{{ path.id }}",
+            "user": "{{ body.user }}",
+            "greeting": "Hi, {{ query.name }}! Item {{ body.items.0.sku }}",
+            "missing": "{{ body.nope }}",
+            "request_id": "{{ uuid }}",
+            "same_request_id": "{{ uuid }}",
+            "created": "{{ timestamp }}",
+        },
+        "template": {},
+    }
+    assert (await async_client.post("/api/v1/mock", json=payload)).status_code == 201
+
+    response = await async_client.post(
+        "/orders/17",
+        params={"name": 'Ann "A"'},
+        headers={"X-Trace": "abc"},
+        json={"user": {"id": 42}, "items": [{"sku": "A-1"}]},
+    )
+    assert response.status_code == 201
+    body = response.json()
+    assert body["id"] == "17"
+    assert body["user"] == {"id": 42}
+    assert body["greeting"] == 'Hi, Ann "A"! Item A-1'
+    assert body["missing"] is None
+    assert body["request_id"] == body["same_request_id"] != "{{ uuid }}"
+    assert isinstance(body["created"], int)
+    assert response.headers["x-trace"] == "trace=abc"
+    assert response.headers["content-length"] == str(len(response.content))
+
+    second = (await async_client.post("/orders/18", json={})).json()
+    assert second["id"] == "18"
+    assert second["request_id"] != body["request_id"]
+
+    payload["body"] = {"bad": "{{ cookies.session }}"}
+    assert (await async_client.post("/api/v1/mock", json=payload)).status_code == 422
@@ -0,0 +1,62 @@
+import pytest
+from httpx import AsyncClient
+
+from src.services.route_trie import RouteTemplate, RouteTrie, validate_route_template
+
+
+def test_route_trie_precedence() -> None:
+    """Тест приоритета шаблонов: статический сегмент > параметр > wildcard."""
+    trie = RouteTrie()
+    for uri in ("/users/{id}", "/users/me", "/users/*", "/users/{id}/posts", "/users/me/*"):
+        trie.insert(RouteTemplate.compile(uri))
+
+    def match(path: str) -> tuple[str, dict[str, str]] | None:
+        found = trie.match(path)
+        return (found[0][0].uri, found[0][1]) if found else None
+
+    assert match("/users/me") == ("/users/me", {})
+    assert match("/users/42") == ("/users/{id}", {"id": "42"})
+    assert match("/users/42/posts") == ("/users/{id}/posts", {"id": "42"})
+    assert match("/users/me/posts") == ("/users/me/*", {"*": "posts"})
+    assert match("/users/me/likes") == ("/users/me/*", {"*": "likes"})
+    assert match("/users/42/files/a.txt") == ("/users/*", {"*": "42/files/a.txt"})
+    assert match("/users") is None
+
+    trie.remove(RouteTemplate.compile("/users/*"))
+    assert match("/users/42/files/a.txt") is None
+    assert len(trie) == 4
+
+
+def test_route_template_validation() -> None:
+    """Тест проверки шаблонов URI."""
+    validate_route_template("/users/{id}/files/*")
+    with pytest.raises(ValueError, match="последним"):
+        validate_route_template("/files/*/meta")
+    with pytest.raises(ValueError, match="Некорректный"):
+        validate_route_template("/users/id-{id}")
+    with pytest.raises(ValueError, match="несколько раз"):
+        validate_route_template("/users/{id}/posts/{id}")
+
+
+@pytest.mark.asyncio
+async def test_template_mocks_served(async_client: AsyncClient) -> None:
+    """Тест обслуживания моков с шаблонами URI."""
+    template = {"uri": "/users/{id}", "method": "GET", "status_code": 200, "body": {"kind": "user"}}
+    static = {**template, "uri": "/users/me", "body": {"kind": "me"}}
+    template_uuid = (await async_client.post("/api/v1/mock", json=template)).json()["uuid"]
+    await async_client.post("/api/v1/mock", json=static)
+
+    assert (await async_client.get("/users/17")).json() == {"kind": "user"}
+    assert (await async_client.get("/users/me")).json() == {"kind": "me"}
+    assert (await async_client.get("/users/17/posts")).status_code == 404
+
+    response = await async_client.get("/users/5", headers={"x-req-id": template_uuid})
+    assert response.json() == {"kind": "user"}
+    response = await async_client.get("/orders/5", headers={"x-req-id": template_uuid})
+    assert response.status_code == 404
+
+    await async_client.delete("/api/v1/mock", params={"uuid": template_uuid})
+    assert (await async_client.get("/users/17")).status_code == 404
+
+    response = await async_client.post("/api/v1/mock", json={**template, "uri": "/files/*/meta"})
+    assert response.status_code == 422
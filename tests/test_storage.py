@@ -0,0 +1,223 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from uuid import UUID
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+
+from src.api.models.mock_model import MockData, MockModelWithDate
+from src.storage import MemoryMockStorage, MockRouteConflictError, MockStorage, SQLAlchemyMockStorage
+
+
+@pytest.fixture(params=["memory", "sqlalchemy"])
+async def storage(request: pytest.FixtureRequest) -> MockStorage:
+    """Фикстура хранилища мок-данных каждого типа."""
+    storage: MockStorage = (
+        MemoryMockStorage() if request.param == "memory" else SQLAlchemyMockStorage("sqlite+aiosqlite:///:memory:")
+    )
+    await storage.initialize()
+    return storage
+
+
+@pytest.fixture
+async def memory_client(monkeypatch: pytest.MonkeyPatch) -> AsyncGenerator[AsyncClient, None]:
+    """Фикстура асинхронного клиента приложения с хранилищем в памяти."""
+    from src.__main__ import app, lifespan
+    from src.settings import config
+
+    monkeypatch.setattr(config, "DB_TYPE", "memory")
+    async with lifespan(app), AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+def _uuid(mock: MockModelWithDate | None) -> UUID | None:
+    return mock.uuid if mock is not None else None
+
+
+def _mock(uri: str, method: str = "GET", status_code: int = 200, variant: str | None = None) -> MockData:
+    match = {"query": {"variant": variant}} if variant is not None else None
+    return MockData.model_validate(
+        {"uri": uri, "method": method, "status_code": status_code, "body": {"uri": uri}, "match": match}
+    )
+
+
+@pytest.mark.asyncio
+async def test_storage_contract(storage: MockStorage) -> None:
+    """Тест одинакового поведения хранилищ: последний мок маршрута, страницы, удаление и журнал запросов."""
+    first = await storage.create_mock_data(_mock("/users"))
+    batch = await storage.create_mock_data_batch(
+        [_mock("/users", variant="b"), _mock("/orders", "POST", 201), _mock("/users/1")]
+    )
+
+    found = await storage.get_mock_data_by_uuid(first.uuid)
+    assert found is not None
+    assert found.body == {"uri": "/users"}
+    assert _uuid(await storage.get_last_mock_data_by_uri_and_method("/users", "GET")) == batch[0].uuid
+    assert [mock.uuid for mock in await storage.get_all_mock_data()] == [first.uuid] + [mock.uuid for mock in batch]
+    found_many = await storage.get_mock_data_by_uuids([batch[1].uuid, first.uuid])
+    assert [mock.uuid for mock in found_many] == [first.uuid, batch[1].uuid]
+
+    page = await storage.get_mock_data_page(2, uri_prefix="/users")
+    assert [mock.uuid for mock in page] == [first.uuid, batch[0].uuid]
+    page = await storage.get_mock_data_page(2, after=(page[-1].created_at, page[-1].uuid), uri_prefix="/users")
+    assert [mock.uuid for mock in page] == [batch[2].uuid]
+    assert [mock.uuid async for mock in storage.iter_mock_data(1, status_code=201)] == [batch[1].uuid]
+
+    assert await storage.delete_mock_data(batch[0].uuid) is True
+    assert await storage.delete_mock_data(batch[0].uuid) is False
+    assert _uuid(await storage.get_last_mock_data_by_uri_and_method("/users", "GET")) == first.uuid
+
+    row = {"mock_uuid": first.uuid, "method": "GET", "path": "/users", "query": "", "headers": {}}
+    await storage.save_request_log(
+        [{**row, "body": b"abc", "body_size": index * 2, "status_code": None, "created_at": first.created_at}
+         for index in range(3)]
+    )  # fmt: skip
+    items, cursor = await storage.get_request_log_page(2, mock_uuid=first.uuid)
+    assert [item.body_size for item in items] == [4, 2]
+    assert [item.body_truncated for item in items] == [True, False]
+    items, cursor = await storage.get_request_log_page(2, cursor=cursor)
+    assert [item.body_size for item in items] == [0]
+    assert cursor is None
+    await storage.prune_request_log(keep_last=1)
+    assert await storage.clear_request_log() == 1
+
+
+@pytest.mark.asyncio
+async def test_storage_update_history(storage: MockStorage) -> None:
+    """Тест изменения мок-данных на месте: версия, маршрут, проверка версии и ограничение истории."""
+    first = await storage.create_mock_data(_mock("/users"))
+    second = await storage.create_mock_data(_mock("/users", variant="b"))
+
+    updated = await storage.update_mock_data(second.uuid, _mock("/orders", status_code=201), history_limit=2)
+    assert updated is not None
+    assert (updated.uuid, updated.version, updated.uri) == (second.uuid, 2, "/orders")
+    assert updated.created_at == second.created_at
+    assert updated.updated_at > second.updated_at
+    assert _uuid(await storage.get_last_mock_data_by_uri_and_method("/users", "GET")) == first.uuid
+    assert _uuid(await storage.get_last_mock_data_by_uri_and_method("/orders", "GET")) == second.uuid
+    assert [mock.uuid for mock in await storage.get_all_mock_data()] == [first.uuid, second.uuid]
+
+    assert await storage.update_mock_data(second.uuid, _mock("/orders"), expected_version=1) is None
+    for status_code in (202, 203):
+        assert await storage.update_mock_data(second.uuid, _mock("/orders", status_code=status_code), history_limit=2)
+    history = await storage.get_mock_history(second.uuid)
+    assert [(mock.version, mock.status_code) for mock in history] == [(3, 202), (2, 201)]
+    version = await storage.get_mock_version(second.uuid, 2)
+    assert version is not None
+    assert version.uri == "/orders"
+    assert await storage.get_mock_version(second.uuid, 1) is None
+
+    assert await storage.delete_mock_data(second.uuid)
+    assert await storage.get_mock_history(second.uuid) == []
+
+
+@pytest.mark.asyncio
+async def test_storage_expiring_batch_delete(storage: MockStorage) -> None:
+    """Тест времени истечения мок-данных и пакетного удаления с восстановлением последнего мока маршрута."""
+    expiring = MockData.model_validate({**_mock("/users", variant="b").model_dump(), "ttl_seconds": 60, "max_hits": 3})
+    first, second, third = await storage.create_mock_data_batch([_mock("/users"), expiring, _mock("/orders")])
+    assert second.expires_at is not None
+    assert second.max_hits == 3
+
+    expirations = await storage.get_mock_expirations()
+    assert [uuid for uuid, _ in expirations] == [second.uuid]
+    assert expirations[0][1].timestamp() == pytest.approx(second.expires_at.timestamp())
+
+    assert set(await storage.delete_mock_data_batch([second.uuid, third.uuid, second.uuid])) == {
+        second.uuid,
+        third.uuid,
+    }
+    assert await storage.delete_mock_data_batch([second.uuid]) == []
+    assert [mock.uuid for mock in await storage.get_all_mock_data()] == [first.uuid]
+    assert _uuid(await storage.get_last_mock_data_by_uri_and_method("/users", "GET")) == first.uuid
+    assert await storage.get_last_mock_data_by_uri_and_method("/orders", "GET") is None
+
+
+@pytest.mark.asyncio
+async def test_storage_create_updates_occupied_route(storage: MockStorage) -> None:
+    """Тест создания мок-данных для занятого маршрута как новой версии, в том числе внутри пакета."""
+    first = await storage.create_mock_data(_mock("/users"), history_limit=5)
+    second = await storage.create_mock_data(_mock("/users", status_code=201), history_limit=5)
+    assert (second.uuid, second.version, second.status_code) == (first.uuid, 2, 201)
+    assert second.created_at == first.created_at
+
+    batch = await storage.create_mock_data_batch(
+        [_mock("/users", status_code=202), _mock("/users", variant="b"), _mock("/users", status_code=203)],
+        history_limit=5,
+    )
+    assert [(mock.uuid, mock.version) for mock in batch] == [(first.uuid, 3), (batch[1].uuid, 1), (first.uuid, 4)]
+    assert [(mock.version, mock.status_code) for mock in await storage.get_mock_history(first.uuid)] == [
+        (3, 202),
+        (2, 201),
+        (1, 200),
+    ]
+    assert [mock.uuid for mock in await storage.get_all_mock_data()] == [first.uuid, batch[1].uuid]
+    assert _uuid(await storage.get_last_mock_data_by_uri_and_method("/users", "GET")) == batch[1].uuid
+
+    with pytest.raises(MockRouteConflictError):
+        await storage.update_mock_data(batch[1].uuid, _mock("/users"))
+    assert await storage.delete_mock_data(first.uuid)
+    assert (await storage.create_mock_data(_mock("/users"))).version == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["memory", "sqlite-file"])
+async def test_concurrent_creates_on_one_route(kind: str, tmp_path: Path) -> None:
+    """Тест конкурентного создания мок-данных одного маршрута: остается одна строка со всеми версиями."""
+    storage: MockStorage = (
+        MemoryMockStorage() if kind == "memory" else SQLAlchemyMockStorage(f"sqlite+aiosqlite:///{tmp_path / 'db'}")
+    )
+    await storage.initialize()
+    mocks = await asyncio.gather(
+        *(storage.create_mock_data(_mock("/race", status_code=200 + i), history_limit=20) for i in range(10))
+    )
+
+    assert len({mock.uuid for mock in mocks}) == 1
+    assert sorted(mock.version for mock in mocks) == list(range(1, 11))
+    assert len(await storage.get_all_mock_data()) == 1
+    assert len(await storage.get_mock_history(mocks[0].uuid)) == 9
+
+
+@pytest.mark.asyncio
+async def test_memory_storage_serves_mocks(memory_client: AsyncClient) -> None:
+    """Тест обслуживания моков приложением с хранилищем в памяти."""
+    from src.storage import get_storage
+
+    assert isinstance(get_storage(), MemoryMockStorage)
+    payload = {"uri": "/items", "method": "GET", "status_code": 200, "body": {"items": []}}
+    uuid = (await memory_client.post("/api/v1/mock", json=payload)).json()["uuid"]
+
+    response = await memory_client.get("/items")
+    assert response.status_code == 200
+    assert response.json() == {"items": []}
+    assert (await memory_client.get("/api/v1/mock", params={"uuid": uuid})).json()["uuid"] == uuid
+    assert (await memory_client.delete("/api/v1/mock", params={"uuid": uuid})).status_code == 200
+    assert (await memory_client.get("/items")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_concurrent_admin_writes_on_in_memory_database(async_client: AsyncClient) -> None:
+    """Тест одновременных изменений и чтений мок-данных в базе данных SQLite в памяти."""
+    writes = [async_client.post("/api/v1/mock", json=_mock(f"/concurrent/{i}").model_dump()) for i in range(20)]
+    reads = [async_client.get("/api/v1/mock") for _ in range(20)]
+    responses = await asyncio.gather(*writes, *reads)
+
+    assert [response.status_code for response in responses] == [201] * 20 + [200] * 20
+    assert len((await async_client.get("/api/v1/mock")).json()) == 20
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("test_app")
+async def test_nested_session_on_in_memory_database() -> None:
+    """Тест вложенной сессии базы данных SQLite в памяти, использующей транзакцию внешней сессии."""
+    from src.db import DBManager
+    from src.db.models.mock_data import MockChangeLog
+
+    db = DBManager()
+    async with asyncio.timeout(5), db.session("outer") as outer:
+        await outer.execute(select(MockChangeLog.id))
+        async with db.session("inner") as inner:
+            assert inner is outer
+            await inner.execute(select(MockChangeLog.id))